@@ -0,0 +1,34 @@
+"""Add coordinates and geohash index to hotels and cars
+
+Revision ID: add_geo_columns
+Revises: add_trigram_search_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_geo_columns'
+down_revision = 'add_trigram_search_indexes'
+branch_labels = None
+depends_on = None
+
+GEO_TABLES = [('hotels', 'idx_hotels_geohash'), ('cars', 'idx_cars_geohash')]
+
+
+def upgrade():
+    for table, index in GEO_TABLES:
+        op.add_column(table, sa.Column('latitude', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('longitude', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('geohash', sa.String(12), nullable=True))
+        # Geohash prefixes are queried as ranges, which a plain B-tree serves
+        op.create_index(index, table, ['geohash'])
+
+
+def downgrade():
+    for table, index in reversed(GEO_TABLES):
+        op.drop_index(index, table_name=table)
+        op.drop_column(table, 'geohash')
+        op.drop_column(table, 'longitude')
+        op.drop_column(table, 'latitude')
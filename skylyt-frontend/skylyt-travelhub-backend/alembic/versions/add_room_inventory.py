@@ -0,0 +1,41 @@
+"""Add per-night room inventory
+
+Revision ID: add_room_inventory
+Revises: add_geo_columns
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_room_inventory'
+down_revision = 'add_geo_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'room_inventory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hotel_id', sa.Integer(), nullable=False),
+        sa.Column('room_type', sa.String(50), nullable=False),
+        sa.Column('night', sa.Date(), nullable=False),
+        sa.Column('total_rooms', sa.Integer(), nullable=False),
+        sa.Column('booked_rooms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['hotel_id'], ['hotels.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('hotel_id', 'room_type', 'night', name='uq_room_inventory_night'),
+        sa.CheckConstraint('booked_rooms >= 0 AND booked_rooms <= total_rooms', name='ck_room_inventory_booked')
+    )
+    op.create_index('ix_room_inventory_id', 'room_inventory', ['id'])
+    op.create_index('idx_room_inventory_night', 'room_inventory', ['night'])
+
+
+def downgrade():
+    op.drop_index('idx_room_inventory_night', table_name='room_inventory')
+    op.drop_index('ix_room_inventory_id', table_name='room_inventory')
+    op.drop_table('room_inventory')
@@ -0,0 +1,23 @@
+"""Index search history by user and time
+
+Revision ID: add_search_history_index
+Revises: add_room_inventory
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_history_index'
+down_revision = 'add_room_inventory'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /search/history reads a user's latest searches on a cache miss
+    op.create_index('idx_search_history_user_created', 'search_history', ['user_id', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('idx_search_history_user_created', table_name='search_history')
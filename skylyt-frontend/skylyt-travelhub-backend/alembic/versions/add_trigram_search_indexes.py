@@ -0,0 +1,52 @@
+"""Add pg_trgm GIN indexes for text search
+
+Revision ID: add_trigram_search_indexes
+Revises: fix_hotel_image_hotel_id
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_trigram_search_indexes'
+down_revision = 'fix_hotel_image_hotel_id'
+branch_labels = None
+depends_on = None
+
+# (index name, table, column) searched with ILIKE '%term%'
+TRIGRAM_INDEXES = [
+    ('idx_hotels_location_trgm', 'hotels', 'location'),
+    ('idx_hotels_name_trgm', 'hotels', 'name'),
+    ('idx_cars_location_trgm', 'cars', 'location'),
+    ('idx_cars_name_trgm', 'cars', 'name'),
+    ('idx_bookings_customer_name_trgm', 'bookings', 'customer_name'),
+    ('idx_bookings_customer_email_trgm', 'bookings', 'customer_email'),
+    ('idx_bookings_reference_trgm', 'bookings', 'booking_reference'),
+    ('idx_bookings_hotel_name_trgm', 'bookings', 'hotel_name'),
+    ('idx_bookings_car_name_trgm', 'bookings', 'car_name'),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite and others fall back to plain ILIKE scans
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY keeps the tables writable, but cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON {table} USING gin ({column} gin_trgm_ops)'
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(TRIGRAM_INDEXES):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+    # pg_trgm is left installed; other objects may depend on it
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import settings as app_settings
+from app.core.database import get_db, run_in_session
 from app.models.about_settings import AboutSettings
 from app.core.dependencies import get_current_user, get_admin_user as require_admin
 from pydantic import BaseModel
@@ -19,8 +21,22 @@ class AboutSettingsUpdate(BaseModel):
     achievements: Optional[List[Dict[str, Any]]] = None
 
 @router.get("/about-settings")
-async def get_about_settings(db: Session = Depends(get_db)):
+async def get_about_settings(request: Request):
     """Get about page settings (public endpoint)"""
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_about_settings)
+    
+    return await cached_response(
+        request, build_cache_key("about_settings", {}), compute,
+        app_settings.CACHE_CATALOG_TTL, soft_ttl=app_settings.CACHE_CATALOG_SOFT_TTL
+    )
+
+
+def _load_about_settings(db: Session) -> dict:
+    """Load the public about page payload, creating default settings if none exist"""
     settings = db.query(AboutSettings).first()
     if not settings:
         # Create default settings if none exist
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
@@ -11,6 +12,7 @@ from app.schemas.booking import (
     BookingStatusUpdate, BookingCreateRequest, BookingUpdateRequest, 
     CancelBookingRequest, BulkDeleteRequest
 )
+from app.utils.pagination import InvalidCursor
 from app.utils.serializers import serialize_booking, parse_date_string
 from app.utils.validators import VALID_BOOKING_STATUSES, VALID_CURRENCIES
 
@@ -34,6 +36,7 @@ async def get_admin_bookings(
     sort_order: str = "desc",
     page: int = 1,
     per_page: int = 20,
+    cursor: str = None,
     current_user = Depends(get_current_user), 
     db: Session = Depends(get_db)
 ):
@@ -59,18 +62,22 @@ async def get_admin_bookings(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid end_date format")
     
-    return booking_service.get_bookings_with_filters(
-        search=search,
-        status=status,
-        payment_status=payment_status,
-        booking_type=booking_type,
-        start_date=parsed_start_date,
-        end_date=parsed_end_date,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        page=page,
-        per_page=per_page
-    )
+    try:
+        return booking_service.get_bookings_with_filters(
+            search=search,
+            status=status,
+            payment_status=payment_status,
+            booking_type=booking_type,
+            start_date=parsed_start_date,
+            end_date=parsed_end_date,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            page=page,
+            per_page=per_page,
+            cursor=cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/admin/bookings/{booking_id}")
 async def get_admin_booking(booking_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -120,7 +127,7 @@ async def update_booking_status_api(booking_id: int, status_update: BookingStatu
         from app.tasks.email_tasks import send_booking_status_update_email
         
         booking_service = BookingService(db)
-        result = booking_service.update_booking_status_helper(booking_id, status_update.status)
+        result = await run_in_threadpool(booking_service.update_booking_status_helper, booking_id, status_update.status)
         
         # Send status update email immediately
         try:
@@ -128,7 +135,8 @@ async def update_booking_status_api(booking_id: int, status_update: BookingStatu
             if booking and booking.customer_email:
                 from app.services.email_service import EmailService
                 email_service = EmailService()
-                email_service.send_booking_status_update(
+                await run_in_threadpool(
+                    email_service.send_booking_status_update,
                     booking.customer_email,
                     {
                         "user_name": booking.customer_name,
@@ -161,7 +169,7 @@ async def update_booking_status(booking_id: int, status_update: BookingStatusUpd
     try:
         from app.services.booking_service import BookingService
         booking_service = BookingService(db)
-        return booking_service.update_booking_status_helper(booking_id, status_update.status)
+        return await run_in_threadpool(booking_service.update_booking_status_helper, booking_id, status_update.status)
     except HTTPException:
         raise
     except Exception as e:
@@ -179,6 +187,8 @@ async def bulk_delete_bookings(request: BulkDeleteRequest, current_user = Depend
     from app.models.booking import Booking
     
     try:
+        # Rooms held by the deleted hotel bookings are released in this transaction
+        # (room_inventory.release_bulk_cancelled_bookings)
         deleted_count = db.query(Booking).filter(Booking.id.in_(request.ids)).delete(synchronize_session=False)
         db.commit()
         
@@ -273,7 +283,8 @@ async def create_booking(booking_data: BookingCreateRequest, current_user = Depe
         try:
             from app.services.email_service import EmailService
             email_service = EmailService()
-            email_service.send_booking_confirmation(
+            await run_in_threadpool(
+                email_service.send_booking_confirmation,
                 user.email,
                 {
                     "user_name": f"{user.first_name} {user.last_name}",
@@ -393,7 +404,8 @@ async def assign_driver_to_booking(
             email_service = EmailService()
             
             # Send driver assignment email
-            email_service.send_driver_assignment(
+            await run_in_threadpool(
+                email_service.send_driver_assignment,
                 driver.email,
                 {
                     "name": driver.name,
@@ -413,7 +425,8 @@ async def assign_driver_to_booking(
             )
             
             # Send customer notification about driver assignment
-            email_service.send_booking_status_update(
+            await run_in_threadpool(
+                email_service.send_booking_status_update,
                 booking.customer_email,
                 {
                     "user_name": booking.customer_name,
@@ -457,7 +470,7 @@ async def resend_booking_confirmation(booking_id: int, current_user = Depends(ge
     from app.services.booking_service import BookingService
     booking_service = BookingService(db)
     
-    success = booking_service.send_confirmation_email(booking_id)
+    success = await run_in_threadpool(booking_service.send_confirmation_email, booking_id)
     if not success:
         raise HTTPException(status_code=404, detail="Booking not found or email failed")
     
@@ -503,7 +516,8 @@ async def cancel_booking_admin(booking_id: int, cancel_data: CancelBookingReques
             try:
                 from app.services.email_service import EmailService
                 email_service = EmailService()
-                email_service.send_booking_cancellation(
+                await run_in_threadpool(
+                    email_service.send_booking_cancellation,
                     booking.customer_email,
                     {
                         "user_name": booking.customer_name,
@@ -538,6 +552,7 @@ async def get_hotel_bookings(
     sort_order: str = "desc",
     page: int = 1,
     per_page: int = 20,
+    cursor: str = None,
     current_user = Depends(get_current_user), 
     db: Session = Depends(get_db)
 ):
@@ -553,18 +568,22 @@ async def get_hotel_bookings(
     parsed_start_date = parse_date_string(start_date) if start_date else None
     parsed_end_date = parse_date_string(end_date) if end_date else None
     
-    return booking_service.get_bookings_with_filters(
-        search=search,
-        status=status,
-        payment_status=payment_status,
-        booking_type="hotel",  # Filter for hotel bookings only
-        start_date=parsed_start_date,
-        end_date=parsed_end_date,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        page=page,
-        per_page=per_page
-    )
+    try:
+        return booking_service.get_bookings_with_filters(
+            search=search,
+            status=status,
+            payment_status=payment_status,
+            booking_type="hotel",  # Filter for hotel bookings only
+            start_date=parsed_start_date,
+            end_date=parsed_end_date,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            page=page,
+            per_page=per_page,
+            cursor=cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # Car-specific booking endpoints
 @router.get("/admin/car-bookings")
@@ -578,6 +597,7 @@ async def get_car_bookings(
     sort_order: str = "desc",
     page: int = 1,
     per_page: int = 20,
+    cursor: str = None,
     current_user = Depends(get_current_user), 
     db: Session = Depends(get_db)
 ):
@@ -593,15 +613,19 @@ async def get_car_bookings(
     parsed_start_date = parse_date_string(start_date) if start_date else None
     parsed_end_date = parse_date_string(end_date) if end_date else None
     
-    return booking_service.get_bookings_with_filters(
-        search=search,
-        status=status,
-        payment_status=payment_status,
-        booking_type="car",  # Filter for car bookings only
-        start_date=parsed_start_date,
-        end_date=parsed_end_date,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        page=page,
-        per_page=per_page
-    )
\ No newline at end of file
+    try:
+        return booking_service.get_bookings_with_filters(
+            search=search,
+            status=status,
+            payment_status=payment_status,
+            booking_type="car",  # Filter for car bookings only
+            start_date=parsed_start_date,
+            end_date=parsed_end_date,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            page=page,
+            per_page=per_page,
+            cursor=cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -6,6 +6,7 @@ import uuid
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.car import Car, CarMaintenance
+from app.services.car_availability import busy_cars, parse_window
 from pydantic import BaseModel, validator
 from fastapi import Query
 
@@ -30,12 +31,27 @@ class CarCreateRequest(BaseModel):
         return v
 
 
+def _booked_now(db: Session) -> set:
+    """Cars with a reservation covering the current moment"""
+    now = datetime.utcnow()
+    return busy_cars(db, now, now + timedelta(minutes=1))
+
+
 @router.get("")
 def get_all_cars(
+    start_date: Optional[str] = Query(None, description="Mark cars booked from this date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Mark cars booked until this date (YYYY-MM-DD)"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get all cars for admin management"""
+    if start_date:
+        try:
+            booked = busy_cars(db, *parse_window(start_date, end_date or start_date))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        booked = _booked_now(db)
     cars = db.query(Car).all()
     return [{
         "id": car.id,
@@ -52,6 +68,7 @@ def get_all_cars(
         "transmission": car.transmission,
         "fuel_type": car.fuel_type,
         "status": car.status,
+        "is_booked": car.id in booked,
         "current_mileage": car.current_mileage,
         "features": car.features or [],
         "is_featured": getattr(car, 'is_featured', False),
@@ -88,6 +105,8 @@ def create_car(
         status=car_data.get("status", "available"),
         current_mileage=car_data.get("current_mileage", 0),
         features=car_data.get("features", []),
+        latitude=car_data.get("latitude"),
+        longitude=car_data.get("longitude"),
         insurance_doc_url=car_data.get("insurance_doc_url"),
         insurance_expiry=datetime.fromisoformat(car_data["insurance_expiry"]) if car_data.get("insurance_expiry") else None,
         registration_doc_url=car_data.get("registration_doc_url"),
@@ -297,21 +316,12 @@ def get_car_stats(
     available_cars = db.query(Car).filter(Car.is_available == True).count()
     
     # Initialize other stats
-    active_bookings = 0
     today_revenue = 0
     
     try:
         from app.models.booking import Booking
         from app.models.payment import Payment
         
-        # Get active car bookings
-        active_bookings = db.query(Booking).filter(
-            and_(
-                Booking.booking_type == 'car',
-                Booking.status.in_(['confirmed', 'ongoing'])
-            )
-        ).count()
-        
         # Update car statuses based on bookings
         out_with_customer = db.query(Booking).filter(
             and_(
@@ -343,13 +353,14 @@ def get_car_stats(
         print(f"Debug: Exception in revenue calculation: {e}")
         pass
     
-    booked_cars = active_bookings
+    # Cars out on a rental right now, one per car however it was booked
+    booked_cars = len(_booked_now(db))
     maintenance_cars = total_cars - available_cars - booked_cars if total_cars > available_cars + booked_cars else 0
     
     # Calculate utilization rate
     utilization_rate = 0
     if total_cars > 0:
-        utilization_rate = round((active_bookings / total_cars) * 100, 1)
+        utilization_rate = round((booked_cars / total_cars) * 100, 1)
     
     return {
         "total_cars": total_cars,
@@ -431,13 +442,8 @@ async def get_fleet_stats(current_user = Depends(get_current_user), db: Session
         total_cars = db.query(Car).count()
         available_cars = db.query(Car).filter(Car.is_available == True).count()
         
-        # Active bookings for rented cars
-        rented_cars = db.query(Booking).filter(
-            and_(
-                Booking.booking_type == 'car',
-                Booking.status.in_(['confirmed', 'ongoing'])
-            )
-        ).count()
+        # Cars with a reservation covering the current moment
+        rented_cars = len(_booked_now(db))
         
         maintenance_cars = max(0, total_cars - available_cars - rented_cars)
         
@@ -44,6 +44,8 @@ def create_hotel(
         id=str(uuid.uuid4()),
         name=hotel_data.get("name", "New Hotel"),
         location=hotel_data.get("location", "Unknown Location"),
+        latitude=hotel_data.get("latitude"),
+        longitude=hotel_data.get("longitude"),
         star_rating=hotel_data.get("rating", hotel_data.get("star_rating", 4)),
         price_per_night=hotel_data.get("price", hotel_data.get("price_per_night", 100.0)),
         room_count=hotel_data.get("room_count", 10),
@@ -14,17 +14,18 @@ async def get_admin_stats(current_user = Depends(get_current_user), db: Session
     if not (current_user.is_admin() or current_user.is_superadmin()):
         raise HTTPException(status_code=403, detail="Admin access required")
     
+    from fastapi.concurrency import run_in_threadpool
     from app.services.analytics_service import AnalyticsService
-    from app.utils.cache_manager import cache_manager
+    from app.utils.cache import cache_manager
     
     # Try cache first (5 minute cache)
     cache_key = "admin_stats"
-    cached_stats = cache_manager.get(cache_key)
+    cached_stats = await cache_manager.get(cache_key)
     if cached_stats:
         return cached_stats
     
-    stats = AnalyticsService.get_admin_stats(db)
-    cache_manager.set(cache_key, stats, 300)
+    stats = await run_in_threadpool(AnalyticsService.get_admin_stats, db)
+    await cache_manager.set(cache_key, stats, 300)
     return stats
 
 @router.get("/admin/active-users")
@@ -78,6 +78,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """User login with session caching"""
     import logging
+    from anyio import from_thread
     from app.utils.sanitize import sanitize_for_logging
     from app.services.cache_service import CacheService
     
@@ -101,7 +102,8 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
         "email": user.email,
         "roles": [role.name for role in user.roles]
     }
-    CacheService.cache_user_session(user.id, session_data)
+    # Sync route runs in a worker thread; hand the cache write to the event loop
+    from_thread.run(CacheService.cache_user_session, user.id, session_data)
     
     # Determine redirect path based on user roles
     redirect_path = "/dashboard"  # default for regular users
@@ -142,12 +144,12 @@ def refresh_token(current_user = Depends(get_current_user)):
 
 
 @router.post("/logout")
-def logout(current_user = Depends(get_current_user)):
+async def logout(current_user = Depends(get_current_user)):
     """User logout with session cleanup"""
     from app.services.cache_service import CacheService
     
     # Clear user session from cache
-    CacheService.invalidate_user_session(current_user.id)
+    await CacheService.invalidate_user_session(current_user.id)
     
     return {"message": "Successfully logged out"}
 
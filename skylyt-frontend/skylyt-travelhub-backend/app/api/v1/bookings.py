@@ -6,6 +6,7 @@ from app.core.dependencies import get_current_user, get_current_user_optional
 from app.schemas.booking import BookingCreate, BookingResponse, BookingUpdate
 from app.services.booking_service import BookingService
 from app.services.email_service import EmailService
+from app.services.room_inventory import RoomsUnavailable, reserve_booking
 import logging
 
 logger = logging.getLogger(__name__)
@@ -45,6 +46,14 @@ def create_booking(
             special_requests=guest_data.get('special_requests', '')
         )
         
+        # Hotel bookings take their rooms in the same transaction
+        try:
+            reserve_booking(db, booking)
+        except RoomsUnavailable as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
         db.add(booking)
         db.commit()
         db.refresh(booking)
@@ -82,6 +91,9 @@ def create_booking(
             "total_amount": float(booking.total_amount)
         }
         
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         import traceback
         print(f"Booking creation error: {e}")
@@ -345,15 +357,11 @@ def get_booking_summary(
         from app.services.currency_service import CurrencyService
         
         if item_type == 'car':
-            base_price = float(item.price_per_day)
-            base_currency = getattr(item, 'base_currency', 'NGN')
-            
-            converted_price = CurrencyService.convert_currency(
-                base_price, base_currency, currency.upper(), db
+            rates = CurrencyService.get_rates(db)
+            converted_price = rates.convert(
+                item.price_per_day, getattr(item, 'base_currency', 'NGN'), currency.upper()
             )
-            
-            curr_obj = CurrencyService.get_currency_by_code(currency.upper(), db)
-            symbol = curr_obj.symbol if curr_obj else currency.upper()
+            symbol = rates.symbol(currency.upper())
             
             return {
                 "id": str(item.id),
@@ -368,15 +376,11 @@ def get_booking_summary(
                 "features": item.features or []
             }
         else:
-            base_price = float(item.price_per_night)
-            base_currency = getattr(item, 'base_currency', 'NGN')
-            
-            converted_price = CurrencyService.convert_currency(
-                base_price, base_currency, currency.upper(), db
+            rates = CurrencyService.get_rates(db)
+            converted_price = rates.convert(
+                item.price_per_night, getattr(item, 'base_currency', 'NGN'), currency.upper()
             )
-            
-            curr_obj = CurrencyService.get_currency_by_code(currency.upper(), db)
-            symbol = curr_obj.symbol if curr_obj else currency.upper()
+            symbol = rates.symbol(currency.upper())
             
             return {
                 "id": str(item.id),
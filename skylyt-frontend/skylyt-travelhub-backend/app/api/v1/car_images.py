@@ -3,12 +3,13 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.http_client import CircuitOpenError, outbound_http
 from app.models.car_image import CarImage
 from app.models.car import Car
 import uuid
 import os
 from pathlib import Path
-import requests
+import httpx
 
 router = APIRouter(prefix="/car-images", tags=["car-images"])
 
@@ -129,12 +130,13 @@ async def upload_car_image_from_url(
     
     try:
         # Download image
-        response = requests.get(
-            image_url, 
-            timeout=10, 
-            allow_redirects=False,
-            headers={'User-Agent': 'Skylyt-ImageBot/1.0'},
-            stream=True
+        response = await outbound_http.request(
+            "GET",
+            image_url,
+            upstream="image-fetch",
+            timeout=10,
+            follow_redirects=False,
+            headers={'User-Agent': 'Skylyt-ImageBot/1.0'}
         )
         response.raise_for_status()
         
@@ -172,7 +174,7 @@ async def upload_car_image_from_url(
         
         return {"message": "Image uploaded successfully", "image": {"id": car_image.id, "url": car_image.image_url}}
         
-    except requests.RequestException:
+    except (httpx.HTTPError, CircuitOpenError):
         raise HTTPException(status_code=400, detail="Failed to download image from URL")
 
 
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.core.database import get_db
+from typing import List, Optional
+from app.core.database import run_in_session
+from app.core.dependencies import get_current_user_id_optional
 from app.schemas.car import CarSearchRequest, CarResponse
 from app.schemas.search import SearchResponse
 from app.services.car_service import CarService
@@ -9,9 +11,13 @@ from decimal import Decimal
 
 router = APIRouter(prefix="/cars", tags=["cars"])
 
+# Cars per bulk availability request (a fleet view)
+MAX_AVAILABILITY_IDS = 500
+
 
 @router.get("/search")
-def search_cars(
+async def search_cars(
+    request: Request,
     location: Optional[str] = Query(None, description="Pickup location"),
     pickup_date: Optional[str] = Query(None, description="Pickup date (YYYY-MM-DD)"),
     return_date: Optional[str] = Query(None, description="Return date (YYYY-MM-DD)"),
@@ -26,37 +32,142 @@ def search_cars(
     currency: str = Query("NGN", description="Currency code"),
     page: int = Query(1, description="Page number"),
     per_page: int = Query(20, description="Items per page"),
-    db: Session = Depends(get_db)
+    facets: bool = Query(False, description="Include transmission, category, feature and price facets of all matches"),
+    near: Optional[str] = Query(None, description="Search around latitude,longitude"),
+    radius_km: Optional[float] = Query(None, description="Radius around near in km (default 10)"),
+    bbox: Optional[str] = Query(None, description="Search within south,west,north,east"),
+    user_id: Optional[int] = Depends(get_current_user_id_optional)
 ):
     """Search cars with filters and caching"""
+    from app.services.car_availability import parse_window
+    from app.services.search_history import response_total, search_history_recorder, search_params
+    from app.utils.geo import DISTANCE, parse_geo_query
+    from app.utils.response_cache import response_from_entry
+    
+    if pickup_date:
+        try:
+            parse_window(pickup_date, return_date or pickup_date)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        geo = parse_geo_query(near, radius_km, bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if (sort_by or '').lstrip('-') == DISTANCE and (geo is None or geo.origin is None):
+        raise HTTPException(status_code=400, detail="Sorting by distance requires near")
+    
+    params = dict(
+        location=location, pickup_date=pickup_date, return_date=return_date,
+        category=category, transmission=transmission, min_price=min_price,
+        max_price=max_price, guests=guests, amenities=amenities, rating=rating,
+        sort_by=sort_by, currency=currency, page=page, per_page=per_page,
+        near=near, radius_km=radius_km, bbox=bbox
+    )
+    entry = await cached_car_search(**params, facets=facets)
+    if user_id is not None:
+        # Written behind the response by the history recorder
+        search_history_recorder.record(user_id, "car", search_params(**params), response_total(entry.value))
+    return response_from_entry(request, entry)
+
+
+async def cached_car_search(
+    location: Optional[str] = None,
+    pickup_date: Optional[str] = None,
+    return_date: Optional[str] = None,
+    category: Optional[str] = None,
+    transmission: Optional[str] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
+    guests: Optional[int] = None,
+    amenities: Optional[str] = None,
+    rating: Optional[float] = None,
+    sort_by: Optional[str] = "price",
+    currency: str = "NGN",
+    page: int = 1,
+    per_page: int = 20,
+    facets: bool = False,
+    near: Optional[str] = None,
+    radius_km: Optional[float] = None,
+    bbox: Optional[str] = None
+):
+    """Run a car search through the shared cache (also used by the cache warmer)"""
     from app.services.cache_service import CacheService
-    from app.models.car import Car
-    from sqlalchemy import desc, asc, and_, or_
+    from app.services.car_availability import AVAILABILITY_TAG, car_availability_index, parse_window
+    from app.utils.geo import parse_geo_query
     
-    # Create cache key from search parameters
+    geo = parse_geo_query(near, radius_km, bbox)
+    # With a pickup date only cars free for the whole rental are listed
+    window = parse_window(pickup_date, return_date or pickup_date) if pickup_date else None
+    
+    # Create cache key from normalized search parameters (text filters are case-insensitive)
     search_params = {
-        'location': location, 'pickup_date': pickup_date, 'return_date': return_date,
-        'category': category, 'transmission': transmission, 'min_price': str(min_price) if min_price else None,
-        'max_price': str(max_price) if max_price else None, 'guests': guests,
-        'amenities': amenities, 'rating': rating, 'sort_by': sort_by,
-        'currency': currency, 'page': page, 'per_page': per_page
+        'location': location.strip().casefold() if location else None,
+        'pickup_date': pickup_date, 'return_date': return_date,
+        'category': category.strip().casefold() if category else None,
+        'transmission': transmission.strip().casefold() if transmission else None,
+        'min_price': min_price, 'max_price': max_price, 'guests': guests,
+        'amenities': sorted({f.strip() for f in amenities.split(',') if f.strip()}) if amenities else None,
+        'rating': rating, 'sort_by': sort_by, 'currency': currency.upper(), 'page': page, 'per_page': per_page
     }
+    if facets:
+        search_params['facets'] = True
+    if geo is not None:
+        search_params['geo'] = [geo.origin, geo.radius_km] if geo.origin else list(geo.bbox)
+    
+    # The search opens its own session so stale hits can refresh it later
+    def compute():
+        # Reserved cars come from the in-memory index once it is built
+        busy = car_availability_index.busy(*window) if window and car_availability_index.ready else None
+        return run_in_threadpool(
+            run_in_session, _run_car_search, location, category, transmission, min_price, max_price,
+            guests, amenities, rating, sort_by, currency, page, per_page, facets, geo, window, busy
+        )
     
-    # Try to get from cache first
-    cached_result = CacheService.get_cached_car_search(search_params)
-    if cached_result:
-        return cached_result
+    # Serve from cache; concurrent misses share one search and stale results
+    # are returned immediately while one background refresh runs. Booking
+    # commits drop the date-filtered searches through their tag.
+    return await CacheService.get_or_compute_car_search(
+        search_params, compute, tags=[AVAILABILITY_TAG] if window else []
+    )
+
+
+def _run_car_search(
+    db: Session,
+    location: Optional[str],
+    category: Optional[str],
+    transmission: Optional[str],
+    min_price: Optional[Decimal],
+    max_price: Optional[Decimal],
+    guests: Optional[int],
+    amenities: Optional[str],
+    rating: Optional[float],
+    sort_by: Optional[str],
+    currency: str,
+    page: int,
+    per_page: int,
+    facets: bool = False,
+    geo=None,
+    window=None,
+    busy=None
+) -> dict:
+    """Run the blocking car search queries (called from the threadpool)"""
+    from app.models.car import Car
+    from app.services.car_availability import load_busy_cars
+    from app.utils.facets import car_facets
+    from app.utils.geo import DISTANCE, distance_km, distance_sq, distance_sq_sql, geo_filter
+    from app.utils.text_search import contains, is_relevance_sort, relevance, search_mode
+    from sqlalchemy import desc, asc, and_, or_
     
     # Build query with filters
     query = db.query(Car).filter(Car.is_available == True)
     
     # Apply filters
     if location:
-        query = query.filter(Car.location.ilike(f"%{location}%"))
+        query = query.filter(contains([Car.location], location))
     if category:
-        query = query.filter(Car.category.ilike(f"%{category}%"))
+        query = query.filter(contains([Car.category], category))
     if transmission:
-        query = query.filter(Car.transmission.ilike(f"%{transmission}%"))
+        query = query.filter(contains([Car.transmission], transmission))
     if min_price:
         query = query.filter(Car.price_per_day >= min_price)
     if max_price:
@@ -65,6 +176,13 @@ def search_cars(
         query = query.filter(Car.seats >= guests)
     if rating:
         query = query.filter(Car.rating >= rating)
+    if geo is not None:
+        query = query.filter(geo_filter(Car, geo))
+    if window is not None:
+        if busy is None:
+            busy = load_busy_cars(db, *window)
+        if busy:
+            query = query.filter(Car.id.notin_(sorted(busy)))
     
     # Filter by features/amenities
     if amenities:
@@ -74,7 +192,15 @@ def search_cars(
                 query = query.filter(Car.features.op('?')(feature))
     
     # Apply sorting
-    if sort_by:
+    if is_relevance_sort(sort_by):
+        if location:
+            query = query.order_by(desc(relevance([Car.location, Car.name], location, search_mode(db))))
+    elif sort_by and sort_by.lstrip('-') == DISTANCE:
+        if geo is not None and geo.origin is not None:
+            distance = distance_sq_sql(Car.latitude, Car.longitude, geo.origin)
+            direction = desc if sort_by.startswith('-') else asc
+            query = query.order_by(direction(distance), direction(Car.id))
+    elif sort_by:
         if sort_by.startswith('-'):
             sort_field = sort_by[1:]
             if hasattr(Car, sort_field):
@@ -83,26 +209,28 @@ def search_cars(
             if hasattr(Car, sort_by):
                 query = query.order_by(asc(getattr(Car, sort_by)))
     
-    # Get total and paginated results
-    total = query.count()
+    # Get total and paginated results; facets scan the faceted columns of
+    # every match, which gives the total without a separate count
+    matches = query.with_entities(
+        Car.price_per_day.label("price"), Car.transmission, Car.category, Car.features
+    ).order_by(None).all() if facets else None
+    total = len(matches) if facets else query.count()
     offset = (page - 1) * per_page
     cars = query.offset(offset).limit(per_page).all()
     
     from app.services.currency_service import CurrencyService
     
+    # One rate snapshot converts the whole page without per-row queries
+    rates = CurrencyService.get_rates(db)
+    converted_prices = rates.convert_many(
+        [car.price_per_day for car in cars],
+        [getattr(car, 'base_currency', 'NGN') for car in cars], currency.upper()
+    )
+    symbol = rates.symbol(currency.upper())
+    
     cars_data = []
-    for car in cars:
-        base_price = float(car.price_per_day)
-        base_currency = getattr(car, 'base_currency', 'NGN')
-        
-        converted_price = CurrencyService.convert_currency(
-            base_price, base_currency, currency.upper(), db
-        )
-        
-        curr_obj = CurrencyService.get_currency_by_code(currency.upper(), db)
-        symbol = curr_obj.symbol if curr_obj else currency.upper()
-        
-        cars_data.append({
+    for car, converted_price in zip(cars, converted_prices):
+        entry = {
             "id": car.id,
             "name": car.name or f"{car.make} {car.model}",
             "category": car.category,
@@ -112,46 +240,62 @@ def search_cars(
             "image_url": (car.car_images[0].image_url if car.car_images else None) or (car.images[0] if car.images else None),
             "passengers": car.seats,
             "transmission": car.transmission,
-            "features": car.features or []
-        })
-    
-    result = {"cars": cars_data, "total": total}
+            "features": car.features or [],
+            "latitude": car.latitude,
+            "longitude": car.longitude
+        }
+        if geo is not None and geo.origin is not None and car.latitude is not None:
+            entry["distance_km"] = distance_km(distance_sq(car.latitude, car.longitude, geo.origin))
+        cars_data.append(entry)
     
-    # Cache the result for 5 minutes
-    CacheService.cache_car_search(search_params, result, ttl=300)
-    
-    return result
+    response = {"cars": cars_data, "total": total}
+    if facets:
+        response["facets"] = car_facets(matches, float(rates.factor('NGN', currency.upper())))
+    return response
 
 @router.get("/")
-def get_all_cars(
-    currency: str = Query("NGN", description="Currency code"),
-    db: Session = Depends(get_db)
+async def get_all_cars(
+    request: Request,
+    currency: str = Query("NGN", description="Currency code")
 ):
     """Get all cars for cars page"""
-    from app.models.car import Car
+    from app.core.config import settings
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    currency = currency.upper()
     
+    def compute():
+        return run_in_threadpool(run_in_session, _load_available_cars, currency)
+    
+    return await cached_response(
+        request, build_cache_key("cars", {"currency": currency}), compute,
+        settings.CACHE_CATALOG_TTL, soft_ttl=settings.CACHE_SEARCH_SOFT_TTL
+    )
+
+
+def _load_available_cars(db: Session, currency: str) -> list:
+    """Load available cars with prices converted to currency"""
+    from app.models.car import Car
     from app.services.currency_service import CurrencyService
     
     cars = db.query(Car).filter(Car.is_available == True).all()
     
+    rates = CurrencyService.get_rates(db)
+    converted_prices = rates.convert_many(
+        [car.price_per_day for car in cars],
+        [getattr(car, 'base_currency', 'NGN') for car in cars], currency
+    )
+    symbol = rates.symbol(currency)
+    
     cars_data = []
-    for car in cars:
-        base_price = float(car.price_per_day)
-        base_currency = getattr(car, 'base_currency', 'NGN')
-        
-        converted_price = CurrencyService.convert_currency(
-            base_price, base_currency, currency.upper(), db
-        )
-        
-        curr_obj = CurrencyService.get_currency_by_code(currency.upper(), db)
-        symbol = curr_obj.symbol if curr_obj else currency.upper()
-        
+    for car, converted_price in zip(cars, converted_prices):
         cars_data.append({
             "id": car.id,
             "name": car.name or f"{car.make} {car.model}",
             "category": car.category,
             "price": converted_price,
-            "currency": currency.upper(),
+            "currency": currency,
             "currency_symbol": symbol,
             "image_url": (car.car_images[0].image_url if car.car_images else None) or (car.images[0] if car.images else None),
             "passengers": car.seats,
@@ -163,50 +307,63 @@ def get_all_cars(
 
 
 @router.get("/featured")
-def get_featured_cars(
-    currency: str = Query("NGN", description="Currency code"),
-    db: Session = Depends(get_db)
+async def get_featured_cars(
+    request: Request,
+    currency: str = Query("NGN", description="Currency code")
 ):
     """Get featured cars for landing page"""
+    from app.core.config import settings
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    currency = currency.upper()
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_featured_cars, currency)
+    
     try:
-        from app.models.car import Car
-        
-        cars = db.query(Car).filter(Car.is_featured == True).limit(6).all()
-        
-        from app.services.currency_service import CurrencyService
-        
-        car_list = []
-        for car in cars:
-            base_price = float(car.price_per_day)
-            base_currency = getattr(car, 'base_currency', 'NGN')
-            
-            converted_price = CurrencyService.convert_currency(
-                base_price, base_currency, currency.upper(), db
-            )
-            
-            curr_obj = CurrencyService.get_currency_by_code(currency.upper(), db)
-            symbol = curr_obj.symbol if curr_obj else currency.upper()
-            
-            car_list.append({
-                "id": car.id,
-                "name": car.name,
-                "category": car.category,
-                "price": converted_price,
-                "currency": currency.upper(),
-                "currency_symbol": symbol,
-                "image_url": (car.car_images[0].image_url if car.car_images else None) or (car.images[0] if car.images and len(car.images) > 0 else None),
-                "passengers": car.seats,
-                "transmission": car.transmission,
-                "features": car.features or [],
-                "is_featured": car.is_featured
-            })
-        
-        return {"cars": car_list}
+        return await cached_response(
+            request, build_cache_key("featured_cars", {"currency": currency}), compute,
+            settings.CACHE_CATALOG_TTL, soft_ttl=settings.CACHE_SEARCH_SOFT_TTL
+        )
     except Exception as e:
         print(f"Error fetching featured cars: {e}")
         return {"cars": []}
 
 
+def _load_featured_cars(db: Session, currency: str) -> dict:
+    """Load featured cars with prices converted to currency"""
+    from app.models.car import Car
+    from app.services.currency_service import CurrencyService
+    
+    cars = db.query(Car).filter(Car.is_featured == True).limit(6).all()
+    
+    rates = CurrencyService.get_rates(db)
+    converted_prices = rates.convert_many(
+        [car.price_per_day for car in cars],
+        [getattr(car, 'base_currency', 'NGN') for car in cars], currency
+    )
+    symbol = rates.symbol(currency)
+    
+    car_list = []
+    for car, converted_price in zip(cars, converted_prices):
+        car_list.append({
+            "id": car.id,
+            "name": car.name,
+            "category": car.category,
+            "price": converted_price,
+            "currency": currency,
+            "currency_symbol": symbol,
+            "image_url": (car.car_images[0].image_url if car.car_images else None) or (car.images[0] if car.images and len(car.images) > 0 else None),
+            "passengers": car.seats,
+            "transmission": car.transmission,
+            "features": car.features or [],
+            "is_featured": car.is_featured
+        })
+    
+    return {"cars": car_list}
+
+
 @router.get("/locations")
 def get_pickup_locations():
     """Get available pickup/dropoff locations"""
@@ -235,9 +392,49 @@ def get_car_categories():
     }
 
 
+@router.get("/availability")
+async def get_cars_availability(
+    ids: str = Query(..., description="Comma-separated car ids, e.g. a fleet page"),
+    pickup_date: str = Query(..., description="Pickup date (YYYY-MM-DD)"),
+    return_date: str = Query(..., description="Return date (YYYY-MM-DD)")
+):
+    """Check which of many cars are free for the whole rental"""
+    car_ids = [i.strip() for i in ids.split(',') if i.strip()]
+    if len(car_ids) > MAX_AVAILABILITY_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_AVAILABILITY_IDS} cars per request")
+    
+    try:
+        free = set(await run_in_threadpool(
+            run_in_session, _load_availability, car_ids, pickup_date, return_date
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "pickup_date": pickup_date,
+        "return_date": return_date,
+        "availability": {car_id: car_id in free for car_id in car_ids}
+    }
+
+
 @router.get("/{car_id}")
-def get_car_details(car_id: str, db: Session = Depends(get_db)):
+async def get_car_details(car_id: str, request: Request):
     """Get detailed car information"""
+    from app.core.config import settings
+    from app.utils.cache_invalidation import car_tag
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_car_details, car_id)
+    
+    return await cached_response(
+        request, build_cache_key("car_detail", {"id": car_id}), compute, settings.CACHE_CATALOG_TTL,
+        soft_ttl=settings.CACHE_CATALOG_SOFT_TTL, tags=[car_tag(car_id)]
+    )
+
+
+def _load_car_details(db: Session, car_id: str) -> dict:
+    """Load the car detail payload"""
     from app.models.car import Car
     from fastapi import HTTPException
     
@@ -268,11 +465,20 @@ def get_car_details(car_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("/{car_id}/check-availability")
-def check_car_availability(
+async def check_car_availability(
     car_id: str,
     pickup_date: str,
     return_date: str
 ):
-    """Check car availability"""
-    available = CarService.check_car_availability(car_id, pickup_date, return_date)
-    return {"available": available, "car_id": car_id}
\ No newline at end of file
+    """Check car availability against its reservations"""
+    try:
+        available = await run_in_threadpool(
+            run_in_session, _load_availability, [car_id], pickup_date, return_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"available": bool(available), "car_id": car_id}
+
+
+def _load_availability(db: Session, car_ids: List[str], pickup_date: str, return_date: str) -> List[str]:
+    return CarService.free_cars(car_ids, pickup_date, return_date, db)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import settings as app_settings
+from app.core.database import get_db, run_in_session
 from app.models.contact_settings import ContactSettings
 from app.models.contact_message import ContactMessage
 from app.core.dependencies import get_current_user, get_admin_user as require_admin
@@ -37,8 +39,22 @@ class ContactMessageResponse(BaseModel):
         from_attributes = True
 
 @router.get("/contact-settings")
-async def get_contact_settings(db: Session = Depends(get_db)):
+async def get_contact_settings(request: Request):
     """Get contact page settings (public endpoint)"""
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_contact_settings)
+    
+    return await cached_response(
+        request, build_cache_key("contact_settings", {}), compute,
+        app_settings.CACHE_CATALOG_TTL, soft_ttl=app_settings.CACHE_CATALOG_SOFT_TTL
+    )
+
+
+def _load_contact_settings(db: Session) -> dict:
+    """Load the public contact page payload, creating default settings if none exist"""
     settings = db.query(ContactSettings).first()
     if not settings:
         # Create default settings if none exist
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, run_in_session
 from app.core.dependencies import get_current_user
 from app.models.currency import Currency
 from app.schemas.currency import (
@@ -14,10 +16,24 @@ router = APIRouter()
 
 
 @router.get("/currencies", response_model=List[CurrencyResponse])
-def get_currencies(db: Session = Depends(get_db)):
+async def get_currencies(request: Request):
     """Get all active currencies"""
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_active_currencies)
+    
+    return await cached_response(
+        request, build_cache_key("currencies", {}), compute,
+        settings.CACHE_CATALOG_TTL, soft_ttl=settings.CACHE_CATALOG_SOFT_TTL
+    )
+
+
+def _load_active_currencies(db: Session) -> list:
+    """Load active currencies, shaped by CurrencyResponse"""
     currencies = CurrencyService.get_active_currencies(db)
-    return currencies
+    return [CurrencyResponse.model_validate(c).model_dump(mode="json") for c in currencies]
 
 
 @router.post("/currencies/convert", response_model=CurrencyConversionResponse)
@@ -27,13 +43,11 @@ def convert_currency(
 ):
     """Convert amount between currencies"""
     try:
-        converted_amount = CurrencyService.convert_currency(
-            request.amount, request.from_currency, request.to_currency, db
+        # Amount and display rate come from the same rate snapshot
+        converted_amount, rate = CurrencyService.convert_many(
+            [request.amount, 1.0], request.from_currency, request.to_currency, db
         )
         
-        # Calculate exchange rate for display
-        rate = CurrencyService.convert_currency(1.0, request.from_currency, request.to_currency, db)
-        
         return CurrencyConversionResponse(
             original_amount=request.amount,
             converted_amount=converted_amount,
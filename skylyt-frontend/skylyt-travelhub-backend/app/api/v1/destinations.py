@@ -1,101 +1,133 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import run_in_session
 from app.models.state import State
 from app.models.city import City
 from app.models.hotel import Hotel
+from app.utils.cache_keys import build_cache_key
+from app.utils.pagination import InvalidCursor, paginate
+from app.utils.response_cache import cached_response
 
 router = APIRouter(prefix="/destinations", tags=["destinations"])
 
 
-@router.get("/")
-def get_all_destinations(
-    featured_only: bool = Query(False),
-    db: Session = Depends(get_db)
-):
-    """Get all destinations (states)"""
+async def _cached_destination(request: Request, prefix: str, params: dict, loader, *args):
+    """Serve a destination payload from cache, loading it in a fresh session.
+
+    Payloads are JSON-encoded while the session is open so cached and
+    freshly loaded responses are identical.
+    """
+    def compute():
+        return run_in_threadpool(run_in_session, loader, *args)
+
+    return await cached_response(
+        request, build_cache_key(prefix, params), compute,
+        settings.CACHE_CATALOG_TTL, soft_ttl=settings.CACHE_CATALOG_SOFT_TTL
+    )
+
+
+def _get_state(db: Session, state_slug: str) -> State:
+    state = db.query(State).filter(State.slug == state_slug).first()
+    if not state:
+        raise HTTPException(status_code=404, detail="State not found")
+    return state
+
+
+def _load_states(db: Session, featured_only: bool) -> dict:
     query = db.query(State)
     if featured_only:
         query = query.filter(State.is_featured == 1)
     
     states = query.order_by(State.popularity_score.desc()).all()
-    return {"states": states}
+    return jsonable_encoder({"states": states})
+
+
+@router.get("/")
+async def get_all_destinations(
+    request: Request,
+    featured_only: bool = Query(False)
+):
+    """Get all destinations (states)"""
+    return await _cached_destination(
+        request, "destinations:states", {"featured_only": featured_only},
+        _load_states, featured_only
+    )
 
 
 @router.get("/states")
-def get_states(
-    featured_only: bool = Query(False),
-    db: Session = Depends(get_db)
+async def get_states(
+    request: Request,
+    featured_only: bool = Query(False)
 ):
     """Get all states or featured states only"""
-    query = db.query(State)
-    if featured_only:
-        query = query.filter(State.is_featured == 1)
-    
-    states = query.order_by(State.popularity_score.desc()).all()
-    return {"states": states}
+    return await _cached_destination(
+        request, "destinations:states", {"featured_only": featured_only},
+        _load_states, featured_only
+    )
 
 
-@router.get("/{state_slug}/cities")
-def get_cities_in_state(
-    state_slug: str,
-    db: Session = Depends(get_db)
-):
-    """Get all cities within a specific state"""
-    state = db.query(State).filter(State.slug == state_slug).first()
-    if not state:
-        raise HTTPException(status_code=404, detail="State not found")
+def _load_cities_in_state(db: Session, state_slug: str) -> dict:
+    state = _get_state(db, state_slug)
     
     cities = db.query(City).filter(City.state_id == state.id)\
         .order_by(City.popularity_ranking.asc()).all()
     
-    return {
+    return jsonable_encoder({
         "state": state,
         "cities": cities
-    }
+    })
 
 
-@router.get("/{state_slug}/hotels")
-def get_hotels_in_state(
+@router.get("/{state_slug}/cities")
+async def get_cities_in_state(
     state_slug: str,
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    request: Request
 ):
-    """Get all hotels within a specific state"""
-    state = db.query(State).filter(State.slug == state_slug).first()
-    if not state:
-        raise HTTPException(status_code=404, detail="State not found")
-    
-    offset = (page - 1) * per_page
-    hotels = db.query(Hotel).filter(Hotel.state_id == state.id)\
-        .offset(offset).limit(per_page).all()
+    """Get all cities within a specific state"""
+    return await _cached_destination(
+        request, "destinations:cities", {"state": state_slug},
+        _load_cities_in_state, state_slug
+    )
+
+
+def _load_hotels_in_state(
+    db: Session, state_slug: str, page: int, per_page: int, cursor: Optional[str]
+) -> dict:
+    state = _get_state(db, state_slug)
     
-    total = db.query(Hotel).filter(Hotel.state_id == state.id).count()
+    query = db.query(Hotel).filter(Hotel.state_id == state.id)
+    try:
+        result = paginate(query, [(Hotel.id, False)], per_page, cursor=cursor, page=page)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return {
-        "state": state,
-        "hotels": hotels,
-        "total": total,
-        "page": page,
-        "per_page": per_page
-    }
+    return jsonable_encoder({"state": state, **result.as_response("hotels", result.items)})
 
 
-@router.get("/{state_slug}/{city_slug}/hotels")
-def get_hotels_in_city(
+@router.get("/{state_slug}/hotels")
+async def get_hotels_in_state(
     state_slug: str,
-    city_slug: str,
+    request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    sort_by: str = Query("rating", regex="^(rating|price|popularity)$"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page")
 ):
-    """Get hotels specific to a city"""
-    state = db.query(State).filter(State.slug == state_slug).first()
-    if not state:
-        raise HTTPException(status_code=404, detail="State not found")
+    """Get all hotels within a specific state"""
+    return await _cached_destination(
+        request, "destinations:state_hotels",
+        {"state": state_slug, "page": page, "per_page": per_page, "cursor": cursor},
+        _load_hotels_in_state, state_slug, page, per_page, cursor
+    )
+
+
+def _load_hotels_in_city(
+    db: Session, state_slug: str, city_slug: str, page: int, per_page: int, sort_by: str
+) -> dict:
+    state = _get_state(db, state_slug)
     
     city = db.query(City).filter(
         City.slug == city_slug,
@@ -118,30 +150,52 @@ def get_hotels_in_city(
     hotels = query.offset(offset).limit(per_page).all()
     total = db.query(Hotel).filter(Hotel.city_id == city.id).count()
     
-    return {
+    return jsonable_encoder({
         "state": state,
         "city": city,
         "hotels": hotels,
         "total": total,
         "page": page,
         "per_page": per_page
-    }
+    })
 
 
-@router.get("/{state_slug}")
-def get_state_details(
+@router.get("/{state_slug}/{city_slug}/hotels")
+async def get_hotels_in_city(
     state_slug: str,
-    db: Session = Depends(get_db)
+    city_slug: str,
+    request: Request,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    sort_by: str = Query("rating", regex="^(rating|price|popularity)$")
 ):
-    """Get state details with cities overview"""
-    state = db.query(State).filter(State.slug == state_slug).first()
-    if not state:
-        raise HTTPException(status_code=404, detail="State not found")
+    """Get hotels specific to a city"""
+    return await _cached_destination(
+        request, "destinations:city_hotels",
+        {"state": state_slug, "city": city_slug, "page": page, "per_page": per_page, "sort_by": sort_by},
+        _load_hotels_in_city, state_slug, city_slug, page, per_page, sort_by
+    )
+
+
+def _load_state_details(db: Session, state_slug: str) -> dict:
+    state = _get_state(db, state_slug)
     
     cities = db.query(City).filter(City.state_id == state.id)\
         .order_by(City.popularity_ranking.asc()).limit(12).all()
     
-    return {
+    return jsonable_encoder({
         "state": state,
         "featured_cities": cities
-    }
\ No newline at end of file
+    })
+
+
+@router.get("/{state_slug}")
+async def get_state_details(
+    state_slug: str,
+    request: Request
+):
+    """Get state details with cities overview"""
+    return await _cached_destination(
+        request, "destinations:state", {"state": state_slug},
+        _load_state_details, state_slug
+    )
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
 
 from app.core.dependencies import get_current_user
-from app.core.database import get_db
+from app.core.config import settings as app_settings
+from app.core.database import get_db, run_in_session
 from app.models.footer_settings import FooterSettings
 
 router = APIRouter()
@@ -79,8 +81,22 @@ async def update_footer_settings(
 
 
 @router.get("/footer-settings")
-async def get_public_footer_settings(db: Session = Depends(get_db)):
+async def get_public_footer_settings(request: Request):
     """Get footer settings for public use"""
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_public_footer_settings)
+    
+    return await cached_response(
+        request, build_cache_key("footer_settings", {}), compute,
+        app_settings.CACHE_CATALOG_TTL, soft_ttl=app_settings.CACHE_CATALOG_SOFT_TTL
+    )
+
+
+def _load_public_footer_settings(db: Session) -> dict:
+    """Load the public footer payload"""
     settings = db.query(FooterSettings).first()
     if not settings:
         # Return default settings
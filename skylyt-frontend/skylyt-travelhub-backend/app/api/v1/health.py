@@ -88,6 +88,23 @@ async def get_metrics():
     """Get application metrics"""
     return metrics_collector.get_health_metrics()
 
+@router.get("/metrics/cache")
+async def get_cache_metrics():
+    """Get shared cache hit/miss statistics"""
+    return cache_manager.get_stats()
+
+@router.get("/metrics/search-history")
+async def get_search_history_metrics():
+    """Get search history recorder buffer and drop counters"""
+    from app.services.search_history import search_history_recorder
+    return search_history_recorder.get_stats()
+
+@router.get("/metrics/http")
+async def get_http_metrics():
+    """Get outbound HTTP latency, retry and circuit breaker state per upstream"""
+    from app.core.http_client import outbound_http
+    return outbound_http.get_stats()
+
 @router.get("/metrics/prometheus")
 async def get_prometheus_metrics():
     """Get Prometheus metrics"""
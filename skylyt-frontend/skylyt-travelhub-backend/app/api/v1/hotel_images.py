@@ -3,12 +3,13 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.http_client import CircuitOpenError, outbound_http
 from app.models.hotel_image import HotelImage
 from app.models.hotel import Hotel
 import uuid
 import os
 from pathlib import Path
-import requests
+import httpx
 
 router = APIRouter(prefix="/hotel-images", tags=["hotel-images"])
 
@@ -131,12 +132,13 @@ async def upload_hotel_image_from_url(
     
     try:
         # Download image
-        response = requests.get(
-            image_url, 
-            timeout=10, 
-            allow_redirects=False,
-            headers={'User-Agent': 'Skylyt-ImageBot/1.0'},
-            stream=True
+        response = await outbound_http.request(
+            "GET",
+            image_url,
+            upstream="image-fetch",
+            timeout=10,
+            follow_redirects=False,
+            headers={'User-Agent': 'Skylyt-ImageBot/1.0'}
         )
         response.raise_for_status()
         
@@ -174,7 +176,7 @@ async def upload_hotel_image_from_url(
         
         return {"message": "Image uploaded successfully", "image": {"id": hotel_image.id, "url": hotel_image.image_url}}
         
-    except requests.RequestException:
+    except (httpx.HTTPError, CircuitOpenError):
         raise HTTPException(status_code=400, detail="Failed to download image from URL")
 
 
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, List
-from app.core.database import get_db
+from app.core.database import run_in_session
+from app.core.dependencies import get_current_user_id_optional
 from app.schemas.hotel import HotelSearchRequest, HotelResponse
 from app.schemas.search import SearchResponse
 from app.services.hotel_service import HotelService
@@ -9,38 +11,57 @@ from decimal import Decimal
 
 router = APIRouter(prefix="/hotels", tags=["hotels"])
 
+# Hotels per bulk availability request (a few search result pages)
+MAX_AVAILABILITY_IDS = 100
+
 
 @router.get("/")
-def get_all_hotels(db: Session = Depends(get_db)):
+async def get_all_hotels(request: Request):
     """Get all hotels for admin management"""
+    from app.core.config import settings
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_all_hotels)
+    
     try:
-        from app.models.hotel import Hotel
-        
-        hotels = db.query(Hotel).all()
-        
-        hotel_list = []
-        for hotel in hotels:
-            hotel_list.append({
-                "id": hotel.id,
-                "name": hotel.name,
-                "location": hotel.location,
-                "rating": float(hotel.star_rating),
-                "price": float(hotel.price_per_night),
-                "image_url": hotel.images[0] if hotel.images and len(hotel.images) > 0 else None,
-                "amenities": hotel.amenities or [],
-                "description": hotel.description or "",
-                "is_available": getattr(hotel, 'is_available', True),
-                "is_featured": getattr(hotel, 'is_featured', False)
-            })
-        
-        return {"hotels": hotel_list}
+        return await cached_response(
+            request, build_cache_key("hotels", {}), compute,
+            settings.CACHE_CATALOG_TTL, soft_ttl=settings.CACHE_CATALOG_SOFT_TTL
+        )
     except Exception as e:
         print(f"Error fetching hotels: {e}")
         return {"hotels": []}
 
 
+def _load_all_hotels(db: Session) -> dict:
+    """Load every hotel as a list entry"""
+    from app.models.hotel import Hotel
+    
+    hotels = db.query(Hotel).all()
+        
+    hotel_list = []
+    for hotel in hotels:
+        hotel_list.append({
+            "id": hotel.id,
+            "name": hotel.name,
+            "location": hotel.location,
+            "rating": float(hotel.star_rating),
+            "price": float(hotel.price_per_night),
+            "image_url": hotel.images[0] if hotel.images and len(hotel.images) > 0 else None,
+            "amenities": hotel.amenities or [],
+            "description": hotel.description or "",
+            "is_available": getattr(hotel, 'is_available', True),
+            "is_featured": getattr(hotel, 'is_featured', False)
+        })
+    
+    return {"hotels": hotel_list}
+
+
 @router.get("/search")
-def search_hotels(
+async def search_hotels(
+    request: Request,
     destination: Optional[str] = Query(None, description="Destination city"),
     city: Optional[str] = Query(None, description="City to search in"),
     checkin_date: Optional[str] = Query(None, description="Check-in date (YYYY-MM-DD)"),
@@ -55,173 +76,356 @@ def search_hotels(
     currency: str = Query("NGN", description="Currency code"),
     page: int = Query(1, description="Page number"),
     per_page: int = Query(20, description="Items per page"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    facets: bool = Query(False, description="Include amenity, star and price facets of all matches"),
+    near: Optional[str] = Query(None, description="Search around latitude,longitude"),
+    radius_km: Optional[float] = Query(None, description="Radius around near in km (default 10)"),
+    bbox: Optional[str] = Query(None, description="Search within south,west,north,east"),
+    user_id: Optional[int] = Depends(get_current_user_id_optional)
 ):
     """Search hotels with filters and caching"""
+    from app.services.search_history import response_total, search_history_recorder, search_params
+    from app.utils.geo import DISTANCE, parse_geo_query
+    from app.utils.pagination import InvalidCursor, decode_cursor
+    from app.utils.response_cache import response_from_entry
+    
+    try:
+        geo = parse_geo_query(near, radius_km, bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if (sort_by or '').lstrip('-') == DISTANCE and (geo is None or geo.origin is None):
+        raise HTTPException(status_code=400, detail="Sorting by distance requires near")
+    
+    if cursor:
+        try:
+            decode_cursor(cursor, _search_scope(sort_by, geo))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    params = dict(
+        destination=destination, city=city, checkin_date=checkin_date,
+        checkout_date=checkout_date, guests=guests, min_price=min_price,
+        max_price=max_price, star_rating=star_rating, rating=rating,
+        amenities=amenities, sort_by=sort_by, currency=currency, page=page,
+        per_page=per_page, near=near, radius_km=radius_km, bbox=bbox
+    )
+    try:
+        entry = await cached_hotel_search(**params, cursor=cursor, facets=facets)
+    except Exception as e:
+        print(f"Error searching hotels: {e}")
+        return {"hotels": [], "total": 0}
+    
+    if user_id is not None:
+        # Written behind the response by the history recorder
+        search_history_recorder.record(user_id, "hotel", search_params(**params), response_total(entry.value))
+    return response_from_entry(request, entry)
+
+
+async def cached_hotel_search(
+    destination: Optional[str] = None,
+    city: Optional[str] = None,
+    checkin_date: Optional[str] = None,
+    checkout_date: Optional[str] = None,
+    guests: int = 1,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
+    star_rating: Optional[float] = None,
+    rating: Optional[float] = None,
+    amenities: Optional[str] = None,
+    sort_by: Optional[str] = "price",
+    currency: str = "NGN",
+    page: int = 1,
+    per_page: int = 20,
+    cursor: Optional[str] = None,
+    facets: bool = False,
+    near: Optional[str] = None,
+    radius_km: Optional[float] = None,
+    bbox: Optional[str] = None
+):
+    """Run a hotel search through the shared cache (also used by the cache warmer)"""
     from app.services.cache_service import CacheService
+    from app.utils.geo import parse_geo_query
+    from app.utils.pagination import decode_cursor, encode_cursor
     
-    # Create cache key from search parameters
+    geo = parse_geo_query(near, radius_km, bbox)
+    
+    # Create cache key from normalized search parameters (location match is case-insensitive)
     search_params = {
-        'destination': destination, 'city': city, 'checkin_date': checkin_date, 'checkout_date': checkout_date,
-        'guests': guests, 'min_price': str(min_price) if min_price else None,
-        'max_price': str(max_price) if max_price else None, 'star_rating': star_rating,
-        'rating': rating, 'amenities': amenities, 'sort_by': sort_by,
-        'currency': currency, 'page': page, 'per_page': per_page
+        'location': (destination or city or '').strip().casefold() or None,
+        'checkin_date': checkin_date, 'checkout_date': checkout_date, 'guests': guests,
+        'min_price': min_price, 'max_price': max_price, 'min_rating': star_rating or rating,
+        'amenities': sorted({a.strip() for a in amenities.split(',') if a.strip()}) if amenities else None,
+        'sort_by': sort_by, 'currency': currency.upper(), 'page': page, 'per_page': per_page,
+        'cursor': cursor
     }
+    if facets:
+        search_params['facets'] = True
+    if geo is not None:
+        search_params['geo'] = [geo.origin, geo.radius_km] if geo.origin else list(geo.bbox)
     
-    # Try to get from cache first
-    cached_result = CacheService.get_cached_hotel_search(search_params)
-    if cached_result:
-        return cached_result
+    # Handle both star_rating and rating parameters. The search opens its own
+    # session because a stale hit refreshes it after this request has finished.
+    async def compute():
+        # The in-memory index answers filters, sort and paging; SQL only
+        # loads the page of hotels (or runs the search until the index is built)
+        from app.services.hotel_search_index import hotel_search_index
+        scope = _search_scope(sort_by, geo)
+        price_factor = await run_in_threadpool(run_in_session, _price_factor, currency) if facets else 1.0
+        # One extra id tells whether another page follows
+        result = hotel_search_index.search(
+            location=destination or city, min_price=min_price, max_price=max_price,
+            min_rating=star_rating or rating,
+            amenities=[a.strip() for a in amenities.split(',') if a.strip()] if amenities else (),
+            sort_by=sort_by, offset=(page - 1) * per_page, limit=per_page + 1,
+            after=decode_cursor(cursor, scope) if cursor else None,
+            facets=facets, price_factor=price_factor, geo=geo
+        )
+        if result is not None:
+            ids = result.ids[:per_page]
+            next_cursor = encode_cursor(
+                hotel_search_index.sort_values(ids[-1], sort_by, geo), scope
+            ) if len(result.ids) > per_page else None
+            return await run_in_threadpool(
+                run_in_session, _load_hotel_page, ids, result.total, currency, next_cursor, result.facets, geo
+            )
+        return await run_in_threadpool(
+            run_in_session, _run_hotel_search, destination or city, min_price, max_price,
+            star_rating or rating, amenities, sort_by, currency, page, per_page, cursor, facets, geo
+        )
     
-    try:
-        from app.models.hotel import Hotel
-        from sqlalchemy import and_, desc, asc
-        
-        # Build query
-        query = db.query(Hotel)
-        
-        # Apply filters
-        search_location = destination or city
+    # Serve from cache; concurrent misses share one search and stale results
+    # are returned immediately while one background refresh runs
+    return await CacheService.get_or_compute_hotel_search(search_params, compute)
+
+
+def _run_hotel_search(
+    db: Session,
+    search_location: Optional[str],
+    min_price: Optional[Decimal],
+    max_price: Optional[Decimal],
+    min_rating: Optional[float],
+    amenities: Optional[str],
+    sort_by: Optional[str],
+    currency: str,
+    page: int,
+    per_page: int,
+    cursor: Optional[str] = None,
+    facets: bool = False,
+    geo=None
+) -> dict:
+    """Run the blocking hotel search queries (called from the threadpool)"""
+    from app.models.hotel import Hotel
+    from app.utils.facets import hotel_facets
+    from app.utils.geo import DISTANCE, distance_sq_sql, geo_filter
+    from app.utils.pagination import paginate
+    from app.utils.text_search import contains, is_relevance_sort, relevance, search_mode
+    
+    # Build query
+    query = db.query(Hotel)
+    
+    # Apply filters
+    if search_location:
+        query = query.filter(contains([Hotel.location], search_location))
+    if min_price:
+        query = query.filter(Hotel.price_per_night >= min_price)
+    if max_price:
+        query = query.filter(Hotel.price_per_night <= max_price)
+    if min_rating:
+        query = query.filter(Hotel.star_rating >= min_rating)
+    if geo is not None:
+        query = query.filter(geo_filter(Hotel, geo))
+    
+    # Filter by amenities
+    if amenities:
+        amenity_list = [a.strip() for a in amenities.split(',') if a.strip()]
+        if amenity_list:
+            for amenity in amenity_list:
+                query = query.filter(Hotel.amenities.op('?')(amenity))
+    
+    # Apply sorting; id breaks ties so each hotel has one stable position
+    order = [(Hotel.id, False)]
+    if is_relevance_sort(sort_by):
         if search_location:
-            query = query.filter(Hotel.location.ilike(f"%{search_location}%"))
-        if min_price:
-            query = query.filter(Hotel.price_per_night >= min_price)
-        if max_price:
-            query = query.filter(Hotel.price_per_night <= max_price)
-        
-        # Handle both star_rating and rating parameters
-        min_rating = star_rating or rating
-        if min_rating:
-            query = query.filter(Hotel.star_rating >= min_rating)
-        
-        # Filter by amenities
-        if amenities:
-            amenity_list = [a.strip() for a in amenities.split(',') if a.strip()]
-            if amenity_list:
-                for amenity in amenity_list:
-                    query = query.filter(Hotel.amenities.op('?')(amenity))
-        
-        # Apply sorting
-        if sort_by:
-            if sort_by.startswith('-'):
-                sort_field = sort_by[1:]
-                if sort_field == 'price':
-                    query = query.order_by(desc(Hotel.price_per_night))
-                elif hasattr(Hotel, sort_field):
-                    query = query.order_by(desc(getattr(Hotel, sort_field)))
-            else:
-                if sort_by == 'price':
-                    query = query.order_by(asc(Hotel.price_per_night))
-                elif hasattr(Hotel, sort_by):
-                    query = query.order_by(asc(getattr(Hotel, sort_by)))
-        
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        hotels = query.offset((page - 1) * per_page).limit(per_page).all()
-        
-        # Format response with currency conversion
-        from app.services.currency_service import CurrencyService
-        
-        hotel_list = []
-        for hotel in hotels:
-            base_price = Decimal(str(hotel.price_per_night))
-            base_currency = getattr(hotel, 'base_currency', 'NGN')
-            
-            if currency.upper() != base_currency:
-                converted_price = CurrencyService.convert_currency(
-                    float(base_price), base_currency, currency.upper(), db
-                )
-            else:
-                converted_price = float(base_price)
-            
-            curr_obj = CurrencyService.get_currency_by_code(currency.upper(), db)
-            symbol = curr_obj.symbol if curr_obj else currency.upper()
-            exchange_rate = CurrencyService.convert_currency(1.0, base_currency, currency.upper(), db)
-            
-            hotel_list.append({
-                "id": hotel.id,
-                "name": hotel.name,
-                "location": hotel.location,
-                "rating": float(hotel.star_rating),
-                "price": converted_price,
-                "original_price": float(base_price),
-                "base_currency": base_currency,
-                "currency": currency.upper(),
-                "currency_symbol": symbol,
-                "exchange_rate": exchange_rate,
-                "image_url": hotel.images[0] if hotel.images and len(hotel.images) > 0 else None,
-                "amenities": hotel.amenities or [],
-                "description": hotel.description or "",
-                "is_available": getattr(hotel, 'is_available', True)
-            })
-        
-        result = {"hotels": hotel_list, "total": total}
-        
-        # Cache the result for 5 minutes
-        CacheService.cache_hotel_search(search_params, result, ttl=300)
+            rank = relevance([Hotel.location, Hotel.name], search_location, search_mode(db))
+            order = [(rank, True), (Hotel.id, True)]
+    elif sort_by:
+        descending = sort_by.startswith('-')
+        sort_field = sort_by[1:] if descending else sort_by
+        if sort_field == 'price':
+            order = [(Hotel.price_per_night, descending), (Hotel.id, descending)]
+        elif sort_field == DISTANCE and geo is not None and geo.origin is not None:
+            # The same formula as the index, so cursors work across both
+            distance = distance_sq_sql(Hotel.latitude, Hotel.longitude, geo.origin)
+            order = [(distance, descending), (Hotel.id, descending)]
+        elif hasattr(Hotel, sort_field):
+            order = [(getattr(Hotel, sort_field), descending), (Hotel.id, descending)]
+    
+    # Facets need the faceted columns of every match; that one scan also
+    # gives the total, so it replaces the count query
+    matches = query.with_entities(
+        Hotel.price_per_night.label("price"), Hotel.star_rating.label("rating"), Hotel.amenities
+    ).all() if facets else None
+    
+    # Cursors are shared with the index search, so they are scoped by sort_by
+    result = paginate(
+        query, order, per_page, cursor=cursor, page=page, with_total=not facets, scope=_search_scope(sort_by, geo)
+    )
+    
+    response = {
+        "hotels": _format_search_hotels(db, result.items, currency, geo),
+        "total": len(matches) if facets else result.total,
+        "next_cursor": result.next_cursor, "has_more": result.has_more
+    }
+    if facets:
+        response["facets"] = hotel_facets(matches, _price_factor(db, currency))
+    return response
+
+
+def _search_scope(sort_by: Optional[str], geo=None) -> str:
+    """Cursor scope of a hotel search ordering; distances depend on the near point"""
+    from app.utils.geo import DISTANCE
+    
+    if (sort_by or '').lstrip('-') == DISTANCE and geo is not None and geo.origin is not None:
+        return f"hotel_search:{sort_by}:{geo.origin[0]},{geo.origin[1]}"
+    return f"hotel_search:{sort_by or 'id'}"
+
+
+def _price_factor(db: Session, currency: str) -> float:
+    """Multiplier from stored (NGN) hotel prices to currency"""
+    from app.services.currency_service import CurrencyService
+    
+    return float(CurrencyService.get_rates(db).factor('NGN', currency.upper()))
+
+
+def _load_hotel_page(
+    db: Session, hotel_ids: List[int], total: int, currency: str, next_cursor: Optional[str] = None,
+    facets: Optional[dict] = None, geo=None
+) -> dict:
+    """Load one page of index search results, keeping the index order"""
+    from app.models.hotel import Hotel
+    
+    hotels = {h.id: h for h in db.query(Hotel).filter(Hotel.id.in_(hotel_ids)).all()} if hotel_ids else {}
+    # Hotels deleted since the index answered are skipped
+    page = [hotels[i] for i in hotel_ids if i in hotels]
+    response = {
+        "hotels": _format_search_hotels(db, page, currency, geo), "total": total,
+        "next_cursor": next_cursor, "has_more": next_cursor is not None
+    }
+    if facets is not None:
+        response["facets"] = facets
+    return response
+
+
+def _format_search_hotels(db: Session, hotels: list, currency: str, geo=None) -> list:
+    """Search result entries with prices converted to currency (and distances from near)"""
+    from app.services.currency_service import CurrencyService
+    from app.utils.geo import distance_km, distance_sq
+    
+    # One rate snapshot converts the whole page without per-row queries
+    currency = currency.upper()
+    rates = CurrencyService.get_rates(db)
+    base_currencies = [getattr(hotel, 'base_currency', 'NGN') for hotel in hotels]
+    converted_prices = rates.convert_many(
+        [hotel.price_per_night for hotel in hotels], base_currencies, currency
+    )
+    symbol = rates.symbol(currency)
+    
+    hotel_list = []
+    for hotel, base_currency, converted_price in zip(hotels, base_currencies, converted_prices):
+        base_price = Decimal(str(hotel.price_per_night))
+        exchange_rate = rates.convert(1.0, base_currency, currency)
         
-        return result
-    except Exception as e:
-        print(f"Error searching hotels: {e}")
-        return {"hotels": [], "total": 0}
+        entry = {
+            "id": hotel.id,
+            "name": hotel.name,
+            "location": hotel.location,
+            "rating": float(hotel.star_rating),
+            "price": converted_price,
+            "original_price": float(base_price),
+            "base_currency": base_currency,
+            "currency": currency,
+            "currency_symbol": symbol,
+            "exchange_rate": exchange_rate,
+            "image_url": hotel.images[0] if hotel.images and len(hotel.images) > 0 else None,
+            "amenities": hotel.amenities or [],
+            "description": hotel.description or "",
+            "is_available": getattr(hotel, 'is_available', True),
+            "latitude": hotel.latitude,
+            "longitude": hotel.longitude
+        }
+        if geo is not None and geo.origin is not None and hotel.latitude is not None:
+            entry["distance_km"] = distance_km(distance_sq(hotel.latitude, hotel.longitude, geo.origin))
+        hotel_list.append(entry)
+    
+    return hotel_list
 
 
 @router.get("/featured")
-def get_featured_hotels(
-    currency: str = Query("NGN", description="Currency code"),
-    db: Session = Depends(get_db)
+async def get_featured_hotels(
+    request: Request,
+    currency: str = Query("NGN", description="Currency code")
 ):
     """Get featured hotels for landing page"""
+    from app.core.config import settings
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    currency = currency.upper()
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_featured_hotels, currency)
+    
     try:
-        from app.models.hotel import Hotel
-        
-        hotels = db.query(Hotel).filter(Hotel.is_featured == True).limit(6).all()
-        
-        from app.services.currency_service import CurrencyService
-        
-        hotel_list = []
-        for hotel in hotels:
-            base_price = Decimal(str(hotel.price_per_night))
-            base_currency = getattr(hotel, 'base_currency', 'NGN')
-            
-            converted_price = CurrencyService.convert_currency(
-                float(base_price), base_currency, currency.upper(), db
-            )
-            
-            curr_obj = CurrencyService.get_currency_by_code(currency.upper(), db)
-            symbol = curr_obj.symbol if curr_obj else currency.upper()
-            
-            hotel_list.append({
-                "id": hotel.id,
-                "name": hotel.name,
-                "location": hotel.location,
-                "rating": float(hotel.star_rating),
-                "price": converted_price,
-                "currency": currency.upper(),
-                "currency_symbol": symbol,
-                "image_url": hotel.images[0] if hotel.images and len(hotel.images) > 0 else None,
-                "amenities": hotel.amenities or [],
-                "description": hotel.description or "",
-                "is_available": getattr(hotel, 'is_available', True),
-                "is_featured": hotel.is_featured
-            })
-        
-        return {"hotels": hotel_list}
+        return await cached_response(
+            request, build_cache_key("featured_hotels", {"currency": currency}), compute,
+            settings.CACHE_CATALOG_TTL, soft_ttl=settings.CACHE_SEARCH_SOFT_TTL
+        )
     except Exception as e:
         print(f"Error fetching featured hotels: {e}")
         return {"hotels": []}
 
 
+def _load_featured_hotels(db: Session, currency: str) -> dict:
+    """Load featured hotels with prices converted to currency"""
+    from app.models.hotel import Hotel
+    from app.services.currency_service import CurrencyService
+    
+    hotels = db.query(Hotel).filter(Hotel.is_featured == True).limit(6).all()
+    
+    rates = CurrencyService.get_rates(db)
+    converted_prices = rates.convert_many(
+        [hotel.price_per_night for hotel in hotels],
+        [getattr(hotel, 'base_currency', 'NGN') for hotel in hotels], currency
+    )
+    symbol = rates.symbol(currency)
+    
+    hotel_list = []
+    for hotel, converted_price in zip(hotels, converted_prices):
+        hotel_list.append({
+            "id": hotel.id,
+            "name": hotel.name,
+            "location": hotel.location,
+            "rating": float(hotel.star_rating),
+            "price": converted_price,
+            "currency": currency,
+            "currency_symbol": symbol,
+            "image_url": hotel.images[0] if hotel.images and len(hotel.images) > 0 else None,
+            "amenities": hotel.amenities or [],
+            "description": hotel.description or "",
+            "is_available": getattr(hotel, 'is_available', True),
+            "is_featured": hotel.is_featured
+        })
+    
+    return {"hotels": hotel_list}
+
+
 @router.get("/destinations")
-def get_popular_destinations():
+async def get_popular_destinations():
     """Get popular hotel destinations with caching"""
-    from app.utils.cache_manager import cache_manager
+    from app.utils.cache import cache_manager
     
     # Cache for 1 hour since destinations don't change frequently
-    cached_destinations = cache_manager.get("popular_destinations")
+    cached_destinations = await cache_manager.get("popular_destinations")
     if cached_destinations:
         return {"destinations": cached_destinations}
     
@@ -232,51 +436,37 @@ def get_popular_destinations():
         {"city": "Tokyo", "country": "Japan", "hotels_count": 750}
     ]
     
-    cache_manager.set("popular_destinations", destinations, 3600)
+    await cache_manager.set("popular_destinations", destinations, 3600)
     return {"destinations": destinations}
 
 
-@router.get("/{hotel_id}")
-def get_hotel_details(hotel_id: str, db: Session = Depends(get_db)):
-    """Get detailed hotel information"""
+@router.get("/availability")
+async def get_hotels_availability(
+    ids: str = Query(..., description="Comma-separated hotel ids, e.g. one search results page"),
+    check_in: str = Query(..., description="Check-in date (YYYY-MM-DD)"),
+    check_out: str = Query(..., description="Check-out date (YYYY-MM-DD)"),
+    rooms: int = Query(1, description="Rooms needed of one room type")
+):
+    """Check availability of many hotels at once"""
     try:
-        from app.models.hotel import Hotel
-        
-        hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-        if not hotel:
-            raise HTTPException(status_code=404, detail="Hotel not found")
-        
-        return {
-            "id": hotel.id,
-            "name": hotel.name,
-            "location": hotel.location,
-            "star_rating": float(hotel.star_rating),
-            "price_per_night": float(hotel.price_per_night),
-            "description": hotel.description or "",
-            "images": hotel.images or [],
-            "amenities": hotel.amenities or [],
-            "room_count": getattr(hotel, 'room_count', 0),
-            "is_available": getattr(hotel, 'is_available', True),
-            "is_featured": hotel.is_featured,
-            "check_in_time": "15:00",
-            "check_out_time": "11:00",
-            "policies": ["No smoking in rooms", "Pets allowed with fee", "Free cancellation up to 24 hours"]
-        }
-    except Exception as e:
-        print(f"Error fetching hotel details: {e}")
-        raise HTTPException(status_code=404, detail="Hotel not found")
+        hotel_ids = [int(i) for i in ids.split(',') if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated hotel ids")
+    if len(hotel_ids) > MAX_AVAILABILITY_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_AVAILABILITY_IDS} hotels per request")
+    
+    try:
+        availability = await run_in_threadpool(
+            run_in_session, _load_bulk_availability, hotel_ids, check_in, check_out, rooms
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"check_in": check_in, "check_out": check_out, "rooms": rooms, "availability": availability}
 
 
-@router.post("/{hotel_id}/check-availability")
-def check_hotel_availability(
-    hotel_id: str,
-    check_in: str,
-    check_out: str,
-    rooms: int = 1
-):
-    """Check hotel availability"""
-    available = HotelService.check_availability(hotel_id, check_in, check_out, rooms)
-    return {"available": available, "hotel_id": hotel_id}
+def _load_bulk_availability(db: Session, hotel_ids: List[int], check_in: str, check_out: str, rooms: int) -> dict:
+    return HotelService.bulk_availability(hotel_ids, check_in, check_out, rooms, db)
+
 
 @router.get("/amenities")
 def get_hotel_amenities():
@@ -291,4 +481,72 @@ def get_hotel_amenities():
             {"name": "Bar", "icon": "bar"},
             {"name": "Business Center", "icon": "business"}
         ]
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/{hotel_id}")
+async def get_hotel_details(hotel_id: int, request: Request):
+    """Get detailed hotel information"""
+    from app.core.config import settings
+    from app.utils.cache_invalidation import hotel_tag
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
+    
+    def compute():
+        return run_in_threadpool(run_in_session, _load_hotel_details, hotel_id)
+    
+    try:
+        return await cached_response(
+            request, build_cache_key("hotel_detail", {"id": hotel_id}), compute, settings.CACHE_CATALOG_TTL,
+            soft_ttl=settings.CACHE_CATALOG_SOFT_TTL, tags=[hotel_tag(hotel_id)]
+        )
+    except Exception as e:
+        print(f"Error fetching hotel details: {e}")
+        raise HTTPException(status_code=404, detail="Hotel not found")
+
+
+def _load_hotel_details(db: Session, hotel_id: int) -> dict:
+    """Load the hotel detail payload"""
+    from app.models.hotel import Hotel
+    
+    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
+    if not hotel:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    
+    return {
+        "id": hotel.id,
+        "name": hotel.name,
+        "location": hotel.location,
+        "star_rating": float(hotel.star_rating),
+        "price_per_night": float(hotel.price_per_night),
+        "description": hotel.description or "",
+        "images": hotel.images or [],
+        "amenities": hotel.amenities or [],
+        "room_count": getattr(hotel, 'room_count', 0),
+        "is_available": getattr(hotel, 'is_available', True),
+        "is_featured": hotel.is_featured,
+        "check_in_time": "15:00",
+        "check_out_time": "11:00",
+        "policies": ["No smoking in rooms", "Pets allowed with fee", "Free cancellation up to 24 hours"]
+    }
+
+
+@router.post("/{hotel_id}/check-availability")
+async def check_hotel_availability(
+    hotel_id: int,
+    check_in: str,
+    check_out: str,
+    rooms: int = 1
+):
+    """Check hotel availability against the room inventory"""
+    try:
+        availability = await run_in_threadpool(
+            run_in_session, _load_availability, hotel_id, check_in, check_out, rooms
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"hotel_id": hotel_id, **availability}
+
+
+def _load_availability(db: Session, hotel_id: int, check_in: str, check_out: str, rooms: int) -> dict:
+    return HotelService.check_availability(hotel_id, check_in, check_out, rooms, db)
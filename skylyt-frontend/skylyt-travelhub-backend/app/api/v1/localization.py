@@ -46,13 +46,9 @@ async def convert_currency(
 ):
     """Convert amount between currencies"""
     try:
-        converted = CurrencyService.convert_currency(
-            amount, from_currency.upper(), to_currency.upper(), db
-        )
-        
-        # Calculate exchange rate
-        rate = CurrencyService.convert_currency(
-            1.0, from_currency.upper(), to_currency.upper(), db
+        # Amount and rate come from the same rate snapshot
+        converted, rate = CurrencyService.convert_many(
+            [amount, 1.0], from_currency.upper(), to_currency.upper(), db
         )
         
         return {
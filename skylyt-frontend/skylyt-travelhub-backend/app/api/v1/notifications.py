@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
-import requests
 import os
 from app.core.database import get_db
+from app.core.http_client import outbound_http
 from app.core.dependencies import get_current_user
 from app.models.notification import Notification
 from app.schemas.notification import NotificationCreate, NotificationResponse
@@ -135,8 +135,8 @@ def send_push_notification(
         payload["url"] = notification.url
     
     try:
-        response = requests.post(
-            "https://onesignal.com/api/v1/notifications",
+        response = outbound_http.request_sync(
+            "POST", "https://onesignal.com/api/v1/notifications", upstream="onesignal",
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Basic {api_key}"
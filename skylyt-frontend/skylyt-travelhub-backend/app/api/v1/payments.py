@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
 from datetime import datetime, date
@@ -12,6 +13,7 @@ from app.core.database import get_db
 from app.services.payment_service import PaymentService
 from app.services.payment.gateway_factory import PaymentGatewayFactory
 from app.services.payment_processor import PaymentProcessor
+from app.utils.pagination import InvalidCursor
 from app.services.email_service import EmailService
 
 logger = logging.getLogger(__name__)
@@ -108,7 +110,8 @@ async def _process_payment_internal(
         # Send payment confirmation or failure email
         if result.get('success') and result.get('payment_id'):
             try:
-                email_service.send_payment_confirmation(
+                await run_in_threadpool(
+                    email_service.send_payment_confirmation,
                     booking.customer_email,
                     {
                         "user_name": booking.customer_name,
@@ -123,7 +126,8 @@ async def _process_payment_internal(
                 logger.warning(f"Failed to send payment confirmation email: {e}")
         elif not result.get('success'):
             try:
-                email_service.send_payment_failed(
+                await run_in_threadpool(
+                    email_service.send_payment_failed,
                     booking.customer_email,
                     {
                         "user_name": booking.customer_name,
@@ -203,7 +207,8 @@ async def upload_proof_of_payment(
         
         # Send payment proof upload confirmation email
         try:
-            email_service.send_payment_confirmation(
+            await run_in_threadpool(
+                email_service.send_payment_confirmation,
                 booking.customer_email,
                 {
                     "user_name": booking.customer_name,
@@ -285,6 +290,7 @@ class StatusUpdateRequest(BaseModel):
 def list_payments(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     provider: Optional[str] = Query(None),
     booking_type: Optional[str] = Query(None),
@@ -311,8 +317,10 @@ def list_payments(
     filters = {k: v for k, v in filters.items() if v is not None}
     
     try:
-        result = payment_service.list_payments(db, filters, page, per_page)
+        result = payment_service.list_payments(db, filters, page, per_page, cursor=cursor)
         return result
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch payments: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch payments")
@@ -321,6 +329,7 @@ def list_payments(
 def list_hotel_payments(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     provider: Optional[str] = Query(None),
     date_from: Optional[date] = Query(None),
@@ -341,8 +350,10 @@ def list_hotel_payments(
     filters = {k: v for k, v in filters.items() if v is not None}
     
     try:
-        result = payment_service.list_payments(db, filters, page, per_page)
+        result = payment_service.list_payments(db, filters, page, per_page, cursor=cursor)
         return result
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch hotel payments: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch hotel payments")
@@ -351,6 +362,7 @@ def list_hotel_payments(
 def list_car_payments(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     provider: Optional[str] = Query(None),
     date_from: Optional[date] = Query(None),
@@ -371,8 +383,10 @@ def list_car_payments(
     filters = {k: v for k, v in filters.items() if v is not None}
     
     try:
-        result = payment_service.list_payments(db, filters, page, per_page)
+        result = payment_service.list_payments(db, filters, page, per_page, cursor=cursor)
         return result
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch car payments: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch car payments")
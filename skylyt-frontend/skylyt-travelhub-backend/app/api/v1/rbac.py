@@ -7,6 +7,7 @@ from app.core.rbac_dependencies import get_superadmin_user, get_admin_user
 from app.services.rbac_service import RBACService
 from app.models.rbac import Role, Permission
 from app.models.user import User
+from app.utils.pagination import InvalidCursor, paginate
 from app.schemas.rbac import (
     RoleCreate, RoleResponse, RoleUpdate,
     PermissionCreate, PermissionResponse,
@@ -179,6 +180,7 @@ def get_all_users(
     status: str = None,
     page: int = 1,
     per_page: int = 20,
+    cursor: str = None,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -204,16 +206,15 @@ def get_all_users(
     elif status == "inactive":
         query = query.filter(User.is_active == False)
     
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    users = query.offset((page - 1) * per_page).limit(per_page).all()
-    
-    # Filter out superadmin users if current user is not superadmin
+    # Hide superadmin users from admins in SQL so pages and totals stay consistent
     if not current_user.is_superadmin():
-        users = [user for user in users if not any(role.name == 'superadmin' for role in user.roles)]
-        total = len([u for u in query.all() if not any(role.name == 'superadmin' for role in u.roles)])
+        query = query.filter(~User.roles.any(Role.name == 'superadmin'))
+    
+    # Newest users first; cursor continues after a previous page
+    try:
+        result = paginate(query, [(User.id, True)], per_page, cursor=cursor, page=page)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "users": [{
@@ -231,12 +232,14 @@ def get_all_users(
                 "name": role.name,
                 "description": role.description
             } for role in user.roles]
-        } for user in users],
+        } for user in result.items],
         "pagination": {
-            "page": page,
+            "page": result.page,
             "per_page": per_page,
-            "total": total,
-            "pages": (total + per_page - 1) // per_page
+            "total": result.total,
+            "pages": (result.total + per_page - 1) // per_page,
+            "next_cursor": result.next_cursor,
+            "has_more": result.has_more
         }
     }
 
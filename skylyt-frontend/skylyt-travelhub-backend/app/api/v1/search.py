@@ -1,24 +1,25 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.services.hotel_service import HotelService
-from app.services.car_service import CarService
-from app.services.booking_service import BookingService
-from decimal import Decimal
-import decimal
+from app.core.config import settings
+from app.core.dependencies import get_current_user, get_current_user_id_optional
+from app.services.bundle_service import SORT_OPTIONS, SORT_SAVINGS, BundleService
+from app.services.search_history import search_history_recorder, search_params
+from app.services.suggestion_index import MAX_SUGGESTIONS, suggestion_index
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 
 @router.get("/bundles")
-def search_bundles(
+async def search_bundles(
     city: str = Query(..., description="Destination city"),
     check_in: str = Query(..., description="Check-in date"),
     check_out: str = Query(..., description="Check-out date"),
     guests: int = Query(1, description="Number of guests"),
-    rooms: int = Query(1, description="Number of rooms")
+    rooms: int = Query(1, description="Number of rooms"),
+    currency: str = Query("NGN", description="Currency code"),
+    sort_by: str = Query(SORT_SAVINGS, description="Rank bundles by savings or price"),
+    limit: int = Query(10, description="Number of bundles"),
+    user_id: Optional[int] = Depends(get_current_user_id_optional)
 ):
     """Search for hotel + car bundles"""
     from app.schemas.search import LocationSearch, DateRange, PaginationParams
@@ -26,56 +27,98 @@ def search_bundles(
     from app.schemas.car import CarSearchRequest
     from datetime import datetime
     
-    # Search hotels
-    hotel_search = HotelSearchRequest(
-        location=LocationSearch(city=city),
-        dates=DateRange(
+    try:
+        dates = DateRange(
             start_date=datetime.strptime(check_in, "%Y-%m-%d").date(),
             end_date=datetime.strptime(check_out, "%Y-%m-%d").date()
-        ),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+    nights = (dates.end_date - dates.start_date).days
+    if nights < 1:
+        raise HTTPException(status_code=400, detail="check_out must be after check_in")
+    if sort_by not in SORT_OPTIONS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of: {', '.join(SORT_OPTIONS)}")
+    
+    # The cheapest candidates on each side; every pair of them is scored
+    candidates = PaginationParams(page=1, limit=settings.BUNDLE_CANDIDATES)
+    hotel_search = HotelSearchRequest(
+        location=LocationSearch(city=city),
+        dates=dates,
         guests=guests,
-        rooms=rooms,
-        pagination=PaginationParams(page=1, limit=5)
+        rooms=max(rooms, 1),
+        pagination=candidates
     )
-    
-    # Search cars
     car_search = CarSearchRequest(
         pickup_location=LocationSearch(city=city),
-        dates=DateRange(
-            start_date=datetime.strptime(check_in, "%Y-%m-%d").date(),
-            end_date=datetime.strptime(check_out, "%Y-%m-%d").date()
-        ),
-        pagination=PaginationParams(page=1, limit=5)
+        dates=dates,
+        pagination=candidates
     )
     
-    hotels = HotelService.search_hotels(hotel_search)
-    cars = CarService.search_cars(car_search)
+    try:
+        bundles = await BundleService.search_bundles(
+            hotel_search, car_search, nights, currency.upper(), sort_by, min(max(limit, 1), 50)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Calculate bundle savings
-    bundles = []
-    for hotel in hotels.items[:3]:
-        for car in cars.items[:3]:
-            try:
-                hotel_price_str = str(hotel["price_per_night"])
-                car_price_str = str(car["price_per_day"])
-                if hotel_price_str.lower() in ['nan', 'inf', '-inf'] or car_price_str.lower() in ['nan', 'inf', '-inf']:
-                    continue
-                hotel_price = Decimal(hotel_price_str)
-                car_price = Decimal(car_price_str)
-            except (ValueError, TypeError, decimal.InvalidOperation):
-                continue
-            savings = BookingService.calculate_bundle_savings(hotel_price, car_price)
-            
-            bundles.append({
-                "hotel": hotel,
-                "car": car,
-                "individual_total": float(savings["individual_total"]),
-                "bundle_price": float(savings["bundle_price"]),
-                "savings": float(savings["savings"]),
-                "discount_percentage": float(savings["discount_percentage"])
-            })
+    search_history_recorder.record(user_id, "bundle", search_params(
+        city=city, check_in=check_in, check_out=check_out, guests=guests, rooms=rooms,
+        currency=currency, sort_by=sort_by, limit=limit
+    ), len(bundles))
+    return {"bundles": bundles, "currency": currency.upper(), "nights": nights}
+
+
+def _parse_dates(start: str, end: str):
+    from datetime import date
     
-    return {"bundles": bundles}
+    try:
+        start_date, end_date = date.fromisoformat(start), date.fromisoformat(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+    if end_date <= start_date:
+        raise HTTPException(status_code=400, detail="The end date must be after the start date")
+    return start_date, end_date
+
+
+@router.get("/inventory/hotels")
+async def search_hotel_inventory(
+    location: str = Query(..., description="Destination city"),
+    check_in: str = Query(..., description="Check-in date (YYYY-MM-DD)"),
+    check_out: str = Query(..., description="Check-out date (YYYY-MM-DD)"),
+    guests: int = Query(1, description="Number of guests"),
+    rooms: int = Query(1, description="Number of rooms"),
+    currency: str = Query("NGN", description="Currency code"),
+    limit: int = Query(50, description="Number of hotels")
+):
+    """Search local hotels and every enabled hotel supplier at once"""
+    from app.services.supplier_search import search_all_hotels
+    
+    start, end = _parse_dates(check_in, check_out)
+    try:
+        return await search_all_hotels(
+            location, start, end, max(guests, 1), max(rooms, 1), currency.upper(), min(max(limit, 1), 100)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/inventory/cars")
+async def search_car_inventory(
+    location: str = Query(..., description="Pickup location"),
+    pickup_date: str = Query(..., description="Pickup date (YYYY-MM-DD)"),
+    return_date: str = Query(..., description="Return date (YYYY-MM-DD)"),
+    currency: str = Query("NGN", description="Currency code"),
+    limit: int = Query(50, description="Number of cars")
+):
+    """Search local cars and every enabled car rental supplier at once"""
+    from app.services.supplier_search import search_all_cars
+    
+    start, end = _parse_dates(pickup_date, return_date)
+    try:
+        return await search_all_cars(location, start, end, currency.upper(), min(max(limit, 1), 100))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/compare")
@@ -91,26 +134,23 @@ def compare_options(options: dict):
 
 
 @router.get("/suggestions")
-def get_search_suggestions(query: str = Query(..., description="Search query")):
-    """Get search suggestions"""
-    suggestions = [
-        {"type": "city", "name": f"{query} City", "country": "USA"},
-        {"type": "hotel", "name": f"Grand {query} Hotel", "rating": 4.5},
-        {"type": "destination", "name": f"{query} Beach Resort", "category": "beach"}
-    ]
-    return {"suggestions": suggestions}
+async def get_search_suggestions(
+    query: str = Query(..., description="Search query"),
+    limit: int = Query(8, description="Maximum number of suggestions")
+):
+    """Typeahead suggestions for states, cities, hotels and car models"""
+    if not suggestion_index.ready:
+        # Only until the startup build finishes; concurrent callers share it
+        await suggestion_index.rebuild()
+    suggestions = suggestion_index.search(query, min(max(limit, 1), MAX_SUGGESTIONS))
+    return {"suggestions": [suggestion.as_response() for suggestion in suggestions]}
 
 
 @router.get("/history")
-def get_search_history(
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_search_history(
+    limit: int = Query(settings.SEARCH_HISTORY_RECENT, description="Number of searches"),
+    current_user = Depends(get_current_user)
 ):
-    """Get user search history"""
-    return {
-        "history": [
-            {"query": "New York Hotels", "date": "2024-01-15", "type": "hotel"},
-            {"query": "Los Angeles Cars", "date": "2024-01-14", "type": "car"},
-            {"query": "Miami Bundle", "date": "2024-01-13", "type": "bundle"}
-        ]
-    }
\ No newline at end of file
+    """Get the user's latest searches, newest first"""
+    history = await search_history_recorder.recent(current_user.id, max(limit, 1))
+    return {"history": history}
\ No newline at end of file
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import settings as app_settings
+from app.core.database import get_db, run_in_session
 from app.core.dependencies import get_current_user
 from app.models.settings import Settings
 from app.schemas.settings import (
@@ -37,9 +39,22 @@ def get_or_create_settings(db: Session) -> Settings:
 
 
 @router.get("/", response_model=SettingsResponse)
-def get_settings(db: Session = Depends(get_db)):
+async def get_settings(request: Request):
     """Get current system settings - public access for basic settings"""
+    from app.utils.cache_keys import build_cache_key
+    from app.utils.response_cache import cached_response
     
+    def compute():
+        return run_in_threadpool(run_in_session, _load_public_settings)
+    
+    return await cached_response(
+        request, build_cache_key("general_settings", {}), compute,
+        app_settings.CACHE_CATALOG_TTL, soft_ttl=app_settings.CACHE_CATALOG_SOFT_TTL
+    )
+
+
+def _load_public_settings(db: Session) -> dict:
+    """Load the public settings payload, shaped by SettingsResponse"""
     settings = get_or_create_settings(db)
     
     # Return settings without sensitive data for non-superadmins
@@ -76,7 +91,8 @@ def get_settings(db: Session = Depends(get_db)):
         "paypal_client_id": settings.paypal_client_id
     })
     
-    return response_data
+    # Cached bytes skip response_model, so validate and filter here
+    return SettingsResponse(**response_data).model_dump(mode="json")
 
 
 @router.put("/general")
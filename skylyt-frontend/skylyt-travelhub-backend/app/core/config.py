@@ -16,6 +16,72 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    CACHE_NAMESPACE: str = "skylyt"
+    CACHE_L1_MAX_ENTRIES: int = 2048
+    CACHE_L1_TTL: int = 60
+    # Soft TTL: serve stale and refresh in background; hard TTL: evict.
+    # Catalog writes invalidate precisely (app.utils.cache_invalidation),
+    # so these only bound drift from changes made outside the ORM.
+    CACHE_SEARCH_SOFT_TTL: int = 1800
+    CACHE_SEARCH_TTL: int = 21600
+    CACHE_CATALOG_SOFT_TTL: int = 3600
+    CACHE_CATALOG_TTL: int = 86400
+    # Value encoding: json, orjson or msgpack; compression: none, zlib, zstd
+    # or lz4, applied to values of at least CACHE_COMPRESS_THRESHOLD bytes
+    CACHE_SERIALIZER: str = "orjson"
+    CACHE_COMPRESSION: str = "zlib"
+    CACHE_COMPRESS_THRESHOLD: int = 2048
+    # Cached response bodies at least this large are stored pre-gzipped;
+    # keep in line with the GZipMiddleware minimum_size
+    CACHE_RESPONSE_GZIP_MIN_SIZE: int = 500
+    # Search cache warming from search history and booking demand
+    CACHE_WARM_TOP_N: int = 50
+    CACHE_WARM_CONCURRENCY: int = 4
+    CACHE_WARM_LOOKBACK_DAYS: int = 14
+    CACHE_WARM_INTERVAL: int = 1800
+    CACHE_WARM_LOCK_TIMEOUT: int = 600
+    # Text search: "auto" ranks with pg_trgm on PostgreSQL; "ilike" disables it
+    TEXT_SEARCH_MODE: str = "auto"
+    # Paginated list totals: "exact", "cached" (exact, reused per filter set
+    # for PAGINATION_COUNT_CACHE_TTL seconds), "estimate" (PostgreSQL planner)
+    # or "auto" (cached, switching to estimates above the exact limit)
+    PAGINATION_COUNT_MODE: str = "auto"
+    PAGINATION_COUNT_CACHE_TTL: int = 30
+    PAGINATION_EXACT_COUNT_LIMIT: int = 10000
+    # In-memory FX rates are replaced on every ORM rate change; this bounds
+    # how long rates changed outside the ORM can go unnoticed (seconds)
+    FX_SNAPSHOT_MAX_AGE: int = 300
+    # Hotel + car bundles: discount on the combined price, and how many of
+    # the cheapest hotels and cars each bundle search pairs up
+    BUNDLE_DISCOUNT_PERCENT: int = 10
+    BUNDLE_CANDIDATES: int = 200
+    # Typeahead index: full rebuilds pick up booking-based popularity
+    SUGGESTION_REBUILD_INTERVAL: int = 900
+    # Room inventory: nights ahead kept in the in-memory calendar, its
+    # maximum age (seconds) and the longest stay that can be booked
+    INVENTORY_HORIZON_DAYS: int = 365
+    INVENTORY_SNAPSHOT_MAX_AGE: int = 60
+    MAX_STAY_NIGHTS: int = 30
+    # Search history is buffered in memory (oldest dropped beyond the buffer
+    # size) and written in batches every flush interval (seconds); the
+    # latest SEARCH_HISTORY_RECENT searches per user are cached for reads
+    SEARCH_HISTORY_BUFFER_SIZE: int = 10000
+    SEARCH_HISTORY_BATCH_SIZE: int = 500
+    SEARCH_HISTORY_FLUSH_INTERVAL: float = 2.0
+    SEARCH_HISTORY_RECENT: int = 20
+    SEARCH_HISTORY_CACHE_TTL: int = 3600
+    # External hotel/car suppliers: search deadline per supplier (seconds),
+    # after which results come back without it, and how long a supplier's
+    # response to one query is cached
+    SUPPLIER_TIMEOUT: float = 3.0
+    SUPPLIER_CACHE_TTL: int = 300
+    # Outbound HTTP (app.core.http_client): connection pool shared by every
+    # upstream, idle keep-alive lifetime (seconds) and HTTP/2, used when the
+    # h2 package is installed; per-upstream limits are in UPSTREAM_POLICIES
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True
     
     # JWT
     SECRET_KEY: str
@@ -52,6 +118,9 @@ class Settings(BaseSettings):
     BOOKING_COM_API_KEY: Optional[str] = None
     EXPEDIA_API_KEY: Optional[str] = None
     HERTZ_API_KEY: Optional[str] = None
+    # Override the supplier endpoints (sandboxes, local fakes)
+    BOOKING_COM_API_URL: Optional[str] = None
+    HERTZ_API_URL: Optional[str] = None
     
     # Environment
     ENVIRONMENT: str = "production"
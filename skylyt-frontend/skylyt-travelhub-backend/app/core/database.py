@@ -64,6 +64,18 @@ def receive_close(dbapi_connection, connection_record):
 def receive_invalidate(dbapi_connection, connection_record, exception):
     logger.error(f"Connection invalidated: {id(dbapi_connection)}, error: {exception}")
 
+def run_in_session(func, *args, **kwargs):
+    """Call func(db, ...) with a dedicated session that is closed afterwards.
+
+    For work that may outlive the request, such as background cache
+    refreshes, which cannot use the request-scoped session from get_db.
+    """
+    db = SessionLocal()
+    try:
+        return func(db, *args, **kwargs)
+    finally:
+        db.close()
+
 def get_db():
     db = SessionLocal()
     connection_id = id(db.connection())
@@ -73,6 +73,19 @@ def get_current_user_optional(
         return None
 
 
+def get_current_user_id_optional(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> Optional[int]:
+    """Id of the signed-in user from the token alone, without a database lookup"""
+    if not credentials:
+        return None
+    payload = verify_token(credentials.credentials)
+    try:
+        return int(payload["sub"]) if payload else None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 def get_admin_user(current_user = Depends(get_current_active_user)):
     if not (current_user.is_admin() or current_user.is_superadmin()):
         raise HTTPException(
@@ -0,0 +1,423 @@
+import asyncio
+import importlib.util
+import logging
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, NamedTuple, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Methods a retry cannot apply twice; anything else is retried only when
+# the request never reached the upstream
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class UpstreamPolicy(NamedTuple):
+    """Limits for one upstream API"""
+    rate: float = 10.0             # requests per second, sustained
+    burst: int = 20                # requests allowed at once before throttling
+    retries: int = 2               # extra attempts after the first
+    backoff: float = 0.2           # first backoff (seconds), doubled per retry, jittered
+    max_backoff: float = 5.0
+    failure_threshold: int = 5     # consecutive failures that open the breaker
+    reset_timeout: float = 30.0    # seconds the breaker stays open before a trial call
+    timeout: float = 10.0
+
+
+# Upstreams not listed here share DEFAULT_POLICY, each with its own bucket and breaker
+UPSTREAM_POLICIES: Dict[str, UpstreamPolicy] = {
+    "resend": UpstreamPolicy(rate=2.0, burst=2, timeout=30.0),
+    "onesignal": UpstreamPolicy(rate=10.0, burst=10),
+    "ipapi": UpstreamPolicy(rate=1.0, burst=5, retries=0, timeout=5.0),
+    "paystack": UpstreamPolicy(rate=20.0, burst=20, timeout=30.0),
+    "flutterwave": UpstreamPolicy(rate=20.0, burst=20, timeout=30.0),
+    "paypal": UpstreamPolicy(rate=20.0, burst=20, timeout=30.0),
+    "booking.com": UpstreamPolicy(rate=20.0, burst=40, retries=1),
+    "hertz": UpstreamPolicy(rate=20.0, burst=40, retries=1),
+    # Images fetched from user-supplied URLs; one budget for every host
+    "image-fetch": UpstreamPolicy(rate=5.0, burst=10, retries=1),
+}
+DEFAULT_POLICY = UpstreamPolicy()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"Circuit open for {upstream}; retry in {retry_in:.1f}s")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens a second, up to ``burst``.
+
+    A caller takes a token even when none is left and waits for it to
+    accrue, so waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def acquire_sync(self) -> float:
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """Stops calls to an upstream after ``threshold`` consecutive failures.
+
+    Once open, calls fail fast for ``reset_timeout`` seconds; then one
+    trial call is let through (half-open), which closes the breaker on
+    success or opens it again on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_started = None
+            if self.state == self.HALF_OPEN:
+                # A trial that never reported back (cancelled) does not block forever
+                if self._trial_started is not None and now - self._trial_started < self.reset_timeout:
+                    return False
+                self._trial_started = now
+                return True
+            return self.state == self.CLOSED
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class UpstreamStats:
+    """Request counters and recent latencies for one upstream"""
+
+    def __init__(self, window: int = 1000):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, failed: bool):
+        self.requests += 1
+        self.errors += failed
+        self.latencies.append(elapsed_ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1) if ordered else None
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+        }
+
+
+class Upstream:
+    """Rate limit, circuit breaker and metrics for one upstream API"""
+
+    def __init__(self, name: str, policy: UpstreamPolicy):
+        self.name = name
+        self.policy = policy
+        self.bucket = TokenBucket(policy.rate, policy.burst)
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+        self.stats = UpstreamStats()
+
+    def check(self):
+        """Raise CircuitOpenError unless the breaker lets a call through"""
+        if not self.breaker.allow():
+            self.stats.rejected += 1
+            raise CircuitOpenError(self.name, self.breaker.retry_in())
+
+    def finish(self, started: float, response: Optional[httpx.Response]):
+        """Record an attempt; transport errors (no response) and 5xx count against the breaker"""
+        failed = response is None or response.status_code >= 500
+        self.stats.record((time.perf_counter() - started) * 1000, failed)
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Seconds before retry number ``attempt`` (from 1): Retry-After if given, else full jitter"""
+        retry_after = _retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.policy.max_backoff)
+        return random.uniform(0, min(self.policy.max_backoff, self.policy.backoff * 2 ** (attempt - 1)))
+
+    def should_retry(self, method: str, attempt: int, response: Optional[httpx.Response] = None,
+                     error: Optional[Exception] = None) -> bool:
+        if attempt > self.policy.retries:
+            return False
+        if error is not None:
+            return method in IDEMPOTENT_METHODS or isinstance(error, NOT_SENT_ERRORS)
+        if response.status_code == 429:
+            # Rejected before it was processed, so safe for any method
+            return True
+        return method in IDEMPOTENT_METHODS and response.status_code in RETRY_STATUSES
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class OutboundHTTP:
+    """The one way the application calls other services over HTTP.
+
+    Requests are named after the upstream they go to; each upstream gets
+    its own token bucket, circuit breaker and latency stats (see
+    ``UPSTREAM_POLICIES``). Failed attempts are retried with jittered
+    exponential backoff, non-idempotent requests only when they never
+    reached the upstream. Connections are kept alive per host in one
+    pool, with HTTP/2 when ``h2`` is installed. asyncio clients are bound
+    to their event loop, so one is kept per loop; sync callers (Celery
+    tasks, sync routes) share a thread-safe client.
+    """
+
+    def __init__(self, policies: Dict[str, UpstreamPolicy] = None, default_policy: UpstreamPolicy = None):
+        self.policies = UPSTREAM_POLICIES if policies is None else policies
+        self.default_policy = default_policy or DEFAULT_POLICY
+        self._upstreams: Dict[str, Upstream] = {}
+        self._async_clients: Dict[int, httpx.AsyncClient] = {}
+        self._sync_client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+
+    def upstream(self, name: str) -> Upstream:
+        upstream = self._upstreams.get(name)
+        if upstream is None:
+            with self._lock:
+                upstream = self._upstreams.setdefault(name, Upstream(name, self.policies.get(name, self.default_policy)))
+        return upstream
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        return {
+            "http2": settings.HTTP2_ENABLED and http2_available(),
+            "limits": httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            "timeout": httpx.Timeout(self.default_policy.timeout, connect=5.0),
+        }
+
+    def async_client(self) -> httpx.AsyncClient:
+        """The pooled asyncio client of the running loop"""
+        loop_id = id(asyncio.get_running_loop())
+        client = self._async_clients.get(loop_id)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**self._client_kwargs())
+            self._async_clients[loop_id] = client
+        return client
+
+    def sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._sync_client is None or self._sync_client.is_closed:
+                self._sync_client = httpx.Client(**self._client_kwargs())
+            return self._sync_client
+
+    def _prepare(self, upstream: Optional[str], url: str, kwargs: Dict[str, Any]) -> Upstream:
+        upstream = self.upstream(upstream or httpx.URL(url).host)
+        kwargs.setdefault("timeout", upstream.policy.timeout)
+        return upstream
+
+    async def request(self, method: str, url: str, *, upstream: str = None, **kwargs) -> httpx.Response:
+        """Send a request through the upstream's limits (default upstream: the URL's host).
+
+        Returns the last response, whatever its status; raises
+        CircuitOpenError when the upstream is failing, or the last
+        ``httpx.TransportError`` once retries run out.
+        """
+        method = method.upper()
+        target = self._prepare(upstream, url, kwargs)
+        client = self.async_client()
+        attempt = 0
+        while True:
+            target.check()
+            if await target.bucket.acquire():
+                target.stats.throttled += 1
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                target.finish(started, None)
+                attempt += 1
+                if not target.should_retry(method, attempt, error=e):
+                    raise
+                delay = target.backoff(attempt, None)
+            else:
+                target.finish(started, response)
+                attempt += 1
+                if not target.should_retry(method, attempt, response=response):
+                    return response
+                delay = target.backoff(attempt, response)
+                await response.aclose()
+            target.stats.retries += 1
+            await asyncio.sleep(delay)
+
+    def request_sync(self, method: str, url: str, *, upstream: str = None, **kwargs) -> httpx.Response:
+        """Blocking ``request``, for code outside the event loop"""
+        method = method.upper()
+        target = self._prepare(upstream, url, kwargs)
+        client = self.sync_client()
+        attempt = 0
+        while True:
+            target.check()
+            if target.bucket.acquire_sync():
+                target.stats.throttled += 1
+            started = time.perf_counter()
+            try:
+                response = client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                target.finish(started, None)
+                attempt += 1
+                if not target.should_retry(method, attempt, error=e):
+                    raise
+                delay = target.backoff(attempt, None)
+            else:
+                target.finish(started, response)
+                attempt += 1
+                if not target.should_retry(method, attempt, response=response):
+                    return response
+                delay = target.backoff(attempt, response)
+                response.close()
+            target.stats.retries += 1
+            time.sleep(delay)
+
+    def session(self, upstream: str) -> "UpstreamSession":
+        return UpstreamSession(self, upstream)
+
+    async def aclose(self):
+        """Close the running loop's client, and the sync client"""
+        client = self._async_clients.pop(id(asyncio.get_running_loop()), None)
+        if client is not None:
+            await client.aclose()
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "http2": settings.HTTP2_ENABLED and http2_available(),
+            "upstreams": {
+                name: {**upstream.stats.as_dict(), "circuit": upstream.breaker.state}
+                for name, upstream in sorted(self._upstreams.items())
+            },
+        }
+
+
+class UpstreamSession:
+    """Client-like view of one upstream, for ``async with`` call sites.
+
+    Leaving the block does not close anything; the pool is shared.
+    """
+
+    def __init__(self, http: OutboundHTTP, upstream: str):
+        self.http = http
+        self.upstream = upstream
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self.http.request(method, url, upstream=self.upstream, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def __aenter__(self) -> "UpstreamSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> bool:
+        return False
+
+
+outbound_http = OutboundHTTP()
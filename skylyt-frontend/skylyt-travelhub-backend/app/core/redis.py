@@ -1,27 +1,39 @@
 import redis
+import redis.asyncio as aioredis
+import asyncio
 import os
-from typing import Optional
+from typing import Optional, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _connection_kwargs() -> dict:
+    """Connection settings shared by the sync and asyncio clients"""
+    return {
+        "host": os.getenv('DRAGONFLY_HOST', 'localhost'),
+        "port": int(os.getenv('DRAGONFLY_PORT', 6379)),
+        "password": os.getenv('DRAGONFLY_PASSWORD'),
+        "db": int(os.getenv('DRAGONFLY_DB', 0)),
+        "socket_connect_timeout": 5,
+        "socket_timeout": 5,
+        "retry_on_timeout": True,
+        "max_connections": int(os.getenv('DRAGONFLY_MAX_CONNECTIONS', 50)),
+    }
+
+
 class RedisService:
     _instance: Optional[redis.Redis] = None
-    
+    # asyncio pools are bound to the loop that created them, so keep one per loop
+    _async_pools: Dict[int, aioredis.ConnectionPool] = {}
+
     @classmethod
     def get_client(cls) -> redis.Redis:
         """Get Redis/Dragonfly client instance"""
         if cls._instance is None:
             try:
                 cls._instance = redis.Redis(
-                    host=os.getenv('DRAGONFLY_HOST', 'localhost'),
-                    port=int(os.getenv('DRAGONFLY_PORT', 6379)),
-                    password=os.getenv('DRAGONFLY_PASSWORD'),
-                    db=int(os.getenv('DRAGONFLY_DB', 0)),
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5,
-                    retry_on_timeout=True
+                    connection_pool=redis.ConnectionPool(decode_responses=True, **_connection_kwargs())
                 )
                 # Test connection
                 cls._instance.ping()
@@ -30,9 +42,30 @@ class RedisService:
                 logger.error(f"Failed to connect to Dragonfly: {e}")
                 # Fallback to None - application will work without cache
                 cls._instance = None
-        
+
         return cls._instance
-    
+
+    @classmethod
+    def get_async_client(cls) -> aioredis.Redis:
+        """Get an asyncio Redis/Dragonfly client backed by the shared pool.
+
+        Clients are cheap wrappers; every caller on the same event loop shares
+        one connection pool. Values are returned as raw bytes.
+        """
+        loop_id = id(asyncio.get_running_loop())
+        pool = cls._async_pools.get(loop_id)
+        if pool is None:
+            pool = aioredis.ConnectionPool(decode_responses=False, **_connection_kwargs())
+            cls._async_pools[loop_id] = pool
+        return aioredis.Redis(connection_pool=pool)
+
+    @classmethod
+    async def close_async(cls):
+        """Disconnect the asyncio pool of the running loop"""
+        pool = cls._async_pools.pop(id(asyncio.get_running_loop()), None)
+        if pool is not None:
+            await pool.disconnect()
+
     @classmethod
     def is_available(cls) -> bool:
         """Check if Redis/Dragonfly is available"""
@@ -47,6 +80,10 @@ def get_redis() -> Optional[redis.Redis]:
     """Get Redis client or None if unavailable"""
     return RedisService.get_client()
 
+def get_async_redis() -> aioredis.Redis:
+    """Get asyncio Redis client for the running event loop"""
+    return RedisService.get_async_client()
+
 def cache_set(key: str, value: str, ex: int = 3600) -> bool:
     """Set cache value with expiration"""
     try:
@@ -77,4 +114,4 @@ def cache_delete(key: str) -> bool:
             return True
     except Exception as e:
         logger.warning(f"Cache delete failed: {e}")
-    return False
\ No newline at end of file
+    return False
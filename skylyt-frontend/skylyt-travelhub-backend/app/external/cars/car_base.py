@@ -1,39 +1,54 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
-from datetime import datetime
+from datetime import date
+from app.external.supplier_base import SupplierAPIBase
 
 
-class CarRentalAPIBase(ABC):
+class CarRentalAPIBase(SupplierAPIBase, ABC):
     """Base class for car rental API integrations"""
     
-    def __init__(self, api_key: str, base_url: str):
-        self.api_key = api_key
-        self.base_url = base_url
-    
     @abstractmethod
-    def search_cars(self, pickup_location: str, dropoff_location: str, 
-                   pickup_date: datetime, dropoff_date: datetime, **filters) -> List[Dict[str, Any]]:
-        """Search for available cars"""
+    async def search_cars(self, pickup_location: str, dropoff_location: str,
+                          pickup_date: date, dropoff_date: date, **filters) -> List[Dict[str, Any]]:
+        """Search for available cars, in the standard format of ``_transform_response``"""
         pass
     
     @abstractmethod
-    def get_car_details(self, car_id: str) -> Dict[str, Any]:
+    async def get_car_details(self, car_id: str) -> Dict[str, Any]:
         """Get detailed car information"""
         pass
     
     @abstractmethod
-    def check_availability(self, car_id: str, pickup_date: datetime, 
-                          dropoff_date: datetime) -> Dict[str, Any]:
+    async def check_availability(self, car_id: str, pickup_date: date,
+                                 dropoff_date: date) -> Dict[str, Any]:
         """Check car availability"""
         pass
     
     @abstractmethod
-    def create_booking(self, car_id: str, driver_info: Dict[str, Any], 
-                      booking_details: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_booking(self, car_id: str, driver_info: Dict[str, Any],
+                             booking_details: Dict[str, Any]) -> Dict[str, Any]:
         """Create car rental booking"""
         pass
     
     @abstractmethod
-    def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
+    async def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
         """Cancel car rental booking"""
-        pass
\ No newline at end of file
+        pass
+    
+    def _transform_response(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Transform a supplier car to the standard format"""
+        make, model = raw_data.get("make"), raw_data.get("model")
+        return {
+            "supplier": self.name,
+            "supplier_id": str(raw_data.get("car_id") or raw_data.get("id")),
+            "name": raw_data.get("name") or " ".join(part for part in (make, model) if part),
+            "make": make,
+            "model": model,
+            "category": raw_data.get("category"),
+            "location": raw_data.get("location"),
+            "price": raw_data.get("price_per_day"),
+            "currency": (raw_data.get("currency") or "USD").upper(),
+            "transmission": raw_data.get("transmission"),
+            "passengers": raw_data.get("seats"),
+            "image_url": raw_data.get("image_url"),
+        }
@@ -1,6 +1,7 @@
 from .car_base import CarRentalAPIBase
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Optional
+from datetime import date
+from app.core.http_client import OutboundHTTP
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,73 +10,37 @@ logger = logging.getLogger(__name__)
 class HertzAPI(CarRentalAPIBase):
     """Hertz car rental API integration"""
     
-    def __init__(self, api_key: str):
-        super().__init__(api_key, "https://api.hertz.com/v1")
+    name = "hertz"
     
-    def search_cars(self, pickup_location: str, dropoff_location: str,
-                   pickup_date: datetime, dropoff_date: datetime, **filters) -> List[Dict[str, Any]]:
+    def __init__(self, api_key: str, base_url: Optional[str] = None,
+                 http: Optional[OutboundHTTP] = None, timeout: Optional[float] = None):
+        super().__init__(api_key, base_url or "https://api.hertz.com/v1", http, timeout)
+    
+    async def search_cars(self, pickup_location: str, dropoff_location: str,
+                          pickup_date: date, dropoff_date: date, **filters) -> List[Dict[str, Any]]:
         """Search cars via Hertz API"""
-        try:
-            mock_results = [
-                {
-                    "car_id": "hertz_economy_1",
-                    "make": "Nissan",
-                    "model": "Versa",
-                    "category": "economy",
-                    "price_per_day": 35.99,
-                    "currency": "USD",
-                    "transmission": "automatic",
-                    "seats": 5,
-                    "supplier": "hertz"
-                },
-                {
-                    "car_id": "hertz_luxury_1",
-                    "make": "Mercedes",
-                    "model": "C-Class",
-                    "category": "luxury",
-                    "price_per_day": 89.99,
-                    "currency": "USD",
-                    "transmission": "automatic",
-                    "seats": 5,
-                    "supplier": "hertz"
-                }
-            ]
-            
-            logger.info(f"Found {len(mock_results)} cars from Hertz")
-            return mock_results
-            
-        except Exception as e:
-            logger.error(f"Hertz search failed: {e}")
-            return []
+        raw = await self._make_request("cars", params={
+            "pickup_location": pickup_location, "dropoff_location": dropoff_location,
+            "pickup_date": pickup_date.isoformat(), "dropoff_date": dropoff_date.isoformat(), **filters
+        })
+        cars = [self._transform_response(car) for car in raw.get("cars", [])]
+        logger.info(f"Found {len(cars)} cars from Hertz")
+        return cars
     
-    def get_car_details(self, car_id: str) -> Dict[str, Any]:
-        return {
-            "car_id": car_id,
-            "detailed_specs": "Full-size sedan with premium features",
-            "included_features": ["GPS", "Bluetooth", "Air Conditioning"],
-            "rental_terms": ["Minimum age 21", "Valid license required"]
-        }
+    async def get_car_details(self, car_id: str) -> Dict[str, Any]:
+        return await self._make_request(f"cars/{car_id}")
     
-    def check_availability(self, car_id: str, pickup_date: datetime,
-                          dropoff_date: datetime) -> Dict[str, Any]:
-        return {
-            "available": True,
-            "cars_available": 3,
-            "price_per_day": 35.99,
-            "currency": "USD"
-        }
+    async def check_availability(self, car_id: str, pickup_date: date,
+                                 dropoff_date: date) -> Dict[str, Any]:
+        return await self._make_request(f"cars/{car_id}/availability", params={
+            "pickup_date": pickup_date.isoformat(), "dropoff_date": dropoff_date.isoformat()
+        })
     
-    def create_booking(self, car_id: str, driver_info: Dict[str, Any],
-                      booking_details: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "booking_id": f"hertz_{hash(car_id)}",
-            "confirmation_number": "HZ123456789",
-            "status": "confirmed"
-        }
+    async def create_booking(self, car_id: str, driver_info: Dict[str, Any],
+                             booking_details: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._make_request("bookings", method="POST", data={
+            "car_id": car_id, "driver": driver_info, "details": booking_details
+        })
     
-    def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
-        return {
-            "booking_id": booking_id,
-            "status": "cancelled",
-            "refund_amount": 179.95
-        }
\ No newline at end of file
+    async def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
+        return await self._make_request(f"bookings/{booking_id}/cancel", method="POST")
@@ -1,6 +1,7 @@
 from .hotel_base import HotelAPIBase
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Optional
+from datetime import date
+from app.core.http_client import OutboundHTTP
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,80 +10,41 @@ logger = logging.getLogger(__name__)
 class BookingComAPI(HotelAPIBase):
     """Booking.com API integration"""
     
-    def __init__(self, api_key: str):
-        super().__init__(api_key, "https://distribution-xml.booking.com/json/bookings")
+    name = "booking.com"
     
-    def search_hotels(self, location: str, check_in: datetime, check_out: datetime,
-                     guests: int, rooms: int, **filters) -> List[Dict[str, Any]]:
+    def __init__(self, api_key: str, base_url: Optional[str] = None,
+                 http: Optional[OutboundHTTP] = None, timeout: Optional[float] = None):
+        super().__init__(api_key, base_url or "https://distribution-xml.booking.com/json/bookings", http, timeout)
+    
+    async def search_hotels(self, location: str, check_in: date, check_out: date,
+                            guests: int, rooms: int, **filters) -> List[Dict[str, Any]]:
         """Search hotels via Booking.com API"""
-        try:
-            # Mock search - would make actual API call
-            mock_results = [
-                {
-                    "hotel_id": "booking_hotel_1",
-                    "name": "Grand Plaza Hotel",
-                    "location": location,
-                    "price": 199.99,
-                    "currency": "USD",
-                    "rating": 4.5,
-                    "amenities": ["wifi", "pool", "gym"],
-                    "supplier": "booking.com"
-                },
-                {
-                    "hotel_id": "booking_hotel_2", 
-                    "name": "City Center Inn",
-                    "location": location,
-                    "price": 129.99,
-                    "currency": "USD",
-                    "rating": 4.2,
-                    "amenities": ["wifi", "breakfast"],
-                    "supplier": "booking.com"
-                }
-            ]
-            
-            logger.info(f"Found {len(mock_results)} hotels from Booking.com")
-            return mock_results
-            
-        except Exception as e:
-            logger.error(f"Booking.com search failed: {e}")
-            return []
+        raw = await self._make_request("hotels", params={
+            "location": location, "check_in": check_in.isoformat(), "check_out": check_out.isoformat(),
+            "guests": guests, "rooms": rooms, **filters
+        })
+        hotels = [self._transform_response(hotel) for hotel in raw.get("hotels", [])]
+        logger.info(f"Found {len(hotels)} hotels from Booking.com")
+        return hotels
     
-    def get_hotel_details(self, hotel_id: str) -> Dict[str, Any]:
+    async def get_hotel_details(self, hotel_id: str) -> Dict[str, Any]:
         """Get hotel details from Booking.com"""
-        return {
-            "hotel_id": hotel_id,
-            "detailed_description": "Luxury hotel in prime location",
-            "facilities": ["Restaurant", "Bar", "Spa", "Business Center"],
-            "policies": {
-                "check_in": "15:00",
-                "check_out": "11:00",
-                "cancellation": "Free cancellation until 24h before arrival"
-            }
-        }
+        return await self._make_request(f"hotels/{hotel_id}")
     
-    def check_availability(self, hotel_id: str, check_in: datetime,
-                          check_out: datetime, rooms: int) -> Dict[str, Any]:
+    async def check_availability(self, hotel_id: str, check_in: date,
+                                 check_out: date, rooms: int) -> Dict[str, Any]:
         """Check availability via Booking.com"""
-        return {
-            "available": True,
-            "rooms_available": 5,
-            "price": 199.99,
-            "currency": "USD"
-        }
+        return await self._make_request(f"hotels/{hotel_id}/availability", params={
+            "check_in": check_in.isoformat(), "check_out": check_out.isoformat(), "rooms": rooms
+        })
     
-    def create_booking(self, hotel_id: str, guest_info: Dict[str, Any],
-                      booking_details: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_booking(self, hotel_id: str, guest_info: Dict[str, Any],
+                             booking_details: Dict[str, Any]) -> Dict[str, Any]:
         """Create booking via Booking.com"""
-        return {
-            "booking_id": f"booking_com_{hash(hotel_id)}",
-            "confirmation_number": "BC123456789",
-            "status": "confirmed"
-        }
+        return await self._make_request("bookings", method="POST", data={
+            "hotel_id": hotel_id, "guest": guest_info, "details": booking_details
+        })
     
-    def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
+    async def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
         """Cancel booking via Booking.com"""
-        return {
-            "booking_id": booking_id,
-            "status": "cancelled",
-            "refund_amount": 199.99
-        }
\ No newline at end of file
+        return await self._make_request(f"bookings/{booking_id}/cancel", method="POST")
@@ -1,54 +1,50 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
-from datetime import datetime
+from datetime import date
+from app.external.supplier_base import SupplierAPIBase
 
 
-class HotelAPIBase(ABC):
+class HotelAPIBase(SupplierAPIBase, ABC):
     """Base class for hotel supplier API integrations"""
     
-    def __init__(self, api_key: str, base_url: str):
-        self.api_key = api_key
-        self.base_url = base_url
-    
     @abstractmethod
-    def search_hotels(self, location: str, check_in: datetime, check_out: datetime, 
-                     guests: int, rooms: int, **filters) -> List[Dict[str, Any]]:
-        """Search for hotels"""
+    async def search_hotels(self, location: str, check_in: date, check_out: date,
+                            guests: int, rooms: int, **filters) -> List[Dict[str, Any]]:
+        """Search for hotels, in the standard format of ``_transform_response``"""
         pass
     
     @abstractmethod
-    def get_hotel_details(self, hotel_id: str) -> Dict[str, Any]:
+    async def get_hotel_details(self, hotel_id: str) -> Dict[str, Any]:
         """Get detailed hotel information"""
         pass
     
     @abstractmethod
-    def check_availability(self, hotel_id: str, check_in: datetime, 
-                          check_out: datetime, rooms: int) -> Dict[str, Any]:
+    async def check_availability(self, hotel_id: str, check_in: date,
+                                 check_out: date, rooms: int) -> Dict[str, Any]:
         """Check hotel availability"""
         pass
     
     @abstractmethod
-    def create_booking(self, hotel_id: str, guest_info: Dict[str, Any], 
-                      booking_details: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_booking(self, hotel_id: str, guest_info: Dict[str, Any],
+                             booking_details: Dict[str, Any]) -> Dict[str, Any]:
         """Create hotel booking"""
         pass
     
     @abstractmethod
-    def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
+    async def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
         """Cancel hotel booking"""
         pass
     
-    def _make_request(self, endpoint: str, method: str = "GET", 
-                     data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Make HTTP request to API"""
-        # Mock implementation - would use httpx or requests
-        return {"status": "success", "data": {}}
-    
-    def _handle_rate_limit(self):
-        """Handle API rate limiting"""
-        # Implementation for rate limiting
-        pass
-    
     def _transform_response(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Transform API response to standard format"""
-        return raw_data
\ No newline at end of file
+        """Transform a supplier hotel to the standard format"""
+        return {
+            "supplier": self.name,
+            "supplier_id": str(raw_data.get("hotel_id") or raw_data.get("id")),
+            "name": raw_data.get("name"),
+            "location": raw_data.get("location"),
+            "price": raw_data.get("price"),
+            "currency": (raw_data.get("currency") or "USD").upper(),
+            "rating": raw_data.get("rating"),
+            "amenities": raw_data.get("amenities") or [],
+            "image_url": raw_data.get("image_url"),
+        }
@@ -0,0 +1,38 @@
+from typing import Any, Dict, Optional
+
+from app.core.http_client import OutboundHTTP, outbound_http
+
+
+class SupplierAPIBase:
+    """HTTP plumbing shared by hotel and car supplier adapters.
+
+    Adapters are async and call out through the shared outbound client,
+    under the upstream named after the supplier, which applies its rate
+    limit, retries and circuit breaker.
+    """
+    
+    name = "supplier"
+    
+    def __init__(self, api_key: str, base_url: str, http: Optional[OutboundHTTP] = None,
+                 timeout: Optional[float] = None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        # Per-supplier search deadline in seconds; None uses the aggregator default
+        self.timeout = timeout
+        self.http = http or outbound_http
+    
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}", "Accept": "application/json"}
+    
+    async def _make_request(self, endpoint: str, method: str = "GET", params: Dict[str, Any] = None,
+                            data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Call the supplier API and return its JSON body.
+
+        Raises httpx.HTTPError, or CircuitOpenError while the supplier is failing.
+        """
+        response = await self.http.request(
+            method, f"{self.base_url}/{endpoint.lstrip('/')}", upstream=self.name,
+            params=params, json=data, headers=self._headers()
+        )
+        response.raise_for_status()
+        return response.json()
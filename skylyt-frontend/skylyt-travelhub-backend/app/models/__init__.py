@@ -14,6 +14,7 @@ from .currency import Currency
 from .state import State
 from .city import City
 from .hotel_image import HotelImage
+from .room_inventory import RoomInventory
 from .car_image import CarImage
 from .driver import Driver
 from .footer_settings import FooterSettings
@@ -37,6 +38,7 @@ __all__ = [
     "State",
     "City",
     "HotelImage",
+    "RoomInventory",
     "CarImage",
     "Driver",
     "FooterSettings",
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, DateTime, JSON, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
 import enum
 from .base import BaseModel
 
@@ -30,7 +30,9 @@ class Booking(BaseModel):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     booking_reference = Column(String(50), unique=True, nullable=False)
     booking_type = Column(String(20), nullable=False)
-    status = Column(String(20), default="pending", nullable=False)
+    # active_history loads the previous status on change, so flush hooks can
+    # tell a cancellation from an edit of an already cancelled booking
+    status = column_property(Column(String(20), default="pending", nullable=False), active_history=True)
     
     # Customer details
     customer_name = Column(String(255), nullable=False)
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Integer, Float, JSON, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, JSON, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.utils.geo import track_geohash
 from datetime import datetime
 import uuid
 
@@ -28,6 +29,10 @@ class Car(Base):
     images = Column(JSON, nullable=True)
     supplier = Column(String, nullable=True)
     location = Column(String, nullable=True)
+    # Pickup coordinates for radius and map searches; geohash is derived on flush
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
     description = Column(String, nullable=True)
     rating = Column(Float, nullable=True)
     mileage_policy = Column(String, nullable=True)
@@ -49,6 +54,13 @@ class Car(Base):
     # Relationships
     maintenance_records = relationship("CarMaintenance", back_populates="car")
     car_images = relationship("CarImage", back_populates="car", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index('idx_cars_geohash', 'geohash'),
+    )
+
+
+track_geohash(Car)
 
 
 class CarMaintenance(Base):
@@ -1,5 +1,6 @@
 from sqlalchemy import Column, String, Float, JSON, Text, Integer, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from app.utils.geo import track_geohash
 from .base import BaseModel
 
 
@@ -19,6 +20,11 @@ class Hotel(BaseModel):
     is_available = Column(Boolean, default=True, nullable=False)
     is_featured = Column(Boolean, default=False, nullable=False)
     
+    # Coordinates for radius and map searches; geohash is derived on flush
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
+    
     # Location relationships
     state_id = Column(Integer, ForeignKey("states.id"), nullable=True)
     city_id = Column(Integer, ForeignKey("cities.id"), nullable=True)
@@ -31,5 +37,9 @@ class Hotel(BaseModel):
     __table_args__ = (
         Index('idx_hotel_state', 'state_id'),
         Index('idx_hotel_city', 'city_id'),
+        Index('idx_hotels_geohash', 'geohash'),
         {"extend_existing": True}
-    )
\ No newline at end of file
+    )
+
+
+track_geohash(Hotel)
\ No newline at end of file
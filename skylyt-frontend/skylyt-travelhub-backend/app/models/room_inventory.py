@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Integer, Date, ForeignKey, Index, UniqueConstraint, CheckConstraint
+from .base import BaseModel
+
+
+class RoomInventory(BaseModel):
+    """Rooms of one type sold on one night.
+
+    Rows are created on a night's first booking with the hotel's allotment
+    for the room type; nights without a row have every room free.
+    """
+    __tablename__ = "room_inventory"
+    
+    hotel_id = Column(Integer, ForeignKey("hotels.id", ondelete="CASCADE"), nullable=False)
+    room_type = Column(String(50), nullable=False)
+    night = Column(Date, nullable=False)
+    total_rooms = Column(Integer, nullable=False)
+    booked_rooms = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('hotel_id', 'room_type', 'night', name='uq_room_inventory_night'),
+        CheckConstraint('booked_rooms >= 0 AND booked_rooms <= total_rooms', name='ck_room_inventory_booked'),
+        Index('idx_room_inventory_night', 'night'),
+    )
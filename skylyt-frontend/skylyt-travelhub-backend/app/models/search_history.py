@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -11,5 +11,10 @@ class SearchHistory(BaseModel):
     search_params = Column(JSON, nullable=False)
     results_count = Column(Integer, default=0)
     
+    __table_args__ = (
+        # Recent searches of a user, newest first
+        Index('idx_search_history_user_created', 'user_id', 'created_at'),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="search_history")
\ No newline at end of file
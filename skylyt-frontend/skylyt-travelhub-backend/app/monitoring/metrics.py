@@ -4,10 +4,12 @@ except ImportError:
     # Mock prometheus client for development
     class Counter:
         def __init__(self, *args, **kwargs): pass
+        def labels(self, *args, **kwargs): return self
         def inc(self, *args, **kwargs): pass
     
     class Histogram:
         def __init__(self, *args, **kwargs): pass
+        def labels(self, *args, **kwargs): return self
         def observe(self, *args, **kwargs): pass
     
     class Gauge:
@@ -54,6 +56,13 @@ SEARCH_COUNT = Counter(
     ['search_type']
 )
 
+CACHE_STALE_AGE = Histogram(
+    'cache_stale_age_seconds',
+    'Age of stale cache entries served while revalidating',
+    ['cache'],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+)
+
 ERROR_COUNT = Counter(
     'errors_total',
     'Total errors',
@@ -95,6 +104,10 @@ class MetricsCollector:
         """Record search metrics"""
         SEARCH_COUNT.labels(search_type=search_type).inc()
     
+    def record_cache_staleness(self, cache_name: str, age: float):
+        """Record the age of a stale cache entry served to a client"""
+        CACHE_STALE_AGE.labels(cache=cache_name).observe(age)
+    
     def record_error(self, error_type: str, endpoint: str):
         """Record error metrics"""
         ERROR_COUNT.labels(
@@ -3,7 +3,6 @@ from sqlalchemy import func, extract, and_
 from datetime import datetime, timedelta
 from typing import Dict, Any
 from app.models.user import User
-from app.utils.cache_manager import cache_result
 try:
     from app.models.booking import Booking
 except ImportError:
@@ -92,7 +91,6 @@ class AnalyticsService:
         }
     
     @staticmethod
-    @cache_result("admin_stats", ttl=300)
     def get_admin_stats(db: Session) -> Dict[str, Any]:
         """Get admin dashboard statistics"""
         
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_
 from typing import List, Dict, Optional, Any
 from datetime import datetime, date
+from decimal import ROUND_HALF_UP, Decimal
 import uuid
 import json
 
@@ -10,7 +11,13 @@ from app.models.user import User
 from app.models.hotel import Hotel
 from app.models.car import Car
 from app.services.email_service import EmailService
+from app.core.config import settings
 from app.core.database import get_db
+from app.utils.pagination import paginate
+from app.utils.text_search import contains, is_relevance_sort, relevance, search_mode
+
+
+CENT = Decimal("0.01")
 
 
 class BookingService:
@@ -18,6 +25,24 @@ class BookingService:
         self.db = db
         self.email_service = EmailService()
 
+    @staticmethod
+    def calculate_bundle_savings(hotel_price: Decimal, car_price: Decimal) -> Dict[str, Decimal]:
+        """Price a hotel + car bundle from the two individual prices.
+
+        The discount is BUNDLE_DISCOUNT_PERCENT of the combined price,
+        rounded half up to cents; BundleService.top_bundles applies the
+        same rule in integer cents and must stay in step with it.
+        """
+        individual_total = (Decimal(hotel_price) + Decimal(car_price)).quantize(CENT, rounding=ROUND_HALF_UP)
+        discount_percentage = Decimal(settings.BUNDLE_DISCOUNT_PERCENT)
+        savings = (individual_total * discount_percentage / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+        return {
+            "individual_total": individual_total,
+            "bundle_price": individual_total - savings,
+            "savings": savings,
+            "discount_percentage": discount_percentage
+        }
+
     def get_bookings_with_filters(
         self,
         search: Optional[str] = None,
@@ -29,21 +54,25 @@ class BookingService:
         sort_by: str = "created_at",
         sort_order: str = "desc",
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get bookings with advanced filtering, search, and pagination"""
+        """Get bookings with advanced filtering, search, and pagination.
+
+        ``cursor`` (the ``next_cursor`` of the previous page) takes
+        precedence over ``page``; raises InvalidCursor for a bad token.
+        ``count_mode`` overrides settings.PAGINATION_COUNT_MODE for the total.
+        """
         query = self.db.query(Booking)
+        search_columns = (
+            Booking.customer_name, Booking.customer_email, Booking.booking_reference,
+            Booking.hotel_name, Booking.car_name
+        )
         
-        # Search functionality
+        # Search functionality (trigram-indexed on PostgreSQL)
         if search:
-            search_filter = or_(
-                Booking.customer_name.ilike(f"%{search}%"),
-                Booking.customer_email.ilike(f"%{search}%"),
-                Booking.booking_reference.ilike(f"%{search}%"),
-                Booking.hotel_name.ilike(f"%{search}%"),
-                Booking.car_name.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
+            query = query.filter(contains(search_columns, search))
         
         # Status filters
         if status:
@@ -59,25 +88,22 @@ class BookingService:
         if end_date:
             query = query.filter(Booking.end_date <= end_date)
         
-        # Sorting
-        sort_column = getattr(Booking, sort_by, Booking.created_at)
-        if sort_order.lower() == "desc":
-            query = query.order_by(desc(sort_column))
+        # Sorting; "relevance" ranks by how well the search matches
+        if search and is_relevance_sort(sort_by):
+            sort_column = relevance(search_columns, search, search_mode(self.db))
         else:
-            query = query.order_by(asc(sort_column))
+            sort_column = getattr(Booking, sort_by, Booking.created_at)
+        # created_at then id break ties so every row has one stable position
+        descending = sort_order.lower() == "desc"
+        order = [(sort_column, descending), (Booking.created_at, True), (Booking.id, True)]
+        if sort_column is Booking.created_at:
+            order = [(Booking.created_at, descending), (Booking.id, descending)]
         
         # Pagination
-        total = query.count()
-        offset = (page - 1) * per_page
-        bookings = query.offset(offset).limit(per_page).all()
-        
-        return {
-            "bookings": [self._serialize_booking(booking) for booking in bookings],
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
-        }
+        result = paginate(query, order, per_page, cursor=cursor, page=page, count_mode=count_mode)
+        return result.as_response(
+            "bookings", [self._serialize_booking(booking) for booking in result.items]
+        )
 
     def get_booking_details(self, booking_id: int) -> Optional[Dict[str, Any]]:
         """Get detailed booking information with related data"""
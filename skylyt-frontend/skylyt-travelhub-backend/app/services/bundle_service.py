@@ -0,0 +1,108 @@
+import asyncio
+import heapq
+import math
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, List, Sequence, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import run_in_session
+from app.schemas.car import CarSearchRequest
+from app.schemas.hotel import HotelSearchRequest
+from app.services.booking_service import BookingService
+from app.services.car_service import CarService
+from app.services.currency_service import CurrencyService
+from app.services.hotel_service import HotelService
+
+SORT_SAVINGS = "savings"
+SORT_PRICE = "price"
+SORT_OPTIONS = (SORT_SAVINGS, SORT_PRICE)
+
+
+def load_hotel_candidates(db: Session, search: HotelSearchRequest, currency: str) -> List[Dict[str, Any]]:
+    """Cheapest matching hotels, priced in currency (called from the threadpool)"""
+    return _priced(db, HotelService.search_hotels(search, db)["hotels"], currency)
+
+
+def load_car_candidates(db: Session, search: CarSearchRequest, currency: str) -> List[Dict[str, Any]]:
+    """Cheapest matching cars, priced in currency (called from the threadpool)"""
+    return _priced(db, CarService.search_cars(search, db)["cars"], currency)
+
+
+def _priced(db: Session, items: List[Dict[str, Any]], currency: str) -> List[Dict[str, Any]]:
+    """Drop items without a usable price and convert the rest from NGN"""
+    items = [item for item in items if item["price"] is not None and math.isfinite(item["price"])]
+    prices = CurrencyService.convert_many([item["price"] for item in items], "NGN", currency, db)
+    return [dict(item, price=price, currency=currency) for item, price in zip(items, prices)]
+
+
+def stay_cents(prices: Sequence[float], units: int) -> List[int]:
+    """Price of units nights (or days) at each rate, in integer cents"""
+    return [
+        int((Decimal(str(price)) * units * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+        for price in prices
+    ]
+
+
+def top_bundles(hotel_cents: Sequence[int], car_cents: Sequence[int], limit: int, sort_by: str) -> List[Tuple[int, int]]:
+    """(hotel, car) index pairs of the best limit bundles, best first.
+
+    Every pair is scored column-wise over flat lists of integer cents
+    (the BookingService.calculate_bundle_savings rule, half-up to the
+    cent), then a heap keeps the top limit without sorting all pairs.
+    Ties keep hotel-then-car candidate order.
+    """
+    if not hotel_cents or not car_cents or limit <= 0:
+        return []
+    percent = settings.BUNDLE_DISCOUNT_PERCENT
+    totals = [hotel + car for hotel in hotel_cents for car in car_cents]
+    savings = [(total * percent + 50) // 100 for total in totals]
+    if sort_by == SORT_PRICE:
+        prices = [total - saved for total, saved in zip(totals, savings)]
+        best = heapq.nsmallest(limit, range(len(prices)), key=prices.__getitem__)
+    else:
+        best = heapq.nlargest(limit, range(len(savings)), key=savings.__getitem__)
+    return [divmod(index, len(car_cents)) for index in best]
+
+
+class BundleService:
+
+    @staticmethod
+    async def search_bundles(
+        hotel_search: HotelSearchRequest,
+        car_search: CarSearchRequest,
+        nights: int,
+        currency: str,
+        sort_by: str = SORT_SAVINGS,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Best hotel + car bundles for a stay of nights.
+
+        The hotel and car searches run concurrently, each in its own
+        session. Bundles are priced for the whole stay: the hotel for
+        every night and room, the car for every day. Raises ValueError
+        for an unknown currency.
+        """
+        hotels, cars = await asyncio.gather(
+            run_in_threadpool(run_in_session, load_hotel_candidates, hotel_search, currency),
+            run_in_threadpool(run_in_session, load_car_candidates, car_search, currency)
+        )
+        hotel_cents = stay_cents([hotel["price"] for hotel in hotels], nights * hotel_search.rooms)
+        car_cents = stay_cents([car["price"] for car in cars], nights)
+
+        bundles = []
+        for hotel_index, car_index in top_bundles(hotel_cents, car_cents, limit, sort_by):
+            savings = BookingService.calculate_bundle_savings(
+                Decimal(hotel_cents[hotel_index]) / 100, Decimal(car_cents[car_index]) / 100
+            )
+            bundles.append({
+                "hotel": hotels[hotel_index],
+                "car": cars[car_index],
+                "individual_total": float(savings["individual_total"]),
+                "bundle_price": float(savings["bundle_price"]),
+                "savings": float(savings["savings"]),
+                "discount_percentage": float(savings["discount_percentage"])
+            })
+        return bundles
@@ -1,103 +1,72 @@
-from typing import Optional, Any
-import json
+from typing import Optional, Any, Awaitable, Callable, Sequence
 import logging
-from app.core.redis import cache_set, cache_get, cache_delete
+from app.core.config import settings
+from app.utils.cache import cache_manager, CacheEntry, search_tags
+from app.utils.cache_keys import build_cache_key
+from app.utils.response_cache import encoded
 
 logger = logging.getLogger(__name__)
 
 class CacheService:
     """Service for caching frequently accessed data"""
-    
-    @staticmethod
-    def cache_hotel_search(search_params: dict, results: list, ttl: int = 300) -> bool:
-        """Cache hotel search results"""
-        try:
-            cache_key = f"hotel_search:{hash(str(sorted(search_params.items())))}"
-            return cache_set(cache_key, json.dumps(results), ex=ttl)
-        except Exception as e:
-            logger.warning(f"Failed to cache hotel search: {e}")
-            return False
-    
-    @staticmethod
-    def get_cached_hotel_search(search_params: dict) -> Optional[list]:
-        """Get cached hotel search results"""
-        try:
-            cache_key = f"hotel_search:{hash(str(sorted(search_params.items())))}"
-            cached = cache_get(cache_key)
-            return json.loads(cached) if cached else None
-        except Exception as e:
-            logger.warning(f"Failed to get cached hotel search: {e}")
-            return None
-    
+
     @staticmethod
-    def cache_car_search(search_params: dict, results: list, ttl: int = 300) -> bool:
-        """Cache car search results"""
-        try:
-            cache_key = f"car_search:{hash(str(sorted(search_params.items())))}"
-            return cache_set(cache_key, json.dumps(results), ex=ttl)
-        except Exception as e:
-            logger.warning(f"Failed to cache car search: {e}")
-            return False
-    
+    async def get_or_compute_hotel_search(
+        search_params: dict,
+        compute: Callable[[], Awaitable[dict]],
+        ttl: int = settings.CACHE_SEARCH_TTL,
+        soft_ttl: int = settings.CACHE_SEARCH_SOFT_TTL
+    ) -> CacheEntry:
+        """Get the cached hotel search response, running one search per key on a miss.
+
+        Results are stored as encoded response bytes (``CachedResponse``).
+        Results older than soft_ttl are served stale while they refresh.
+        """
+        cache_key = build_cache_key("hotel_search", search_params)
+        return await cache_manager.get_or_compute_entry(
+            cache_key, encoded(compute), ttl, soft_ttl, tags=search_tags("hotel")
+        )
+
     @staticmethod
-    def get_cached_car_search(search_params: dict) -> Optional[list]:
-        """Get cached car search results"""
-        try:
-            cache_key = f"car_search:{hash(str(sorted(search_params.items())))}"
-            cached = cache_get(cache_key)
-            return json.loads(cached) if cached else None
-        except Exception as e:
-            logger.warning(f"Failed to get cached car search: {e}")
-            return None
-    
+    async def get_or_compute_car_search(
+        search_params: dict,
+        compute: Callable[[], Awaitable[dict]],
+        ttl: int = settings.CACHE_SEARCH_TTL,
+        soft_ttl: int = settings.CACHE_SEARCH_SOFT_TTL,
+        tags: Sequence[str] = ()
+    ) -> CacheEntry:
+        """Get the cached car search response, running one search per key on a miss.
+
+        Results are stored as encoded response bytes (``CachedResponse``).
+        Results older than soft_ttl are served stale while they refresh.
+        ``tags`` are added to the search tags.
+        """
+        cache_key = build_cache_key("car_search", search_params)
+        return await cache_manager.get_or_compute_entry(
+            cache_key, encoded(compute), ttl, soft_ttl, tags=search_tags("car") + list(tags)
+        )
+
     @staticmethod
-    def cache_user_session(user_id: int, session_data: dict, ttl: int = 3600) -> bool:
+    async def cache_user_session(user_id: int, session_data: dict, ttl: int = 3600) -> bool:
         """Cache user session data"""
-        try:
-            cache_key = f"user_session:{user_id}"
-            return cache_set(cache_key, json.dumps(session_data), ex=ttl)
-        except Exception as e:
-            logger.warning(f"Failed to cache user session: {e}")
-            return False
-    
+        return await cache_manager.set(f"user_session:{user_id}", session_data, ttl)
+
     @staticmethod
-    def get_cached_user_session(user_id: int) -> Optional[dict]:
+    async def get_cached_user_session(user_id: int) -> Optional[dict]:
         """Get cached user session data"""
-        try:
-            cache_key = f"user_session:{user_id}"
-            cached = cache_get(cache_key)
-            return json.loads(cached) if cached else None
-        except Exception as e:
-            logger.warning(f"Failed to get cached user session: {e}")
-            return None
-    
+        return await cache_manager.get(f"user_session:{user_id}")
+
     @staticmethod
-    def invalidate_user_session(user_id: int) -> bool:
+    async def invalidate_user_session(user_id: int) -> bool:
         """Invalidate user session cache"""
-        try:
-            cache_key = f"user_session:{user_id}"
-            return cache_delete(cache_key)
-        except Exception as e:
-            logger.warning(f"Failed to invalidate user session: {e}")
-            return False
-    
+        return await cache_manager.delete(f"user_session:{user_id}")
+
     @staticmethod
-    def cache_currency_rates(rates: dict, ttl: int = 3600) -> bool:
+    async def cache_currency_rates(rates: dict, ttl: int = 3600) -> bool:
         """Cache currency exchange rates"""
-        try:
-            cache_key = "currency_rates"
-            return cache_set(cache_key, json.dumps(rates), ex=ttl)
-        except Exception as e:
-            logger.warning(f"Failed to cache currency rates: {e}")
-            return False
-    
+        return await cache_manager.set("currency_rates", rates, ttl)
+
     @staticmethod
-    def get_cached_currency_rates() -> Optional[dict]:
+    async def get_cached_currency_rates() -> Optional[dict]:
         """Get cached currency rates"""
-        try:
-            cache_key = "currency_rates"
-            cached = cache_get(cache_key)
-            return json.loads(cached) if cached else None
-        except Exception as e:
-            logger.warning(f"Failed to get cached currency rates: {e}")
-            return None
\ No newline at end of file
+        return await cache_manager.get("currency_rates")
@@ -0,0 +1,222 @@
+import bisect
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking
+from app.services.index_sync import SyncedIndex
+
+PENDING_KEY = "car_availability_changes"
+BROADCAST_FIELD = "car_availability"
+# Cached car searches filtered by dates carry this tag; booking commits drop it
+AVAILABILITY_TAG = "car_availability"
+# Bookings in these states no longer hold their car
+RELEASED_STATUSES = ("cancelled", "completed")
+
+
+class Reservation(NamedTuple):
+    """One booking holding a car from start (inclusive) to end (exclusive)"""
+    booking_id: int
+    car_id: str
+    start: datetime
+    end: datetime
+
+
+class CarSchedule(NamedTuple):
+    """A car's reservations sorted by start, with the running maximum of their ends.
+
+    A window overlaps some reservation exactly when one of the reservations
+    starting before the window ends also ends after it starts, i.e. when the
+    running maximum end at that position is past the window start: one
+    bisect per car.
+    """
+    starts: Tuple[datetime, ...]
+    max_ends: Tuple[datetime, ...]
+
+    @classmethod
+    def of(cls, reservations: Iterable[Reservation]) -> "CarSchedule":
+        ordered = sorted(reservations, key=lambda r: (r.start, r.end))
+        max_ends, latest = [], None
+        for reservation in ordered:
+            latest = reservation.end if latest is None else max(latest, reservation.end)
+            max_ends.append(latest)
+        return cls(tuple(r.start for r in ordered), tuple(max_ends))
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        before_end = bisect.bisect_left(self.starts, end)
+        return before_end > 0 and self.max_ends[before_end - 1] > start
+
+
+def parse_window(start: Any, end: Any) -> Tuple[datetime, datetime]:
+    """A pickup to return window; dates mean midnight and a same-day rental lasts one day.
+
+    Raises ValueError for unparseable dates or a return before pickup.
+    """
+    def moment(value: Any) -> datetime:
+        if isinstance(value, datetime):
+            return value.replace(tzinfo=None)
+        if isinstance(value, date):
+            return datetime.combine(value, datetime.min.time())
+        try:
+            return datetime.fromisoformat(str(value).strip().replace("Z", "+00:00")).replace(tzinfo=None)
+        except ValueError:
+            raise ValueError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+
+    start, end = moment(start), moment(end)
+    if end < start:
+        raise ValueError("return_date must not be before pickup_date")
+    return start, max(end, start + timedelta(days=1))
+
+
+def booking_car_id(booking_type: Optional[str], data: Any) -> Optional[str]:
+    """The car a booking holds: booking_data item_id for car bookings, or car.id"""
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return None
+    if not isinstance(data, dict):
+        return None
+    car = data.get("car") if isinstance(data.get("car"), dict) else {}
+    car_id = (data.get("item_id") if booking_type == "car" else None) or car.get("id")
+    return str(car_id) if car_id not in (None, "") else None
+
+
+def reservation_from_row(row) -> Optional[Reservation]:
+    """The reservation of a booking row, None when it holds no car"""
+    booking_id, booking_type, status, start, end, data = row
+    if status in RELEASED_STATUSES or start is None or end is None:
+        return None
+    car_id = booking_car_id(booking_type, data)
+    if car_id is None:
+        return None
+    try:
+        start, end = parse_window(start, end)
+    except ValueError:
+        # A return before pickup holds nothing
+        return None
+    return Reservation(booking_id, car_id, start, end)
+
+
+def _booking_rows(db: Session):
+    return db.query(
+        Booking.id, Booking.booking_type, Booking.status, Booking.start_date, Booking.end_date, Booking.booking_data
+    )
+
+
+def load_reservations(db: Session, ids: Optional[Iterable[int]] = None) -> List[Reservation]:
+    """Reservations of the given bookings, or of every booking not yet over"""
+    query = _booking_rows(db)
+    if ids is not None:
+        query = query.filter(Booking.id.in_(list(ids)))
+    else:
+        query = query.filter(Booking.end_date > datetime.utcnow() - timedelta(days=1))
+    return [r for r in map(reservation_from_row, query.all()) if r is not None]
+
+
+def load_busy_cars(db: Session, start: datetime, end: datetime) -> Set[str]:
+    """Cars reserved at some point in [start, end), in one query (used until the index is built)"""
+    rows = _booking_rows(db).filter(
+        Booking.start_date < end, Booking.end_date > start - timedelta(days=1),
+        Booking.status.notin_(RELEASED_STATUSES)
+    ).all()
+    return {
+        r.car_id for r in map(reservation_from_row, rows)
+        if r is not None and r.start < end and r.end > start
+    }
+
+
+class CarAvailabilityIndex(SyncedIndex):
+    """In-memory car reservations for bulk availability checks.
+
+    Each car's reservations are kept as a CarSchedule, so "which of these
+    cars are free between two dates" costs one bisect per car. It is only
+    mutated on the event loop, and schedules are replaced rather than
+    modified, so worker threads may read it too. Bookings are patched in
+    as they commit, on every worker, through the cache broadcast channel.
+    """
+
+    label = "Car availability index"
+    broadcast_field = BROADCAST_FIELD
+    # Date-filtered car searches go stale with every booking change
+    invalidates = (AVAILABILITY_TAG,)
+
+    def __init__(self):
+        super().__init__()
+        self._reservations: Dict[int, Reservation] = {}
+        self._by_car: Dict[str, Dict[int, Reservation]] = {}
+        self._schedules: Dict[str, CarSchedule] = {}
+
+    def __len__(self) -> int:
+        return len(self._reservations)
+
+    def load(self, db: Session, ids: Optional[Iterable[int]] = None) -> List[Reservation]:
+        return load_reservations(db, ids)
+
+    def key_of(self, reservation: Reservation) -> int:
+        return reservation.booking_id
+
+    def changed_key(self, booking: Booking) -> Optional[int]:
+        # Hotel bookings are skipped unless they name a car (bundles)
+        if booking.booking_type != "hotel" or booking_car_id(booking.booking_type, booking.booking_data) is not None:
+            return booking.id
+        return None
+
+    def build(self, reservations: Iterable[Reservation]):
+        self._reservations = {r.booking_id: r for r in reservations}
+        by_car: Dict[str, Dict[int, Reservation]] = {}
+        for r in self._reservations.values():
+            by_car.setdefault(r.car_id, {})[r.booking_id] = r
+        self._by_car = by_car
+        self._schedules = {car_id: CarSchedule.of(held.values()) for car_id, held in by_car.items()}
+        self.ready = True
+
+    def _reschedule(self, car_id: str):
+        held = self._by_car.get(car_id)
+        if held:
+            self._schedules[car_id] = CarSchedule.of(held.values())
+        else:
+            self._by_car.pop(car_id, None)
+            self._schedules.pop(car_id, None)
+
+    def upsert(self, reservation: Reservation):
+        self.remove(reservation.booking_id)
+        self._reservations[reservation.booking_id] = reservation
+        self._by_car.setdefault(reservation.car_id, {})[reservation.booking_id] = reservation
+        self._reschedule(reservation.car_id)
+
+    def remove(self, booking_id: int):
+        old = self._reservations.pop(booking_id, None)
+        if old is not None:
+            self._by_car.get(old.car_id, {}).pop(booking_id, None)
+            self._reschedule(old.car_id)
+
+    def is_free(self, car_id: str, start: datetime, end: datetime) -> bool:
+        schedule = self._schedules.get(car_id)
+        return schedule is None or not schedule.overlaps(start, end)
+
+    def free(self, car_ids: Iterable[str], start: datetime, end: datetime) -> List[str]:
+        """The given cars with no reservation in [start, end), in order"""
+        schedules = self._schedules
+        return [
+            car_id for car_id in car_ids
+            if car_id not in schedules or not schedules[car_id].overlaps(start, end)
+        ]
+
+    def busy(self, start: datetime, end: datetime) -> Set[str]:
+        """Every car reserved at some point in [start, end)"""
+        # list() copies the items in one step, so a concurrent patch cannot break iteration
+        return {car_id for car_id, schedule in list(self._schedules.items()) if schedule.overlaps(start, end)}
+
+
+car_availability_index = CarAvailabilityIndex()
+car_availability_index.track((Booking,), PENDING_KEY)
+
+
+def busy_cars(db: Session, start: datetime, end: datetime) -> Set[str]:
+    """Cars reserved at some point in [start, end); SQL until the index is built"""
+    if car_availability_index.ready:
+        return car_availability_index.busy(start, end)
+    return load_busy_cars(db, start, end)
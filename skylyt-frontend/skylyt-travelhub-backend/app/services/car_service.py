@@ -4,7 +4,8 @@ from sqlalchemy import and_, or_
 from app.models.car import Car
 from app.schemas.car import CarSearchRequest, CarResponse
 from app.schemas.search import SearchResponse
-from app.utils.cache_manager import cache_manager, cache_result
+from app.services.car_availability import busy_cars, car_availability_index, load_busy_cars, parse_window
+from app.utils.text_search import contains
 from decimal import Decimal
 
 
@@ -23,6 +24,15 @@ class CarService:
             filters.append(Car.price_per_day >= search_request.min_price)
         if search_request.max_price:
             filters.append(Car.price_per_day <= search_request.max_price)
+        # City and country are both part of the free-text location
+        if search_request.pickup_location.city:
+            filters.append(contains([Car.location], search_request.pickup_location.city))
+        if search_request.pickup_location.country:
+            filters.append(contains([Car.location], search_request.pickup_location.country))
+        # Only cars free for the whole rental
+        busy = busy_cars(db, *parse_window(search_request.dates.start_date, search_request.dates.end_date))
+        if busy:
+            filters.append(Car.id.notin_(sorted(busy)))
         
         # Single query with all filters
         query = db.query(Car).filter(and_(*filters))
@@ -30,9 +40,9 @@ class CarService:
         # Get total count efficiently
         total = query.count()
         
-        # Pagination with optimized query
+        # Pagination, cheapest first with a stable tie-breaker
         offset = (search_request.pagination.page - 1) * search_request.pagination.limit
-        cars = query.order_by(Car.price_per_day).offset(offset).limit(search_request.pagination.limit).all()
+        cars = query.order_by(Car.price_per_day, Car.id).offset(offset).limit(search_request.pagination.limit).all()
         
         # Optimized list comprehension
         car_list = [{
@@ -43,7 +53,7 @@ class CarService:
             "image_url": car.images[0] if car.images else "/placeholder.svg",
             "passengers": car.seats,
             "transmission": car.transmission,
-            "features": [f["name"] for f in car.features] if car.features else []
+            "features": car.features or []
         } for car in cars]
         
         return {
@@ -63,8 +73,18 @@ class CarService:
         }
     
     @staticmethod
-    def check_car_availability(car_id: str, pickup_date: str, return_date: str) -> bool:
-        return True
+    def check_car_availability(car_id: str, pickup_date: str, return_date: str, db: Session) -> bool:
+        """Whether the car has no reservation in the window (raises ValueError for bad dates)"""
+        return bool(CarService.free_cars([car_id], pickup_date, return_date, db))
+    
+    @staticmethod
+    def free_cars(car_ids: List[str], pickup_date: Any, return_date: Any, db: Session) -> List[str]:
+        """The given cars with no reservation in the window, in one call"""
+        start, end = parse_window(pickup_date, return_date)
+        if car_availability_index.ready:
+            return car_availability_index.free(car_ids, start, end)
+        busy = load_busy_cars(db, start, end)
+        return [car_id for car_id in car_ids if car_id not in busy]
     
     @staticmethod
     def calculate_car_pricing(car_id: str, pickup_date: str, return_date: str, insurance: str = None) -> Dict[str, Any]:
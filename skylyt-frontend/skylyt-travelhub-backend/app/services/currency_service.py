@@ -1,7 +1,7 @@
-from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy.orm import Session
 from app.models.currency import Currency
-from typing import Optional, Dict, List
+from app.services.fx_rates import RateSnapshot, get_rates
+from typing import Any, Optional, Dict, List, Sequence, Union
 
 
 class CurrencyService:
@@ -15,35 +15,26 @@ class CurrencyService:
         - rate_to_ngn represents: 1 foreign currency = X NGN
         - From foreign to NGN: multiply by rate_to_ngn
         - From NGN to foreign: divide by rate_to_ngn
-        """
-        if from_currency == to_currency:
-            return round(float(amount), 2)
-        
-        amount_decimal = Decimal(str(amount))
-        
-        # Convert to NGN first if not already
-        if from_currency != CurrencyService.BASE_CURRENCY:
-            from_rate = db.query(Currency).filter(
-                Currency.code == from_currency, 
-                Currency.is_active == True
-            ).first()
-            if not from_rate:
-                raise ValueError(f"Currency {from_currency} not found or inactive")
-            # Foreign to NGN: multiply by rate (1 USD = 1600 NGN, so 5 USD = 5 * 1600 NGN)
-            amount_decimal = amount_decimal * from_rate.rate_to_ngn
         
-        # Convert from NGN to target currency
-        if to_currency != CurrencyService.BASE_CURRENCY:
-            to_rate = db.query(Currency).filter(
-                Currency.code == to_currency, 
-                Currency.is_active == True
-            ).first()
-            if not to_rate:
-                raise ValueError(f"Currency {to_currency} not found or inactive")
-            # NGN to foreign: divide by rate (8000 NGN = 8000 / 1600 USD = 5 USD)
-            amount_decimal = amount_decimal / to_rate.rate_to_ngn
+        Rates come from the in-memory snapshot (app.services.fx_rates), so
+        this runs no queries once the snapshot is loaded.
+        """
+        return get_rates(db).convert(amount, from_currency, to_currency)
+    
+    @staticmethod
+    def convert_many(
+        amounts: Sequence[Any], from_currencies: Union[str, Sequence[str]], to_currency: str, db: Session
+    ) -> List[float]:
+        """Convert a batch of amounts with one rate snapshot.
         
-        return float(amount_decimal.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+        from_currencies is a single code or one code per amount.
+        """
+        return get_rates(db).convert_many(amounts, from_currencies, to_currency)
+    
+    @staticmethod
+    def get_rates(db: Session) -> RateSnapshot:
+        """The current exchange rate snapshot, for converting many rows"""
+        return get_rates(db)
     
     @staticmethod
     def get_active_currencies(db: Session) -> List[Currency]:
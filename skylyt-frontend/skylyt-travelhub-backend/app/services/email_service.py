@@ -1,10 +1,10 @@
 from typing import Dict, Any, List
 import logging
-import requests
 import html
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pathlib import Path
 from app.core.config import settings
+from app.core.http_client import outbound_http
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +36,8 @@ class EmailService:
             return False
             
         try:
-            response = requests.post(
-                f"{self.base_url}/emails",
+            response = outbound_http.request_sync(
+                "POST", f"{self.base_url}/emails", upstream="resend",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json"
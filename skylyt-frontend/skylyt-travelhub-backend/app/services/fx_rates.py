@@ -0,0 +1,119 @@
+import logging
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import repeat
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.currency import Currency
+from app.services.index_sync import SyncedSnapshot
+
+logger = logging.getLogger(__name__)
+
+BASE_CURRENCY = "NGN"
+CENT = Decimal("0.01")
+# Currency commits delete this cache key (see MODEL_KEYS in
+# app.utils.cache_invalidation) and every worker hears the deletion
+RATES_KEY = "currency_rates"
+PENDING_KEY = "fx_rates_changed"
+
+
+class RateSnapshot(NamedTuple):
+    """Exchange rates of the active currencies at one point in time.
+
+    ``rates`` maps a code to rate_to_ngn (1 unit = rate NGN). Snapshots
+    are never modified; a rate change installs a new one, so a listing
+    converts every row with the same rates.
+    """
+    version: int
+    loaded_at: float
+    rates: Mapping[str, Decimal]
+    symbols: Mapping[str, str]
+
+    @classmethod
+    def from_rows(cls, version: int, rows: Iterable[Tuple[str, Any, str]]) -> "RateSnapshot":
+        """Build from (code, rate_to_ngn, symbol) rows"""
+        rates: Dict[str, Decimal] = {}
+        symbols: Dict[str, str] = {}
+        for code, rate, symbol in rows:
+            rates[code] = Decimal(str(rate))
+            symbols[code] = symbol
+        return cls(version, time.monotonic(), MappingProxyType(rates), MappingProxyType(symbols))
+
+    def rate(self, code: str) -> Decimal:
+        if code == BASE_CURRENCY:
+            return Decimal(1)
+        rate = self.rates.get(code)
+        if rate is None:
+            raise ValueError(f"Currency {code} not found or inactive")
+        return rate
+
+    def factor(self, from_currency: str, to_currency: str) -> Decimal:
+        """Unrounded multiplier from from_currency amounts to to_currency"""
+        return self.rate(from_currency) / self.rate(to_currency)
+
+    def symbol(self, code: str) -> str:
+        """Display symbol, or the code itself for unknown currencies"""
+        return self.symbols.get(code, code)
+
+    def convert(self, amount: Any, from_currency: str, to_currency: str) -> float:
+        return self.convert_many([amount], from_currency, to_currency)[0]
+
+    def convert_many(
+        self,
+        amounts: Sequence[Any],
+        from_currencies: Union[str, Sequence[str]],
+        to_currency: str
+    ) -> List[float]:
+        """Convert a batch of amounts to to_currency, rounded to cents.
+
+        ``from_currencies`` is one code for all amounts or one per amount.
+        Arithmetic is in Decimal through NGN, exactly as
+        CurrencyService.convert_currency has always done it; raises
+        ValueError for an unknown or inactive currency.
+        """
+        if isinstance(from_currencies, str):
+            from_currencies = repeat(from_currencies)
+        to_rate = None
+        converted = []
+        for amount, from_currency in zip(amounts, from_currencies):
+            if from_currency == to_currency:
+                converted.append(round(float(amount), 2))
+                continue
+            value = Decimal(str(amount))
+            if from_currency != BASE_CURRENCY:
+                value = value * self.rate(from_currency)
+            if to_currency != BASE_CURRENCY:
+                if to_rate is None:
+                    to_rate = self.rate(to_currency)
+                value = value / to_rate
+            converted.append(float(value.quantize(CENT, rounding=ROUND_HALF_UP)))
+        return converted
+
+
+def load_snapshot(db: Session, version: int) -> RateSnapshot:
+    rows = db.query(Currency.code, Currency.rate_to_ngn, Currency.symbol).filter(
+        Currency.is_active == True
+    ).all()
+    return RateSnapshot.from_rows(version, rows)
+
+
+rate_snapshots = SyncedSnapshot(load_snapshot, RATES_KEY, settings.FX_SNAPSHOT_MAX_AGE)
+rate_snapshots.track((Currency,), PENDING_KEY)
+
+
+def get_rates(db: Session) -> RateSnapshot:
+    """The current rate snapshot, loaded with db when missing or expired.
+
+    Rate changes made through the ORM replace it immediately on every
+    worker; FX_SNAPSHOT_MAX_AGE bounds drift from changes made elsewhere.
+    """
+    return rate_snapshots.get(db)
+
+
+def invalidate_rates():
+    """Drop this worker's snapshot; the next conversion reloads it"""
+    rate_snapshots.invalidate()
@@ -0,0 +1,325 @@
+import bisect
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.hotel import Hotel
+from app.services.index_sync import SyncedIndex
+from app.utils.facets import hotel_facets
+from app.utils.geo import DISTANCE, MAX_CELLS, GeoQuery, covering_cells, distance_sq, encode_geohash
+
+PENDING_KEY = "hotel_index_changes"
+BROADCAST_FIELD = "hotel_index"
+# Longest geohash prefix kept in the in-memory grid (cells of about 1 km)
+GRID_PRECISION = 6
+
+
+class IndexedHotel(NamedTuple):
+    """The searchable fields of one hotel"""
+    id: int
+    name: str
+    location: str
+    price: float
+    rating: float
+    amenities: FrozenSet[str]
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    @property
+    def cells(self) -> List[str]:
+        """The grid cells holding this hotel, coarsest first"""
+        if self.latitude is None or self.longitude is None:
+            return []
+        geohash = encode_geohash(self.latitude, self.longitude, GRID_PRECISION)
+        return [geohash[:n] for n in range(1, GRID_PRECISION + 1)]
+
+
+class SearchPage(NamedTuple):
+    ids: List[int]
+    total: int
+    facets: Optional[Dict[str, Any]] = None
+
+
+def normalize_location(text: str) -> str:
+    """Case-folded text, compared the way ILIKE compares it"""
+    return (text or "").casefold()
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def document_from_row(row) -> IndexedHotel:
+    hotel_id, name, location, price, rating, amenities, latitude, longitude = row
+    return IndexedHotel(
+        hotel_id, name or "", normalize_location(location), float(price or 0),
+        float(rating or 0), frozenset(a for a in (amenities or []) if isinstance(a, str)),
+        latitude, longitude
+    )
+
+
+def load_documents(db: Session, ids: Optional[Iterable[int]] = None) -> List[IndexedHotel]:
+    """Read the indexed columns of all hotels, or only the given ones"""
+    query = db.query(
+        Hotel.id, Hotel.name, Hotel.location, Hotel.price_per_night,
+        Hotel.star_rating, Hotel.amenities, Hotel.latitude, Hotel.longitude
+    )
+    if ids is not None:
+        query = query.filter(Hotel.id.in_(list(ids)))
+    return [document_from_row(row) for row in query]
+
+
+class HotelSearchIndex(SyncedIndex):
+    """In-process index answering hotel search filters, sort and paging.
+
+    Locations are indexed by trigram so substring queries keep the
+    ``ILIKE '%x%'`` semantics of the SQL search; amenities have posting
+    sets plus a per-hotel bitset; price, rating and name are kept in
+    sorted arrays for range filters and ordering; coordinates go into a
+    geohash grid for radius and bounding-box searches, which can be
+    ordered by distance. It is only mutated on the event loop, so it needs no
+    locking. Searches it cannot answer (not built yet, unsupported sort)
+    return None and the caller falls back to SQL.
+    """
+
+    # Accepted sort_by values (with optional "-" prefix) -> document field
+    SORT_FIELDS = {"price": "price", "star_rating": "rating", "name": "name", "id": "id"}
+    label = "Hotel search index"
+    broadcast_field = BROADCAST_FIELD
+
+    def __init__(self):
+        super().__init__()
+        self.version = 0
+        self._docs: Dict[int, IndexedHotel] = {}
+        self._masks: Dict[int, int] = {}
+        self._amenity_bits: Dict[str, int] = {}
+        self._amenity_ids: Dict[str, Set[int]] = defaultdict(set)
+        self._trigrams: Dict[str, Set[int]] = defaultdict(set)
+        self._cells: Dict[str, Set[int]] = defaultdict(set)
+        self._sorted: Dict[str, List[Tuple[Any, int]]] = {
+            field: [] for field in set(self.SORT_FIELDS.values())
+        }
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def load(self, db: Session, ids: Optional[Iterable[int]] = None) -> List[IndexedHotel]:
+        return load_documents(db, ids)
+
+    def key_of(self, doc: IndexedHotel) -> int:
+        return doc.id
+
+    def _mask(self, amenities: Iterable[str], create: bool = False) -> Optional[int]:
+        mask = 0
+        for amenity in amenities:
+            bit = self._amenity_bits.get(amenity)
+            if bit is None:
+                if not create:
+                    return None
+                bit = self._amenity_bits[amenity] = 1 << len(self._amenity_bits)
+            mask |= bit
+        return mask
+
+    def build(self, documents: Iterable[IndexedHotel]):
+        """Replace the whole index"""
+        self._docs = {doc.id: doc for doc in documents}
+        self._amenity_bits = {}
+        self._masks = {doc.id: self._mask(doc.amenities, create=True) for doc in self._docs.values()}
+        self._amenity_ids = defaultdict(set)
+        self._trigrams = defaultdict(set)
+        self._cells = defaultdict(set)
+        for doc in self._docs.values():
+            for amenity in doc.amenities:
+                self._amenity_ids[amenity].add(doc.id)
+            for gram in trigrams(doc.location):
+                self._trigrams[gram].add(doc.id)
+            for cell in doc.cells:
+                self._cells[cell].add(doc.id)
+        self._sorted = {
+            field: sorted((getattr(doc, field), doc.id) for doc in self._docs.values())
+            for field in self._sorted
+        }
+        self.ready = True
+        self.version += 1
+
+    def upsert(self, doc: IndexedHotel):
+        """Add or replace one hotel"""
+        self.remove(doc.id)
+        self._docs[doc.id] = doc
+        self._masks[doc.id] = self._mask(doc.amenities, create=True)
+        for amenity in doc.amenities:
+            self._amenity_ids[amenity].add(doc.id)
+        for gram in trigrams(doc.location):
+            self._trigrams[gram].add(doc.id)
+        for cell in doc.cells:
+            self._cells[cell].add(doc.id)
+        for field, entries in self._sorted.items():
+            bisect.insort(entries, (getattr(doc, field), doc.id))
+        self.version += 1
+
+    def remove(self, hotel_id: int):
+        doc = self._docs.pop(hotel_id, None)
+        if doc is None:
+            return
+        del self._masks[hotel_id]
+        for amenity in doc.amenities:
+            self._amenity_ids[amenity].discard(hotel_id)
+        for gram in trigrams(doc.location):
+            postings = self._trigrams.get(gram)
+            if postings is not None:
+                postings.discard(hotel_id)
+                if not postings:
+                    del self._trigrams[gram]
+        for cell in doc.cells:
+            members = self._cells.get(cell)
+            if members is not None:
+                members.discard(hotel_id)
+                if not members:
+                    del self._cells[cell]
+        for field, entries in self._sorted.items():
+            entry = (getattr(doc, field), hotel_id)
+            i = bisect.bisect_left(entries, entry)
+            if i < len(entries) and entries[i] == entry:
+                del entries[i]
+        self.version += 1
+
+    def _location_matches(self, query: str) -> Set[int]:
+        grams = trigrams(query)
+        if not grams:
+            # Too short to index; substring-scan the (short) location strings
+            return {doc.id for doc in self._docs.values() if query in doc.location}
+        postings = sorted((self._trigrams.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {i for i in candidates if query in self._docs[i].location}
+
+    def _geo_matches(self, geo: GeoQuery) -> Set[int]:
+        candidates = set()
+        for cell in covering_cells(geo.bbox, MAX_CELLS, GRID_PRECISION):
+            candidates |= self._cells.get(cell, set()) if cell else set(self._docs)
+        docs = self._docs
+        return {i for i in candidates if geo.contains(docs[i].latitude, docs[i].longitude)}
+
+    def search(
+        self,
+        location: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        min_rating: Optional[float] = None,
+        amenities: Iterable[str] = (),
+        sort_by: Optional[str] = "price",
+        offset: int = 0,
+        limit: int = 20,
+        after: Optional[Sequence[Any]] = None,
+        facets: bool = False,
+        price_factor: float = 1.0,
+        geo: Optional[GeoQuery] = None
+    ) -> Optional[SearchPage]:
+        """Matching hotel ids for one page plus the total match count.
+
+        Falsy filter values are ignored, as in the SQL search. ``after``
+        (the sort_values of a hotel) starts the page right after that
+        hotel instead of at ``offset``. With ``facets`` the page also
+        carries the facets of every match, prices multiplied by
+        ``price_factor``. ``geo`` keeps hotels inside its area; a radius
+        search can be sorted by ``distance``.
+        """
+        sort = self._sort_field(sort_by, geo) if self.ready else None
+        if sort is None:
+            return None
+        field, descending = sort
+
+        amenities = set(amenities)
+        required = self._mask(amenities)
+        if required is None:
+            # An amenity no hotel has
+            return SearchPage([], 0, hotel_facets([]) if facets else None)
+        low = float(min_price) if min_price else None
+        high = float(max_price) if max_price else None
+        rating = float(min_rating) if min_rating else None
+
+        # The smallest posting set bounds the matches; the amenity bitset
+        # checks the remaining amenities without further set lookups
+        pools = [self._amenity_ids[amenity] for amenity in amenities]
+        # Location and area matches are exact, so they are always intersected
+        exact = []
+        if location:
+            exact.append(self._location_matches(normalize_location(location)))
+        if geo is not None:
+            exact.append(self._geo_matches(geo))
+        pools.extend(exact)
+        pool = min(pools, key=len) if pools else None
+        for matched in exact:
+            if matched is not pool:
+                pool = pool & matched
+
+        def matches(i: int) -> bool:
+            doc = self._docs[i]
+            return (
+                (low is None or doc.price >= low)
+                and (high is None or doc.price <= high)
+                and (rating is None or doc.rating >= rating)
+                and self._masks[i] & required == required
+            )
+
+        # A lone location or amenity filter is fully answered by its pool
+        check = None if low is None and high is None and rating is None and len(pools) <= 1 else matches
+
+        key = self._sort_key(field, geo)
+        if field == DISTANCE or (pool is not None and len(pool) * 4 < len(self._docs)):
+            # Few candidates: sorting them beats walking the sorted array
+            found = [i for i in pool if check(i)] if check else list(pool)
+            found.sort(key=key, reverse=descending)
+        else:
+            entries = self._sorted[field]
+            if field == "price" and (low is not None or high is not None):
+                start = bisect.bisect_left(entries, (low,)) if low is not None else 0
+                end = bisect.bisect_right(entries, (high, float("inf"))) if high is not None else len(entries)
+                entries = entries[start:end]
+            ordered = (i for _, i in (reversed(entries) if descending else entries))
+            if pool is not None:
+                ordered = (i for i in ordered if i in pool)
+            found = [i for i in ordered if check(i)] if check else list(ordered)
+        if after is not None:
+            offset = self._position_after(found, field, descending, after, key)
+        return SearchPage(
+            found[offset:offset + limit], len(found),
+            hotel_facets((self._docs[i] for i in found), price_factor) if facets else None
+        )
+
+    def _sort_field(self, sort_by: Optional[str], geo: Optional[GeoQuery] = None) -> Optional[Tuple[str, bool]]:
+        """(document field, descending) for sort_by, None when unsupported"""
+        descending = bool(sort_by) and sort_by.startswith("-")
+        sort_name = sort_by[1:] if descending else sort_by
+        if sort_name == DISTANCE:
+            return (DISTANCE, descending) if geo is not None and geo.origin is not None else None
+        if sort_name and sort_name not in self.SORT_FIELDS:
+            return None
+        return (self.SORT_FIELDS[sort_name] if sort_name else "id"), descending
+
+    def _sort_key(self, field: str, geo: Optional[GeoQuery] = None):
+        """(sort value, id) of a hotel id; distances are geo.distance_sq values"""
+        docs = self._docs
+        if field == DISTANCE:
+            origin = geo.origin
+            return lambda i: (distance_sq(docs[i].latitude, docs[i].longitude, origin), i)
+        return lambda i: (getattr(docs[i], field), i)
+
+    def sort_values(self, hotel_id: int, sort_by: Optional[str], geo: Optional[GeoQuery] = None) -> List[Any]:
+        """The (sort key, id) position of an indexed hotel, for cursors"""
+        field, _ = self._sort_field(sort_by, geo)
+        return list(self._sort_key(field, geo)(hotel_id))
+
+    def _position_after(self, found: List[int], field: str, descending: bool, after: Sequence[Any], key) -> int:
+        value, hotel_id = after
+        # Cursors from the SQL search carry Decimal prices
+        target = (float(value) if field in ("price", "rating") else value, int(hotel_id))
+
+        if descending:
+            return len(found) - bisect.bisect_left(found[::-1], target, key=key)
+        return bisect.bisect_right(found, target, key=key)
+
+
+hotel_search_index = HotelSearchIndex()
+hotel_search_index.track((Hotel,), PENDING_KEY)
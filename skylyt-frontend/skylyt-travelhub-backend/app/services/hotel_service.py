@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from app.models.hotel import Hotel
 from app.schemas.hotel import HotelSearchRequest, HotelResponse
 from app.schemas.search import SearchResponse
+from app.services.room_inventory import get_calendar, parse_stay
+from app.utils.text_search import contains
 from decimal import Decimal
 
 
@@ -13,10 +15,11 @@ class HotelService:
         query = db.query(Hotel).filter(Hotel.is_available == True)
         
         # Apply filters
+        # City and country are both part of the free-text location
         if search_request.location.city:
-            query = query.filter(Hotel.city.ilike(f"%{search_request.location.city}%"))
+            query = query.filter(contains([Hotel.location], search_request.location.city))
         if search_request.location.country:
-            query = query.filter(Hotel.country.ilike(f"%{search_request.location.country}%"))
+            query = query.filter(contains([Hotel.location], search_request.location.country))
         if search_request.min_price:
             query = query.filter(Hotel.price_per_night >= search_request.min_price)
         if search_request.max_price:
@@ -24,10 +27,12 @@ class HotelService:
         if search_request.star_rating:
             query = query.filter(Hotel.star_rating >= search_request.star_rating)
         
-        # Pagination
+        # Pagination, cheapest first with a stable tie-breaker
         total = query.count()
         offset = (search_request.pagination.page - 1) * search_request.pagination.limit
-        hotels = query.offset(offset).limit(search_request.pagination.limit).all()
+        hotels = query.order_by(Hotel.price_per_night, Hotel.id).offset(offset).limit(
+            search_request.pagination.limit
+        ).all()
         
         # Convert to API format
         hotel_list = []
@@ -35,11 +40,11 @@ class HotelService:
             hotel_list.append({
                 "id": str(hotel.id),
                 "name": hotel.name,
-                "location": f"{hotel.city}, {hotel.country}",
-                "rating": hotel.rating or 0,
+                "location": hotel.location,
+                "rating": hotel.star_rating or 0,
                 "price": float(hotel.price_per_night),
                 "image_url": hotel.images[0] if hotel.images else "/placeholder.svg",
-                "amenities": [a["name"] for a in hotel.amenities] if hotel.amenities else [],
+                "amenities": hotel.amenities or [],
                 "description": hotel.description or ""
             })
         
@@ -67,9 +72,22 @@ class HotelService:
         }
     
     @staticmethod
-    def check_availability(hotel_id: str, check_in: str, check_out: str, rooms: int) -> bool:
-        # Mock availability check
-        return True
+    def check_availability(hotel_id: int, check_in: str, check_out: str, rooms: int, db: Session) -> Dict[str, Any]:
+        """Free rooms per room type for a stay, from the in-memory inventory calendar.
+
+        Raises ValueError for an invalid stay or dates past the calendar.
+        """
+        check_in, check_out = parse_stay(check_in, check_out)
+        free = get_calendar(db).free_rooms(hotel_id, check_in, check_out)
+        return {"available": any(count >= rooms for count in free.values()), "room_types": free}
+    
+    @staticmethod
+    def bulk_availability(
+        hotel_ids: List[int], check_in: str, check_out: str, rooms: int, db: Session
+    ) -> Dict[int, bool]:
+        """Availability of a whole page of hotels from one calendar snapshot"""
+        check_in, check_out = parse_stay(check_in, check_out)
+        return get_calendar(db).available_many(hotel_ids, check_in, check_out, rooms)
     
     @staticmethod
     def calculate_pricing(hotel_id: str, check_in: str, check_out: str, rooms: int) -> Dict[str, Any]:
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from itertools import chain
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Type
+
+from anyio import from_thread
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, run_in_session
+from app.core.redis import RedisService
+from app.utils.cache import cache_manager
+
+logger = logging.getLogger(__name__)
+
+# Marks a change to unknown rows (bulk UPDATE/DELETE)
+REBUILD = "*"
+
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _keep(task: asyncio.Task):
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def register_session_tracking(
+    model_types: Tuple[Type, ...],
+    pending_key: str,
+    on_commit: Callable[[Set[Any]], None],
+    changed_key: Callable[[Any], Optional[Hashable]] = lambda obj: obj.id,
+    bulk_inserts: bool = False
+):
+    """Call on_commit after SessionLocal commits that changed rows of model_types.
+
+    The changed_key of every flushed row (None skips it) is collected under
+    ``session.info[pending_key]`` and passed on once the transaction
+    commits; bulk UPDATE/DELETE statements on those models, and with
+    bulk_inserts bulk INSERTs too, bypass flush events and pass REBUILD.
+    """
+
+    def collect_changes(session, flush_context):
+        pending = session.info.setdefault(pending_key, set())
+        for obj in chain(session.new, session.dirty, session.deleted):
+            if isinstance(obj, model_types) and obj.id is not None:
+                key = changed_key(obj)
+                if key is not None:
+                    pending.add(key)
+
+    def collect_bulk_changes(orm_execute_state):
+        bulk = orm_execute_state.is_update or orm_execute_state.is_delete
+        if not (bulk or bulk_inserts and orm_execute_state.is_insert):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, model_types):
+            orm_execute_state.session.info.setdefault(pending_key, set()).add(REBUILD)
+
+    def publish_after_commit(session):
+        pending = session.info.pop(pending_key, None)
+        if pending:
+            on_commit(pending)
+
+    def discard_changes(session):
+        session.info.pop(pending_key, None)
+
+    event.listen(SessionLocal, "after_flush", collect_changes)
+    event.listen(SessionLocal, "do_orm_execute", collect_bulk_changes)
+    event.listen(SessionLocal, "after_commit", publish_after_commit)
+    event.listen(SessionLocal, "after_rollback", discard_changes)
+
+
+class SyncedIndex(ABC):
+    """Base of the in-memory indexes kept in step with committed rows.
+
+    Subclasses load items (all of them, or those with the given keys) and
+    maintain their structures in ``build``/``upsert``/``remove``; this
+    class reloads changed keys after commit and relays them to the other
+    workers through the cache broadcast channel under ``broadcast_field``.
+    Indexes are only mutated on the event loop.
+    """
+
+    label = "Index"
+    broadcast_field = ""
+    # Cache tags dropped whenever the indexed rows change
+    invalidates: Tuple[str, ...] = ()
+
+    def __init__(self):
+        self.ready = False
+        self._rebuild_task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    def load(self, db: Session, keys: Optional[Iterable[Any]] = None) -> List[Any]:
+        pass
+
+    @abstractmethod
+    def key_of(self, item: Any) -> Hashable:
+        pass
+
+    @abstractmethod
+    def build(self, items: Iterable[Any]):
+        pass
+
+    @abstractmethod
+    def upsert(self, item: Any):
+        pass
+
+    @abstractmethod
+    def remove(self, key: Any):
+        pass
+
+    def changed_key(self, obj: Any) -> Optional[Hashable]:
+        """The key a flushed row of a tracked model changes, None to skip it"""
+        return obj.id
+
+    def stale_keys(self, keys: Set[Any]) -> Set[Any]:
+        """Indexed keys a refresh of keys may drop when they no longer load"""
+        return keys
+
+    async def rebuild(self):
+        """Rebuild from the database; concurrent calls share one load"""
+        if self._rebuild_task is None or self._rebuild_task.done():
+            self._rebuild_task = asyncio.ensure_future(self._rebuild())
+        await asyncio.shield(self._rebuild_task)
+
+    async def _rebuild(self):
+        items = await run_in_threadpool(run_in_session, self.load)
+        self.build(items)
+        logger.info(f"{self.label} built with {len(items)} entries")
+
+    async def refresh(self, keys: Iterable[Any]):
+        """Reload the changed keys, or everything if REBUILD is among them"""
+        keys = set(keys)
+        if REBUILD in keys or not self.ready:
+            await self.rebuild()
+            return
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            # The rebuild may have read these rows before they changed
+            await asyncio.shield(self._rebuild_task)
+        items = await run_in_threadpool(run_in_session, self.load, keys)
+        stale = self.stale_keys(keys)
+        for item in items:
+            self.upsert(item)
+        for key in stale - {self.key_of(item) for item in items}:
+            self.remove(key)
+
+    def schedule_refresh(self, keys: Iterable[Any]):
+        """Refresh in the background from the running loop"""
+        _keep(asyncio.ensure_future(self.refresh(list(keys))))
+
+    def handle_broadcast(self, message: Optional[Dict[str, Any]]):
+        """Apply changes committed by other workers"""
+        if message is None:
+            # Reconnected; changes may have been missed
+            if self.ready:
+                self.schedule_refresh([REBUILD])
+            return
+        keys = message.get(self.broadcast_field)
+        if keys and self.ready:
+            self.schedule_refresh(keys)
+
+    async def _announce(self, keys: List[Any]):
+        if self.invalidates:
+            await cache_manager.invalidate_tags(*self.invalidates)
+        await cache_manager.broadcast(**{self.broadcast_field: keys})
+
+    async def publish_changes(self, keys: List[Any]):
+        """Patch this worker's index and tell the other workers to do the same"""
+        if self.ready:
+            self.schedule_refresh(keys)
+        await self._announce(keys)
+
+    async def _publish_in_fresh_loop(self, keys: List[Any]):
+        try:
+            await self._announce(keys)
+        finally:
+            await RedisService.close_async()
+
+    def dispatch_changes(self, keys: Set[Any]):
+        """Publish committed changes from whatever thread committed them"""
+        keys = sorted(keys, key=str)
+        try:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                _keep(loop.create_task(self.publish_changes(keys)))
+                return
+            try:
+                from_thread.run(self.publish_changes, keys)
+            except RuntimeError:
+                # Not an AnyIO worker thread (scripts, Celery): no local index
+                asyncio.run(self._publish_in_fresh_loop(keys))
+        except Exception as e:
+            logger.error(f"{self.label} update after commit failed: {e}")
+
+    def track(self, model_types: Tuple[Type, ...], pending_key: str):
+        """Keep this index in step with commits touching model_types on every worker"""
+        register_session_tracking(
+            model_types, pending_key, lambda keys: self.dispatch_changes(keys), self.changed_key
+        )
+        cache_manager.add_broadcast_handler(self.handle_broadcast)
+
+
+class SyncedSnapshot:
+    """A read-only value loaded from the database and shared by a worker's threads.
+
+    ``load(db, version)`` returns a value carrying that ``version`` and a
+    ``loaded_at`` monotonic time. Tracked commits delete ``cache_key`` (see
+    MODEL_KEYS in app.utils.cache_invalidation), which drops the value on
+    every worker; ``max_age`` bounds drift from changes made elsewhere.
+    Values are replaced, never modified.
+    """
+
+    def __init__(self, load: Callable[[Session, int], Any], cache_key: str, max_age: float):
+        self._load = load
+        self.cache_key = cache_key
+        self.max_age = max_age
+        self._value: Optional[Any] = None
+        self._version = 0
+        # Bumped by every invalidation, so a load that raced one is not installed
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def fresh(self, value: Any) -> bool:
+        return time.monotonic() - value.loaded_at < self.max_age
+
+    def get(self, db: Session) -> Any:
+        """The current value, loaded with db when missing or no longer fresh"""
+        value = self._value
+        if value is not None and self.fresh(value):
+            return value
+
+        with self._lock:
+            self._version += 1
+            version, generation = self._version, self._generation
+        value = self._load(db, version)
+        with self._lock:
+            if generation == self._generation and (self._value is None or self._value.version < version):
+                self._value = value
+        return value
+
+    def invalidate(self):
+        """Drop this worker's value; the next get reloads it"""
+        with self._lock:
+            self._value = None
+            self._generation += 1
+
+    def handle_broadcast(self, message: Optional[Dict[str, Any]]):
+        """Drop the value after changes committed by other workers"""
+        if message is None or cache_manager.make_key(self.cache_key) in message.get("keys", ()):
+            # None: reconnected, and a change may have been missed
+            self.invalidate()
+
+    def track(self, model_types: Tuple[Type, ...], pending_key: str, bulk_inserts: bool = False):
+        """Drop the value after commits touching model_types, on every worker"""
+        register_session_tracking(
+            model_types, pending_key, lambda keys: self.invalidate(), bulk_inserts=bulk_inserts
+        )
+        cache_manager.add_broadcast_handler(self.handle_broadcast)
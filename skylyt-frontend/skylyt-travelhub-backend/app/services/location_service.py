@@ -1,6 +1,7 @@
 from typing import Optional, Dict
-import httpx
-from app.utils.cache_manager import cache_manager
+from app.core.http_client import outbound_http
+from app.utils.cache import cache_manager
+from app.utils.cache_keys import build_cache_key
 
 
 class LocationService:
@@ -20,13 +21,13 @@ class LocationService:
     @staticmethod
     async def detect_location_from_ip(ip_address: str) -> Dict[str, str]:
         """Detect country and currency from IP address"""
-        cache_key = f"location_{ip_address}"
-        cached = cache_manager.get(cache_key)
+        cache_key = build_cache_key("location", {"ip": ip_address})
+        cached = await cache_manager.get(cache_key)
         if cached:
             return cached
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with outbound_http.session("ipapi") as client:
                 # Using ipapi.co (free tier)
                 response = await client.get(f"https://ipapi.co/{ip_address}/json/")
                 data = response.json()
@@ -45,7 +46,7 @@ class LocationService:
                 }
                 
                 # Cache for 1 hour
-                cache_manager.set(cache_key, result, 3600)
+                await cache_manager.set(cache_key, result, 3600)
                 return result
                 
         except Exception as e:
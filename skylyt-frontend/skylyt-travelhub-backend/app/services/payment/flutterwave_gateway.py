@@ -1,4 +1,4 @@
-import httpx
+from app.core.http_client import outbound_http
 import hashlib
 from typing import Dict, Any
 from decimal import Decimal
@@ -15,7 +15,7 @@ class FlutterwaveGateway(PaymentGatewayBase):
                            booking_reference: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
         """Create Flutterwave payment"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with outbound_http.session("flutterwave") as client:
                 response = await client.post(
                     f"{self.base_url}/payments",
                     headers={
@@ -63,7 +63,7 @@ class FlutterwaveGateway(PaymentGatewayBase):
     async def verify_payment(self, transaction_id: str) -> Dict[str, Any]:
         """Verify Flutterwave payment"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with outbound_http.session("flutterwave") as client:
                 response = await client.get(
                     f"{self.base_url}/transactions/verify_by_reference",
                     headers={
@@ -1,4 +1,4 @@
-import httpx
+from app.core.http_client import outbound_http
 import base64
 from typing import Dict, Any
 from decimal import Decimal
@@ -18,7 +18,7 @@ class PayPalGateway(PaymentGatewayBase):
         try:
             credentials = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
             
-            async with httpx.AsyncClient() as client:
+            async with outbound_http.session("paypal") as client:
                 response = await client.post(
                     f"{self.base_url}/v1/oauth2/token",
                     headers={
@@ -41,7 +41,7 @@ class PayPalGateway(PaymentGatewayBase):
             if not access_token:
                 return {'success': False, 'error': 'Failed to get access token'}
             
-            async with httpx.AsyncClient() as client:
+            async with outbound_http.session("paypal") as client:
                 response = await client.post(
                     f"{self.base_url}/v2/checkout/orders",
                     headers={
@@ -101,7 +101,7 @@ class PayPalGateway(PaymentGatewayBase):
             if not access_token:
                 return {'success': False, 'error': 'Failed to get access token'}
             
-            async with httpx.AsyncClient() as client:
+            async with outbound_http.session("paypal") as client:
                 response = await client.get(
                     f"{self.base_url}/v2/checkout/orders/{transaction_id}",
                     headers={
@@ -1,4 +1,4 @@
-import httpx
+from app.core.http_client import outbound_http
 import hashlib
 import hmac
 from typing import Dict, Any
@@ -19,7 +19,7 @@ class PaystackGateway(PaymentGatewayBase):
             # Convert amount to kobo for NGN or cents for other currencies
             amount_kobo = int(amount * 100)
             
-            async with httpx.AsyncClient() as client:
+            async with outbound_http.session("paystack") as client:
                 response = await client.post(
                     f"{self.base_url}/transaction/initialize",
                     headers={
@@ -61,7 +61,7 @@ class PaystackGateway(PaymentGatewayBase):
     async def verify_payment(self, transaction_id: str) -> Dict[str, Any]:
         """Verify Paystack payment"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with outbound_http.session("paystack") as client:
                 response = await client.get(
                     f"{self.base_url}/transaction/verify/{transaction_id}",
                     headers={
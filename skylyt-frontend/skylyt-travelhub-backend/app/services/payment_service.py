@@ -5,6 +5,7 @@ from sqlalchemy import and_, or_
 from datetime import datetime, date
 from app.models.payment import Payment, PaymentStatus
 from app.models.booking import Booking
+from app.utils.pagination import paginate
 import csv
 import io
 
@@ -184,7 +185,14 @@ class PaymentService:
         db.commit()
         return {"status": payment.status}
     
-    def list_payments(self, db: Session, filters: Dict[str, Any] = None, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
+    def list_payments(
+        self, db: Session, filters: Dict[str, Any] = None, page: int = 1, per_page: int = 20,
+        cursor: Optional[str] = None, count_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Newest payments first; ``cursor`` continues after a previous page.
+
+        ``count_mode`` overrides settings.PAGINATION_COUNT_MODE for the total.
+        """
         query = db.query(Payment).join(Booking)
         
         if filters:
@@ -211,12 +219,14 @@ class PaymentService:
                     Booking.customer_name.ilike(search)
                 ))
         
-        total = query.count()
-        payments = query.offset((page - 1) * per_page).limit(per_page).all()
+        result = paginate(
+            query, [(Payment.created_at, True), (Payment.id, True)], per_page,
+            cursor=cursor, page=page, count_mode=count_mode
+        )
         
         # Serialize payments with booking info
         serialized_payments = []
-        for payment in payments:
+        for payment in result.items:
             payment_dict = {
                 "id": payment.id,
                 "booking_id": payment.booking_id,
@@ -241,13 +251,7 @@ class PaymentService:
             }
             serialized_payments.append(payment_dict)
         
-        return {
-            "payments": serialized_payments,
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
-        }
+        return result.as_response("payments", serialized_payments)
     
     def get_payment_details(self, db: Session, payment_id: int) -> Optional[Payment]:
         return db.query(Payment).filter(Payment.id == payment_id).first()
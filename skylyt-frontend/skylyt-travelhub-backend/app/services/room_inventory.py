@@ -0,0 +1,359 @@
+import logging
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.booking import Booking
+from app.models.hotel import Hotel
+from app.models.room_inventory import RoomInventory
+from app.services.index_sync import SyncedSnapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOM_TYPE = "Standard"
+# Inventory and hotel commits delete this cache key (see MODEL_KEYS in
+# app.utils.cache_invalidation) and every worker hears the deletion
+INVENTORY_KEY = "room_inventory"
+PENDING_KEY = "room_inventory_changed"
+# Where a booking records the rooms it holds, for release on cancellation
+RESERVATION_FIELD = "room_reservation"
+
+
+class RoomsUnavailable(ValueError):
+    """Not enough rooms are free on some night of the stay"""
+
+
+def parse_day(value: Any) -> date:
+    """A date from a date, datetime, YYYY-MM-DD or ISO timestamp"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    try:
+        if len(text) == 10:
+            return date.fromisoformat(text)
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).date()
+    except ValueError:
+        raise ValueError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+
+
+def parse_stay(check_in: Any, check_out: Any) -> Tuple[date, date]:
+    """Check-in and check-out dates; raises ValueError for an invalid stay"""
+    check_in, check_out = parse_day(check_in), parse_day(check_out)
+    nights = (check_out - check_in).days
+    if nights < 1:
+        raise ValueError("check_out must be after check_in")
+    if nights > settings.MAX_STAY_NIGHTS:
+        raise ValueError(f"Stays are limited to {settings.MAX_STAY_NIGHTS} nights")
+    return check_in, check_out
+
+
+def room_allotments(room_count: Optional[int], room_types: Any) -> Dict[str, int]:
+    """Rooms per room type: the hotel's room_types, else room_count Standard rooms"""
+    allotments: Dict[str, int] = {}
+    for room_type in room_types or ():
+        if isinstance(room_type, dict):
+            name = str(room_type.get("type") or DEFAULT_ROOM_TYPE)
+            rooms = max(int(room_type.get("available_rooms", 1) or 0), 0)
+            allotments[name] = allotments.get(name, 0) + rooms
+    return allotments or {DEFAULT_ROOM_TYPE: max(int(room_count or 0), 0)}
+
+
+class InventoryCalendar(NamedTuple):
+    """Free rooms per hotel, room type and night, from start for days nights.
+
+    Room types with booked nights keep an array of free rooms per night;
+    the others have their whole allotment free. A stay is checked with one
+    slice of that array, so checks cost O(nights) and never touch the
+    database. Calendars are never modified; a change installs a new one.
+    """
+    version: int
+    loaded_at: float
+    start: date
+    days: int
+    allotments: Mapping[int, Mapping[str, int]]
+    free: Mapping[Tuple[int, str], array]
+
+    @classmethod
+    def from_rows(
+        cls, version: int, start: date, days: int,
+        hotels: Iterable[Tuple[int, Any, Any]], rows: Iterable[Tuple[int, str, date, int, int]]
+    ) -> "InventoryCalendar":
+        """Build from (id, room_count, room_types) hotel rows and
+        (hotel_id, room_type, night, total_rooms, booked_rooms) inventory rows"""
+        allotments = {
+            hotel_id: MappingProxyType(room_allotments(room_count, room_types))
+            for hotel_id, room_count, room_types in hotels
+        }
+        free: Dict[Tuple[int, str], array] = {}
+        for hotel_id, room_type, night, total, booked in rows:
+            offset = (night - start).days
+            if not 0 <= offset < days:
+                continue
+            nights = free.get((hotel_id, room_type))
+            if nights is None:
+                allotment = allotments.get(hotel_id, {}).get(room_type, 0)
+                nights = free[(hotel_id, room_type)] = array("i", [allotment]) * days
+            nights[offset] = max(total - booked, 0)
+        return cls(version, time.monotonic(), start, days, MappingProxyType(allotments), MappingProxyType(free))
+
+    def _span(self, check_in: date, check_out: date) -> Tuple[int, int]:
+        first, last = (check_in - self.start).days, (check_out - self.start).days
+        if first < 0 or last > self.days:
+            raise ValueError(f"Availability is only known from today to {self.days} days ahead")
+        return first, last
+
+    def free_rooms(self, hotel_id: int, check_in: date, check_out: date) -> Dict[str, int]:
+        """Rooms of each type free on every night of the stay"""
+        first, last = self._span(check_in, check_out)
+        result = {}
+        for room_type, allotment in self.allotments.get(hotel_id, {}).items():
+            nights = self.free.get((hotel_id, room_type))
+            result[room_type] = allotment if nights is None else min(nights[first:last])
+        return result
+
+    def is_available(
+        self, hotel_id: int, check_in: date, check_out: date, rooms: int = 1, room_type: Optional[str] = None
+    ) -> bool:
+        """Whether rooms rooms of room_type (or of any one type) are free for the stay"""
+        free = self.free_rooms(hotel_id, check_in, check_out)
+        if room_type is not None:
+            return free.get(room_type, 0) >= rooms
+        return any(count >= rooms for count in free.values())
+
+    def available_many(
+        self, hotel_ids: Iterable[int], check_in: date, check_out: date, rooms: int = 1
+    ) -> Dict[int, bool]:
+        """is_available for a page of hotels at once"""
+        self._span(check_in, check_out)
+        return {hotel_id: self.is_available(hotel_id, check_in, check_out, rooms) for hotel_id in hotel_ids}
+
+
+def load_calendar(db: Session, version: int) -> InventoryCalendar:
+    start, days = date.today(), settings.INVENTORY_HORIZON_DAYS
+    hotels = db.query(Hotel.id, Hotel.room_count, Hotel.room_types).filter(Hotel.is_available == True).all()
+    rows = db.query(
+        RoomInventory.hotel_id, RoomInventory.room_type, RoomInventory.night,
+        RoomInventory.total_rooms, RoomInventory.booked_rooms
+    ).filter(RoomInventory.night >= start, RoomInventory.night < start + timedelta(days=days)).all()
+    return InventoryCalendar.from_rows(version, start, days, hotels, rows)
+
+
+class CalendarSnapshot(SyncedSnapshot):
+    def fresh(self, calendar: InventoryCalendar) -> bool:
+        # A calendar starts today, so it goes stale at midnight
+        return calendar.start == date.today() and super().fresh(calendar)
+
+
+calendars = CalendarSnapshot(load_calendar, INVENTORY_KEY, settings.INVENTORY_SNAPSHOT_MAX_AGE)
+# Reservations are bulk UPDATEs and INSERTs, which bypass flush events
+calendars.track((RoomInventory, Hotel), PENDING_KEY, bulk_inserts=True)
+
+
+def get_calendar(db: Session) -> InventoryCalendar:
+    """The current inventory calendar, loaded with db when missing or expired.
+
+    Bookings and hotel edits made through the ORM replace it on every
+    worker; INVENTORY_SNAPSHOT_MAX_AGE bounds drift from other writers.
+    It is advisory: reserve_rooms checks the database itself.
+    """
+    return calendars.get(db)
+
+
+def invalidate_calendar():
+    """Drop this worker's calendar; the next check reloads it"""
+    calendars.invalidate()
+
+
+def _stay_nights(check_in: date, check_out: date) -> List[date]:
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+
+def _insert_missing_nights(db: Session, hotel_id: int, room_type: str, nights: List[date], total: int):
+    """Create inventory rows for nights that have none; existing rows win"""
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    now = datetime.utcnow()
+    db.execute(insert(RoomInventory).values([
+        {
+            "hotel_id": hotel_id, "room_type": room_type, "night": night, "total_rooms": total,
+            "booked_rooms": 0, "created_at": now, "updated_at": now
+        }
+        for night in nights
+    ]).on_conflict_do_nothing(index_elements=["hotel_id", "room_type", "night"]))
+
+
+def _stay_filter(hotel_id: int, room_type: str, nights: List[date]):
+    return (
+        RoomInventory.hotel_id == hotel_id, RoomInventory.room_type == room_type,
+        RoomInventory.night >= nights[0], RoomInventory.night <= nights[-1]
+    )
+
+
+def _take_rooms(db: Session, hotel_id: int, room_type: str, nights: List[date], allotment: int, rooms: int) -> bool:
+    _insert_missing_nights(db, hotel_id, room_type, nights, allotment)
+    stay = _stay_filter(hotel_id, room_type, nights)
+    # Lock the nights in date order, so overlapping stays queue instead of deadlocking
+    free = [
+        total - booked for total, booked in db.query(RoomInventory.total_rooms, RoomInventory.booked_rooms).filter(
+            *stay
+        ).order_by(RoomInventory.night).with_for_update()
+    ]
+    if len(free) < len(nights) or min(free) < rooms:
+        return False
+    updated = db.query(RoomInventory).filter(
+        *stay, RoomInventory.booked_rooms + rooms <= RoomInventory.total_rooms
+    ).update({
+        RoomInventory.booked_rooms: RoomInventory.booked_rooms + rooms,
+        RoomInventory.updated_at: datetime.utcnow()
+    }, synchronize_session=False)
+    if updated != len(nights):
+        raise RoomsUnavailable("Rooms were taken while booking, please try again")
+    return True
+
+
+def reserve_rooms(
+    db: Session, hotel_id: int, check_in: Any, check_out: Any, rooms: int = 1, room_type: Optional[str] = None
+) -> str:
+    """Take rooms for every night of a stay and return the room type used.
+
+    Without room_type the first type with enough free rooms is used. The
+    nights are locked and then decremented by a conditional UPDATE that
+    only succeeds while rooms are left, so concurrent bookings cannot
+    oversell. All of it runs in a savepoint: nothing is taken unless every
+    night is. Raises RoomsUnavailable, or ValueError for bad input.
+    """
+    check_in, check_out = parse_stay(check_in, check_out)
+    if rooms < 1:
+        raise ValueError("rooms must be at least 1")
+    hotel = db.query(Hotel.room_count, Hotel.room_types).filter(Hotel.id == hotel_id).first()
+    if hotel is None:
+        raise ValueError("Hotel not found")
+    allotments = room_allotments(hotel.room_count, hotel.room_types)
+    if room_type is not None and room_type not in allotments:
+        raise ValueError(f"Unknown room type {room_type}")
+
+    nights = _stay_nights(check_in, check_out)
+    with db.begin_nested():
+        for candidate in [room_type] if room_type is not None else list(allotments):
+            if _take_rooms(db, hotel_id, candidate, nights, allotments[candidate], rooms):
+                return candidate
+        raise RoomsUnavailable("No rooms available for the selected dates")
+
+
+def release_rooms(db: Session, hotel_id: int, room_type: str, check_in: Any, check_out: Any, rooms: int = 1) -> int:
+    """Give back rooms taken by reserve_rooms; returns the nights released"""
+    nights = _stay_nights(parse_day(check_in), parse_day(check_out))
+    if not nights:
+        return 0
+    released = db.query(RoomInventory).filter(
+        *_stay_filter(hotel_id, room_type, nights), RoomInventory.booked_rooms >= rooms
+    ).update({
+        RoomInventory.booked_rooms: RoomInventory.booked_rooms - rooms,
+        RoomInventory.updated_at: datetime.utcnow()
+    }, synchronize_session=False)
+    if released != len(nights):
+        # Some nights lost their row or were given back already; never go below zero
+        logger.warning(
+            f"Released {rooms} {room_type} room(s) of hotel {hotel_id} on only {released} "
+            f"of {len(nights)} nights from {nights[0]}"
+        )
+    return released
+
+
+def reserve_booking(db: Session, booking: Booking) -> Optional[Dict[str, Any]]:
+    """Reserve the rooms of a hotel booking and record them on it.
+
+    Bookings name the hotel as booking_data["item_id"] (or hotel.id), and
+    may give room_type and rooms; other bookings are left alone.
+    """
+    data = booking.booking_data or {}
+    hotel = data.get("hotel") if isinstance(data.get("hotel"), dict) else {}
+    hotel_id = data.get("item_id") or hotel.get("id")
+    if booking.booking_type != "hotel" or not hotel_id or not booking.start_date or not booking.end_date:
+        return None
+    try:
+        hotel_id = int(hotel_id)
+        rooms = int(data.get("rooms") or hotel.get("rooms") or 1)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid hotel or room count")
+    check_in, check_out = parse_stay(booking.start_date, booking.end_date)
+    room_type = reserve_rooms(
+        db, hotel_id, check_in, check_out, rooms, data.get("room_type") or hotel.get("room_type")
+    )
+    reservation = {
+        "hotel_id": hotel_id, "room_type": room_type, "rooms": rooms,
+        "check_in": check_in.isoformat(), "check_out": check_out.isoformat()
+    }
+    booking.booking_data = {**data, RESERVATION_FIELD: reservation}
+    return reservation
+
+
+def _was_holding_rooms(booking: Booking) -> bool:
+    """Whether the booking held its rooms before this flush (Booking.status keeps active history)"""
+    history = inspect(booking).attrs.status.history
+    previous = history.deleted[0] if history.deleted else booking.status
+    return previous != "cancelled"
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def release_cancelled_bookings(session, flush_context, instances):
+    """Give back the rooms of bookings being cancelled or deleted, in the same transaction"""
+    for booking in chain(session.dirty, session.deleted):
+        if not isinstance(booking, Booking):
+            continue
+        reservation = (booking.booking_data or {}).get(RESERVATION_FIELD)
+        cancelled = booking in session.deleted or booking.status == "cancelled"
+        if reservation and cancelled and _was_holding_rooms(booking):
+            release_rooms(
+                session, reservation["hotel_id"], reservation["room_type"],
+                reservation["check_in"], reservation["check_out"], reservation["rooms"]
+            )
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def release_bulk_cancelled_bookings(orm_execute_state):
+    """Bulk UPDATE/DELETE of bookings skips before_flush: release the rooms they drop here.
+
+    The bookings the statement matches that hold rooms are noted first;
+    once it has run, those deleted or now cancelled give their rooms back
+    in the same transaction.
+    """
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not Booking:
+        return None
+    session = orm_execute_state.session
+    whereclause = orm_execute_state.statement.whereclause
+    holding = session.query(Booking.id, Booking.booking_data).filter(Booking.status != "cancelled")
+    if whereclause is not None:
+        holding = holding.filter(whereclause)
+    held = {
+        booking_id: data[RESERVATION_FIELD] for booking_id, data in holding
+        if isinstance(data, dict) and data.get(RESERVATION_FIELD)
+    }
+    if not held:
+        return None
+
+    result = orm_execute_state.invoke_statement()
+    still_holding = {
+        booking_id for (booking_id,) in
+        session.query(Booking.id).filter(Booking.id.in_(held), Booking.status != "cancelled")
+    }
+    for booking_id, reservation in held.items():
+        if booking_id not in still_holding:
+            release_rooms(
+                session, reservation["hotel_id"], reservation["room_type"],
+                reservation["check_in"], reservation["check_out"], reservation["rooms"]
+            )
+    return result
@@ -0,0 +1,135 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.booking import Booking
+from app.models.car import Car
+from app.models.city import City
+from app.models.hotel import Hotel
+from app.models.search_history import SearchHistory
+from app.utils.cache_keys import build_cache_key
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _decimal(value: Any) -> Decimal:
+    return Decimal(str(value))
+
+
+def _text(value: Any) -> str:
+    return str(value).strip()
+
+
+def _amenities(value: Any) -> str:
+    return ",".join(value) if isinstance(value, (list, tuple)) else _text(value)
+
+
+# Search arguments that may be replayed from history, with their types
+HOTEL_SEARCH_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "destination": _text, "city": _text, "checkin_date": _text, "checkout_date": _text,
+    "guests": int, "min_price": _decimal, "max_price": _decimal, "star_rating": float,
+    "rating": float, "amenities": _amenities, "sort_by": _text, "currency": _text,
+    "page": int, "per_page": int,
+}
+CAR_SEARCH_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "location": _text, "pickup_date": _text, "return_date": _text, "category": _text,
+    "transmission": _text, "min_price": _decimal, "max_price": _decimal, "guests": int,
+    "amenities": _amenities, "rating": float, "sort_by": _text, "currency": _text,
+    "page": int, "per_page": int,
+}
+SEARCH_FIELDS = {"hotel": HOTEL_SEARCH_FIELDS, "car": CAR_SEARCH_FIELDS}
+DATE_FIELDS = {"hotel": ("checkin_date", "checkout_date"), "car": ("pickup_date", "return_date")}
+
+
+class SearchDemandService:
+    """Finds the searches worth keeping warm from history and bookings"""
+
+    # Most recent history rows examined per search type
+    HISTORY_SCAN_LIMIT = 5000
+    # A booking in a location counts as this many searches for it
+    BOOKING_WEIGHT = 5
+
+    @staticmethod
+    def warmable_params(search_type: str, params: Any) -> Optional[Dict[str, Any]]:
+        """Reduce stored search parameters to arguments the search accepts.
+
+        Unknown or malformed fields are dropped. Searches for dates that
+        have passed are replayed without dates, since nobody will repeat
+        them as they were.
+        """
+        if not isinstance(params, dict):
+            return None
+        fields = SEARCH_FIELDS[search_type]
+        cleaned = {}
+        for name, value in params.items():
+            if name not in fields or value in (None, ""):
+                continue
+            try:
+                cleaned[name] = fields[name](value)
+            except (TypeError, ValueError, InvalidOperation):
+                continue
+
+        start_field, end_field = DATE_FIELDS[search_type]
+        try:
+            expired = date.fromisoformat(cleaned[start_field]) < date.today()
+        except (KeyError, ValueError):
+            expired = start_field in cleaned
+        if expired:
+            cleaned.pop(start_field, None)
+            cleaned.pop(end_field, None)
+        return cleaned
+
+    @staticmethod
+    def _booked_locations(db: Session, search_type: str, since: datetime) -> List[Tuple[str, int]]:
+        """Locations with recent bookings, as they would be searched for"""
+        if search_type == "hotel":
+            location = func.coalesce(City.name, Hotel.location)
+            query = db.query(location, func.count(Booking.id))\
+                .join(Hotel, Hotel.name == Booking.hotel_name)\
+                .outerjoin(City, City.id == Hotel.city_id)
+        else:
+            location = Car.location
+            query = db.query(location, func.count(Booking.id))\
+                .join(Car, Car.name == Booking.car_name)
+        return query.filter(
+            Booking.booking_type == search_type,
+            Booking.created_at >= since,
+            location.isnot(None)
+        ).group_by(location).all()
+
+    @staticmethod
+    def top_searches(db: Session, search_type: str, limit: int, lookback_days: int) -> List[Dict[str, Any]]:
+        """Most requested parameter sets for a search type, busiest first"""
+        since = datetime.utcnow() - timedelta(days=lookback_days)
+        location_field = "destination" if search_type == "hotel" else "location"
+        counts: Counter = Counter()
+        params_by_key: Dict[str, Dict[str, Any]] = {}
+
+        def count(params: Dict[str, Any], weight: int):
+            # Text filters match case-insensitively, so count them that way
+            key = build_cache_key(search_type, {
+                k: v.casefold() if isinstance(v, str) else v for k, v in params.items()
+            })
+            counts[key] += weight
+            params_by_key.setdefault(key, params)
+
+        history = db.query(SearchHistory.search_params).filter(
+            SearchHistory.search_type == search_type,
+            SearchHistory.created_at >= since
+        ).order_by(SearchHistory.created_at.desc()).limit(SearchDemandService.HISTORY_SCAN_LIMIT)
+        for (stored,) in history:
+            params = SearchDemandService.warmable_params(search_type, stored)
+            if params is not None:
+                count(params, 1)
+
+        try:
+            for location, bookings in SearchDemandService._booked_locations(db, search_type, since):
+                count({location_field: location}, bookings * SearchDemandService.BOOKING_WEIGHT)
+        except Exception as e:
+            logger.warning(f"Could not read booking demand for {search_type} searches: {e}")
+            db.rollback()
+
+        return [params_by_key[key] for key, _ in counts.most_common(limit)]
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import run_in_session
+from app.models.search_history import SearchHistory
+from app.models.user import User
+from app.utils.cache import cache_manager
+from app.utils.cache_serialization import CachedResponse
+from app.utils.response_cache import decode_body
+
+logger = logging.getLogger(__name__)
+
+TYPE_LABELS = {"hotel": "Hotels", "car": "Cars", "bundle": "Bundle"}
+PLACE_FIELDS = ("destination", "city", "location")
+
+
+def response_total(response: CachedResponse) -> int:
+    """The total of a cached search response, 0 when it has none"""
+    try:
+        return int(json.loads(decode_body(response)).get("total", 0))
+    except (ValueError, TypeError, AttributeError):
+        return 0
+
+
+class HistoryEntry(NamedTuple):
+    """One recorded search, as written to search_history"""
+    user_id: int
+    search_type: str
+    search_params: Dict[str, Any]
+    results_count: int
+    created_at: datetime
+
+    def as_row(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id, "search_type": self.search_type, "search_params": self.search_params,
+            "results_count": self.results_count, "created_at": self.created_at, "updated_at": self.created_at,
+        }
+
+    def as_item(self) -> Dict[str, Any]:
+        """The entry as shown by /search/history"""
+        place = next((self.search_params[f] for f in PLACE_FIELDS if self.search_params.get(f)), None)
+        label = TYPE_LABELS.get(self.search_type, self.search_type.title())
+        return {
+            "query": f"{place} {label}" if place else label,
+            "date": self.created_at.date().isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "type": self.search_type,
+            "params": self.search_params,
+            "results_count": self.results_count,
+        }
+
+
+def search_params(**params: Any) -> Dict[str, Any]:
+    """Route query parameters as stored: unset ones dropped, decimals as strings.
+
+    They are stored under the route's own names, so the cache warmer can
+    replay them (``SearchDemandService.warmable_params``).
+    """
+    return {
+        name: str(value) if isinstance(value, Decimal) else value
+        for name, value in params.items() if value is not None
+    }
+
+
+def write_entries(db: Session, entries: List[HistoryEntry]) -> int:
+    """Insert the entries in one multi-row INSERT; returns the rows written"""
+    rows = [entry.as_row() for entry in entries]
+    try:
+        db.execute(insert(SearchHistory), rows)
+        db.commit()
+        return len(rows)
+    except IntegrityError:
+        db.rollback()
+    # A deleted account fails the whole batch; keep the other users' searches
+    user_ids = {row["user_id"] for row in rows}
+    known = {user_id for (user_id,) in db.query(User.id).filter(User.id.in_(user_ids))}
+    rows = [row for row in rows if row["user_id"] in known]
+    if rows:
+        db.execute(insert(SearchHistory), rows)
+        db.commit()
+    return len(rows)
+
+
+def load_recent(db: Session, user_id: int, limit: int) -> List[Dict[str, Any]]:
+    """A user's latest searches from the database, newest first"""
+    rows = db.query(SearchHistory).filter(SearchHistory.user_id == user_id)\
+        .order_by(SearchHistory.created_at.desc(), SearchHistory.id.desc()).limit(limit).all()
+    return [
+        HistoryEntry(row.user_id, row.search_type, row.search_params or {}, row.results_count or 0, row.created_at).as_item()
+        for row in rows
+    ]
+
+
+class SearchHistoryRecorder:
+    """Write-behind recorder for user searches.
+
+    ``record`` only appends to a bounded in-memory buffer, so the search
+    routes never wait on the database. A background task drains it in
+    batches of multi-row INSERTs every flush interval, or sooner once a
+    batch is waiting. When the buffer is full the oldest entries are
+    dropped and counted. Each user's latest searches are kept in a
+    Dragonfly list, pushed to after every write and filled from the
+    database on a miss; entries still in this worker's buffer are merged
+    in on read.
+    """
+
+    def __init__(self, capacity: int = None, batch_size: int = None, recent: int = None):
+        self._buffer: Deque[HistoryEntry] = deque(maxlen=capacity or settings.SEARCH_HISTORY_BUFFER_SIZE)
+        self.batch_size = batch_size or settings.SEARCH_HISTORY_BATCH_SIZE
+        self.recent_size = recent or settings.SEARCH_HISTORY_RECENT
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(self, user_id: Optional[int], search_type: str, params: Dict[str, Any], results_count: int = 0):
+        """Queue a search for writing; anonymous searches are not kept"""
+        if user_id is None:
+            return
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(HistoryEntry(user_id, search_type, params, results_count, datetime.utcnow()))
+        self.recorded += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _drain(self) -> List[HistoryEntry]:
+        buffer = self._buffer
+        return [buffer.popleft() for _ in range(min(self.batch_size, len(buffer)))]
+
+    def _recent_key(self, user_id: int) -> str:
+        return cache_manager.make_key(f"search_history:{user_id}")
+
+    async def flush(self) -> int:
+        """Write everything buffered so far; returns the rows written"""
+        written = 0
+        while self._buffer:
+            batch = self._drain()
+            try:
+                count = await run_in_threadpool(run_in_session, write_entries, batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error(f"Writing {len(batch)} search history entries failed: {e}")
+                continue
+            self.written += count
+            self.failed += len(batch) - count
+            written += count
+            await self._push_recent(batch)
+        return written
+
+    async def _push_recent(self, batch: List[HistoryEntry]):
+        """Prepend written entries to the users' cached lists (lists not cached are left to the next read)"""
+        by_user: Dict[int, List[str]] = {}
+        for entry in batch:
+            by_user.setdefault(entry.user_id, []).append(json.dumps(entry.as_item(), default=str))
+        try:
+            async with cache_manager.client.pipeline(transaction=False) as pipe:
+                for user_id, items in by_user.items():
+                    key = self._recent_key(user_id)
+                    # Oldest first, so the newest ends up at the head
+                    pipe.lpushx(key, *items)
+                    pipe.ltrim(key, 0, self.recent_size - 1)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Updating cached search history failed: {e}")
+
+    async def recent(self, user_id: int, limit: int = None) -> List[Dict[str, Any]]:
+        """A user's latest searches, newest first"""
+        limit = min(limit or self.recent_size, self.recent_size)
+        key = self._recent_key(user_id)
+        try:
+            cached = await cache_manager.client.lrange(key, 0, self.recent_size - 1)
+        except Exception as e:
+            logger.warning(f"Reading cached search history failed: {e}")
+            cached = None
+        if cached:
+            items = [json.loads(item) for item in cached]
+        else:
+            items = await run_in_threadpool(run_in_session, load_recent, user_id, self.recent_size)
+            if items:
+                try:
+                    async with cache_manager.client.pipeline(transaction=True) as pipe:
+                        pipe.delete(key)
+                        pipe.rpush(key, *[json.dumps(item, default=str) for item in items])
+                        pipe.expire(key, settings.SEARCH_HISTORY_CACHE_TTL)
+                        await pipe.execute()
+                except Exception as e:
+                    logger.warning(f"Caching search history failed: {e}")
+
+        pending = [entry.as_item() for entry in reversed(self._buffer) if entry.user_id == user_id]
+        # A write landing between a database read and its list push can repeat entries
+        seen, history = set(), []
+        for item in pending + items:
+            if item["created_at"] not in seen:
+                seen.add(item["created_at"])
+                history.append(item)
+        return history[:limit]
+
+    async def run(self, interval: float):
+        """Flush every interval seconds, or as soon as a full batch is waiting"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Search history flush failed: {e}")
+
+    def start(self, interval: float = None):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(interval or settings.SEARCH_HISTORY_FLUSH_INTERVAL))
+
+    async def stop(self):
+        """Stop the background task and write what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": len(self._buffer),
+            "capacity": self._buffer.maxlen,
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+search_history_recorder = SearchHistoryRecorder()
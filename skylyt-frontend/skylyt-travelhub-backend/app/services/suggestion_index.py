@@ -0,0 +1,280 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking
+from app.models.car import Car
+from app.models.city import City
+from app.models.hotel import Hotel
+from app.models.state import State
+from app.services.index_sync import SyncedIndex
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "suggestion_index_changes"
+# Car suggestions are per make and model, so any car change reloads them all
+CARS = "car"
+BROADCAST_FIELD = "suggestion_index"
+MODEL_TYPES = {State: "state", City: "city", Hotel: "hotel", Car: CARS}
+
+# A booking counts as this much popularity
+BOOKING_WEIGHT = 5.0
+MAX_SUGGESTIONS = 20
+# Prefixes matching more tokens than this keep their ranked results
+SCAN_LIMIT = 64
+
+
+class Suggestion(NamedTuple):
+    """One typeahead entry; key is "<type>:<id>" and unique in the index"""
+    key: str
+    type: str
+    name: str
+    score: float
+    fields: Tuple[Tuple[str, Any], ...] = ()
+
+    def as_response(self) -> Dict[str, Any]:
+        return {"type": self.type, "name": self.name, **dict(self.fields)}
+
+
+def normalize(text: str) -> str:
+    """Case-folded words separated by single spaces"""
+    return " ".join(re.findall(r"\w+", (text or "").casefold()))
+
+
+def tokens(name: str) -> Set[str]:
+    """The name from each of its words on, so any word can start a match"""
+    words = normalize(name).split(" ")
+    return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+def _booking_counts(db: Session, booking_type: str, column, names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    query = db.query(column, func.count(Booking.id)).filter(
+        Booking.booking_type == booking_type, column.is_not(None)
+    )
+    if names is not None:
+        query = query.filter(column.in_(list(names)))
+    return dict(query.group_by(column).all())
+
+
+def load_states(db: Session, ids: Optional[Iterable[int]] = None) -> List[Suggestion]:
+    query = db.query(State.id, State.name, State.country, State.popularity_score, State.hotel_count)
+    if ids is not None:
+        query = query.filter(State.id.in_(list(ids)))
+    return [
+        Suggestion(
+            f"state:{state_id}", "state", name, float(score or 0) + (hotel_count or 0),
+            (("id", state_id), ("country", country))
+        )
+        for state_id, name, country, score, hotel_count in query
+    ]
+
+
+def load_cities(db: Session, ids: Optional[Iterable[int]] = None) -> List[Suggestion]:
+    query = db.query(
+        City.id, City.name, State.name, City.popularity_ranking, City.hotel_count
+    ).outerjoin(State, State.id == City.state_id)
+    if ids is not None:
+        query = query.filter(City.id.in_(list(ids)))
+    # popularity_ranking counts up from 1 for the most popular city; 0 is unranked
+    return [
+        Suggestion(
+            f"city:{city_id}", "city", name,
+            (100.0 / ranking if ranking and ranking > 0 else 0.0) + (hotel_count or 0),
+            (("id", city_id), ("state", state))
+        )
+        for city_id, name, state, ranking, hotel_count in query
+    ]
+
+
+def load_hotels(db: Session, ids: Optional[Iterable[int]] = None) -> List[Suggestion]:
+    query = db.query(Hotel.id, Hotel.name, Hotel.location, Hotel.star_rating).filter(Hotel.is_available == True)
+    if ids is not None:
+        query = query.filter(Hotel.id.in_(list(ids)))
+    rows = query.all()
+    bookings = _booking_counts(
+        db, "hotel", Booking.hotel_name, None if ids is None else {row.name for row in rows}
+    )
+    return [
+        Suggestion(
+            f"hotel:{hotel_id}", "hotel", name,
+            float(rating or 0) + bookings.get(name, 0) * BOOKING_WEIGHT,
+            (("id", hotel_id), ("location", location), ("rating", rating or 0))
+        )
+        for hotel_id, name, location, rating in rows
+    ]
+
+
+def load_cars(db: Session) -> List[Suggestion]:
+    """One suggestion per make and model, scored by fleet size and bookings"""
+    bookings = _booking_counts(db, "car", Booking.car_name)
+    groups: Dict[str, List[Any]] = {}
+    for make, model, category, name in db.query(Car.make, Car.model, Car.category, Car.name).filter(
+        Car.is_available == True
+    ):
+        label = f"{make} {model}"
+        group = groups.setdefault(normalize(label), [label, make, model, category, 0.0])
+        group[4] += 1 + bookings.get(name, 0) * BOOKING_WEIGHT
+    return [
+        Suggestion(f"car:{key}", "car", label, score, (("make", make), ("model", model), ("category", category)))
+        for key, (label, make, model, category, score) in groups.items()
+    ]
+
+
+def load_entries(db: Session, keys: Optional[Iterable[str]] = None) -> List[Suggestion]:
+    """Load every entry, or those for the changed "<type>:<id>" keys"""
+    if keys is None:
+        return load_states(db) + load_cities(db) + load_hotels(db) + load_cars(db)
+    keys = set(keys)
+    ids: Dict[str, List[int]] = defaultdict(list)
+    for key in keys:
+        kind, _, entry_id = key.partition(":")
+        if entry_id:
+            ids[kind].append(int(entry_id))
+    entries = []
+    for kind, loader in (("state", load_states), ("city", load_cities), ("hotel", load_hotels)):
+        if ids[kind]:
+            entries.extend(loader(db, ids[kind]))
+    if CARS in keys:
+        entries.extend(load_cars(db))
+    return entries
+
+
+class SuggestionIndex(SyncedIndex):
+    """Typeahead over states, cities, hotels and car models.
+
+    A sorted array of (token, key) pairs answers a prefix with two
+    bisects; every word of a name starts a token. Prefixes broad enough
+    to match more than SCAN_LIMIT tokens keep their top MAX_SUGGESTIONS
+    keys by popularity, patched in place as entries change, so no
+    keystroke ranks more than SCAN_LIMIT entries. Like the hotel search
+    index it is only mutated on the event loop.
+    """
+
+    label = "Suggestion index"
+    broadcast_field = BROADCAST_FIELD
+
+    def __init__(self):
+        super().__init__()
+        self.version = 0
+        self._entries: Dict[str, Suggestion] = {}
+        self._tokens: List[Tuple[str, str]] = []
+        self._top: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, db: Session, keys: Optional[Iterable[str]] = None) -> List[Suggestion]:
+        return load_entries(db, keys)
+
+    def key_of(self, entry: Suggestion) -> str:
+        return entry.key
+
+    def changed_key(self, obj: Any) -> str:
+        kind = MODEL_TYPES[type(obj)]
+        return CARS if kind == CARS else f"{kind}:{obj.id}"
+
+    def _rank(self, key: str):
+        entry = self._entries[key]
+        return -entry.score, entry.name, key
+
+    def build(self, entries: Iterable[Suggestion]):
+        """Replace the whole index"""
+        self._entries = {entry.key: entry for entry in entries}
+        self._tokens = sorted(
+            (token, entry.key) for entry in self._entries.values() for token in tokens(entry.name)
+        )
+        self._top = {}
+        # The shortest prefixes match the most; rank them up front
+        for prefix in {token[:n] for token, _ in self._tokens for n in (1, 2)}:
+            self._ranked(prefix)
+        self.ready = True
+        self.version += 1
+
+    def upsert(self, entry: Suggestion):
+        """Add or replace one entry"""
+        self.remove(entry.key)
+        self._entries[entry.key] = entry
+        rank = self._rank(entry.key)
+        for token in tokens(entry.name):
+            bisect.insort(self._tokens, (token, entry.key))
+            for prefix in self._prefixes(token):
+                top = self._top.get(prefix)
+                if top is None or entry.key in top:
+                    continue
+                position = bisect.bisect_left(top, rank, key=self._rank)
+                if position < MAX_SUGGESTIONS:
+                    top.insert(position, entry.key)
+                    del top[MAX_SUGGESTIONS:]
+        self.version += 1
+
+    def remove(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        for token in tokens(entry.name):
+            i = bisect.bisect_left(self._tokens, (token, key))
+            if i < len(self._tokens) and self._tokens[i] == (token, key):
+                del self._tokens[i]
+            for prefix in self._prefixes(token):
+                top = self._top.get(prefix)
+                if top is not None and key in top:
+                    # The runner-up is unknown; rank again on the next lookup
+                    del self._top[prefix]
+        del self._entries[key]
+        self.version += 1
+
+    @staticmethod
+    def _prefixes(token: str) -> Iterable[str]:
+        return (token[:n] for n in range(1, len(token) + 1))
+
+    def _ranked(self, prefix: str) -> List[str]:
+        """Keys matching prefix, most popular first, at most MAX_SUGGESTIONS"""
+        top = self._top.get(prefix)
+        if top is not None:
+            return top
+        lo = bisect.bisect_left(self._tokens, (prefix,))
+        hi = bisect.bisect_left(self._tokens, (prefix + "\U0010ffff",), lo)
+        keys = {key for _, key in self._tokens[lo:hi]}
+        top = heapq.nsmallest(MAX_SUGGESTIONS, keys, key=self._rank)
+        if hi - lo > SCAN_LIMIT:
+            self._top[prefix] = top
+        return top
+
+    def search(self, query: str, limit: int = 10) -> Optional[List[Suggestion]]:
+        """Most popular entries with a word starting with query, or None before the first build"""
+        if not self.ready:
+            return None
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        return [self._entries[key] for key in self._ranked(prefix)[:limit]]
+
+    async def keep_fresh(self, interval: int):
+        """Rebuild now and every interval seconds.
+
+        Row changes are applied as they commit; the periodic rebuild
+        picks up booking counts and renamed states shown with cities.
+        """
+        while True:
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.error(f"Suggestion index rebuild failed: {e}")
+            await asyncio.sleep(interval)
+
+    def stale_keys(self, keys: Set[str]) -> Set[str]:
+        stale = {key for key in keys if ":" in key}
+        if CARS in keys:
+            stale.update(key for key in self._entries if key.startswith(f"{CARS}:"))
+        return stale
+
+
+suggestion_index = SuggestionIndex()
+suggestion_index.track(tuple(MODEL_TYPES), PENDING_KEY)
@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import date
+from itertools import chain
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import run_in_session
+from app.external.cars.car_base import CarRentalAPIBase
+from app.external.cars.hertz import HertzAPI
+from app.external.hotels.booking_com import BookingComAPI
+from app.external.hotels.hotel_base import HotelAPIBase
+from app.external.supplier_base import SupplierAPIBase
+from app.models.car import Car
+from app.models.hotel import Hotel
+from app.services.car_availability import busy_cars, parse_window
+from app.services.fx_rates import RateSnapshot
+from app.services.room_inventory import get_calendar
+from app.utils.cache import cache_manager
+from app.utils.cache_keys import build_cache_key
+from app.utils.text_search import contains
+
+logger = logging.getLogger(__name__)
+
+LOCAL = "local"
+# Supplier outcomes; timeouts and errors make the results partial
+OK = "ok"
+CACHED = "cached"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+
+class SupplierResult(NamedTuple):
+    """What one supplier returned for a search"""
+    supplier: str
+    status: str
+    items: List[Dict[str, Any]]
+    elapsed_ms: float
+
+    def summary(self) -> Dict[str, Any]:
+        return {"status": self.status, "count": len(self.items), "elapsed_ms": round(self.elapsed_ms, 1)}
+
+
+def dedupe_key(name: Optional[str]) -> str:
+    """Listings of one property or car model: the name, ignoring case and punctuation"""
+    return " ".join(re.findall(r"\w+", (name or "").casefold()))
+
+
+def convert_offers(offers: Iterable[Dict[str, Any]], rates: RateSnapshot, currency: str) -> List[Dict[str, Any]]:
+    """Supplier offers priced in currency; offers without a usable price are left out"""
+    converted = []
+    for offer in offers:
+        try:
+            price = rates.convert(offer["price"], offer["currency"], currency)
+        except (KeyError, TypeError, ValueError, ArithmeticError):
+            continue
+        converted.append({**offer, "source": offer["supplier"], "price": price, "currency": currency})
+    return converted
+
+
+def merge_offers(local: Sequence[Dict[str, Any]], offers: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Local rows plus the cheapest supplier offer for everything not listed locally, by price.
+
+    Local rows are never merged with each other (two cars of one model
+    are two cars); supplier offers matching a local row are dropped, as
+    the local listing is booked in-house.
+    """
+    seen = {dedupe_key(item["name"]) for item in local}
+    best: Dict[str, Dict[str, Any]] = {}
+    for offer in offers:
+        key = dedupe_key(offer["name"])
+        if not key or key in seen:
+            continue
+        if key not in best or offer["price"] < best[key]["price"]:
+            best[key] = offer
+    return sorted(chain(local, best.values()), key=lambda item: item["price"])
+
+
+def load_local_hotels(
+    db: Session, location: str, currency: str, limit: int, check_in: date, check_out: date, rooms: int
+) -> Tuple[List[Dict[str, Any]], RateSnapshot]:
+    """The cheapest local hotels in location with rooms free for the stay, with the rates to price supplier offers.
+
+    Raises ValueError for a bad currency or a stay outside the inventory horizon.
+    """
+    from app.services.currency_service import CurrencyService
+
+    rates = CurrencyService.get_rates(db)
+    query = db.query(Hotel).filter(Hotel.is_available == True, contains([Hotel.location], location))\
+        .order_by(Hotel.price_per_night, Hotel.id)
+    # Sold-out hotels are left out before the limit, from the in-memory calendar
+    hotel_ids = [hotel_id for (hotel_id,) in query.with_entities(Hotel.id)]
+    available = get_calendar(db).available_many(hotel_ids, check_in, check_out, rooms)
+    hotel_ids = [hotel_id for hotel_id in hotel_ids if available[hotel_id]][:limit]
+    hotels = query.filter(Hotel.id.in_(hotel_ids)).all() if hotel_ids else []
+    prices = rates.convert_many(
+        [hotel.price_per_night for hotel in hotels],
+        [getattr(hotel, 'base_currency', 'NGN') for hotel in hotels], currency
+    )
+    return [{
+        "source": LOCAL,
+        "id": hotel.id,
+        "name": hotel.name,
+        "location": hotel.location,
+        "price": price,
+        "currency": currency,
+        "rating": float(hotel.star_rating),
+        "amenities": hotel.amenities or [],
+        "image_url": hotel.images[0] if hotel.images else None,
+    } for hotel, price in zip(hotels, prices)], rates
+
+
+def load_local_cars(
+    db: Session, location: str, currency: str, limit: int, pickup_date: date, return_date: date
+) -> Tuple[List[Dict[str, Any]], RateSnapshot]:
+    """The cheapest local cars in location free for the rental, with the rates to price supplier offers"""
+    from app.services.currency_service import CurrencyService
+
+    rates = CurrencyService.get_rates(db)
+    query = db.query(Car).filter(Car.is_available == True, contains([Car.location], location))
+    busy = busy_cars(db, *parse_window(pickup_date, return_date))
+    if busy:
+        query = query.filter(Car.id.notin_(sorted(busy)))
+    cars = query.order_by(Car.price_per_day, Car.id).limit(limit).all()
+    prices = rates.convert_many(
+        [car.price_per_day for car in cars], [getattr(car, 'base_currency', 'NGN') for car in cars], currency
+    )
+    return [{
+        "source": LOCAL,
+        "id": car.id,
+        "name": car.name or f"{car.make} {car.model}",
+        "make": car.make,
+        "model": car.model,
+        "category": car.category,
+        "location": car.location,
+        "price": price,
+        "currency": currency,
+        "transmission": car.transmission,
+        "passengers": car.seats,
+        "image_url": car.images[0] if car.images else None,
+    } for car, price in zip(cars, prices)], rates
+
+
+class SupplierAggregator:
+    """Fans a search out to every enabled supplier at once.
+
+    Each supplier gets its own deadline (its ``timeout``, else the
+    aggregator's); a supplier that misses it, or fails, is reported and
+    left out, so a search returns the partial results it has instead of
+    waiting on the slowest supplier. Each supplier's answer to a query is
+    cached for ``cache_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        hotel_suppliers: Sequence[HotelAPIBase] = (),
+        car_suppliers: Sequence[CarRentalAPIBase] = (),
+        timeout: float = None,
+        cache_ttl: int = None
+    ):
+        self.hotel_suppliers = list(hotel_suppliers)
+        self.car_suppliers = list(car_suppliers)
+        self.timeout = timeout or settings.SUPPLIER_TIMEOUT
+        self.cache_ttl = cache_ttl or settings.SUPPLIER_CACHE_TTL
+
+    async def _query(
+        self,
+        supplier: SupplierAPIBase,
+        kind: str,
+        params: Dict[str, Any],
+        call: Callable[[Any], Awaitable[List[Dict[str, Any]]]]
+    ) -> SupplierResult:
+        started = time.perf_counter()
+
+        def elapsed() -> float:
+            return (time.perf_counter() - started) * 1000
+
+        key = build_cache_key(f"supplier_{kind}", {"supplier": supplier.name, **params})
+        cached = await cache_manager.get(key)
+        if cached is not None:
+            return SupplierResult(supplier.name, CACHED, cached["items"], elapsed())
+        try:
+            items = await asyncio.wait_for(call(supplier), supplier.timeout or self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Supplier {supplier.name} missed its {kind} search deadline")
+            return SupplierResult(supplier.name, TIMEOUT, [], elapsed())
+        except Exception as e:
+            logger.warning(f"Supplier {supplier.name} {kind} search failed: {e}")
+            return SupplierResult(supplier.name, ERROR, [], elapsed())
+        await cache_manager.set(key, {"items": items}, self.cache_ttl)
+        return SupplierResult(supplier.name, OK, items, elapsed())
+
+    async def fan_out(
+        self,
+        suppliers: Sequence[SupplierAPIBase],
+        kind: str,
+        params: Dict[str, Any],
+        call: Callable[[Any], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[SupplierResult]:
+        """Query the suppliers concurrently; never raises"""
+        return list(await asyncio.gather(*(self._query(supplier, kind, params, call) for supplier in suppliers)))
+
+    async def search_hotels(self, location: str, check_in: date, check_out: date, guests: int, rooms: int) -> List[SupplierResult]:
+        params = {
+            "location": location.strip().casefold(), "check_in": check_in.isoformat(),
+            "check_out": check_out.isoformat(), "guests": guests, "rooms": rooms,
+        }
+        return await self.fan_out(
+            self.hotel_suppliers, "hotels", params,
+            lambda supplier: supplier.search_hotels(location, check_in, check_out, guests, rooms)
+        )
+
+    async def search_cars(self, location: str, pickup_date: date, return_date: date) -> List[SupplierResult]:
+        params = {
+            "location": location.strip().casefold(), "pickup_date": pickup_date.isoformat(),
+            "return_date": return_date.isoformat(),
+        }
+        return await self.fan_out(
+            self.car_suppliers, "cars", params,
+            lambda supplier: supplier.search_cars(location, location, pickup_date, return_date)
+        )
+
+
+def build_supplier_aggregator() -> SupplierAggregator:
+    """Suppliers with an API key configured"""
+    hotel_suppliers, car_suppliers = [], []
+    if settings.BOOKING_COM_API_KEY:
+        hotel_suppliers.append(BookingComAPI(settings.BOOKING_COM_API_KEY, settings.BOOKING_COM_API_URL))
+    if settings.HERTZ_API_KEY:
+        car_suppliers.append(HertzAPI(settings.HERTZ_API_KEY, settings.HERTZ_API_URL))
+    return SupplierAggregator(hotel_suppliers, car_suppliers)
+
+
+_aggregator: Optional[SupplierAggregator] = None
+
+
+def get_supplier_aggregator() -> SupplierAggregator:
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = build_supplier_aggregator()
+    return _aggregator
+
+
+def _merged_response(
+    kind: str,
+    local: List[Dict[str, Any]],
+    rates: RateSnapshot,
+    results: List[SupplierResult],
+    currency: str,
+    limit: int
+) -> Dict[str, Any]:
+    offers = convert_offers(chain.from_iterable(result.items for result in results), rates, currency)
+    merged = merge_offers(local, offers)[:limit]
+    return {
+        kind: merged,
+        "total": len(merged),
+        "currency": currency,
+        "suppliers": {result.supplier: result.summary() for result in results},
+        "partial": any(result.status in (TIMEOUT, ERROR) for result in results),
+    }
+
+
+async def search_all_hotels(
+    location: str, check_in: date, check_out: date, guests: int, rooms: int, currency: str, limit: int,
+    aggregator: SupplierAggregator = None
+) -> Dict[str, Any]:
+    """Local hotels with rooms free and supplier offers, deduplicated, cheapest first.
+
+    Raises ValueError for a bad currency or a stay outside the inventory horizon.
+    """
+    aggregator = aggregator or get_supplier_aggregator()
+    (local, rates), results = await asyncio.gather(
+        run_in_threadpool(run_in_session, load_local_hotels, location, currency, limit, check_in, check_out, rooms),
+        aggregator.search_hotels(location, check_in, check_out, guests, rooms)
+    )
+    return _merged_response("hotels", local, rates, results, currency, limit)
+
+
+async def search_all_cars(
+    location: str, pickup_date: date, return_date: date, currency: str, limit: int,
+    aggregator: SupplierAggregator = None
+) -> Dict[str, Any]:
+    """Local cars free for the rental and supplier offers, deduplicated, cheapest first (raises ValueError for a bad currency)"""
+    aggregator = aggregator or get_supplier_aggregator()
+    (local, rates), results = await asyncio.gather(
+        run_in_threadpool(run_in_session, load_local_cars, location, currency, limit, pickup_date, return_date),
+        aggregator.search_cars(location, pickup_date, return_date)
+    )
+    return _merged_response("cars", local, rates, results, currency, limit)
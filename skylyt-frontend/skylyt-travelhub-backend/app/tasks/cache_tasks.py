@@ -0,0 +1,26 @@
+import asyncio
+from app.core.redis import RedisService
+from app.tasks.email_tasks import celery_app
+from app.utils.cache import cache_warmer
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def _warm_search_cache():
+    try:
+        return await cache_warmer.warm_popular_searches()
+    finally:
+        # The async pool belongs to this short-lived event loop
+        await RedisService.close_async()
+
+
+@celery_app.task
+def warm_search_cache():
+    """Re-run the most requested hotel and car searches"""
+    try:
+        warmed = asyncio.run(_warm_search_cache())
+        return {"status": "completed", "warmed": warmed}
+    except Exception as e:
+        logger.error(f"Search cache warming failed: {str(e)}")
+        raise
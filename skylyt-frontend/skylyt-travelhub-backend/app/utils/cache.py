@@ -1,76 +1,637 @@
-import redis
+import asyncio
 import json
-import pickle
-from typing import Any, Optional, Union, Dict
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Iterable, NamedTuple, Optional, Union, Dict, List
 from datetime import timedelta
-import hashlib
+from functools import wraps
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.redis import get_async_redis
+from app.utils.cache_local import LocalCache
+from app.utils.cache_keys import build_cache_key
+from app.utils.cache_serialization import CachedResponse, CacheSerializer
+from app.monitoring.metrics import metrics_collector
+
+logger = logging.getLogger(__name__)
+
+# Deletes the fill lock only if this caller still owns it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Records ARGV[1] in the tag sets KEYS, scored by when it expires (ARGV[2],
+# "inf" without a TTL), drops members expired at ARGV[3] and keeps each set
+# alive exactly as long as its longest-lived member
+TAG_KEY_SCRIPT = """
+for _, tag_key in ipairs(KEYS) do
+    redis.call("zadd", tag_key, ARGV[2], ARGV[1])
+    redis.call("zremrangebyscore", tag_key, "-inf", ARGV[3])
+    local last = redis.call("zrange", tag_key, -1, -1, "withscores")[2]
+    if last == "inf" then
+        redis.call("persist", tag_key)
+    else
+        redis.call("expireat", tag_key, math.ceil(tonumber(last)))
+    end
+end
+return #KEYS
+"""
+
+
+class CacheStats:
+    """Process-wide cache counters shared by every cache user"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.deletes = 0
+        self.errors = 0
+        self.computes = 0
+        self.coalesced = 0
+        self.lock_waits = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "deletes": self.deletes,
+            "errors": self.errors,
+            "computes": self.computes,
+            "coalesced": self.coalesced,
+            "lock_waits": self.lock_waits,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CacheEntry(NamedTuple):
+    """A value served by ``get_or_compute_entry`` with its age in seconds"""
+    value: Any
+    age: float
+    stale: bool
+    hit: bool = True
+
 
 class CacheManager:
-    def __init__(self, redis_url: str = None):
-        self.redis_client = redis.from_url(redis_url or settings.REDIS_URL)
-    
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+    """Single async cache used by every router and service.
+
+    Reads go through a per-worker in-process LRU (L1) before Dragonfly
+    (L2). All keys are prefixed with ``settings.CACHE_NAMESPACE`` and all
+    L2 I/O goes through the shared asyncio connection pool in
+    ``app.core.redis``, so cache access never blocks the event loop.
+    Writes and deletes are broadcast on a pub/sub channel so every worker
+    drops its stale L1 copy. Cache failures are logged and treated as
+    misses.
+
+    ``get_or_compute`` adds single-flight protection for expensive misses:
+    concurrent callers in a worker share one computation, and workers on
+    different nodes coordinate through a short Dragonfly lock. Given a
+    ``soft_ttl`` it also serves stale-while-revalidate: entries older than
+    the soft TTL are returned immediately while one background refresh
+    runs, until the hard TTL (``expire``) drops them.
+
+    Invalidation never scans the keyspace. Every stored key is added to a
+    Dragonfly sorted set for its namespace (the key prefix before the
+    first ``:``) and for any extra tags, scored by when the key expires,
+    and invalidating a namespace or tag deletes exactly the live members
+    of that set. Expired members are pruned whenever a set is written.
+    """
+
+    lock_timeout = 10.0
+    lock_poll_interval = 0.05
+    invalidation_batch_size = 500
+
+    def __init__(
+        self,
+        namespace: str = None,
+        local_cache: LocalCache = None,
+        serializer: CacheSerializer = None
+    ):
+        self.namespace = namespace or settings.CACHE_NAMESPACE
+        self.stats = CacheStats()
+        self.local = local_cache or LocalCache(
+            max_entries=settings.CACHE_L1_MAX_ENTRIES,
+            default_ttl=settings.CACHE_L1_TTL,
+        )
+        self.serializer = serializer or CacheSerializer.from_settings()
+        self.channel = f"{self.namespace}:invalidate"
+        self.worker_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._broadcast_handlers: List[Callable[[Optional[Dict[str, Any]]], None]] = []
+
+    @property
+    def client(self):
+        return get_async_redis()
+
+    def make_key(self, key: str) -> str:
+        """Prefix key with the cache namespace"""
+        return f"{self.namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return self.make_key(f"tag:{tag}")
+
+    @staticmethod
+    def _namespace_tag(prefix: str) -> str:
+        return f"ns:{prefix}"
+
+    def _key_tags(self, key: str, tags: Iterable[str]) -> List[str]:
+        """Tag sets a key belongs to: its namespace plus any explicit tags"""
+        return [self._namespace_tag(key.split(":", 1)[0]), *tags]
+
+    def _serialize(self, value: Any) -> bytes:
+        return self.serializer.dumps(value)
+
+    def _deserialize(self, raw: bytes) -> Optional[Any]:
+        """Decode a stored value; unreadable entries are treated as misses"""
         try:
-            value = self.redis_client.get(key)
-            if value is None:
-                return None
-            
-            # Try to deserialize as JSON first, then pickle
+            return self.serializer.loads(raw)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache value could not be decoded: {e}")
+            return None
+
+    @staticmethod
+    def _ttl_seconds(expire: Union[int, timedelta, None]) -> Optional[int]:
+        if isinstance(expire, timedelta):
+            return int(expire.total_seconds())
+        return expire
+
+    def _invalidation_message(self, keys: List[str] = None, patterns: List[str] = None, **extra) -> bytes:
+        return json.dumps({
+            "origin": self.worker_id,
+            "keys": keys or [],
+            "patterns": patterns or [],
+            **extra,
+        }).encode()
+
+    def add_broadcast_handler(self, handler: Callable[[Optional[Dict[str, Any]]], None]):
+        """Also pass broadcasts from other workers to ``handler``.
+
+        Lets other in-process state ride on the invalidation channel.
+        ``handler`` is called with None after a reconnect, since
+        broadcasts may have been missed while disconnected.
+        """
+        self._broadcast_handlers.append(handler)
+
+    async def broadcast(self, **fields) -> bool:
+        """Publish extra fields to every other worker's broadcast handlers"""
+        try:
+            await self.client.publish(self.channel, self._invalidation_message(**fields))
+            return True
+        except Exception as e:
+            logger.warning(f"Cache broadcast failed: {e}")
+            return False
+
+    def _notify_handlers(self, message: Optional[Dict[str, Any]]):
+        for handler in self._broadcast_handlers:
             try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return pickle.loads(value)
-        except Exception:
+                handler(message)
+            except Exception as e:
+                logger.warning(f"Cache broadcast handler failed: {e}")
+
+    async def get(self, key: str, local: bool = True) -> Optional[Any]:
+        """Get value from cache, checking the in-process tier first"""
+        full_key = self.make_key(key)
+        if local:
+            value = self.local.get(full_key)
+            if value is not None:
+                return value
+
+        # An invalidation arriving while L2 is read must not be undone by the L1 fill
+        generation = self.local.generation
+        try:
+            raw = await self.client.get(full_key)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache get failed for {key}: {e}")
             return None
-    
+
+        value = self._deserialize(raw) if raw is not None else None
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        if local:
+            self.local.set(full_key, value, generation=generation)
+        return value
+
+    async def mget(self, keys: List[str], local: bool = True) -> List[Optional[Any]]:
+        """Get several values in one round trip; missing keys yield None"""
+        if not keys:
+            return []
+        full_keys = [self.make_key(k) for k in keys]
+        results: List[Optional[Any]] = [
+            self.local.get(k) if local else None for k in full_keys
+        ]
+        pending = [i for i, value in enumerate(results) if value is None]
+        if not pending:
+            return results
+
+        generation = self.local.generation
+        try:
+            values = await self.client.mget([full_keys[i] for i in pending])
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache mget failed: {e}")
+            return results
+
+        for i, raw in zip(pending, values):
+            value = self._deserialize(raw) if raw is not None else None
+            if value is None:
+                self.stats.misses += 1
+                continue
+            self.stats.hits += 1
+            results[i] = value
+            if local:
+                self.local.set(full_keys[i], results[i], generation=generation)
+        return results
+
     async def set(
-        self, 
-        key: str, 
-        value: Any, 
-        expire: Union[int, timedelta] = None
+        self,
+        key: str,
+        value: Any,
+        expire: Union[int, timedelta] = None,
+        local: bool = True,
+        tags: Iterable[str] = ()
     ) -> bool:
-        """Set value in cache"""
+        """Set value in both tiers and tell other workers to drop their copy.
+
+        The key is recorded in its namespace and tag sets in the same
+        transaction, so a concurrent invalidation either sees both the
+        value and its membership or neither. Tag sets expire with their
+        longest-lived member, and never while they hold a key without a TTL.
+        """
+        full_key = self.make_key(key)
+        ttl = self._ttl_seconds(expire)
+        tag_keys = [self._tag_key(tag) for tag in self._key_tags(key, tags)]
+        now = time.time()
         try:
-            # Try to serialize as JSON first, then pickle
-            try:
-                serialized = json.dumps(value)
-            except (TypeError, ValueError):
-                serialized = pickle.dumps(value)
-            
-            if expire:
-                if isinstance(expire, timedelta):
-                    expire = int(expire.total_seconds())
-                return self.redis_client.setex(key, expire, serialized)
-            else:
-                return self.redis_client.set(key, serialized)
-        except Exception:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.set(full_key, self._serialize(value), ex=ttl)
+                pipe.eval(TAG_KEY_SCRIPT, len(tag_keys), *tag_keys, full_key, now + ttl if ttl else "inf", now)
+                pipe.publish(self.channel, self._invalidation_message(keys=[full_key]))
+                await pipe.execute()
+            self.stats.sets += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache set failed for {key}: {e}")
+            self.local.delete([full_key])
             return False
-    
-    async def delete(self, key: str) -> bool:
-        """Delete key from cache"""
+
+        if local:
+            self.local.set(full_key, value, ttl)
+        return True
+
+    async def delete(self, *keys: str) -> bool:
+        """Delete one or more keys from every tier and every worker"""
+        if not keys:
+            return False
+        full_keys = [self.make_key(k) for k in keys]
+        self.local.delete(full_keys)
         try:
-            return bool(self.redis_client.delete(key))
-        except Exception:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.delete(*full_keys)
+                pipe.publish(self.channel, self._invalidation_message(keys=full_keys))
+                deleted, _ = await pipe.execute()
+            self.stats.deletes += deleted
+            return bool(deleted)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache delete failed: {e}")
             return False
-    
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         try:
-            return bool(self.redis_client.exists(key))
+            return bool(await self.client.exists(self.make_key(key)))
         except Exception:
+            self.stats.errors += 1
             return False
-    
-    async def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching pattern"""
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key recorded under any of the given tags.
+
+        Each tag set is read and dropped in one MULTI/EXEC, so keys tagged
+        concurrently land in a fresh set instead of being lost. Members
+        already expired are skipped; the cost is proportional to the live
+        members, not the keyspace.
+        """
+        deleted = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            try:
+                async with self.client.pipeline(transaction=True) as pipe:
+                    pipe.zrangebyscore(tag_key, time.time(), "+inf")
+                    pipe.delete(tag_key)
+                    members, _ = await pipe.execute()
+                keys = sorted(k.decode() if isinstance(k, bytes) else k for k in members)
+                self.local.delete(keys)
+                for i in range(0, len(keys), self.invalidation_batch_size):
+                    batch = keys[i:i + self.invalidation_batch_size]
+                    async with self.client.pipeline(transaction=False) as pipe:
+                        pipe.unlink(*batch)
+                        pipe.publish(self.channel, self._invalidation_message(keys=batch))
+                        removed, _ = await pipe.execute()
+                    deleted += removed
+            except Exception as e:
+                self.stats.errors += 1
+                logger.warning(f"Cache invalidation failed for tag {tag}: {e}")
+        self.stats.deletes += deleted
+        return deleted
+
+    async def invalidate_namespace(self, *prefixes: str) -> int:
+        """Delete every key whose prefix is one of ``prefixes``"""
+        return await self.invalidate_tags(*(self._namespace_tag(p) for p in prefixes))
+
+    async def clear_all(self) -> int:
+        """Drop the whole cache namespace.
+
+        Meant for maintenance scripts: it walks the namespace with SCAN,
+        which does not block Dragonfly but is proportional to its size.
+        """
+        full_pattern = self.make_key("*")
+        self.local.clear()
+        deleted = 0
+        batch: List[Any] = []
+        try:
+            async for key in self.client.scan_iter(match=full_pattern, count=1000):
+                batch.append(key)
+                if len(batch) >= self.invalidation_batch_size:
+                    deleted += await self.client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.client.unlink(*batch)
+            await self.client.publish(
+                self.channel, self._invalidation_message(patterns=[full_pattern])
+            )
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache clear failed: {e}")
+        self.stats.deletes += deleted
+        return deleted
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        expire: Union[int, timedelta] = None,
+        soft_ttl: Optional[float] = None,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """Return the cached value, computing it at most once on a miss"""
+        entry = await self.get_or_compute_entry(key, compute, expire, soft_ttl, tags)
+        return entry.value
+
+    async def get_or_compute_entry(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        expire: Union[int, timedelta] = None,
+        soft_ttl: Optional[float] = None,
+        tags: Iterable[str] = ()
+    ) -> CacheEntry:
+        """Like ``get_or_compute`` but also report the age of the value.
+
+        Callers in this worker that miss on the same key await a single
+        shared task, so cancelling one request does not abort the fill.
+        Exceptions from ``compute`` propagate to every waiter and nothing
+        is cached. ``compute`` may also be called after the request has
+        finished (background refresh), so it must not depend on
+        request-scoped resources such as the request's DB session.
+        """
+        envelope = await self.get(key)
+        if envelope is not None:
+            value, created_at = self._unwrap(envelope)
+            age = max(0.0, time.time() - created_at)
+            if soft_ttl is not None and age > soft_ttl:
+                self.stats.stale_hits += 1
+                metrics_collector.record_cache_staleness(key.split(":", 1)[0], age)
+                self._schedule_refresh(key, compute, expire, tags)
+                return CacheEntry(value, age, True)
+            return CacheEntry(value, age, False)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(key, compute, expire, tags))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats.coalesced += 1
+        return CacheEntry(await asyncio.shield(task), 0.0, False, hit=False)
+
+    def _schedule_refresh(self, key: str, compute: Callable[[], Awaitable[Any]], expire, tags=()):
+        """Start a background refresh unless one is already running here"""
+        if key in self._refreshing or key in self._inflight:
+            return
+        task = asyncio.ensure_future(self._refresh(key, compute, expire, tags))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, compute: Callable[[], Awaitable[Any]], expire, tags=()):
+        """Recompute a stale entry unless another node already is"""
+        lock_key = self.make_key(f"lock:{key}")
+        token = uuid.uuid4().hex
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
-            return 0
+            acquired = await self.client.set(
+                lock_key, token, nx=True, px=int(self.lock_timeout * 1000)
+            )
+        except Exception as e:
+            logger.warning(f"Cache lock failed for {key}: {e}")
+            acquired, token = True, None
+        if not acquired:
+            return
+
+        try:
+            self.stats.refreshes += 1
+            await self._compute_and_set(key, compute, expire, tags)
+        except Exception as e:
+            logger.warning(f"Background refresh failed for {key}: {e}")
+        finally:
+            if token:
+                await self._release_lock(lock_key, token)
+
+    async def _fill(self, key: str, compute: Callable[[], Awaitable[Any]], expire, tags=()) -> Any:
+        """Compute and store a value while holding the cross-node fill lock"""
+        lock_key = self.make_key(f"lock:{key}")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_timeout
+
+        while True:
+            token = uuid.uuid4().hex
+            try:
+                acquired = await self.client.set(
+                    lock_key, token, nx=True, px=int(self.lock_timeout * 1000)
+                )
+            except Exception as e:
+                # Without Dragonfly we can still coalesce within this worker
+                logger.warning(f"Cache lock failed for {key}: {e}")
+                acquired, token = True, None
+
+            if acquired:
+                try:
+                    # Another node may have stored the value and released
+                    # the lock between our miss and this acquire
+                    value = await self._peek(key)
+                    if value is not None:
+                        return value
+                    return await self._compute_and_set(key, compute, expire, tags)
+                finally:
+                    if token:
+                        await self._release_lock(lock_key, token)
+
+            # Another node is filling this key; wait for its result
+            self.stats.lock_waits += 1
+            while loop.time() < deadline:
+                await asyncio.sleep(self.lock_poll_interval)
+                value = await self._peek(key)
+                if value is not None:
+                    return value
+                if not await self._lock_held(lock_key):
+                    # Holder gave up without storing a value; try to take over
+                    break
+            else:
+                logger.warning(f"Timed out waiting for cache fill of {key}")
+                return await self._compute_and_set(key, compute, expire, tags)
+
+    async def _compute_and_set(
+        self, key: str, compute: Callable[[], Awaitable[Any]], expire, tags=()
+    ) -> Any:
+        self.stats.computes += 1
+        value = await compute()
+        await self.set(key, self._wrap(value), expire, tags=tags)
+        return value
+
+    @staticmethod
+    def _wrap(value: Any) -> Any:
+        """Pair a computed value with its creation time for SWR"""
+        if isinstance(value, CachedResponse):
+            # Carries its own timestamp, and must stay a CachedResponse so
+            # the serializer frames its bytes instead of encoding them
+            return value
+        return {"v": value, "t": time.time()}
+
+    @staticmethod
+    def _unwrap(envelope: Any):
+        if isinstance(envelope, CachedResponse):
+            return envelope, envelope.created_at
+        return envelope["v"], envelope["t"]
+
+    async def _peek(self, key: str) -> Optional[Any]:
+        """Read L2 directly without touching hit/miss counters"""
+        generation = self.local.generation
+        try:
+            raw = await self.client.get(self.make_key(key))
+        except Exception:
+            return None
+        envelope = self._deserialize(raw) if raw is not None else None
+        if envelope is None:
+            return None
+        self.local.set(self.make_key(key), envelope, generation=generation)
+        return self._unwrap(envelope)[0]
+
+    async def _lock_held(self, lock_key: str) -> bool:
+        try:
+            return bool(await self.client.exists(lock_key))
         except Exception:
-            return 0
+            return False
+
+    async def _release_lock(self, lock_key: str, token: str):
+        try:
+            await self.client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.warning(f"Cache lock release failed for {lock_key}: {e}")
+
+    async def wait_for_refreshes(self):
+        """Wait for the background refreshes running in this process"""
+        if self._refreshing:
+            await asyncio.gather(*list(self._refreshing.values()), return_exceptions=True)
+
+    async def ping(self) -> bool:
+        try:
+            return bool(await self.client.ping())
+        except Exception:
+            return False
+
+    def handle_invalidation(self, payload: Union[str, bytes]):
+        """Apply an invalidation broadcast from another worker to L1"""
+        try:
+            message = json.loads(payload)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.worker_id:
+            return
+        self.local.delete(message.get("keys", []))
+        for pattern in message.get("patterns", []):
+            self.local.delete_pattern(pattern)
+        self._notify_handlers(message)
+
+    async def listen_for_invalidations(self):
+        """Subscribe to the invalidation channel until cancelled.
+
+        On reconnect the whole L1 is dropped, since broadcasts may have
+        been missed while disconnected.
+        """
+        backoff = 1
+        while True:
+            try:
+                pubsub = self.client.pubsub()
+                await pubsub.subscribe(self.channel)
+                self.local.clear()
+                self._notify_handlers(None)
+                backoff = 1
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self.handle_invalidation(message["data"])
+                finally:
+                    await pubsub.unsubscribe(self.channel)
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener lost connection: {e}")
+                self.local.clear()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def start_invalidation_listener(self):
+        """Start the pub/sub listener on the running loop"""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self.listen_for_invalidations())
+
+    async def stop_invalidation_listener(self):
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-tier cache hit/miss statistics"""
+        return {
+            "namespace": self.namespace,
+            "l1": self.local.get_stats(),
+            "l2": self.stats.as_dict(),
+        }
+
+def search_tags(search_type: str = None) -> List[str]:
+    """Tags for a cached search: every search, then its type if known"""
+    return ["search", f"search:{search_type}"] if search_type else ["search"]
+
 
 class SearchCache:
     def __init__(self, cache_manager: CacheManager):
@@ -79,10 +640,7 @@ class SearchCache:
     
     def _generate_search_key(self, search_params: Dict) -> str:
         """Generate cache key for search parameters"""
-        # Sort parameters for consistent key generation
-        sorted_params = json.dumps(search_params, sort_keys=True)
-        hash_key = hashlib.md5(sorted_params.encode()).hexdigest()
-        return f"search:{hash_key}"
+        return build_cache_key("search", search_params)
     
     async def get_search_results(self, search_params: Dict) -> Optional[Dict]:
         """Get cached search results"""
@@ -97,12 +655,13 @@ class SearchCache:
     ) -> bool:
         """Cache search results"""
         key = self._generate_search_key(search_params)
-        return await self.cache.set(key, results, ttl or self.default_ttl)
+        return await self.cache.set(
+            key, results, ttl or self.default_ttl, tags=search_tags(search_params.get("search_type"))
+        )
     
     async def invalidate_search_cache(self, search_type: str = None):
-        """Invalidate search cache"""
-        pattern = f"search:*" if not search_type else f"search:{search_type}:*"
-        return await self.cache.clear_pattern(pattern)
+        """Invalidate all cached searches, or only those of one type"""
+        return await self.cache.invalidate_tags(search_tags(search_type)[-1])
 
 class UserSessionCache:
     def __init__(self, cache_manager: CacheManager):
@@ -131,9 +690,7 @@ class APIResponseCache:
     
     def _generate_api_key(self, endpoint: str, params: Dict) -> str:
         """Generate cache key for API response"""
-        key_data = f"{endpoint}:{json.dumps(params, sort_keys=True)}"
-        hash_key = hashlib.md5(key_data.encode()).hexdigest()
-        return f"api:{hash_key}"
+        return build_cache_key("api", {"endpoint": endpoint, "params": params})
     
     async def get_cached_response(self, endpoint: str, params: Dict) -> Optional[Any]:
         """Get cached API response"""
@@ -153,22 +710,75 @@ class APIResponseCache:
 
 # Cache warming functions
 class CacheWarmer:
+    """Pre-computes the most requested searches.
+
+    Parameter sets come from recent search history and bookings
+    (``SearchDemandService``) and run through the same cached code paths
+    as the search routes, at most ``CACHE_WARM_CONCURRENCY`` at a time,
+    so a cold cache after a deploy is filled without flooding Postgres.
+    A Dragonfly lock keeps workers and beat runs from warming at once.
+    """
+
+    search_types = ("hotel", "car")
+
     def __init__(self, cache_manager: CacheManager):
         self.cache = cache_manager
     
-    async def warm_popular_searches(self):
-        """Warm cache with popular search queries"""
-        popular_destinations = [
-            {"destination": "Lagos", "check_in": "2024-06-01", "check_out": "2024-06-03"},
-            {"destination": "Abuja", "check_in": "2024-06-01", "check_out": "2024-06-03"},
-            {"destination": "Port Harcourt", "check_in": "2024-06-01", "check_out": "2024-06-03"},
-        ]
+    @staticmethod
+    def _load_popular_searches(db: Session, limit: int) -> List[tuple]:
+        from app.services.search_demand_service import SearchDemandService
+        searches = []
+        for search_type in CacheWarmer.search_types:
+            for params in SearchDemandService.top_searches(
+                db, search_type, limit, settings.CACHE_WARM_LOOKBACK_DAYS
+            ):
+                searches.append((search_type, params))
+        return searches
+    
+    async def warm_popular_searches(self, limit: int = None) -> Dict[str, int]:
+        """Run the top searches of each type; returns how many were warmed"""
+        from fastapi.concurrency import run_in_threadpool
+        from app.api.v1.cars import cached_car_search
+        from app.api.v1.hotels import cached_hotel_search
+        from app.core.database import run_in_session
+        
+        lock_key = self.cache.make_key("lock:cache_warmer")
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.cache.client.set(
+                lock_key, token, nx=True, px=settings.CACHE_WARM_LOCK_TIMEOUT * 1000
+            )
+        except Exception as e:
+            logger.warning(f"Cache warming skipped, lock unavailable: {e}")
+            return {}
+        if not acquired:
+            logger.info("Cache warming already running elsewhere")
+            return {}
+        
+        runners = {"hotel": cached_hotel_search, "car": cached_car_search}
+        pool = asyncio.Semaphore(settings.CACHE_WARM_CONCURRENCY)
+        warmed = {search_type: 0 for search_type in self.search_types}
         
-        # This would typically call your search service
-        # For now, just cache placeholder data
-        for search in popular_destinations:
-            key = f"popular_search:{search['destination']}"
-            await self.cache.set(key, {"cached": True, "results": []}, 1800)  # 30 min
+        async def warm(search_type: str, params: Dict[str, Any]):
+            async with pool:
+                try:
+                    entry = await runners[search_type](**params)
+                    if entry.stale:
+                        # Keep stale refreshes inside the pool as well
+                        await self.cache.wait_for_refreshes()
+                    warmed[search_type] += 1
+                except Exception as e:
+                    logger.warning(f"Warming {search_type} search {params} failed: {e}")
+        
+        try:
+            searches = await run_in_threadpool(
+                run_in_session, self._load_popular_searches, limit or settings.CACHE_WARM_TOP_N
+            )
+            await asyncio.gather(*(warm(search_type, params) for search_type, params in searches))
+            logger.info(f"Cache warmed: {warmed}")
+            return warmed
+        finally:
+            await self.cache._release_lock(lock_key, token)
     
     async def warm_static_data(self):
         """Warm cache with static data like amenities, locations"""
@@ -186,4 +796,38 @@ cache_manager = CacheManager()
 search_cache = SearchCache(cache_manager)
 session_cache = UserSessionCache(cache_manager)
 api_cache = APIResponseCache(cache_manager)
-cache_warmer = CacheWarmer(cache_manager)
\ No newline at end of file
+cache_warmer = CacheWarmer(cache_manager)
+
+
+def call_key_params(args: tuple, kwargs: dict) -> Dict[str, Any]:
+    """Key parameters for a function call, ignoring database sessions"""
+    return {
+        "args": [a for a in args if not isinstance(a, Session)],
+        "kwargs": {k: v for k, v in kwargs.items() if not isinstance(v, Session)},
+    }
+
+
+def cache_result(key_prefix: str, ttl: int = 300):
+    """Cache the result of an async function in the shared cache"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = build_cache_key(key_prefix, call_key_params(args, kwargs))
+
+            # Try to get from cache
+            cached_result = await cache_manager.get(cache_key)
+            if cached_result is not None:
+                return cached_result
+
+            # Execute function and cache result
+            result = await func(*args, **kwargs)
+            await cache_manager.set(cache_key, result, ttl)
+            return result
+        return wrapper
+    return decorator
+
+
+def apply_cache_headers(response, entry: CacheEntry):
+    """Expose the age of a cached payload to clients"""
+    response.headers["Age"] = str(int(entry.age))
+    response.headers["X-Cache"] = "STALE" if entry.stale else ("HIT" if entry.hit else "MISS")
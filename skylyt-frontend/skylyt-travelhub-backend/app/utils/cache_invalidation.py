@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from itertools import chain
+from typing import Iterable, NamedTuple, Set, Tuple
+
+from anyio import from_thread
+from sqlalchemy import event
+
+from app.core.database import SessionLocal
+from app.core.redis import RedisService
+from app.utils.cache import cache_manager
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "cache_invalidations"
+
+# Keeps invalidations scheduled on the event loop from being collected
+_background_tasks: Set[asyncio.Task] = set()
+
+HOTEL_LISTINGS = ("hotels", "hotel_search", "featured_hotels", "destinations")
+CAR_LISTINGS = ("car_search", "featured_cars", "cars")
+PRICED_LISTINGS = HOTEL_LISTINGS + CAR_LISTINGS + ("hotel_detail", "car_detail")
+
+# Cache namespaces listing each model's rows
+MODEL_NAMESPACES = {
+    "Hotel": HOTEL_LISTINGS,
+    "HotelImage": HOTEL_LISTINGS,
+    "Car": CAR_LISTINGS,
+    "CarImage": CAR_LISTINGS,
+    # Every priced listing embeds converted prices and symbols
+    "Currency": PRICED_LISTINGS + ("currencies",),
+    "CurrencyRate": PRICED_LISTINGS,
+    "State": ("destinations",),
+    "City": ("destinations",),
+    "Settings": ("general_settings",),
+    "FooterSettings": ("footer_settings",),
+    "ContactSettings": ("contact_settings",),
+    "AboutSettings": ("about_settings",),
+}
+
+# Per-object detail entries: model -> (detail namespace, id attribute)
+MODEL_DETAILS = {
+    "Hotel": ("hotel_detail", "id"),
+    "HotelImage": ("hotel_detail", "hotel_id"),
+    "Car": ("car_detail", "id"),
+    "CarImage": ("car_detail", "car_id"),
+}
+
+MODEL_KEYS = {
+    "Currency": ("currency_rates",),
+    "CurrencyRate": ("currency_rates",),
+    # The in-memory room inventory calendar (app.services.room_inventory)
+    "RoomInventory": ("room_inventory",),
+    "Hotel": ("room_inventory",),
+}
+
+
+class Invalidation(NamedTuple):
+    """A cache namespace (``ns``), tag (``tag``) or key (``key``) to drop"""
+    kind: str
+    name: str
+
+
+def hotel_tag(hotel_id) -> str:
+    return f"hotel:{hotel_id}"
+
+
+def car_tag(car_id) -> str:
+    return f"car:{car_id}"
+
+
+DETAIL_TAGS = {"hotel_detail": hotel_tag, "car_detail": car_tag}
+
+
+def _model_invalidations(model: str) -> Set[Invalidation]:
+    return (
+        {Invalidation("ns", prefix) for prefix in MODEL_NAMESPACES.get(model, ())}
+        | {Invalidation("key", key) for key in MODEL_KEYS.get(model, ())}
+    )
+
+
+def invalidations_for(obj) -> Set[Invalidation]:
+    """Cache entries made stale by a change to one mapped object"""
+    model = type(obj).__name__
+    invalidations = _model_invalidations(model)
+    if model in MODEL_DETAILS:
+        namespace, id_attr = MODEL_DETAILS[model]
+        invalidations.add(Invalidation("tag", DETAIL_TAGS[namespace](getattr(obj, id_attr))))
+    return invalidations
+
+
+def bulk_invalidations_for(model: str) -> Set[Invalidation]:
+    """Cache entries made stale by a bulk UPDATE or DELETE of a model.
+
+    The affected rows are unknown, so detail entries go by namespace.
+    """
+    invalidations = _model_invalidations(model)
+    if model in MODEL_DETAILS:
+        invalidations.add(Invalidation("ns", MODEL_DETAILS[model][0]))
+    return invalidations
+
+
+async def apply_invalidations(invalidations: Iterable[Invalidation]) -> int:
+    """Drop the given namespaces, tags and keys from every cache tier"""
+    by_kind = {"ns": [], "tag": [], "key": []}
+    for invalidation in sorted(invalidations):
+        by_kind[invalidation.kind].append(invalidation.name)
+
+    deleted = 0
+    if by_kind["ns"]:
+        deleted += await cache_manager.invalidate_namespace(*by_kind["ns"])
+    if by_kind["tag"]:
+        deleted += await cache_manager.invalidate_tags(*by_kind["tag"])
+    if by_kind["key"] and await cache_manager.delete(*by_kind["key"]):
+        deleted += len(by_kind["key"])
+    return deleted
+
+
+async def _apply_in_fresh_loop(invalidations: Tuple[Invalidation, ...]) -> int:
+    try:
+        return await apply_invalidations(invalidations)
+    finally:
+        await RedisService.close_async()
+
+
+def dispatch_invalidations(invalidations: Set[Invalidation]):
+    """Run invalidations from synchronous code, whatever thread it is on.
+
+    Sync routes run in AnyIO worker threads and block until the cache is
+    clean, so the next read after a write never sees the old value. A
+    commit made on the event loop schedules the work instead, and
+    scripts or Celery tasks get a short-lived loop of their own.
+    """
+    invalidations = tuple(invalidations)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    try:
+        if loop is not None:
+            task = loop.create_task(apply_invalidations(invalidations))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            return
+        try:
+            from_thread.run(apply_invalidations, invalidations)
+        except RuntimeError:
+            # Not an AnyIO worker thread
+            asyncio.run(_apply_in_fresh_loop(invalidations))
+    except Exception as e:
+        logger.error(f"Cache invalidation after commit failed: {e}")
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def collect_invalidations(session, flush_context):
+    """Remember which cache entries the flushed changes make stale"""
+    pending = session.info.setdefault(PENDING_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        pending |= invalidations_for(obj)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def collect_bulk_invalidations(orm_execute_state):
+    """Bulk UPDATE/DELETE statements bypass flush events"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    pending = orm_execute_state.session.info.setdefault(PENDING_KEY, set())
+    pending |= bulk_invalidations_for(mapper.class_.__name__)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def invalidate_after_commit(session):
+    """Invalidate only once the changes are visible to other sessions"""
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        dispatch_invalidations(pending)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def discard_invalidations(session):
+    session.info.pop(PENDING_KEY, None)
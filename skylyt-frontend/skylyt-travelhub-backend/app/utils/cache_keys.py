@@ -0,0 +1,59 @@
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Optional
+
+# Bump when the shape of cached values changes so old entries are ignored
+CACHE_KEY_VERSION = "v3"
+
+
+def normalize_key_value(value: Any) -> Any:
+    """Reduce a parameter value to a canonical JSON-safe form.
+
+    None-valued dict entries are dropped so a missing filter and an
+    explicit ``None`` share a key, integral floats and Decimals collapse
+    to ints, and sets are sorted.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, Enum):
+        return normalize_key_value(value.value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else repr(value)
+    if isinstance(value, Decimal):
+        if value == value.to_integral_value():
+            return int(value)
+        return format(value.normalize(), "f")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {
+            str(k): normalize_key_value(v)
+            for k, v in value.items()
+            if v is not None
+        }
+    if isinstance(value, (list, tuple)):
+        return [normalize_key_value(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((normalize_key_value(v) for v in value), key=repr)
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+
+def key_digest(params: Any) -> str:
+    """Stable digest of normalized parameters, identical in every process"""
+    canonical = json.dumps(
+        normalize_key_value(params),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def build_cache_key(prefix: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build a versioned cache key: ``<prefix>:<version>:<digest>``"""
+    return f"{prefix}:{CACHE_KEY_VERSION}:{key_digest(params or {})}"
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry TTL.
+
+    This is the L1 tier that sits in front of Dragonfly in every worker.
+    It is only touched from the event loop, so it needs no locking.
+    Cached objects are shared between requests and must be treated as
+    read-only by callers.
+
+    ``generation`` counts invalidations. A caller filling L1 from a slower
+    tier reads it first and passes it to ``set``, so a value that was
+    invalidated while it was being fetched is not cached.
+    """
+
+    def __init__(self, max_entries: int = 2048, default_ttl: float = 60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None):
+        """Store value; ttl is capped at the tier default.
+
+        With ``generation``, nothing is stored if an invalidation has run
+        since that generation was read.
+        """
+        if generation is not None and generation != self.generation:
+            return
+        ttl = min(ttl or self.default_ttl, self.default_ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, keys: Iterable[str]) -> int:
+        self.generation += 1
+        removed = 0
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                removed += 1
+        self.invalidations += removed
+        return removed
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Drop every key matching a glob pattern"""
+        return self.delete([k for k in list(self._entries) if fnmatchcase(k, pattern)])
+
+    def clear(self):
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
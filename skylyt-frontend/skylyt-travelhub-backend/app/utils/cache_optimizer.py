@@ -1,8 +1,7 @@
-import hashlib
-import json
 from typing import Any, Dict, Optional, List
 from functools import wraps
-from app.utils.cache import cache_manager
+from app.utils.cache import cache_manager, call_key_params
+from app.utils.cache_keys import build_cache_key
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,9 +12,7 @@ class CacheOptimizer:
     @staticmethod
     def generate_cache_key(prefix: str, **kwargs) -> str:
         """Generate optimized cache key"""
-        key_data = json.dumps(kwargs, sort_keys=True, default=str)
-        hash_key = hashlib.md5(key_data.encode()).hexdigest()
-        return f"{prefix}:{hash_key}"
+        return build_cache_key(prefix, kwargs)
     
     @staticmethod
     def cache_with_tags(tags: List[str], ttl: int = 300):
@@ -25,9 +22,8 @@ class CacheOptimizer:
             async def wrapper(*args, **kwargs):
                 # Generate cache key
                 cache_key = CacheOptimizer.generate_cache_key(
-                    f"func:{func.__name__}", 
-                    args=args, 
-                    kwargs=kwargs
+                    f"func:{func.__module__}.{func.__qualname__}",
+                    **call_key_params(args, kwargs)
                 )
                 
                 # Try to get from cache
@@ -39,16 +35,8 @@ class CacheOptimizer:
                 # Execute function
                 result = await func(*args, **kwargs) if hasattr(func, '__await__') else func(*args, **kwargs)
                 
-                # Cache result with tags
-                await cache_manager.set(cache_key, result, ttl)
-                
-                # Store tag associations
-                for tag in tags:
-                    tag_key = f"tag:{tag}"
-                    tag_keys = await cache_manager.get(tag_key) or []
-                    if cache_key not in tag_keys:
-                        tag_keys.append(cache_key)
-                        await cache_manager.set(tag_key, tag_keys, ttl * 2)
+                # Cache result; tag membership is recorded atomically with it
+                await cache_manager.set(cache_key, result, ttl, tags=tags)
                 
                 logger.debug(f"Cache miss for {func.__name__}, result cached")
                 return result
@@ -59,15 +47,10 @@ class CacheOptimizer:
     @staticmethod
     async def invalidate_by_tag(tag: str):
         """Invalidate all cache entries with specific tag"""
-        tag_key = f"tag:{tag}"
-        cache_keys = await cache_manager.get(tag_key)
-        
-        if cache_keys:
-            for cache_key in cache_keys:
-                await cache_manager.delete(cache_key)
-            
-            await cache_manager.delete(tag_key)
-            logger.info(f"Invalidated {len(cache_keys)} cache entries for tag: {tag}")
+        deleted = await cache_manager.invalidate_tags(tag)
+        if deleted:
+            logger.info(f"Invalidated {deleted} cache entries for tag: {tag}")
+        return deleted
 
 class SmartCache:
     """Smart caching with automatic optimization"""
@@ -0,0 +1,190 @@
+import json
+import logging
+import struct
+import zlib
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+# Stored values start with a header byte: 1 | compression (3 bits) | codec
+# (4 bits). The high bit never starts JSON text, so entries written before
+# the header existed are still read as plain JSON.
+HEADER_FLAG = 0x80
+
+
+class CachedResponse(NamedTuple):
+    """A fully encoded HTTP response body, stored and served as raw bytes"""
+    created_at: float
+    media_type: str
+    etag: str
+    # Content-Encoding of body: "" for identity or "gzip"
+    encoding: str
+    body: bytes
+
+
+# created_at, then the lengths of media_type, etag and encoding
+RESPONSE_FRAME = struct.Struct("!dHHB")
+RESPONSE_CODEC_ID = 0x0E
+
+
+def _pack_response(response: CachedResponse) -> bytes:
+    media_type = response.media_type.encode()
+    etag = response.etag.encode()
+    encoding = response.encoding.encode()
+    return b"".join((
+        RESPONSE_FRAME.pack(response.created_at, len(media_type), len(etag), len(encoding)),
+        media_type, etag, encoding, response.body,
+    ))
+
+
+def _unpack_response(data: bytes) -> CachedResponse:
+    created_at, media_len, etag_len, encoding_len = RESPONSE_FRAME.unpack_from(data)
+    offset = RESPONSE_FRAME.size
+    fields = []
+    for length in (media_len, etag_len, encoding_len):
+        fields.append(bytes(data[offset:offset + length]).decode())
+        offset += length
+    return CachedResponse(created_at, *fields, bytes(data[offset:]))
+
+
+class Codec(NamedTuple):
+    id: int
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+class Compressor(NamedTuple):
+    id: int
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, default=str, separators=(",", ":")).encode()
+
+
+CODECS: Dict[str, Codec] = {
+    "json": Codec(1, _json_encode, json.loads),
+}
+if orjson is not None:
+    CODECS["orjson"] = Codec(
+        2,
+        lambda value: orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS),
+        orjson.loads,
+    )
+if msgpack is not None:
+    CODECS["msgpack"] = Codec(
+        3,
+        lambda value: msgpack.packb(value, default=str, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+    )
+
+COMPRESSORS: Dict[str, Compressor] = {
+    "zlib": Compressor(1, lambda data: zlib.compress(data, 1), zlib.decompress),
+}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = Compressor(
+        2,
+        zstandard.ZstdCompressor(level=3).compress,
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+if lz4_frame is not None:
+    COMPRESSORS["lz4"] = Compressor(3, lz4_frame.compress, lz4_frame.decompress)
+
+CODECS_BY_ID = {codec.id: codec for codec in CODECS.values()}
+COMPRESSORS_BY_ID = {compressor.id: compressor for compressor in COMPRESSORS.values()}
+
+
+class CacheSerializer:
+    """Encodes cached values as header byte + optionally compressed payload.
+
+    Any installed codec or compressor can be read back regardless of how
+    this instance is configured, so settings can change without flushing
+    the cache. Values below ``compress_threshold`` bytes, or that do not
+    shrink, are stored uncompressed. ``CachedResponse`` values bypass the
+    codec and compressor: their body is already encoded and is framed as
+    is, so reading one back never parses it.
+    """
+
+    def __init__(
+        self,
+        codec: str = "orjson",
+        compression: Optional[str] = "zlib",
+        compress_threshold: int = 2048
+    ):
+        if codec not in CODECS:
+            logger.warning(f"Cache codec {codec!r} is not installed, using json")
+            codec = "json"
+        if compression in ("", "none"):
+            compression = None
+        if compression is not None and compression not in COMPRESSORS:
+            logger.warning(f"Cache compression {compression!r} is not installed, using zlib")
+            compression = "zlib"
+        self.codec_name = codec
+        self.compression_name = compression
+        self.codec = CODECS[codec]
+        self.compressor = COMPRESSORS[compression] if compression else None
+        self.compress_threshold = compress_threshold
+
+    @classmethod
+    def from_settings(cls) -> "CacheSerializer":
+        from app.core.config import settings
+        return cls(
+            codec=settings.CACHE_SERIALIZER,
+            compression=settings.CACHE_COMPRESSION,
+            compress_threshold=settings.CACHE_COMPRESS_THRESHOLD,
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, CachedResponse):
+            return bytes((HEADER_FLAG | RESPONSE_CODEC_ID,)) + _pack_response(value)
+        payload = self.codec.encode(value)
+        compression_id = 0
+        if self.compressor is not None and len(payload) >= self.compress_threshold:
+            compressed = self.compressor.compress(payload)
+            if len(compressed) < len(payload):
+                payload, compression_id = compressed, self.compressor.id
+        return bytes((HEADER_FLAG | compression_id << 4 | self.codec.id,)) + payload
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        if isinstance(data, str):
+            data = data.encode()
+        if not data or not data[0] & HEADER_FLAG:
+            # Written before the header byte existed
+            return json.loads(data)
+
+        header = data[0]
+        if header == HEADER_FLAG | RESPONSE_CODEC_ID:
+            return _unpack_response(memoryview(data)[1:])
+        codec = CODECS_BY_ID.get(header & 0x0F)
+        compression_id = (header >> 4) & 0x07
+        if codec is None:
+            raise ValueError(f"Unknown cache codec in header {header:#04x}")
+        payload = memoryview(data)[1:]
+        if compression_id:
+            compressor = COMPRESSORS_BY_ID.get(compression_id)
+            if compressor is None:
+                raise ValueError(f"Unknown cache compression in header {header:#04x}")
+            payload = compressor.decompress(payload)
+        return codec.decode(bytes(payload))
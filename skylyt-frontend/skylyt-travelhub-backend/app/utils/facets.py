@@ -0,0 +1,85 @@
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Sequence
+
+# Target number of buckets in a price histogram
+PRICE_BUCKETS = 8
+
+
+def value_counts(values: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Distinct values with their counts, most common first"""
+    counts = Counter(value for value in values if value not in (None, ""))
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+    ]
+
+
+def star_histogram(ratings: Iterable[Any]) -> List[Dict[str, int]]:
+    """Matches per whole star, highest first; 4.5 counts as 4 stars"""
+    counts = Counter(int(rating) for rating in ratings if rating is not None)
+    return [{"stars": stars, "count": counts[stars]} for stars in sorted(counts, reverse=True)]
+
+
+def bucket_width(low: float, high: float, buckets: int = PRICE_BUCKETS) -> float:
+    """A 1, 2 or 5 times power of ten width giving at most buckets buckets"""
+    raw = (high - low) / buckets
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for step in (1, 2, 5, 10):
+        width = step * magnitude
+        if math.floor(high / width) - math.floor(low / width) < buckets:
+            return width
+    return 20 * magnitude
+
+
+def price_histogram(prices: Sequence[float], buckets: int = PRICE_BUCKETS) -> List[Dict[str, float]]:
+    """Contiguous price ranges with round edges and their match counts.
+
+    Each range includes its min and excludes its max, except the last.
+    """
+    prices = [price for price in prices if price is not None and math.isfinite(price)]
+    if not prices:
+        return []
+    low, high = min(prices), max(prices)
+    if high == low:
+        return [{"min": round(low, 2), "max": round(high, 2), "count": len(prices)}]
+    width = bucket_width(low, high, buckets)
+    first = math.floor(low / width)
+    counts = Counter(min(math.floor(price / width), math.floor(high / width)) for price in prices)
+    last = max(counts)
+    return [
+        {"min": round(i * width, 2), "max": round((i + 1) * width, 2), "count": counts[i]}
+        for i in range(first, last + 1)
+    ]
+
+
+def _names(items: Any) -> Iterable[str]:
+    """Amenity or feature names, stored as strings or {"name": ...} objects"""
+    for item in items or ():
+        name = item.get("name") if isinstance(item, dict) else item
+        if isinstance(name, str):
+            yield name
+
+
+def hotel_facets(rows: Iterable[Any], price_factor: float = 1.0) -> Dict[str, List[Dict[str, Any]]]:
+    """Sidebar facets for hotel rows with price, rating and amenities.
+
+    price_factor converts the stored prices into the display currency.
+    """
+    rows = list(rows)
+    return {
+        "amenities": value_counts(name for row in rows for name in set(_names(row.amenities))),
+        "star_rating": star_histogram(row.rating for row in rows),
+        "price": price_histogram([float(row.price) * price_factor for row in rows])
+    }
+
+
+def car_facets(rows: Iterable[Any], price_factor: float = 1.0) -> Dict[str, List[Dict[str, Any]]]:
+    """Sidebar facets for car rows with price, transmission, category and features"""
+    rows = list(rows)
+    return {
+        "transmission": value_counts(row.transmission for row in rows),
+        "category": value_counts(row.category for row in rows),
+        "features": value_counts(name for row in rows for name in set(_names(row.features))),
+        "price": price_histogram([float(row.price) * price_factor for row in rows])
+    }
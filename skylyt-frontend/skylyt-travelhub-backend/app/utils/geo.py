@@ -0,0 +1,216 @@
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, event, or_
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Stored geohash length; 9 characters is a cell of about 5 m
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+MAX_RADIUS_KM = 500.0
+# Geohash prefixes looked up per search; larger areas use shorter prefixes
+MAX_CELLS = 32
+# Sort value that orders results by distance from the near point
+DISTANCE = "distance"
+
+Point = Tuple[float, float]
+
+
+class BBox(NamedTuple):
+    """Latitude/longitude box; west > east means it crosses the antimeridian"""
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def parts(self) -> List["BBox"]:
+        """The box split into parts that do not cross the antimeridian"""
+        if self.west <= self.east:
+            return [self]
+        return [BBox(self.south, self.west, self.north, 180.0), BBox(self.south, -180.0, self.north, self.east)]
+
+    def contains(self, lat: float, lng: float) -> bool:
+        if not self.south <= lat <= self.north:
+            return False
+        if self.west <= self.east:
+            return self.west <= lng <= self.east
+        return lng >= self.west or lng <= self.east
+
+
+class GeoQuery(NamedTuple):
+    """A search area: a box, or a radius around origin (with its enclosing box)"""
+    bbox: BBox
+    origin: Optional[Point] = None
+    radius_km: Optional[float] = None
+
+    def contains(self, lat: Optional[float], lng: Optional[float]) -> bool:
+        if lat is None or lng is None or not self.bbox.contains(lat, lng):
+            return False
+        return self.origin is None or distance_sq(lat, lng, self.origin) <= degrees_sq(self.radius_km)
+
+
+def encode_geohash(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell"""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def covering_cells(bbox: BBox, max_cells: int = MAX_CELLS, max_precision: int = GEOHASH_PRECISION) -> List[str]:
+    """Geohash prefixes whose cells cover bbox, as long as max_cells allows"""
+    best = [""]
+    for precision in range(1, max_precision + 1):
+        height, width = cell_size(precision)
+        spans = []
+        for part in bbox.parts():
+            rows = range(int((part.south + 90) // height), min(int((part.north + 90) // height), int(180 / height) - 1) + 1)
+            columns = range(int((part.west + 180) // width), min(int((part.east + 180) // width), int(360 / width) - 1) + 1)
+            spans.append((rows, columns))
+        if sum(len(rows) * len(columns) for rows, columns in spans) > max_cells:
+            break
+        best = [
+            encode_geohash(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+            for rows, columns in spans for row in rows for column in columns
+        ]
+    return best
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """The first geohash after every hash starting with prefix, None if there is none"""
+    while prefix and prefix[-1] == BASE32[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+
+def distance_sq(lat: float, lng: float, origin: Point) -> float:
+    """Squared equirectangular distance in degrees of latitude.
+
+    Within MAX_RADIUS_KM it stays within a fraction of a percent of the
+    great-circle distance; it does not wrap around the antimeridian.
+    distance_sq_sql computes the same value in the database, so SQL and
+    in-memory searches order and page results identically.
+    """
+    origin_lat, origin_lng = origin
+    dx = (lng - origin_lng) * math.cos(math.radians(origin_lat))
+    dy = lat - origin_lat
+    return dx * dx + dy * dy
+
+
+def distance_sq_sql(lat_column, lng_column, origin: Point):
+    origin_lat, origin_lng = origin
+    dx = (lng_column - origin_lng) * math.cos(math.radians(origin_lat))
+    dy = lat_column - origin_lat
+    return dx * dx + dy * dy
+
+
+def degrees_sq(radius_km: float) -> float:
+    return (radius_km / KM_PER_DEGREE) ** 2
+
+
+def distance_km(distance_sq_value: float) -> float:
+    return round(math.sqrt(distance_sq_value) * KM_PER_DEGREE, 2)
+
+
+def around(origin: Point, radius_km: float) -> BBox:
+    """The box enclosing a radius around origin"""
+    lat, lng = origin
+    dlat = radius_km / KM_PER_DEGREE
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    cos_lat = min(math.cos(math.radians(south)), math.cos(math.radians(north)))
+    if cos_lat <= 0 or dlat / cos_lat >= 180:
+        return BBox(south, -180.0, north, 180.0)
+    dlng = dlat / cos_lat
+    west, east = lng - dlng, lng + dlng
+    return BBox(south, west + 360 if west < -180 else west, north, east - 360 if east > 180 else east)
+
+
+def _floats(text: str, count: int, name: str) -> List[float]:
+    try:
+        values = [float(part) for part in text.split(",")]
+    except ValueError:
+        values = []
+    if len(values) != count or not all(math.isfinite(v) for v in values):
+        raise ValueError(f"{name} must be {count} comma-separated numbers")
+    return values
+
+
+def parse_geo_query(near: Optional[str], radius_km: Optional[float], bbox: Optional[str]) -> Optional[GeoQuery]:
+    """The area of the near/radius_km or bbox search parameters.
+
+    near is "latitude,longitude" and bbox "south,west,north,east";
+    raises ValueError for malformed or out-of-range values.
+    """
+    if near and bbox:
+        raise ValueError("Search either near a point or within a bbox, not both")
+    if near:
+        lat, lng = _floats(near, 2, "near")
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError("near is outside the valid latitude/longitude range")
+        radius_km = 10.0 if radius_km is None else radius_km
+        if not 0 < radius_km <= MAX_RADIUS_KM:
+            raise ValueError(f"radius_km must be between 0 and {MAX_RADIUS_KM:g}")
+        return GeoQuery(around((lat, lng), radius_km), (lat, lng), radius_km)
+    if bbox:
+        south, west, north, east = _floats(bbox, 4, "bbox")
+        if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+            raise ValueError("bbox must be south,west,north,east within the valid range")
+        return GeoQuery(BBox(south, west, north, east))
+    return None
+
+
+def geo_filter(model, geo: GeoQuery):
+    """SQL criteria for rows of model inside geo.
+
+    Geohash prefix ranges narrow the search through the geohash index on
+    any database; the coordinate and distance checks make it exact.
+    """
+    cells = []
+    for cell in covering_cells(geo.bbox):
+        upper = prefix_upper_bound(cell)
+        cells.append(model.geohash >= cell if upper is None else and_(model.geohash >= cell, model.geohash < upper))
+    box = geo.bbox
+    if box.west <= box.east:
+        longitude = model.longitude.between(box.west, box.east)
+    else:
+        longitude = or_(model.longitude >= box.west, model.longitude <= box.east)
+    criteria = [or_(*cells), model.latitude.between(box.south, box.north), longitude]
+    if geo.origin is not None:
+        criteria.append(distance_sq_sql(model.latitude, model.longitude, geo.origin) <= degrees_sq(geo.radius_km))
+    return and_(*criteria)
+
+
+def track_geohash(model):
+    """Keep model.geohash in step with its latitude and longitude on flush.
+
+    Bulk UPDATEs bypass this and must set geohash themselves.
+    """
+    def set_geohash(mapper, connection, target):
+        if target.latitude is None or target.longitude is None:
+            target.geohash = None
+        else:
+            target.geohash = encode_geohash(float(target.latitude), float(target.longitude))
+
+    event.listen(model, "before_insert", set_geohash)
+    event.listen(model, "before_update", set_geohash)
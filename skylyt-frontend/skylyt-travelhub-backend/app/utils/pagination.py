@@ -0,0 +1,291 @@
+import base64
+import hashlib
+import json
+import logging
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import Table, and_, false, or_, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.utils.cache_local import LocalCache
+
+logger = logging.getLogger(__name__)
+
+# (sort expression, descending). The last key must be unique, e.g. the id.
+SortKey = Tuple[Any, bool]
+
+# Count strategies, see settings.PAGINATION_COUNT_MODE
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATE = "estimate"
+COUNT_AUTO = "auto"
+
+# Totals by query fingerprint. Services run in threadpool workers, so
+# unlike the event-loop L1 cache this one is locked.
+_count_cache = LocalCache(max_entries=1024, default_ttl=settings.PAGINATION_COUNT_CACHE_TTL)
+_count_lock = threading.Lock()
+
+
+class InvalidCursor(ValueError):
+    """A cursor that is malformed or was issued for a different ordering"""
+
+
+class Count(NamedTuple):
+    total: int
+    estimated: bool
+
+
+class Page(NamedTuple):
+    items: list
+    total: Optional[int]
+    page: Optional[int]
+    per_page: int
+    next_cursor: Optional[str]
+    total_estimated: bool = False
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def as_response(self, key: str, items: list) -> dict:
+        """The list response shape shared by the paginated endpoints"""
+        total_pages = (self.total + self.per_page - 1) // self.per_page if self.total is not None else None
+        return {
+            key: items,
+            "total": self.total,
+            "page": self.page,
+            "per_page": self.per_page,
+            "total_pages": total_pages,
+            "total_estimated": self.total_estimated,
+            "next_cursor": self.next_cursor,
+            "has_more": self.has_more
+        }
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        # SQLAlchemy Enum columns bind member names
+        return value.name
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    (tag, raw), = value.items()
+    if tag == "dt":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    if tag == "n":
+        return Decimal(raw)
+    raise ValueError(f"unknown cursor value tag {tag!r}")
+
+
+def order_fingerprint(order: Sequence[SortKey]) -> str:
+    """Identifies an ordering so its cursors are rejected by any other"""
+    spec = "|".join(f"{expr}:{'desc' if descending else 'asc'}" for expr, descending in order)
+    return hashlib.blake2b(spec.encode(), digest_size=6).hexdigest()
+
+
+def encode_cursor(values: Sequence[Any], scope: str) -> str:
+    """Opaque token for the position after a row with these sort values"""
+    payload = json.dumps({"s": scope, "v": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, scope: str) -> List[Any]:
+    """Sort values of a cursor issued for scope; raises InvalidCursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if payload["s"] != scope:
+            raise InvalidCursor("Cursor does not match the requested ordering")
+        return [_decode_value(v) for v in payload["v"]]
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+
+def _nullable(expr) -> bool:
+    return getattr(getattr(expr, "expression", expr), "nullable", True)
+
+
+def order_clauses(order: Sequence[SortKey]) -> list:
+    """ORDER BY terms; NULLs sort as the largest value, as PostgreSQL does by default"""
+    return [expr.desc().nulls_first() if descending else expr.asc().nulls_last() for expr, descending in order]
+
+
+def keyset_after(order: Sequence[SortKey], values: Sequence[Any]):
+    """Rows that come after the row with the given sort values.
+
+    Expands to ``k1 > v1 OR (k1 = v1 AND k2 > v2) ...`` with NULL handling,
+    plus a plain range bound on the first key so an index on it can seek
+    straight to the cursor position instead of skipping OFFSET rows.
+    """
+    if len(values) != len(order):
+        raise InvalidCursor("Cursor does not match the requested ordering")
+    branches = []
+    equal = []
+    for (expr, descending), value in zip(order, values):
+        nullable = _nullable(expr)
+        if value is None:
+            # NULL is the largest value: descending puts rows with values after it
+            beyond = expr.is_not(None) if descending else false()
+            same = expr.is_(None)
+        elif descending:
+            beyond = expr < value
+            same = expr == value
+        else:
+            beyond = or_(expr > value, expr.is_(None)) if nullable else expr > value
+            same = expr == value
+        branches.append(and_(*equal, beyond))
+        equal.append(same)
+
+    condition = or_(*branches)
+    (first, descending), first_value = order[0], values[0]
+    if first_value is not None and descending:
+        condition = and_(first <= first_value, condition)
+    elif first_value is not None and not _nullable(first):
+        condition = and_(first >= first_value, condition)
+    return condition
+
+
+def _compiled(query):
+    return query.statement.compile(
+        dialect=query.session.get_bind().dialect, compile_kwargs={"render_postcompile": True}
+    )
+
+
+def count_fingerprint(query) -> str:
+    """Identifies a query by its SQL and bound values"""
+    compiled = _compiled(query)
+    params = sorted((name, repr(value)) for name, value in compiled.params.items())
+    return hashlib.blake2b(f"{compiled.string}|{params}".encode(), digest_size=12).hexdigest()
+
+
+def plan_rows(plan: Any) -> Optional[float]:
+    """Top-level row estimate from ``EXPLAIN (FORMAT JSON)`` output"""
+    if isinstance(plan, (str, bytes)):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+def planner_estimate(query) -> Optional[int]:
+    """PostgreSQL's estimate of the query's row count.
+
+    An unfiltered single table reads the ``pg_class.reltuples`` statistic;
+    anything else asks the planner with EXPLAIN. None on other databases
+    or when the table has no statistics yet.
+    """
+    db = query.session
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    statement = query.statement
+    froms = statement.get_final_froms()
+    try:
+        # A savepoint keeps a failed estimate from aborting the transaction
+        with db.begin_nested():
+            if statement.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+                rows = db.execute(
+                    text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+                    {"name": froms[0].fullname}
+                ).scalar()
+            else:
+                compiled = _compiled(query)
+                rows = plan_rows(db.connection().exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+                ).scalar())
+    except SQLAlchemyError as e:
+        logger.warning(f"Row estimate failed, counting exactly: {e}")
+        return None
+    # reltuples is -1 (or 0) before the first ANALYZE
+    return int(rows) if rows and rows > 0 else None
+
+
+def count_total(query, mode: Optional[str] = None) -> Count:
+    """Total rows of query under a count strategy.
+
+    "exact" always runs COUNT(*). "cached" reuses an exact count of the
+    same query for PAGINATION_COUNT_CACHE_TTL seconds. "estimate" uses the
+    PostgreSQL planner estimate. "auto" caches, and takes the estimate
+    when it exceeds PAGINATION_EXACT_COUNT_LIMIT, where exact counts get
+    expensive and nobody pages to the end anyway.
+    """
+    mode = mode or settings.PAGINATION_COUNT_MODE
+    query = query.order_by(None)
+    if mode == COUNT_EXACT:
+        return Count(query.count(), False)
+
+    key = f"{mode}:{count_fingerprint(query)}"
+    with _count_lock:
+        cached = _count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    count = None
+    if mode in (COUNT_ESTIMATE, COUNT_AUTO):
+        estimate = planner_estimate(query)
+        if estimate is not None and (mode == COUNT_ESTIMATE or estimate > settings.PAGINATION_EXACT_COUNT_LIMIT):
+            count = Count(estimate, True)
+    if count is None:
+        count = Count(query.count(), False)
+    with _count_lock:
+        _count_cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TTL)
+    return count
+
+
+def paginate(
+    query,
+    order: Sequence[SortKey],
+    per_page: int,
+    cursor: Optional[str] = None,
+    page: int = 1,
+    with_total: bool = True,
+    scope: Optional[str] = None,
+    count_mode: Optional[str] = None
+) -> Page:
+    """One page of an ORM query in a stable order.
+
+    With a cursor the page starts right after the cursor row (keyset
+    pagination, constant cost at any depth); otherwise ``page`` is applied
+    as an OFFSET for older clients. Either way the result carries the
+    cursor of the next page. The query must select a single entity.
+    ``scope`` replaces the ordering fingerprint when cursors must stay
+    valid across equivalent orderings; ``count_mode`` picks the count
+    strategy for the total (see count_total).
+    """
+    scope = scope or order_fingerprint(order)
+    count = count_total(query, count_mode) if with_total else None
+
+    keyed = query.order_by(None).add_columns(*[expr for expr, _ in order])
+    if cursor:
+        keyed = keyed.filter(keyset_after(order, decode_cursor(cursor, scope)))
+        page = None
+    keyed = keyed.order_by(*order_clauses(order))
+    offset = 0 if cursor else (page - 1) * per_page
+    if offset:
+        keyed = keyed.offset(offset)
+
+    # One extra row tells whether another page follows
+    rows = keyed.limit(per_page + 1).all()
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = encode_cursor(list(rows[-1][1:]), scope) if more else None
+
+    if count is not None and not cursor and not more and (rows or not offset):
+        # The last page reveals the exact total, whatever the count strategy said
+        count = Count(offset + len(rows), False)
+    total, estimated = count if count is not None else (None, False)
+    return Page([row[0] for row in rows], total, page, per_page, next_cursor, estimated)
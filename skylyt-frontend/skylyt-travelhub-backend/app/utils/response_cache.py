@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import json
+import time
+from datetime import timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.utils.cache import CacheEntry, apply_cache_headers, cache_manager
+from app.utils.cache_serialization import CachedResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _dump_json(payload: Any) -> bytes:
+    # Same bytes as FastAPI's JSONResponse: compact, UTF-8, no NaN
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def encode_response(payload: Any, media_type: str = JSON_MEDIA_TYPE) -> CachedResponse:
+    """Encode a router payload once into the bytes every later hit sends.
+
+    The ETag is taken over the identity body so it does not depend on
+    how the body is stored. Bodies the GZip middleware would compress
+    are stored gzipped, which also keeps them small in Dragonfly.
+    """
+    body = _dump_json(jsonable_encoder(payload))
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    encoding = ""
+    if len(body) >= settings.CACHE_RESPONSE_GZIP_MIN_SIZE:
+        # mtime=0 keeps the gzip bytes identical for identical bodies
+        body, encoding = gzip.compress(body, compresslevel=6, mtime=0), "gzip"
+    return CachedResponse(time.time(), media_type, etag, encoding, body)
+
+
+def decode_body(cached: CachedResponse) -> bytes:
+    """The identity body of a cached response"""
+    return gzip.decompress(cached.body) if cached.encoding == "gzip" else cached.body
+
+
+def encoded(compute: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[CachedResponse]]:
+    """Wrap a payload loader so the cache stores its encoded response"""
+    async def compute_response() -> CachedResponse:
+        return encode_response(await compute())
+    return compute_response
+
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def is_not_modified(request: Request, cached: CachedResponse) -> bool:
+    """Whether the client's copy of a cached response is still current.
+
+    If-Modified-Since is only consulted when the request carries no
+    If-None-Match, as RFC 9110 requires.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, cached.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(cached.created_at) <= since
+    return False
+
+
+def response_from_entry(request: Request, entry: CacheEntry) -> Response:
+    """Send a cached response's bytes without decoding them.
+
+    Clients revalidating a copy that is still current get an empty 304.
+    """
+    cached: CachedResponse = entry.value
+    headers = {
+        "ETag": cached.etag,
+        "Last-Modified": formatdate(cached.created_at, usegmt=True),
+        # Catalog data changes without notice, so clients must revalidate
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if is_not_modified(request, cached):
+        response = Response(status_code=304, headers=headers)
+        apply_cache_headers(response, entry)
+        return response
+
+    body = cached.body
+    if cached.encoding == "gzip":
+        if _accepts_gzip(request):
+            headers["Content-Encoding"] = "gzip"
+        else:
+            body = decode_body(cached)
+    response = Response(content=body, media_type=cached.media_type, headers=headers)
+    apply_cache_headers(response, entry)
+    return response
+
+
+async def cached_response(
+    request: Request,
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    expire: Union[int, timedelta],
+    soft_ttl: Optional[float] = None,
+    tags: Iterable[str] = ()
+) -> Response:
+    """Serve a router payload from the shared cache as pre-encoded bytes"""
+    entry = await cache_manager.get_or_compute_entry(
+        key, encoded(compute), expire, soft_ttl, tags
+    )
+    return response_from_entry(request, entry)
@@ -0,0 +1,67 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Sort value that orders text search results by how well they match
+RELEVANCE = "relevance"
+LIKE_ESCAPE = "\\"
+
+
+def search_mode(db: Session) -> str:
+    """"trigram" on PostgreSQL (pg_trgm), otherwise plain "ilike".
+
+    TEXT_SEARCH_MODE can force "ilike" everywhere, e.g. before the
+    pg_trgm migration has run.
+    """
+    if settings.TEXT_SEARCH_MODE == "ilike":
+        return "ilike"
+    bind = db.get_bind()
+    return "trigram" if bind is not None and bind.dialect.name == "postgresql" else "ilike"
+
+
+def escape_like(term: str) -> str:
+    """Match the term literally inside a LIKE pattern"""
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def contains(columns: Sequence, term: str):
+    """Rows where any column contains the term, case-insensitively.
+
+    Written as ``ILIKE '%term%'`` in every mode: on PostgreSQL the GIN
+    trigram indexes from the ``add_trigram_search_indexes`` migration
+    serve these predicates directly, OR-ed columns via a bitmap OR.
+    """
+    pattern = f"%{escape_like(term)}%"
+    return or_(*[column.ilike(pattern, escape=LIKE_ESCAPE) for column in columns])
+
+
+def relevance(columns: Sequence, term: str, mode: str):
+    """How well a row matches the term, higher is better.
+
+    Trigram mode uses pg_trgm's word similarity; elsewhere a prefix match
+    scores above a substring match, summed over the columns.
+    """
+    if mode == "trigram":
+        return func.greatest(*[
+            func.word_similarity(term, func.coalesce(column, "")) for column in columns
+        ])
+    escaped = escape_like(term)
+    return sum(
+        case(
+            (column.ilike(f"{escaped}%", escape=LIKE_ESCAPE), 2),
+            (column.ilike(f"%{escaped}%", escape=LIKE_ESCAPE), 1),
+            else_=0,
+        )
+        for column in columns
+    )
+
+
+def is_relevance_sort(sort_by: Optional[str]) -> bool:
+    return bool(sort_by) and sort_by.lstrip("-") == RELEVANCE
@@ -1,5 +1,7 @@
 from celery import Celery
 from app.core.config import settings
+import app.utils.cache_invalidation  # noqa: F401  registers after-commit cache invalidation
+import app.services.hotel_search_index  # noqa: F401  publishes hotel changes to API workers' search index
 
 # Create Celery app
 celery_app = Celery(
@@ -10,7 +12,8 @@ celery_app = Celery(
         "app.tasks.email_tasks",
         "app.tasks.booking_tasks", 
         "app.tasks.cleanup_tasks",
-        "app.tasks.payment_tasks"
+        "app.tasks.payment_tasks",
+        "app.tasks.cache_tasks"
     ]
 )
 
@@ -54,6 +57,10 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.booking_tasks.generate_booking_reports",
         "schedule": 86400.0,  # Daily
     },
+    "warm-search-cache": {
+        "task": "app.tasks.cache_tasks.warm_search_cache",
+        "schedule": float(settings.CACHE_WARM_INTERVAL),
+    },
 }
 
 if __name__ == "__main__":
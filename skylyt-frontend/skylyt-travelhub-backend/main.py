@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, validator
 from typing import List, Optional
+import asyncio
 import logging
 import re
 from datetime import datetime, timezone
@@ -26,7 +27,13 @@ from app.middleware.security_hardening import (
 from app.middleware.db_monitoring import DatabaseMonitoringMiddleware
 from app.monitoring.error_tracking import ErrorHandlingMiddleware, error_tracker
 from app.utils.logger import setup_logging
-from app.utils.cache import cache_warmer
+from app.utils.cache import cache_manager, cache_warmer
+from app.utils import cache_invalidation  # noqa: F401  registers after-commit cache invalidation
+from app.services.hotel_search_index import hotel_search_index
+from app.services.car_availability import car_availability_index
+from app.services.search_history import search_history_recorder
+from app.core.http_client import outbound_http
+from app.services.suggestion_index import suggestion_index
 from app.api.v1 import auth, users, hotels, cars, search, bookings, rbac, health, admin_cars, admin_hotels, roles, permissions, settings, emails, destinations, hotel_images, car_images, localization, payment_webhooks, payment_config, currency_rates, currencies, footer_settings, contact_settings, about_settings
 from app.api.v1 import payments, bank_accounts, admin_reviews, admin_support, admin_notifications, notifications, drivers, admin_bookings, admin_payments, admin_stats, driver
 from app.core.openapi import custom_openapi
@@ -58,6 +65,7 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logging.warning(f"Dragonfly initialization failed: {e}")
     
+    cache_manager.start_invalidation_listener()
     await cache_warmer.warm_static_data()
     
     # Initialize default currencies
@@ -74,9 +82,30 @@ async def lifespan(app: FastAPI):
         if db:
             db.close()
     
+    # Hotel searches use SQL until the in-memory index has loaded
+    index_task = asyncio.create_task(hotel_search_index.rebuild())
+    # Car availability checks query bookings until their interval index has loaded
+    car_index_task = asyncio.create_task(car_availability_index.rebuild())
+    suggestion_task = asyncio.create_task(
+        suggestion_index.keep_fresh(config_settings.SUGGESTION_REBUILD_INTERVAL)
+    )
+    
+    # Search history is written in batches behind the search responses
+    search_history_recorder.start()
+    
+    # Fill the search cache from recent demand without delaying startup
+    warm_task = asyncio.create_task(cache_warmer.warm_popular_searches())
+    
     yield
     # Shutdown
-    pass
+    warm_task.cancel()
+    index_task.cancel()
+    car_index_task.cancel()
+    suggestion_task.cancel()
+    await search_history_recorder.stop()
+    await outbound_http.aclose()
+    await cache_manager.stop_invalidation_listener()
+    await RedisService.close_async()
 
 app = FastAPI(
     title="Skylyt Luxury API",
@@ -174,7 +203,7 @@ if not config_settings.DEBUG:
 # app.add_middleware(RequestValidationMiddleware)
 
 # Performance middleware - optimized compression
-app.add_middleware(GZipMiddleware, minimum_size=500)  # Lower threshold for better compression
+app.add_middleware(GZipMiddleware, minimum_size=config_settings.CACHE_RESPONSE_GZIP_MIN_SIZE)  # Cached responses arrive pre-gzipped
 app.add_middleware(PerformanceMiddleware)
 
 # Database connection handling
@@ -6,11 +6,12 @@ Run this script to add indexes and optimize database performance
 
 import sys
 import os
+import asyncio
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import text
 from app.core.database import engine
-from app.utils.cache_manager import cache_manager
+from app.utils.cache import cache_manager
 
 def apply_indexes():
     """Apply performance indexes to the database"""
@@ -57,7 +58,7 @@ def apply_indexes():
 def clear_cache():
     """Clear all cached data to ensure fresh performance"""
     try:
-        cache_manager.clear_pattern("*")
+        asyncio.run(cache_manager.clear_all())
         print("✓ Cache cleared successfully")
     except Exception as e:
         print(f"✗ Cache clear failed: {e}")
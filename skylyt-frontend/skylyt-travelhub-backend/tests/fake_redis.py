@@ -0,0 +1,132 @@
+import math
+
+
+class FakeAsyncRedis:
+    """Minimal in-memory stand-in for redis.asyncio.Redis"""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.published = []
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for k in keys:
+            self.ttls.pop(k, None)
+        return sum(1 for k in keys if self.store.pop(k, None) is not None)
+
+    unlink = delete
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    async def zadd(self, key, mapping):
+        scores = self.store.setdefault(key, {})
+        added = len(set(mapping) - set(scores))
+        scores.update({member: float(score) for member, score in mapping.items()})
+        return added
+
+    async def zrangebyscore(self, key, low, high):
+        scores = self.store.get(key, {})
+        return sorted((m for m, s in scores.items() if float(low) <= s <= float(high)), key=scores.get)
+
+    async def expire(self, key, seconds):
+        if key not in self.store:
+            return 0
+        self.ttls[key] = seconds
+        return 1
+
+    async def record_tags(self, tag_keys, member, expires_at, now):
+        """TAG_KEY_SCRIPT; ttls hold the seconds left"""
+        for key in tag_keys:
+            scores = self.store.setdefault(key, {})
+            scores[member] = float(expires_at)
+            for expired in [m for m, score in scores.items() if score <= float(now)]:
+                del scores[expired]
+            last = max(scores.values())
+            if last == float("inf"):
+                self.ttls.pop(key, None)
+            else:
+                self.ttls[key] = math.ceil(last - float(now))
+        return len(tag_keys)
+
+    async def lpushx(self, key, *values):
+        if key not in self.store:
+            return 0
+        for value in values:
+            self.store[key].insert(0, value)
+        return len(self.store[key])
+
+    async def rpush(self, key, *values):
+        self.store.setdefault(key, []).extend(values)
+        return len(self.store[key])
+
+    async def ltrim(self, key, start, end):
+        if key in self.store:
+            self.store[key] = self.store[key][start:end + 1]
+        return True
+
+    async def lrange(self, key, start, end):
+        return list(self.store.get(key, [])[start:end + 1])
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = (match or "*").rstrip("*")
+        for k in list(self.store):
+            if k.startswith(prefix):
+                yield k
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        if "zadd" in script:
+            return await self.record_tags(keys_and_args[:numkeys], *keys_and_args[numkeys:])
+        # Otherwise the compare-and-delete lock release script
+        key, token = keys_and_args
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+    async def ping(self):
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        results = []
+        for name, args, kwargs in self.calls:
+            results.append(await getattr(self.client, name)(*args, **kwargs))
+        self.calls = []
+        return results
@@ -0,0 +1,72 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeSupplierServer:
+    """A local supplier API: canned JSON per path, optionally slow or failing.
+
+    ``status`` is one status for every request, or a list answered in
+    turn (the last one repeating).
+    """
+
+    def __init__(self, routes, delay=0.0, status=200, headers=None):
+        self.routes = routes
+        self.delay = delay
+        self.statuses = list(status) if isinstance(status, (list, tuple)) else [status]
+        self.headers = headers or {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive, as real supplier APIs do
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.serve(self)
+
+            do_POST = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def serve(self, handler):
+        url = urlparse(handler.path)
+        # Drain the body so the kept-alive connection stays in step
+        handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+        path = url.path.lstrip("/")
+        self.requests.append((path, {k: v[0] for k, v in parse_qs(url.query).items()}, handler.headers.get("Authorization")))
+        time.sleep(self.delay)
+        status = (self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]) if path in self.routes else 404
+        body = json.dumps(self.routes.get(path, {})).encode()
+        try:
+            handler.send_response(status)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(body)))
+            for name, value in self.headers.items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            handler.wfile.write(body)
+        except OSError:
+            # The client gave up waiting
+            pass
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,30 @@
+import random
+import time
+
+import pytest
+from app.services.bundle_service import SORT_PRICE, SORT_SAVINGS, top_bundles
+
+CANDIDATES = 200
+TOP_K = 10
+REPEATS = 20
+BUDGET_SECONDS = 0.05
+
+
+@pytest.mark.performance
+class TestBundleScoringBenchmark:
+    @pytest.mark.parametrize("sort_by", [SORT_SAVINGS, SORT_PRICE])
+    def test_full_candidate_grid_fits_budget(self, sort_by):
+        """Benchmark scoring 200 x 200 hotel/car pairs and picking the top 10."""
+        rng = random.Random(17)
+        hotel_cents = [rng.randrange(20_000_00, 900_000_00) for _ in range(CANDIDATES)]
+        car_cents = [rng.randrange(5_000_00, 150_000_00) for _ in range(CANDIDATES)]
+
+        top_bundles(hotel_cents, car_cents, TOP_K, sort_by)
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            best = top_bundles(hotel_cents, car_cents, TOP_K, sort_by)
+        elapsed = (time.perf_counter() - start) / REPEATS
+
+        print(f"\n{CANDIDATES * CANDIDATES} pairs by {sort_by}: {elapsed * 1000:.2f} ms")
+        assert len(best) == TOP_K
+        assert elapsed < BUDGET_SECONDS
@@ -0,0 +1,76 @@
+import json
+import time
+
+import pytest
+from app.utils.cache_serialization import CODECS, COMPRESSORS, CacheSerializer
+
+ITERATIONS = 200
+
+
+def hotel_search_payload(count: int = 20) -> dict:
+    """A /hotels/search response page as cached by the search route"""
+    return {
+        "v": {
+            "hotels": [
+                {
+                    "id": f"3f0c6a1e-5b7d-4c1a-9e2f-{i:012d}",
+                    "name": f"Eko Grand Hotel {i}",
+                    "location": "Victoria Island, Lagos",
+                    "rating": 4.5,
+                    "price": 185000.0 + i * 2500,
+                    "original_price": 185000.0 + i * 2500,
+                    "base_currency": "NGN",
+                    "currency": "NGN",
+                    "currency_symbol": "₦",
+                    "exchange_rate": 1.0,
+                    "image_url": f"https://cdn.skylyt.com/uploads/hotels/{i}/cover.jpg",
+                    "amenities": ["WiFi", "Pool", "Gym", "Spa", "Restaurant", "Airport Shuttle"],
+                    "description": "Beachfront rooms with city views, a rooftop bar and "
+                                   "conference facilities a short drive from the airport.",
+                    "is_available": True,
+                }
+                for i in range(count)
+            ],
+            "total": 137,
+        },
+        "t": 1718000000.25,
+    }
+
+
+def measure(serializer, payload) -> tuple:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        data = serializer.dumps(payload)
+    encode = (time.perf_counter() - start) / ITERATIONS
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        serializer.loads(data)
+    decode = (time.perf_counter() - start) / ITERATIONS
+    return len(data), encode, decode
+
+
+@pytest.mark.performance
+class TestCacheSerializationBenchmark:
+    def test_hotel_search_payload_formats(self):
+        """Test compact formats store search pages smaller than stdlib JSON."""
+        payload = hotel_search_payload()
+        baseline = len(json.dumps(payload, default=str).encode())
+
+        results = {}
+        for codec in sorted(CODECS):
+            for compression in [None, *sorted(COMPRESSORS)]:
+                serializer = CacheSerializer(codec, compression)
+                assert serializer.loads(serializer.dumps(payload)) == payload
+                results[(codec, compression or "none")] = measure(serializer, payload)
+
+        print(f"\nstdlib json.dumps baseline: {baseline} bytes")
+        for (codec, compression), (size, encode, decode) in results.items():
+            print(
+                f"{codec:>8} + {compression:<5} {size:>7} bytes "
+                f"({size / baseline:6.1%})  encode {encode * 1e6:8.1f} us  "
+                f"decode {decode * 1e6:8.1f} us"
+            )
+
+        default = CacheSerializer()
+        size, _, _ = results[(default.codec_name, default.compression_name or "none")]
+        assert size < baseline / 2
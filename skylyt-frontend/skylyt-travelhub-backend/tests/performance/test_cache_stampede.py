@@ -0,0 +1,102 @@
+import asyncio
+import json
+import time
+import pytest
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.models.city import City
+from app.models.hotel import Hotel
+from app.models.state import State
+from app.services.cache_service import CacheService
+from app.utils import cache as cache_module
+from app.utils.cache import CacheManager
+from app.utils.response_cache import decode_body
+from tests.fake_redis import FakeAsyncRedis
+
+CONCURRENT_REQUESTS = 200
+SEARCH_LATENCY = 0.05
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "get_async_redis", lambda: client)
+    monkeypatch.setattr(cache_module, "cache_manager", CacheManager(namespace="bench"))
+    monkeypatch.setattr("app.services.cache_service.cache_manager", cache_module.cache_manager)
+    return client
+
+
+@pytest.fixture
+def db():
+    """A hotel table, and the list of SQL statements run against it"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for model in (State, City, Hotel):
+        model.__table__.create(engine)
+    statements = []
+    with Session(engine) as session:
+        session.add_all([
+            Hotel(name=f"Hotel {i}", location="Ikeja, Lagos", star_rating=4.0, price_per_night=100.0 + i, room_count=10)
+            for i in range(40)
+        ])
+        session.commit()
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+        yield session, statements
+
+
+def search_hotels(db: Session, location: str, page: int, per_page: int) -> dict:
+    """The count and page queries of the hotel search, on a slow database"""
+    time.sleep(SEARCH_LATENCY)
+    query = db.query(Hotel).filter(Hotel.location.ilike(f"%{location}%")).order_by(Hotel.price_per_night)
+    total = query.count()
+    hotels = query.offset((page - 1) * per_page).limit(per_page).all()
+    return {"hotels": [{"id": hotel.id, "name": hotel.name} for hotel in hotels], "total": total}
+
+
+@pytest.mark.performance
+class TestSearchStampede:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_run_one_query(self, fake_redis, db):
+        """Benchmark N concurrent identical searches against a cold cache."""
+        session, statements = db
+        params = {"location": "lagos", "currency": "NGN", "page": 1, "per_page": 20}
+
+        def compute():
+            return run_in_threadpool(search_hotels, session, "lagos", 1, 20)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            CacheService.get_or_compute_hotel_search(params, compute)
+            for _ in range(CONCURRENT_REQUESTS)
+        ])
+        elapsed = time.perf_counter() - start
+        coalesced = len(statements)
+        statements.clear()
+        search_hotels(session, "lagos", 1, 20)
+
+        print(f"\n{CONCURRENT_REQUESTS} concurrent searches -> {coalesced} DB queries in {elapsed * 1000:.1f} ms")
+        assert coalesced == len(statements) == 2
+        assert all(json.loads(decode_body(r.value))["total"] == 40 for r in results)
+        assert elapsed < SEARCH_LATENCY * 5
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_across_nodes_run_one_query(self, fake_redis, db):
+        """Benchmark concurrent misses spread over workers sharing Dragonfly."""
+        session, statements = db
+        workers = [CacheManager(namespace="bench") for _ in range(4)]
+        for worker in workers:
+            worker.lock_poll_interval = 0.005
+
+        def compute():
+            return run_in_threadpool(search_hotels, session, "lagos", 1, 20)
+
+        results = await asyncio.gather(*[
+            workers[i % len(workers)].get_or_compute("hotel_search:cold", compute, 300)
+            for i in range(CONCURRENT_REQUESTS)
+        ])
+
+        print(f"\n{CONCURRENT_REQUESTS} searches on {len(workers)} workers -> {len(statements)} DB queries")
+        assert len(statements) == 2
+        assert sum(w.stats.lock_waits for w in workers) == len(workers) - 1
+        assert all(r["total"] == 40 for r in results)
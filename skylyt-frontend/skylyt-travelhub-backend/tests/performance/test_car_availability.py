@@ -0,0 +1,61 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from app.services.car_availability import CarAvailabilityIndex, Reservation
+
+CARS = 5_000
+RENTALS_PER_CAR = 40
+PAGE = 500
+QUERIES = 200
+
+
+def reservations(start: datetime):
+    """Back-to-back rentals of one to seven days over the coming year"""
+    rng = random.Random(23)
+    booking_id = 0
+    for car in range(CARS):
+        pickup = start + timedelta(days=rng.randint(0, 5))
+        for _ in range(RENTALS_PER_CAR):
+            booking_id += 1
+            ret = pickup + timedelta(days=rng.randint(1, 7))
+            yield Reservation(booking_id, f"car-{car}", pickup, ret)
+            pickup = ret + timedelta(days=rng.randint(0, 4))
+
+
+@pytest.mark.performance
+class TestCarAvailabilityBenchmark:
+    def test_fleet_page_latency(self):
+        """Benchmark which of 500 cars are free for a rental, against scanning every reservation."""
+        start = datetime(2026, 1, 1)
+        rows = list(reservations(start))
+        index = CarAvailabilityIndex()
+        began = time.perf_counter()
+        index.build(rows)
+        print(f"\nindexed {len(rows)} reservations in {(time.perf_counter() - began) * 1000:.0f} ms")
+
+        by_car = {}
+        for r in rows:
+            by_car.setdefault(r.car_id, []).append(r)
+        rng = random.Random(29)
+        windows = []
+        for _ in range(QUERIES):
+            pickup = start + timedelta(days=rng.randint(0, 200))
+            windows.append((rng.sample(sorted(by_car), PAGE), pickup, pickup + timedelta(days=rng.randint(1, 5))))
+
+        began = time.perf_counter()
+        indexed = [index.free(cars, pickup, ret) for cars, pickup, ret in windows]
+        elapsed = (time.perf_counter() - began) / QUERIES
+
+        began = time.perf_counter()
+        scanned = [
+            [c for c in cars if not any(r.start < ret and r.end > pickup for r in by_car[c])]
+            for cars, pickup, ret in windows
+        ]
+        scan = (time.perf_counter() - began) / QUERIES
+        print(f"page of {PAGE}: index {elapsed * 1e6:.0f} us, scan {scan * 1e6:.0f} us")
+
+        assert indexed == scanned
+        assert elapsed < scan
+        assert elapsed < 0.01
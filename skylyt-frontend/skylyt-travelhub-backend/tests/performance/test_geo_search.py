@@ -0,0 +1,88 @@
+import random
+import time
+
+import pytest
+from sqlalchemy import Column, Float, Integer, String, create_engine, func, select
+from sqlalchemy.orm import Session, declarative_base
+from app.services.hotel_search_index import HotelSearchIndex, IndexedHotel
+from app.utils.geo import encode_geohash, geo_filter, parse_geo_query
+
+POINTS = 100_000
+QUERIES = 50
+# Hotels spread over Nigeria's bounding box
+SOUTH, WEST, NORTH, EAST = 4.0, 2.7, 13.9, 14.7
+
+Base = declarative_base()
+
+
+class Place(Base):
+    __tablename__ = "places"
+    id = Column(Integer, primary_key=True)
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String(12), index=True)
+
+
+def points(count: int):
+    rng = random.Random(5)
+    return [(rng.uniform(SOUTH, NORTH), rng.uniform(WEST, EAST)) for _ in range(count)]
+
+
+def searches(count: int):
+    rng = random.Random(9)
+    return [
+        parse_geo_query(f"{rng.uniform(SOUTH, NORTH)},{rng.uniform(WEST, EAST)}", rng.choice([2.0, 10.0, 25.0]), None)
+        for _ in range(count)
+    ]
+
+
+def timed(run, queries):
+    start = time.perf_counter()
+    results = [run(geo) for geo in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+@pytest.mark.performance
+class TestGeoSearchBenchmark:
+    def test_index_grid_against_full_scan(self):
+        """Benchmark radius searches over 100k hotels: geohash grid vs scanning every hotel."""
+        coordinates = points(POINTS)
+        index = HotelSearchIndex()
+        start = time.perf_counter()
+        index.build(
+            IndexedHotel(i, f"Hotel {i}", "lagos", 100.0, 4.0, frozenset(), lat, lng)
+            for i, (lat, lng) in enumerate(coordinates)
+        )
+        print(f"\nbuilt {POINTS} hotels in {(time.perf_counter() - start) * 1000:.0f} ms")
+        queries = searches(QUERIES)
+
+        grid, found = timed(lambda geo: index.search(geo=geo, sort_by="distance", limit=20), queries)
+        scan, expected = timed(
+            lambda geo: sum(1 for lat, lng in coordinates if geo.contains(lat, lng)), queries
+        )
+        print(f"grid: {grid * 1e3:.2f} ms  full scan: {scan * 1e3:.2f} ms per search")
+        assert [page.total for page in found] == expected
+        assert grid * 5 < scan
+
+    def test_sql_geohash_ranges_against_bounds_scan(self):
+        """Benchmark the SQL filter on SQLite: geohash index ranges vs a coordinate-only filter."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.execute(Place.__table__.insert(), [
+                {"id": i, "latitude": lat, "longitude": lng, "geohash": encode_geohash(lat, lng)}
+                for i, (lat, lng) in enumerate(points(POINTS))
+            ])
+            session.execute(select(func.count()).select_from(Place)).scalar()
+            queries = searches(QUERIES)
+
+            def count(criteria):
+                return session.execute(select(func.count()).select_from(Place).where(criteria)).scalar()
+
+            indexed, found = timed(lambda geo: count(geo_filter(Place, geo)), queries)
+            bounded, expected = timed(lambda geo: count(
+                Place.latitude.between(geo.bbox.south, geo.bbox.north) & Place.longitude.between(geo.bbox.west, geo.bbox.east)
+            ), queries)
+        print(f"\ngeohash ranges: {indexed * 1e3:.2f} ms  bounds scan: {bounded * 1e3:.2f} ms per search")
+        assert all(hit <= box for hit, box in zip(found, expected))
+        assert indexed < bounded
@@ -0,0 +1,67 @@
+import random
+import time
+
+import pytest
+from app.services.hotel_search_index import HotelSearchIndex, IndexedHotel
+
+HOTELS = 10_000
+QUERIES = 200
+CITIES = ["Lagos", "Abuja", "Port Harcourt", "Ibadan", "Kano", "Enugu", "Calabar", "Benin City"]
+AMENITIES = ["WiFi", "Pool", "Gym", "Spa", "Restaurant", "Airport Shuttle", "Parking", "Bar"]
+
+
+def catalog(count: int):
+    rng = random.Random(7)
+    return [
+        IndexedHotel(
+            i, f"Hotel {i}", f"District {i % 97}, {rng.choice(CITIES)}".casefold(),
+            float(rng.randint(20, 900)), rng.choice([3.0, 3.5, 4.0, 4.5, 5.0]),
+            frozenset(rng.sample(AMENITIES, rng.randint(0, 5)))
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.performance
+class TestHotelSearchIndexBenchmark:
+    def test_search_latency(self):
+        """Benchmark typical /hotels/search filter combinations over 10k hotels."""
+        start = time.perf_counter()
+        index = HotelSearchIndex()
+        index.build(catalog(HOTELS))
+        build = time.perf_counter() - start
+
+        searches = {
+            "location": dict(location="lagos"),
+            "location+amenities": dict(location="abuja", amenities=["Pool", "WiFi"], sort_by="-star_rating"),
+            "price range": dict(min_price=100, max_price=150),
+            "amenities only": dict(amenities=["Spa"], sort_by="price"),
+        }
+        print(f"\nbuilt {HOTELS} hotels in {build * 1000:.1f} ms")
+        for name, params in searches.items():
+            start = time.perf_counter()
+            for _ in range(QUERIES):
+                result = index.search(**params)
+            elapsed = (time.perf_counter() - start) / QUERIES
+            print(f"{name:>20}: {elapsed * 1e6:8.1f} us  ({result.total} matches)")
+            assert elapsed < 0.05
+
+        start = time.perf_counter()
+        for i in range(QUERIES):
+            index.upsert(IndexedHotel(i, f"Hotel {i}", "ikoyi, lagos", 100.0 + i, 4.0, frozenset(["WiFi"])))
+        print(f"{'upsert':>20}: {(time.perf_counter() - start) / QUERIES * 1e6:8.1f} us")
+
+    def test_facet_overhead(self):
+        """Benchmark a broad search with and without sidebar facets."""
+        index = HotelSearchIndex()
+        index.build(catalog(HOTELS))
+
+        timings = {}
+        for facets in (False, True):
+            start = time.perf_counter()
+            for _ in range(QUERIES // 10):
+                result = index.search(location="lagos", facets=facets, price_factor=1 / 1600)
+            timings[facets] = (time.perf_counter() - start) / (QUERIES // 10)
+        print(f"\n{result.total} matches: {timings[False] * 1000:.2f} ms, with facets {timings[True] * 1000:.2f} ms")
+        assert sum(bucket["count"] for bucket in result.facets["price"]) == result.total
+        assert timings[True] < 0.05
@@ -0,0 +1,33 @@
+import time
+
+import httpx
+import pytest
+from app.core.http_client import OutboundHTTP, UpstreamPolicy
+from tests.fake_suppliers import FakeSupplierServer
+
+CALLS = 200
+
+
+@pytest.mark.performance
+class TestOutboundHTTPBenchmark:
+    @pytest.mark.asyncio
+    async def test_pooled_request_latency(self):
+        """Benchmark calls over the kept-alive pool, limits included, against a new client per call."""
+        http = OutboundHTTP({"api": UpstreamPolicy(rate=1e6, burst=CALLS)})
+        with FakeSupplierServer({"ping": {"ok": True}}) as server:
+            url = f"{server.url}/ping"
+            began = time.perf_counter()
+            for _ in range(CALLS):
+                (await http.request("GET", url, upstream="api")).raise_for_status()
+            pooled = (time.perf_counter() - began) / CALLS
+
+            began = time.perf_counter()
+            for _ in range(CALLS):
+                async with httpx.AsyncClient() as client:
+                    (await client.get(url)).raise_for_status()
+            fresh = (time.perf_counter() - began) / CALLS
+            await http.aclose()
+        print(f"\npooled {pooled * 1e6:.0f} us/call, new client per call {fresh * 1e6:.0f} us/call")
+
+        assert http.get_stats()["upstreams"]["api"]["requests"] == CALLS
+        assert pooled < fresh
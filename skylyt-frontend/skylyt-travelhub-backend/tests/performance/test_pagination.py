@@ -0,0 +1,94 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, Index, Integer, String, create_engine, insert
+from sqlalchemy.orm import Session, declarative_base
+from app.utils import pagination
+from app.utils.pagination import count_total, encode_cursor, order_fingerprint, paginate
+
+# Any SQLAlchemy URL; the default in-memory SQLite needs no setup
+BENCH_DATABASE_URL = os.getenv("PAGINATION_BENCH_DATABASE_URL", "sqlite://")
+PER_PAGE = 20
+DEEP_PAGE = 5000
+ROWS = PER_PAGE * DEEP_PAGE + 1000
+REPEATS = 20
+
+Base = declarative_base()
+
+
+class BenchPayment(Base):
+    __tablename__ = "bench_payments"
+    id = Column(Integer, primary_key=True)
+    reference = Column(String(50))
+    created_at = Column(DateTime, nullable=False)
+    __table_args__ = (Index("idx_bench_payments_created_id", "created_at", "id"),)
+
+
+ORDER = [(BenchPayment.created_at, True), (BenchPayment.id, True)]
+
+
+@pytest.fixture(scope="module")
+def db():
+    engine = create_engine(BENCH_DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        # Several payments per second so the id tie-breaker matters
+        conn.execute(insert(BenchPayment), [
+            {"id": i, "reference": f"PAY-{i}", "created_at": start + timedelta(seconds=i // 3)}
+            for i in range(1, ROWS + 1)
+        ])
+    with Session(engine) as session:
+        yield session
+    Base.metadata.drop_all(engine)
+
+
+def timed(fetch) -> float:
+    fetch()
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fetch()
+    return (time.perf_counter() - start) / REPEATS
+
+
+@pytest.mark.performance
+class TestPaginationBenchmark:
+    def test_deep_pages_cost_the_same_as_the_first(self, db):
+        """Benchmark page 1 against page 5000 with OFFSET and with a cursor."""
+        query = db.query(BenchPayment)
+        # The last row of page DEEP_PAGE - 1, i.e. the cursor a client holds for page DEEP_PAGE
+        before_deep = paginate(query, ORDER, PER_PAGE, page=DEEP_PAGE - 1, with_total=False).items[-1]
+        cursor = encode_cursor([before_deep.created_at, before_deep.id], order_fingerprint(ORDER))
+
+        first = timed(lambda: paginate(query, ORDER, PER_PAGE, with_total=False))
+        offset_deep = timed(lambda: paginate(query, ORDER, PER_PAGE, page=DEEP_PAGE, with_total=False))
+        cursor_deep = timed(lambda: paginate(query, ORDER, PER_PAGE, cursor=cursor, with_total=False))
+
+        print(f"\n{ROWS} rows, {PER_PAGE} per page")
+        print(f"{'page 1':>22}: {first * 1000:7.2f} ms")
+        print(f"{f'page {DEEP_PAGE} (offset)':>22}: {offset_deep * 1000:7.2f} ms")
+        print(f"{f'page {DEEP_PAGE} (cursor)':>22}: {cursor_deep * 1000:7.2f} ms")
+
+        deep = paginate(query, ORDER, PER_PAGE, cursor=cursor, with_total=False)
+        assert [p.id for p in deep.items] == [
+            p.id for p in paginate(query, ORDER, PER_PAGE, page=DEEP_PAGE, with_total=False).items
+        ]
+        # Keyset pages seek through the index: depth does not matter
+        assert cursor_deep < first * 3
+        assert cursor_deep < offset_deep
+
+    def test_cached_counts_skip_the_count_query(self, db):
+        """Benchmark exact against cached totals for a filtered payments list."""
+        query = db.query(BenchPayment).filter(BenchPayment.reference.like("PAY-1%"))
+        pagination._count_cache.clear()
+
+        exact = timed(lambda: count_total(query, "exact"))
+        cached = timed(lambda: count_total(query, "cached"))
+
+        print(f"\n{'exact count':>22}: {exact * 1000:7.2f} ms")
+        print(f"{'cached count':>22}: {cached * 1000:7.2f} ms")
+        assert count_total(query, "cached") == count_total(query, "exact")
+        assert cached < exact
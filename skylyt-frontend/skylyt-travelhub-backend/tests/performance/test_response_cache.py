@@ -0,0 +1,42 @@
+import time
+
+import pytest
+from app.utils.cache_serialization import CacheSerializer
+from app.utils.response_cache import encode_response
+from tests.performance.test_cache_serialization import hotel_search_payload
+
+ITERATIONS = 500
+
+
+def per_hit(func) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func()
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+@pytest.mark.performance
+class TestResponseCacheBenchmark:
+    def test_hit_skips_decode_and_encode(self):
+        """Benchmark a search cache hit as stored payload vs. stored response bytes."""
+        serializer = CacheSerializer()
+        envelope = hotel_search_payload()
+        stored_payload = serializer.dumps(envelope)
+        stored_response = serializer.dumps(encode_response(envelope["v"]))
+
+        def payload_hit():
+            # Previous hit path: decode the payload, then JSON-encode and gzip it again
+            value = serializer.loads(stored_payload)["v"]
+            encode_response(value)
+
+        def response_hit():
+            serializer.loads(stored_response).body
+
+        payload_time = per_hit(payload_hit)
+        response_time = per_hit(response_hit)
+
+        print(
+            f"\npayload hit {payload_time * 1e6:8.1f} us ({len(stored_payload)} bytes stored)"
+            f"\nbytes hit   {response_time * 1e6:8.1f} us ({len(stored_response)} bytes stored)"
+        )
+        assert response_time < payload_time / 5
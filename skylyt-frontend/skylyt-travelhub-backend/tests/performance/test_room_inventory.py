@@ -0,0 +1,45 @@
+import random
+import time
+from datetime import date, timedelta
+
+import pytest
+from app.services.room_inventory import InventoryCalendar
+
+HOTELS = 10_000
+DAYS = 365
+PAGE = 50
+QUERIES = 200
+ROOM_TYPES = [{"type": "Standard", "available_rooms": 20}, {"type": "Deluxe", "available_rooms": 5}]
+
+
+def inventory(start: date):
+    """Hotels with two room types, a third of them booked on most nights"""
+    rng = random.Random(13)
+    hotels = [(i, 25, ROOM_TYPES) for i in range(HOTELS)]
+    rows = [
+        (i, room_type["type"], start + timedelta(days=offset), room_type["available_rooms"], rng.randint(0, room_type["available_rooms"]))
+        for i in range(0, HOTELS, 3) for room_type in ROOM_TYPES for offset in range(0, 120, 1)
+    ]
+    return hotels, rows
+
+
+@pytest.mark.performance
+class TestRoomInventoryBenchmark:
+    def test_page_availability_latency(self):
+        """Benchmark availability of a 50-hotel search page for a week's stay over 10k hotels."""
+        start = date.today()
+        hotels, rows = inventory(start)
+        began = time.perf_counter()
+        calendar = InventoryCalendar.from_rows(1, start, DAYS, hotels, rows)
+        print(f"\nloaded {len(rows)} inventory rows in {(time.perf_counter() - began) * 1000:.0f} ms")
+
+        rng = random.Random(17)
+        began = time.perf_counter()
+        for _ in range(QUERIES):
+            check_in = start + timedelta(days=rng.randint(0, 100))
+            page = rng.sample(range(HOTELS), PAGE)
+            result = calendar.available_many(page, check_in, check_in + timedelta(days=7), rooms=2)
+        elapsed = (time.perf_counter() - began) / QUERIES
+        print(f"page of {PAGE}: {elapsed * 1e6:.0f} us ({sum(result.values())} available)")
+        assert len(result) == PAGE
+        assert elapsed < 0.01
@@ -0,0 +1,23 @@
+import time
+
+import pytest
+from app.services.search_history import SearchHistoryRecorder, search_params
+
+SEARCHES = 100_000
+CAPACITY = 10_000
+
+
+@pytest.mark.performance
+class TestSearchHistoryBenchmark:
+    def test_record_latency(self):
+        """Benchmark what recording adds to a search request, with the buffer overflowing."""
+        recorder = SearchHistoryRecorder(capacity=CAPACITY, batch_size=SEARCHES)
+        began = time.perf_counter()
+        for i in range(SEARCHES):
+            recorder.record(i % 500, "car", search_params(location="Lagos", page=i % 5 + 1, category=None))
+        elapsed = (time.perf_counter() - began) / SEARCHES
+        print(f"\nrecord: {elapsed * 1e6:.2f} us per search, {recorder.dropped} dropped")
+
+        assert len(recorder) == CAPACITY
+        assert recorder.dropped == SEARCHES - CAPACITY
+        assert elapsed < 50e-6
@@ -0,0 +1,51 @@
+import random
+import time
+
+import pytest
+from app.services.suggestion_index import Suggestion, SuggestionIndex
+
+ENTRIES = 50_000
+TYPED_NAMES = 300
+P99_BUDGET_SECONDS = 0.001
+SYLLABLES = ["la", "go", "ab", "u", "ja", "ik", "e", "ko", "le", "ki", "ba", "dan", "ka", "no", "su", "ite", "ro", "yal"]
+
+
+def catalog(count: int, rng: random.Random):
+    def word():
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+    return [
+        Suggestion(f"hotel:{i}", "hotel", f"{word()} {word()} {rng.choice(['Hotel', 'Suites', 'Inn'])}", rng.random() * 100)
+        for i in range(count)
+    ]
+
+
+def p99(samples):
+    return sorted(samples)[int(len(samples) * 0.99)]
+
+
+@pytest.mark.performance
+class TestSuggestionIndexBenchmark:
+    def test_every_keystroke_under_a_millisecond(self):
+        """Benchmark typing names letter by letter while entries keep changing."""
+        rng = random.Random(18)
+        entries = catalog(ENTRIES, rng)
+        index = SuggestionIndex()
+        start = time.perf_counter()
+        index.build(entries)
+        build = time.perf_counter() - start
+
+        timings = []
+        for typed in rng.sample(entries, TYPED_NAMES):
+            # A concurrent edit between searches, as commits arrive
+            changed = rng.choice(entries)
+            index.upsert(changed._replace(score=rng.random() * 100))
+            for n in range(1, len(typed.name) + 1):
+                start = time.perf_counter()
+                results = index.search(typed.name[:n], limit=8)
+                timings.append(time.perf_counter() - start)
+            assert typed.key in [result.key for result in results]
+
+        print(f"\n{ENTRIES} entries built in {build * 1000:.0f} ms")
+        print(f"{len(timings)} keystrokes: p50 {sorted(timings)[len(timings) // 2] * 1e6:.0f} us, p99 {p99(timings) * 1e6:.0f} us")
+        assert p99(timings) < P99_BUDGET_SECONDS
@@ -0,0 +1,45 @@
+import time
+from contextlib import ExitStack
+from datetime import date, timedelta
+
+import pytest
+from app.core.http_client import OutboundHTTP
+from app.external.hotels.booking_com import BookingComAPI
+from app.services import supplier_search
+from app.services.supplier_search import OK, SupplierAggregator
+from app.utils import cache as cache_module
+from app.utils.cache import CacheManager
+from tests.fake_redis import FakeAsyncRedis
+from tests.fake_suppliers import FakeSupplierServer
+
+SUPPLIERS = 8
+LATENCY = 0.2
+
+
+@pytest.mark.performance
+class TestSupplierSearchBenchmark:
+    @pytest.mark.asyncio
+    async def test_fan_out_latency(self, monkeypatch):
+        """Benchmark a search over 8 suppliers of 200 ms each: the slowest supplier, not their sum."""
+        redis_client = FakeAsyncRedis()
+        monkeypatch.setattr(cache_module, "get_async_redis", lambda: redis_client)
+        monkeypatch.setattr(supplier_search, "cache_manager", CacheManager())
+        check_in = date.today() + timedelta(days=7)
+        offers = {"hotels": [{"hotel_id": f"h{i}", "name": f"Hotel {i}", "price": 100 + i} for i in range(50)]}
+
+        with ExitStack() as stack:
+            servers = [stack.enter_context(FakeSupplierServer({"hotels": offers}, delay=LATENCY)) for _ in range(SUPPLIERS)]
+            http = OutboundHTTP()
+            aggregator = SupplierAggregator([BookingComAPI("key", server.url, http) for server in servers], timeout=2)
+            began = time.perf_counter()
+            results = await aggregator.search_hotels("Lagos", check_in, check_in + timedelta(days=2), 2, 1)
+            elapsed = time.perf_counter() - began
+            began = time.perf_counter()
+            await aggregator.search_hotels("Lagos", check_in, check_in + timedelta(days=2), 2, 1)
+            cached = time.perf_counter() - began
+            await http.aclose()
+        print(f"\n{SUPPLIERS} suppliers: {elapsed * 1000:.0f} ms (serial {SUPPLIERS * LATENCY * 1000:.0f} ms), cached {cached * 1000:.1f} ms")
+
+        assert all(result.status == OK for result in results)
+        assert elapsed < 2 * LATENCY
+        assert cached < LATENCY / 4
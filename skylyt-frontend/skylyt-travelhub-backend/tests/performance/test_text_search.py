@@ -0,0 +1,95 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+# A PostgreSQL database the benchmark may create and drop tables in
+BENCH_DATABASE_URL = os.getenv("TEXT_SEARCH_BENCH_DATABASE_URL")
+ROW_COUNTS = [int(n) for n in os.getenv("TEXT_SEARCH_BENCH_ROWS", "10000,100000,1000000").split(",")]
+QUERIES = ["ada", "okafor", "SKY-4821", "grand hotel", "@example.org"]
+REPEATS = 5
+
+SEARCH_COLUMNS = ["customer_name", "customer_email", "booking_reference", "hotel_name", "car_name"]
+WHERE = " OR ".join(f"{column} ILIKE :pattern" for column in SEARCH_COLUMNS)
+RANK = "greatest(" + ", ".join(
+    f"word_similarity(:term, coalesce({column}, ''))" for column in SEARCH_COLUMNS
+) + ")"
+
+pytestmark = pytest.mark.skipif(
+    not BENCH_DATABASE_URL, reason="set TEXT_SEARCH_BENCH_DATABASE_URL to a PostgreSQL database"
+)
+
+
+def fill_bookings(conn, rows: int):
+    """A bookings-shaped table with realistic text spread"""
+    conn.execute(text("DROP TABLE IF EXISTS bench_bookings"))
+    conn.execute(text("""
+        CREATE TABLE bench_bookings (
+            id serial PRIMARY KEY,
+            customer_name varchar(255), customer_email varchar(255),
+            booking_reference varchar(50), hotel_name varchar(255), car_name varchar(255),
+            created_at timestamp DEFAULT now()
+        )
+    """))
+    conn.execute(text("""
+        INSERT INTO bench_bookings (customer_name, customer_email, booking_reference, hotel_name, car_name)
+        SELECT
+            (ARRAY['Ada','Chidi','Ngozi','Tunde','Amaka','Emeka','Funke','Bayo'])[1 + i % 8]
+                || ' ' || (ARRAY['Okafor','Adeyemi','Balogun','Eze','Nwosu','Bello'])[1 + (i / 8) % 6]
+                || ' ' || md5(i::text)::varchar(6),
+            'user' || i || '@' || (ARRAY['example.com','example.org','mail.ng'])[1 + i % 3],
+            'SKY-' || i,
+            CASE WHEN i % 2 = 0 THEN (ARRAY['Grand Hotel','Eko Suites','Transcorp Hilton'])[1 + i % 3]
+                 || ' ' || (i % 500) END,
+            CASE WHEN i % 2 = 1 THEN (ARRAY['Toyota Camry','Lexus RX','Range Rover'])[1 + i % 3] END
+        FROM generate_series(1, :rows) AS i
+    """), {"rows": rows})
+    conn.execute(text("ANALYZE bench_bookings"))
+
+
+def add_trigram_indexes(conn):
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for column in SEARCH_COLUMNS:
+        conn.execute(text(
+            f"CREATE INDEX bench_{column}_trgm ON bench_bookings USING gin ({column} gin_trgm_ops)"
+        ))
+    conn.execute(text("ANALYZE bench_bookings"))
+
+
+def time_search(conn, ranked: bool) -> float:
+    order = f"{RANK} DESC" if ranked else "created_at DESC"
+    sql = text(f"SELECT id FROM bench_bookings WHERE {WHERE} ORDER BY {order} LIMIT 20")
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for term in QUERIES:
+            conn.execute(sql, {"pattern": f"%{term}%", "term": term}).all()
+        best = min(best, (time.perf_counter() - start) / len(QUERIES))
+    return best
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestTextSearchBenchmark:
+    @pytest.mark.parametrize("rows", ROW_COUNTS)
+    def test_trigram_indexes_vs_ilike_scan(self, rows):
+        """Benchmark the five-column booking search with and without pg_trgm."""
+        engine = create_engine(BENCH_DATABASE_URL)
+        try:
+            with engine.begin() as conn:
+                fill_bookings(conn, rows)
+                scan = time_search(conn, ranked=False)
+                add_trigram_indexes(conn)
+                indexed = time_search(conn, ranked=False)
+                ranked = time_search(conn, ranked=True)
+                conn.execute(text("DROP TABLE bench_bookings"))
+        finally:
+            engine.dispose()
+
+        print(
+            f"\n{rows:>9} rows: ILIKE scan {scan * 1000:8.2f} ms | "
+            f"trigram {indexed * 1000:8.2f} ms | trigram ranked {ranked * 1000:8.2f} ms"
+        )
+        if rows >= 100_000:
+            assert indexed < scan
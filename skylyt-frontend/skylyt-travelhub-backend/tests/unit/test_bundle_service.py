@@ -0,0 +1,134 @@
+import threading
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+import app.models  # noqa: F401  (every table, for create_all)
+from app.core.database import Base, SessionLocal
+from app.models.booking import Booking
+from app.models.car import Car
+from app.models.currency import Currency
+from app.models.hotel import Hotel
+from app.schemas.car import CarSearchRequest
+from app.schemas.hotel import HotelSearchRequest
+from app.schemas.search import DateRange, LocationSearch
+from app.services import bundle_service, fx_rates
+from app.services.booking_service import BookingService
+from app.services.bundle_service import SORT_PRICE, SORT_SAVINGS, BundleService, stay_cents, top_bundles
+
+HOTEL_CENTS = [45_000_00, 12_345_67, 99_999_99, 12_345_67, 80_000_05]
+CAR_CENTS = [15_000_00, 7_777_77, 30_000_33, 5]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # One connection, shared with the threadpool the candidate searches run in
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = SessionLocal(bind=engine)
+    monkeypatch.setattr(bundle_service, "run_in_session", lambda func, *args: func(session, *args))
+    fx_rates.invalidate_rates()
+    yield session
+    session.close()
+
+
+def car(car_id, location, price, features=None):
+    return Car(
+        id=car_id, name=car_id, make="Toyota", model=car_id, category="sedan", transmission="automatic",
+        seats=5, price_per_day=price, location=location, features=features
+    )
+
+
+def pairwise(sort_by):
+    """Every pair priced through calculate_bundle_savings, best first"""
+    scored = []
+    for i, hotel in enumerate(HOTEL_CENTS):
+        for j, car in enumerate(CAR_CENTS):
+            savings = BookingService.calculate_bundle_savings(Decimal(hotel) / 100, Decimal(car) / 100)
+            key = savings["bundle_price"] if sort_by == SORT_PRICE else -savings["savings"]
+            scored.append((key, i, j))
+    return [(i, j) for key, i, j in sorted(scored)]
+
+
+class TestBundleScoring:
+    def test_bundle_savings_round_half_up(self):
+        """Test the discount is rounded half up to the cent."""
+        savings = BookingService.calculate_bundle_savings(Decimal("6.00"), Decimal("4.05"))
+
+        assert savings == {
+            "individual_total": Decimal("10.05"),
+            "bundle_price": Decimal("9.04"),
+            "savings": Decimal("1.01"),
+            "discount_percentage": Decimal("10")
+        }
+
+    @pytest.mark.parametrize("sort_by", [SORT_SAVINGS, SORT_PRICE])
+    def test_top_bundles_match_pairwise_pricing(self, sort_by):
+        """Test the column-wise scores rank pairs exactly like the Decimal rule."""
+        for limit in (1, 3, len(HOTEL_CENTS) * len(CAR_CENTS)):
+            assert top_bundles(HOTEL_CENTS, CAR_CENTS, limit, sort_by) == pairwise(sort_by)[:limit]
+
+    def test_no_candidates_no_bundles(self):
+        """Test an empty side yields no bundles instead of failing."""
+        assert top_bundles([], CAR_CENTS, 5, SORT_PRICE) == []
+        assert top_bundles(HOTEL_CENTS, [], 5, SORT_SAVINGS) == []
+
+    def test_stay_cents_cover_every_unit(self):
+        """Test nightly rates are multiplied out before rounding."""
+        assert stay_cents([100.0, 33.335, 0.005], 3) == [300_00, 100_01, 2]
+
+
+class TestSearchBundles:
+    @pytest.mark.asyncio
+    async def test_candidate_searches_run_concurrently(self, monkeypatch):
+        """Test the hotel and car searches overlap and bundles cover the whole stay."""
+        both_running = threading.Barrier(2, timeout=5)
+
+        def hotels(db, search, currency):
+            both_running.wait()
+            return [{"id": "h1", "price": 100.0, "currency": currency}, {"id": "h2", "price": 250.0, "currency": currency}]
+
+        def cars(db, search, currency):
+            both_running.wait()
+            return [{"id": "c1", "price": 40.0, "currency": currency}]
+
+        monkeypatch.setattr(bundle_service, "load_hotel_candidates", hotels)
+        monkeypatch.setattr(bundle_service, "load_car_candidates", cars)
+        dates = DateRange(start_date=date(2024, 6, 1), end_date=date(2024, 6, 4))
+        hotel_search = HotelSearchRequest(location=LocationSearch(city="Lagos"), dates=dates, rooms=2)
+        car_search = CarSearchRequest(pickup_location=LocationSearch(city="Lagos"), dates=dates)
+
+        bundles = await BundleService.search_bundles(hotel_search, car_search, 3, "USD", SORT_PRICE, 5)
+
+        assert [(b["hotel"]["id"], b["car"]["id"]) for b in bundles] == [("h1", "c1"), ("h2", "c1")]
+        # 3 nights x 2 rooms at 100 plus 3 days at 40
+        assert bundles[0]["individual_total"] == 720.0
+        assert bundles[0]["bundle_price"] == 648.0
+        assert bundles[0]["savings"] == 72.0
+
+    @pytest.mark.asyncio
+    async def test_car_candidates_are_free_cars_in_the_city(self, db):
+        """Test bundle cars come from the searched city, keep string features and skip cars booked for the stay."""
+        db.add_all([
+            Currency(code="USD", name="US Dollar", symbol="$", rate_to_ngn=1500),
+            Hotel(id=1, name="Eko Hotel", location="Victoria Island, Lagos", star_rating=5, price_per_night=150000, room_count=10),
+            car("lagos-free", "Ikeja, Lagos", 60000, ["Air Conditioning"]),
+            car("lagos-booked", "Lekki, Lagos", 30000),
+            car("abuja", "Wuse, Abuja", 15000),
+            Booking(
+                booking_reference="B1", booking_type="car", customer_name="Ada", customer_email="ada@example.com",
+                total_amount=100, start_date=datetime(2024, 6, 2), end_date=datetime(2024, 6, 3), status="confirmed",
+                booking_data={"item_id": "lagos-booked"}
+            ),
+        ])
+        db.commit()
+        dates = DateRange(start_date=date(2024, 6, 1), end_date=date(2024, 6, 4))
+        hotel_search = HotelSearchRequest(location=LocationSearch(city="Lagos"), dates=dates)
+        car_search = CarSearchRequest(pickup_location=LocationSearch(city="lagos"), dates=dates)
+
+        bundles = await BundleService.search_bundles(hotel_search, car_search, 3, "USD", SORT_PRICE, 5)
+
+        assert [(b["hotel"]["name"], b["car"]["id"]) for b in bundles] == [("Eko Hotel", "lagos-free")]
+        assert bundles[0]["car"]["features"] == ["Air Conditioning"]
+        assert bundles[0]["car"]["price"] == 40.0
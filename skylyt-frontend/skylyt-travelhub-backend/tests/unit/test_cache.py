@@ -0,0 +1,353 @@
+import asyncio
+import json
+import pytest
+from app.utils import cache as cache_module
+from app.utils.cache import CacheManager
+from app.utils.cache_local import LocalCache
+from tests.fake_redis import FakeAsyncRedis
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "get_async_redis", lambda: client)
+    return client
+
+
+class TestCacheManager:
+    @pytest.mark.asyncio
+    async def test_keys_are_namespaced(self, fake_redis):
+        """Test every key is stored under the cache namespace."""
+        cache = CacheManager(namespace="test")
+        await cache.set("hotel:1", {"name": "Test Hotel"}, 60)
+
+        assert "test:hotel:1" in fake_redis.store
+        assert all(k.startswith("test:") for k in fake_redis.store)
+        assert await cache.get("hotel:1") == {"name": "Test Hotel"}
+
+    @pytest.mark.asyncio
+    async def test_mget_preserves_order_and_misses(self, fake_redis):
+        """Test mget returns values in key order with None for misses."""
+        cache = CacheManager(namespace="test")
+        await cache.set("a", 1)
+        await cache.set("c", 3)
+
+        assert await cache.mget(["a", "b", "c"]) == [1, None, 3]
+
+    @pytest.mark.asyncio
+    async def test_stats_are_reported_per_tier(self, fake_redis):
+        """Test hits are served from L1 and misses fall through to L2."""
+        cache = CacheManager(namespace="test")
+        await cache.set("key", "value")
+        await cache.get("key")
+        await cache.get("missing")
+
+        stats = cache.get_stats()
+        assert stats["l1"]["hits"] == 1
+        assert stats["l1"]["misses"] == 1
+        assert stats["l2"]["hits"] == 0
+        assert stats["l2"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_l2_hit_populates_l1(self, fake_redis):
+        """Test a value read from Dragonfly is kept in the worker tier."""
+        writer = CacheManager(namespace="test")
+        reader = CacheManager(namespace="test")
+        await writer.set("key", {"v": 1})
+
+        assert await reader.get("key") == {"v": 1}
+        assert await reader.get("key") == {"v": 1}
+        assert reader.get_stats()["l2"]["hits"] == 1
+        assert reader.get_stats()["l1"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_broadcast_invalidations(self, fake_redis):
+        """Test another worker drops its L1 copy when a key changes."""
+        worker_a = CacheManager(namespace="test")
+        worker_b = CacheManager(namespace="test")
+        await worker_a.set("settings", {"v": 1})
+        await worker_b.get("settings")
+
+        await worker_a.set("settings", {"v": 2})
+        channel, payload = fake_redis.published[-1]
+        assert channel == "test:invalidate"
+        worker_b.handle_invalidation(payload)
+
+        assert await worker_b.get("settings") == {"v": 2}
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_l2_read_is_not_undone(self, fake_redis):
+        """Test a value invalidated while it was being read from Dragonfly is not kept in L1."""
+        writer = CacheManager(namespace="test")
+        reader = CacheManager(namespace="test")
+        await writer.set("settings", {"v": 1})
+        read = fake_redis.get
+
+        async def racing_get(key):
+            raw = await read(key)
+            reader.handle_invalidation(json.dumps({"keys": [key], "patterns": []}))
+            return raw
+
+        fake_redis.get = racing_get
+        assert await reader.get("settings") == {"v": 1}
+        fake_redis.get = read
+
+        await writer.set("settings", {"v": 2})
+        assert await reader.get("settings") == {"v": 2}
+
+    @pytest.mark.asyncio
+    async def test_own_broadcasts_are_ignored(self, fake_redis):
+        """Test a worker does not evict entries it just wrote."""
+        cache = CacheManager(namespace="test")
+        await cache.set("key", "value")
+        cache.handle_invalidation(fake_redis.published[-1][1])
+
+        assert cache.local.get("test:key") == "value"
+
+    @pytest.mark.asyncio
+    async def test_broadcasts_reach_handlers_on_other_workers(self, fake_redis):
+        """Test extra broadcast fields are passed to other workers' handlers."""
+        sender = CacheManager(namespace="test")
+        receiver = CacheManager(namespace="test")
+        received = []
+        sender.add_broadcast_handler(received.append)
+        receiver.add_broadcast_handler(received.append)
+
+        assert await sender.broadcast(hotel_index=[1, 2])
+        payload = fake_redis.published[-1][1]
+        sender.handle_invalidation(payload)
+        receiver.handle_invalidation(payload)
+
+        assert [message["hotel_index"] for message in received] == [[1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_namespace_deletes_only_its_keys(self, fake_redis):
+        """Test a namespace is dropped from its tag set without scanning keys."""
+        writer = CacheManager(namespace="test")
+        reader = CacheManager(namespace="test")
+        await writer.set("hotel:1", {"id": 1})
+        await writer.set("hotel:2", {"id": 2})
+        await writer.set("car:1", {"id": 1})
+        await reader.get("hotel:1")
+
+        assert await writer.invalidate_namespace("hotel") == 2
+        reader.handle_invalidation(fake_redis.published[-1][1])
+
+        assert await reader.get("hotel:1") is None
+        assert await writer.get("hotel:2") is None
+        assert await writer.get("car:1") == {"id": 1}
+        assert "test:tag:ns:hotel" not in fake_redis.store
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tagged_writes_are_all_invalidated(self, fake_redis):
+        """Test concurrent writers never drop each other's tag membership."""
+        cache = CacheManager(namespace="test")
+        await asyncio.gather(
+            *[cache.set(f"search:{i}", i, 60, tags=["search"]) for i in range(50)]
+        )
+
+        assert await cache.invalidate_tags("search") == 50
+        assert not any(k.startswith("test:search:") for k in fake_redis.store)
+
+    @pytest.mark.asyncio
+    async def test_tag_sets_outlive_their_members(self, fake_redis, monkeypatch):
+        """Test a tag set keeps the TTL of its longest-lived member."""
+        monkeypatch.setattr(cache_module.time, "time", lambda: 1000.0)
+        cache = CacheManager(namespace="test")
+        await cache.set("a", 1, 600, tags=["t"])
+        await cache.set("b", 2, 60, tags=["t"])
+
+        assert fake_redis.ttls["test:tag:t"] == 600
+
+    @pytest.mark.asyncio
+    async def test_persistent_members_keep_their_tag_set(self, fake_redis):
+        """Test a member without a TTL is never expired with its tag set."""
+        cache = CacheManager(namespace="test")
+        await cache.set("a", 1, tags=["t"])
+        await cache.set("b", 2, 60, tags=["t"])
+
+        assert "test:tag:t" not in fake_redis.ttls
+        assert await cache.invalidate_tags("t") == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_members_are_pruned(self, fake_redis, monkeypatch):
+        """Test expired members are dropped on write and skipped on invalidation."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+        cache = CacheManager(namespace="test")
+        await cache.set("a", 1, 60, tags=["t"])
+        await cache.set("b", 2, 600, tags=["t"])
+        now[0] += 120
+        await cache.set("c", 3, 60, tags=["t"])
+
+        assert set(fake_redis.store["test:tag:t"]) == {"test:b", "test:c"}
+        assert fake_redis.ttls["test:tag:t"] == 480
+        now[0] += 120
+        assert await cache.invalidate_tags("t") == 1
+        assert await cache.get("b") is None
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_caches_result(self, fake_redis):
+        """Test a computed value is stored and reused."""
+        cache = CacheManager(namespace="test")
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {"total": 1}
+
+        assert await cache.get_or_compute("key", compute, 60) == {"total": 1}
+        assert await cache.get_or_compute("key", compute, 60) == {"total": 1}
+        assert len(calls) == 1
+        assert "test:lock:key" not in fake_redis.store
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_reuses_a_fill_that_beat_the_lock(self, fake_redis):
+        """Test a node taking the lock right after another node filled the key does not compute again."""
+        cache = CacheManager(namespace="test")
+        other = CacheManager(namespace="test")
+        calls = []
+        take = fake_redis.set
+
+        async def other_compute():
+            return {"total": 2}
+
+        async def set_after_other_fill(key, value, **kwargs):
+            if key == "test:lock:key" and not calls:
+                calls.append("other")
+                await other.get_or_compute("key", other_compute, 60)
+            return await take(key, value, **kwargs)
+
+        async def compute():
+            calls.append("compute")
+            return {"total": 1}
+
+        fake_redis.set = set_after_other_fill
+        assert await cache.get_or_compute("key", compute, 60) == {"total": 2}
+        assert calls == ["other"]
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_failure_reaches_every_waiter(self, fake_redis):
+        """Test a failed computation is not cached and releases the lock."""
+        cache = CacheManager(namespace="test")
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("database unavailable")
+
+        results = await asyncio.gather(
+            *[cache.get_or_compute("key", compute, 60) for _ in range(5)],
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert fake_redis.store == {}
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_refreshing(self, fake_redis, monkeypatch):
+        """Test a value past its soft TTL is returned at once and refreshed once."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+        cache = CacheManager(namespace="test")
+        version = [1]
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"version": version[0]}
+
+        first = await cache.get_or_compute_entry("key", compute, 600, soft_ttl=60)
+        assert (first.value, first.hit, first.stale) == ({"version": 1}, False, False)
+
+        now[0] += 120
+        version[0] = 2
+        entries = await asyncio.gather(
+            *[cache.get_or_compute_entry("key", compute, 600, soft_ttl=60) for _ in range(10)]
+        )
+        assert all(e.stale and e.value == {"version": 1} for e in entries)
+        assert entries[0].age == 120
+
+        await asyncio.sleep(0.05)
+        fresh = await cache.get_or_compute_entry("key", compute, 600, soft_ttl=60)
+        assert fresh.value == {"version": 2}
+        assert not fresh.stale
+        assert len(calls) == 2
+        assert cache.stats.refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_skipped_while_another_node_refreshes(self, fake_redis, monkeypatch):
+        """Test only the node holding the key lock recomputes a stale entry."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+        cache = CacheManager(namespace="test")
+
+        async def compute():
+            return {"v": 1}
+
+        await cache.get_or_compute_entry("key", compute, 600, soft_ttl=60)
+        now[0] += 120
+        await fake_redis.set("test:lock:key", "other-node")
+
+        entry = await cache.get_or_compute_entry("key", compute, 600, soft_ttl=60)
+        await asyncio.sleep(0.01)
+
+        assert entry.stale
+        assert cache.stats.refreshes == 0
+
+    def test_cache_headers(self):
+        """Test responses expose the age and freshness of cached payloads."""
+        class FakeResponse:
+            headers = {}
+
+        response = FakeResponse()
+        cache_module.apply_cache_headers(response, cache_module.CacheEntry({}, 42.7, True))
+        assert response.headers == {"Age": "42", "X-Cache": "STALE"}
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_are_misses(self, monkeypatch):
+        """Test an unavailable backend degrades to a cache miss."""
+        class BrokenRedis(FakeAsyncRedis):
+            async def get(self, key):
+                raise ConnectionError("down")
+
+        monkeypatch.setattr(cache_module, "get_async_redis", lambda: BrokenRedis())
+        cache = CacheManager(namespace="test")
+
+        assert await cache.get("key") is None
+        assert cache.get_stats()["l2"]["errors"] == 1
+
+
+class TestLocalCache:
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        local = LocalCache(max_entries=2, default_ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("b") is None
+        assert local.get("a") == 1
+        assert local.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries expire after their TTL."""
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.cache_local.time.monotonic", lambda: now[0])
+        local = LocalCache(max_entries=10, default_ttl=60)
+        local.set("a", 1, ttl=5)
+
+        now[0] += 6
+        assert local.get("a") is None
+        assert local.get_stats()["expirations"] == 1
+
+    def test_pattern_invalidation(self):
+        """Test glob invalidation only drops matching keys."""
+        local = LocalCache()
+        local.set("ns:hotel_search:1", 1)
+        local.set("ns:hotel_search:2", 2)
+        local.set("ns:car_search:1", 3)
+
+        assert local.delete_pattern("ns:hotel_search:*") == 2
+        assert local.get("ns:car_search:1") == 3
@@ -0,0 +1,74 @@
+import pytest
+from app.utils import cache as cache_module
+from app.utils import cache_invalidation
+from app.utils.cache import CacheManager
+from app.utils.cache_invalidation import (
+    Invalidation, apply_invalidations, bulk_invalidations_for, invalidations_for
+)
+from tests.fake_redis import FakeAsyncRedis
+
+
+class Hotel:
+    def __init__(self, id):
+        self.id = id
+
+
+class CarImage:
+    def __init__(self, car_id):
+        self.car_id = car_id
+
+
+class Currency:
+    pass
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    client = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "get_async_redis", lambda: client)
+    manager = CacheManager(namespace="test")
+    monkeypatch.setattr(cache_invalidation, "cache_manager", manager)
+    return manager
+
+
+class TestCacheInvalidation:
+    def test_hotel_change_targets_its_detail_and_listings(self):
+        """Test a hotel update drops its own detail entry and hotel listings only."""
+        invalidations = invalidations_for(Hotel("h1"))
+
+        assert Invalidation("tag", "hotel:h1") in invalidations
+        assert Invalidation("ns", "hotel_search") in invalidations
+        assert Invalidation("ns", "featured_hotels") in invalidations
+        assert Invalidation("ns", "hotel_detail") not in invalidations
+        assert Invalidation("ns", "car_search") not in invalidations
+
+    def test_image_change_targets_its_parent(self):
+        """Test image changes invalidate the owning car's detail entry."""
+        assert Invalidation("tag", "car:c1") in invalidations_for(CarImage("c1"))
+
+    def test_currency_change_targets_priced_listings(self):
+        """Test exchange rate changes drop every payload with converted prices."""
+        invalidations = invalidations_for(Currency())
+
+        assert Invalidation("ns", "hotel_detail") in invalidations
+        assert Invalidation("ns", "car_search") in invalidations
+        assert Invalidation("key", "currency_rates") in invalidations
+
+    def test_bulk_changes_drop_the_detail_namespace(self):
+        """Test bulk updates with unknown rows invalidate all detail entries."""
+        assert Invalidation("ns", "car_detail") in bulk_invalidations_for("CarImage")
+        assert bulk_invalidations_for("Booking") == set()
+
+    @pytest.mark.asyncio
+    async def test_apply_invalidations(self, cache):
+        """Test only the entries made stale by a hotel update are dropped."""
+        await cache.set("hotel_detail:h1", {"id": "h1"}, 60, tags=["hotel:h1"])
+        await cache.set("hotel_detail:h2", {"id": "h2"}, 60, tags=["hotel:h2"])
+        await cache.set("hotel_search:v2:abc", {"total": 2}, 60)
+        await cache.set("car_search:v2:abc", {"total": 1}, 60)
+
+        assert await apply_invalidations(invalidations_for(Hotel("h1"))) == 2
+        assert await cache.get("hotel_detail:h1") is None
+        assert await cache.get("hotel_search:v2:abc") is None
+        assert await cache.get("hotel_detail:h2") == {"id": "h2"}
+        assert await cache.get("car_search:v2:abc") == {"total": 1}
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from app.utils.cache_keys import CACHE_KEY_VERSION, build_cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+KEY_SCRIPT = """
+from decimal import Decimal
+from app.utils.cache_keys import build_cache_key
+print(build_cache_key("hotel_search", {
+    "location": "lagos", "min_price": Decimal("100.00"), "min_rating": 4.0,
+    "amenities": {"Pool", "WiFi", "Gym"}, "currency": "NGN", "page": 1, "per_page": 20,
+}))
+"""
+
+
+def key_in_subprocess(hash_seed: str) -> str:
+    env = {**os.environ, "PYTHONHASHSEED": hash_seed, "PYTHONPATH": str(PROJECT_ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-c", KEY_SCRIPT],
+        env=env, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+class TestBuildCacheKey:
+    def test_stable_across_hash_seeds(self):
+        """Test interpreters with different hash seeds produce identical keys."""
+        keys = {key_in_subprocess(seed) for seed in ("0", "1", "12345")}
+        assert len(keys) == 1
+
+    def test_key_is_versioned(self):
+        """Test keys carry the prefix and format version."""
+        key = build_cache_key("hotel_search", {"location": "lagos"})
+        prefix, version, digest = key.split(":")
+        assert prefix == "hotel_search"
+        assert version == CACHE_KEY_VERSION
+        assert len(digest) == 32
+
+    def test_parameter_order_does_not_matter(self):
+        """Test dict ordering does not change the key."""
+        assert build_cache_key("s", {"a": 1, "b": 2}) == build_cache_key("s", {"b": 2, "a": 1})
+
+    def test_equivalent_values_share_a_key(self):
+        """Test None filters, numeric spellings and set ordering are normalized."""
+        assert build_cache_key("s", {"a": 1, "b": None}) == build_cache_key("s", {"a": 1})
+        assert build_cache_key("s", {"p": Decimal("100.00")}) == build_cache_key("s", {"p": 100})
+        assert build_cache_key("s", {"r": 4.0}) == build_cache_key("s", {"r": 4})
+        assert build_cache_key("s", {"t": {"x", "y"}}) == build_cache_key("s", {"t": {"y", "x"}})
+
+    def test_different_values_differ(self):
+        """Test distinct parameters never collide."""
+        assert build_cache_key("s", {"page": 1}) != build_cache_key("s", {"page": 2})
+        assert build_cache_key("hotel_search", {}) != build_cache_key("car_search", {})
+
+    def test_unsupported_types_are_rejected(self):
+        """Test objects without a canonical form cannot silently become keys."""
+        with pytest.raises(TypeError):
+            build_cache_key("s", {"obj": object()})
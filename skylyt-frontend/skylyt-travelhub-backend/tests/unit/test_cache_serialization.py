@@ -0,0 +1,61 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from app.utils.cache_serialization import (
+    CODECS, COMPRESSORS, HEADER_FLAG, CachedResponse, CacheSerializer
+)
+
+
+class TestCacheSerializer:
+    @pytest.mark.parametrize("codec", sorted(CODECS))
+    @pytest.mark.parametrize("compression", [None, *sorted(COMPRESSORS)])
+    def test_round_trip(self, codec, compression):
+        """Test every installed codec and compressor reads back what it wrote."""
+        serializer = CacheSerializer(codec, compression, compress_threshold=0)
+        value = {"hotels": [{"id": "h1", "price": 120.5, "amenities": ["Pool"]}] * 50, "total": 50}
+
+        assert CacheSerializer.loads(serializer.dumps(value)) == value
+
+    def test_header_records_format(self):
+        """Test the first byte names the codec and compression actually used."""
+        serializer = CacheSerializer("json", "zlib", compress_threshold=100)
+
+        small = serializer.dumps({"a": 1})
+        large = serializer.dumps({"a": "x" * 1000})
+        assert small[0] == HEADER_FLAG | CODECS["json"].id
+        assert large[0] == HEADER_FLAG | COMPRESSORS["zlib"].id << 4 | CODECS["json"].id
+
+    def test_reads_entries_without_header(self):
+        """Test plain JSON written before the header existed is still readable."""
+        legacy = json.dumps({"v": {"total": 3}, "t": 1.5}).encode()
+
+        assert CacheSerializer.loads(legacy) == {"v": {"total": 3}, "t": 1.5}
+
+    def test_non_json_types_become_strings(self):
+        """Test Decimals and dates are stored as strings, as with stdlib JSON."""
+        serializer = CacheSerializer()
+        value = CacheSerializer.loads(serializer.dumps({"price": Decimal("10.50"), "day": date(2024, 6, 1)}))
+
+        assert value == {"price": "10.50", "day": "2024-06-01"}
+
+    def test_cached_response_round_trip(self):
+        """Test encoded responses are framed as is and read back unchanged."""
+        cached = CachedResponse(1718000000.25, "application/json", '"abc"', "gzip", b"\x1f\x8b\x00body")
+        data = CacheSerializer("json", "zlib", compress_threshold=0).dumps(cached)
+
+        assert data.endswith(cached.body)
+        assert CacheSerializer.loads(data) == cached
+
+    def test_unknown_header_is_rejected(self):
+        """Test values from an unknown format raise instead of decoding garbage."""
+        with pytest.raises(ValueError):
+            CacheSerializer.loads(bytes((HEADER_FLAG | 0x0F,)) + b"{}")
+
+    def test_unavailable_backends_fall_back(self):
+        """Test configuring a missing codec or compressor degrades gracefully."""
+        serializer = CacheSerializer("no-such-codec", "no-such-compression")
+
+        assert serializer.codec_name == "json"
+        assert serializer.compression_name == "zlib"
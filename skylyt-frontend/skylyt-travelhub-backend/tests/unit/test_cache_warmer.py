@@ -0,0 +1,82 @@
+import asyncio
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from app.services.search_demand_service import SearchDemandService
+from app.utils import cache as cache_module
+from app.utils.cache import CacheEntry, CacheManager, CacheWarmer
+from tests.fake_redis import FakeAsyncRedis
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "get_async_redis", lambda: client)
+    return client
+
+
+class TestSearchDemandService:
+    def test_params_are_coerced_to_search_arguments(self):
+        """Test stored history becomes arguments the search accepts."""
+        params = SearchDemandService.warmable_params("hotel", {
+            "destination": " Lagos ", "min_price": "100.00", "star_rating": "4",
+            "amenities": ["Pool", "WiFi"], "page": "2", "unknown": "x", "city": None,
+        })
+
+        assert params == {
+            "destination": "Lagos", "min_price": Decimal("100.00"), "star_rating": 4.0,
+            "amenities": "Pool,WiFi", "page": 2,
+        }
+
+    def test_past_dates_are_dropped(self):
+        """Test searches for dates that have passed are replayed without dates."""
+        past = (date.today() - timedelta(days=1)).isoformat()
+        future = (date.today() + timedelta(days=7)).isoformat()
+
+        assert SearchDemandService.warmable_params(
+            "car", {"location": "Abuja", "pickup_date": past, "return_date": future}
+        ) == {"location": "Abuja"}
+        assert SearchDemandService.warmable_params(
+            "car", {"location": "Abuja", "pickup_date": future}
+        ) == {"location": "Abuja", "pickup_date": future}
+
+    def test_malformed_history_is_ignored(self):
+        """Test rows that are not parameter objects are skipped."""
+        assert SearchDemandService.warmable_params("hotel", ["Lagos"]) is None
+        assert SearchDemandService.warmable_params("hotel", {"guests": "many"}) == {}
+
+
+class TestCacheWarmer:
+    @pytest.mark.asyncio
+    async def test_warms_searches_in_a_bounded_pool(self, fake_redis, monkeypatch):
+        """Test every popular search runs, never more than the pool size at once."""
+        monkeypatch.setattr(cache_module.settings, "CACHE_WARM_CONCURRENCY", 2)
+        searches = [("hotel", {"destination": f"City {i}"}) for i in range(6)]
+        monkeypatch.setattr(CacheWarmer, "_load_popular_searches", staticmethod(lambda db, limit: searches))
+        monkeypatch.setattr("app.core.database.run_in_session", lambda func, *args: func(None, *args))
+        running, peak, seen = [0], [0], []
+
+        async def fake_search(**params):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            seen.append(params["destination"])
+            return CacheEntry({"hotels": []}, 0.0, False, hit=False)
+
+        monkeypatch.setattr("app.api.v1.hotels.cached_hotel_search", fake_search)
+        warmer = CacheWarmer(CacheManager(namespace="test"))
+
+        assert await warmer.warm_popular_searches() == {"hotel": 6, "car": 0}
+        assert sorted(seen) == [f"City {i}" for i in range(6)]
+        assert peak[0] == 2
+        assert "test:lock:cache_warmer" not in fake_redis.store
+
+    @pytest.mark.asyncio
+    async def test_only_one_process_warms_at_a_time(self, fake_redis):
+        """Test a warm run is skipped while another holds the warmer lock."""
+        await fake_redis.set("test:lock:cache_warmer", "other-node")
+        warmer = CacheWarmer(CacheManager(namespace="test"))
+
+        assert await warmer.warm_popular_searches() == {}
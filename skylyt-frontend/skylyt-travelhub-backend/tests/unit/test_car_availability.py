@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+
+import app.models  # noqa: F401  (every table, for create_all)
+from app.core.database import Base, SessionLocal
+from app.models.booking import Booking
+from app.services.car_availability import (
+    CarAvailabilityIndex, CarSchedule, Reservation, booking_car_id, load_busy_cars, load_reservations, parse_window
+)
+
+START = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def day(offset: int) -> datetime:
+    return START + timedelta(days=offset)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = SessionLocal(bind=engine)
+    yield session
+    session.close()
+
+
+def booking(reference, car_id, start, end, status="confirmed", booking_type="car"):
+    data = {"item_id": car_id} if booking_type == "car" else {"car": {"id": car_id}}
+    return Booking(
+        booking_reference=reference, booking_type=booking_type, customer_name="Ada", customer_email="ada@example.com",
+        total_amount=100, start_date=day(start), end_date=day(end), status=status, booking_data=data
+    )
+
+
+class TestCarAvailability:
+    def test_schedule_overlaps_match_brute_force(self):
+        """Test the running maximum end finds overlaps hidden behind later, shorter reservations."""
+        reservations = [Reservation(1, "car", day(0), day(10)), Reservation(2, "car", day(2), day(3))]
+        schedule = CarSchedule.of(reservations)
+
+        for start in range(-2, 13):
+            for length in range(1, 4):
+                expected = any(r.start < day(start + length) and r.end > day(start) for r in reservations)
+                assert schedule.overlaps(day(start), day(start + length)) == expected
+
+    def test_touching_rentals_do_not_overlap(self):
+        """Test a car returned on a day can be picked up again that day."""
+        schedule = CarSchedule.of([Reservation(1, "car", day(2), day(4))])
+        assert not schedule.overlaps(day(4), day(6))
+        assert not schedule.overlaps(day(0), day(2))
+        assert schedule.overlaps(day(3), day(5))
+
+    def test_windows_are_validated(self):
+        """Test dates mean midnight, same-day rentals last a day and reversed windows are refused."""
+        assert parse_window("2026-01-01", "2026-01-03T00:00:00Z") == (datetime(2026, 1, 1), datetime(2026, 1, 3))
+        assert parse_window("2026-01-01", "2026-01-01") == (datetime(2026, 1, 1), datetime(2026, 1, 2))
+        for start, end in [("01/01/2026", "2026-01-03"), ("2026-01-03", "2026-01-01")]:
+            with pytest.raises(ValueError):
+                parse_window(start, end)
+
+    def test_booked_car_comes_from_item_id_or_car(self):
+        """Test car bookings name their car by item_id and bundles through the car details."""
+        assert booking_car_id("car", {"item_id": "c1"}) == "c1"
+        assert booking_car_id("hotel", {"item_id": "h1", "car": {"id": "c2"}}) == "c2"
+        assert booking_car_id("hotel", '{"item_id": "h1"}') is None
+        assert booking_car_id("car", "not json") is None
+
+    def test_index_patches_follow_bookings(self):
+        """Test upserts move a reservation between cars and removals free the car."""
+        index = CarAvailabilityIndex()
+        index.build([Reservation(1, "a", day(1), day(3)), Reservation(2, "b", day(2), day(4))])
+        assert index.free(["a", "b", "c"], day(2), day(3)) == ["c"]
+
+        index.upsert(Reservation(1, "c", day(1), day(3)))
+        assert index.busy(day(1), day(2)) == {"c"}
+        index.remove(2)
+        assert index.free(["a", "b", "c"], day(2), day(3)) == ["a", "b"]
+        assert len(index) == 1
+
+    def test_database_fallback_matches_the_index(self, db):
+        """Test the SQL check and the built index agree on which cars are reserved."""
+        db.add_all([
+            booking("BK1", "a", 1, 3),
+            booking("BK2", "b", 2, 5, status="cancelled"),
+            booking("BK3", "c", 4, 6, booking_type="hotel"),
+            booking("BK4", "d", -30, -20),
+        ])
+        db.commit()
+        index = CarAvailabilityIndex()
+        index.build(load_reservations(db))
+
+        assert {r.car_id for r in index._reservations.values()} == {"a", "c"}
+        for start, end in [(0, 2), (2, 5), (3, 4), (5, 8)]:
+            assert load_busy_cars(db, day(start), day(end)) == index.busy(day(start), day(end))
+        assert load_busy_cars(db, day(2), day(5)) == {"a", "c"}
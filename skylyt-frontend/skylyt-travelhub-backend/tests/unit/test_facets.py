@@ -0,0 +1,66 @@
+import pytest
+from collections import namedtuple
+from app.utils.facets import bucket_width, car_facets, hotel_facets, price_histogram, star_histogram, value_counts
+
+HotelRow = namedtuple("HotelRow", "price rating amenities")
+CarRow = namedtuple("CarRow", "price transmission category features")
+
+
+class TestFacetHelpers:
+    def test_value_counts_most_common_first(self):
+        """Test blanks are skipped and ties are ordered by value."""
+        assert value_counts(["SUV", "sedan", None, "SUV", "", "coupe"]) == [
+            {"value": "SUV", "count": 2}, {"value": "coupe", "count": 1}, {"value": "sedan", "count": 1}
+        ]
+
+    def test_star_histogram_uses_whole_stars(self):
+        """Test half stars count toward the star below."""
+        assert star_histogram([4.5, 4.0, 5.0, 3.5, None]) == [
+            {"stars": 5, "count": 1}, {"stars": 4, "count": 2}, {"stars": 3, "count": 1}
+        ]
+
+    @pytest.mark.parametrize("low,high,width", [(0, 100, 20), (12.5, 987, 200), (0.3, 1.1, 0.2), (45_000, 1_250_000, 200_000)])
+    def test_bucket_widths_are_round(self, low, high, width):
+        """Test widths come from the 1-2-5 series and keep the bucket count bounded."""
+        assert bucket_width(low, high) == pytest.approx(width)
+
+    def test_price_histogram_covers_every_price(self):
+        """Test buckets are contiguous, include empty ranges and count every price."""
+        histogram = price_histogram([5, 12, 18, 95, 100, float("nan")])
+
+        assert histogram[0] == {"min": 0, "max": 20, "count": 3}
+        assert histogram[-1] == {"min": 100, "max": 120, "count": 1}
+        assert [bucket["min"] for bucket in histogram] == [0, 20, 40, 60, 80, 100]
+        assert sum(bucket["count"] for bucket in histogram) == 5
+        assert price_histogram([]) == []
+        assert price_histogram([7.5, 7.5]) == [{"min": 7.5, "max": 7.5, "count": 2}]
+
+
+class TestSearchFacets:
+    def test_hotel_facets_in_display_currency(self):
+        """Test prices are converted before bucketing and amenities count once per hotel."""
+        rows = [
+            HotelRow(16000.0, 4.5, ["WiFi", "Pool", "WiFi"]),
+            HotelRow(80000.0, 5.0, [{"name": "WiFi"}]),
+            HotelRow(40000.0, 3.0, None),
+        ]
+        facets = hotel_facets(rows, price_factor=1 / 1600)
+
+        assert facets["amenities"] == [{"value": "WiFi", "count": 2}, {"value": "Pool", "count": 1}]
+        assert facets["star_rating"] == [{"stars": 5, "count": 1}, {"stars": 4, "count": 1}, {"stars": 3, "count": 1}]
+        assert facets["price"][0]["min"] == 10
+        assert facets["price"][-1]["max"] == 60
+
+    def test_car_facets(self):
+        """Test transmission, category and feature counts come from one pass."""
+        rows = [
+            CarRow(40.0, "automatic", "SUV", ["GPS"]),
+            CarRow(55.0, "manual", "SUV", []),
+            CarRow(30.0, "automatic", "sedan", [{"name": "GPS", "included": True}]),
+        ]
+        facets = car_facets(rows)
+
+        assert facets["transmission"][0] == {"value": "automatic", "count": 2}
+        assert facets["category"][0] == {"value": "SUV", "count": 2}
+        assert facets["features"] == [{"value": "GPS", "count": 2}]
+        assert sum(bucket["count"] for bucket in facets["price"]) == 3
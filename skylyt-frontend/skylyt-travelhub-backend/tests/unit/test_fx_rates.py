@@ -0,0 +1,121 @@
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from app.core.database import SessionLocal
+from app.models.currency import Currency
+from app.services import fx_rates
+from app.services.currency_service import CurrencyService
+from app.utils.cache import cache_manager
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Currency.__table__.create(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = SessionLocal(bind=engine)
+    session.add_all([
+        Currency(code="USD", name="US Dollar", symbol="$", rate_to_ngn=Decimal("1600")),
+        Currency(code="EUR", name="Euro", symbol="€", rate_to_ngn=Decimal("1800")),
+        Currency(code="GBP", name="British Pound", symbol="£", rate_to_ngn=Decimal("2100"), is_active=False),
+    ])
+    session.commit()
+    fx_rates.invalidate_rates()
+    yield session
+    session.close()
+    fx_rates.invalidate_rates()
+
+
+def count_queries(engine) -> list:
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    return statements
+
+
+class TestRateSnapshot:
+    def test_conversions_go_through_ngn(self, db):
+        """Test foreign amounts are multiplied into NGN and divided out of it."""
+        rates = fx_rates.get_rates(db)
+
+        assert rates.convert(5, "USD", "NGN") == 8000.0
+        assert rates.convert(8000, "NGN", "USD") == 5.0
+        assert rates.convert(Decimal("19.99"), "USD", "EUR") == 17.77
+        assert rates.convert(Decimal("12.50"), "NGN", "NGN") == 12.5
+
+    def test_inactive_currencies_are_rejected(self, db):
+        """Test an inactive or unknown currency raises like before."""
+        rates = fx_rates.get_rates(db)
+
+        with pytest.raises(ValueError, match="GBP"):
+            rates.convert(1, "GBP", "NGN")
+        assert rates.symbol("GBP") == "GBP"
+        assert rates.symbol("USD") == "$"
+
+    def test_batch_matches_single_conversions(self, db):
+        """Test a batch with mixed base currencies equals row-by-row conversion."""
+        amounts = [Decimal("250.00"), 99.99, Decimal("0.01"), 120000]
+        bases = ["USD", "EUR", "USD", "NGN"]
+        rates = fx_rates.get_rates(db)
+
+        assert rates.convert_many(amounts, bases, "EUR") == [
+            rates.convert(amount, base, "EUR") for amount, base in zip(amounts, bases)
+        ]
+        assert rates.convert_many(amounts, "NGN", "USD") == [0.16, 0.06, 0.0, 75.0]
+
+    def test_snapshots_are_read_only(self, db):
+        """Test a snapshot cannot be changed in place."""
+        rates = fx_rates.get_rates(db)
+
+        with pytest.raises(TypeError):
+            rates.rates["USD"] = Decimal("1")
+
+
+class TestRateRefresh:
+    def test_listings_run_no_fx_queries_once_loaded(self, db, engine):
+        """Test converting a page of prices hits the snapshot, not the database."""
+        CurrencyService.get_rates(db)
+        statements = count_queries(engine)
+
+        prices = CurrencyService.convert_many([Decimal("45000.00")] * 20, "NGN", "USD", db)
+        CurrencyService.convert_currency(1.0, "NGN", "USD", db)
+
+        assert prices == [28.13] * 20
+        assert statements == []
+
+    def test_commit_installs_a_new_snapshot(self, db):
+        """Test a committed rate change is used by the next conversion."""
+        before = fx_rates.get_rates(db)
+        db.query(Currency).filter(Currency.code == "USD").one().rate_to_ngn = Decimal("1500")
+        db.commit()
+        after = fx_rates.get_rates(db)
+
+        assert after.version > before.version
+        assert after.convert(1, "USD", "NGN") == 1500.0
+        assert before.convert(1, "USD", "NGN") == 1600.0
+
+    def test_rollback_keeps_the_snapshot(self, db):
+        """Test an abandoned change does not force a reload."""
+        before = fx_rates.get_rates(db)
+        db.query(Currency).filter(Currency.code == "USD").one().rate_to_ngn = Decimal("1500")
+        db.flush()
+        db.rollback()
+
+        assert fx_rates.get_rates(db) is before
+
+    def test_broadcast_from_another_worker_reloads(self, db):
+        """Test only the rates key deletion or a reconnect drops the snapshot."""
+        first = fx_rates.get_rates(db)
+        fx_rates.rate_snapshots.handle_broadcast({"keys": [cache_manager.make_key("hotels:v3:x")], "patterns": []})
+        assert fx_rates.get_rates(db) is first
+
+        fx_rates.rate_snapshots.handle_broadcast({"keys": [cache_manager.make_key("currency_rates")], "patterns": []})
+        second = fx_rates.get_rates(db)
+        assert second is not first
+
+        fx_rates.rate_snapshots.handle_broadcast(None)
+        assert fx_rates.get_rates(db) is not second
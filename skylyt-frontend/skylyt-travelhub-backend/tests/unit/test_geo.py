@@ -0,0 +1,97 @@
+import random
+
+import pytest
+from sqlalchemy import Column, Float, Integer, String, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+from app.utils.geo import (
+    BBox, GeoQuery, covering_cells, distance_sq, encode_geohash, geo_filter, parse_geo_query,
+    prefix_upper_bound, track_geohash
+)
+
+Base = declarative_base()
+
+
+class Place(Base):
+    __tablename__ = "places"
+    id = Column(Integer, primary_key=True)
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String(12), index=True)
+
+
+track_geohash(Place)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+class TestGeo:
+    def test_geohash_matches_reference_encoding(self):
+        """Test encoding agrees with the published geohash example."""
+        assert encode_geohash(57.64911, 10.40744) == "u4pruydqq"
+        assert encode_geohash(6.4281, 3.4219, 5) == encode_geohash(6.4281, 3.4219)[:5]
+
+    def test_covering_cells_contain_every_point_in_the_box(self):
+        """Test the prefixes cover the box, including across the antimeridian."""
+        rng = random.Random(3)
+        for box in (BBox(6.3, 3.2, 6.7, 3.6), BBox(-18.0, 177.0, -16.0, -179.0)):
+            cells = covering_cells(box)
+            assert 0 < len(cells) <= 32
+            for _ in range(500):
+                lat = rng.uniform(box.south, box.north)
+                lng = rng.uniform(box.west, box.east if box.west <= box.east else box.east + 360)
+                lng = lng - 360 if lng > 180 else lng
+                assert any(encode_geohash(lat, lng).startswith(cell) for cell in cells)
+
+    def test_prefix_upper_bound_skips_every_hash_with_the_prefix(self):
+        """Test the range end is the next prefix, or open past the last one."""
+        assert prefix_upper_bound("s0") == "s1"
+        assert prefix_upper_bound("s0z") == "s1"
+        assert prefix_upper_bound("zz") is None
+
+    def test_parse_rejects_bad_parameters(self):
+        """Test malformed, out-of-range and conflicting areas are refused."""
+        geo = parse_geo_query("6.45,3.39", None, None)
+        assert geo.origin == (6.45, 3.39) and geo.radius_km == 10.0
+        assert parse_geo_query(None, None, "6,3,7,4") == GeoQuery(BBox(6.0, 3.0, 7.0, 4.0))
+        assert parse_geo_query(None, 5.0, None) is None
+        for near, radius, bbox in [
+            ("6.45", None, None), ("91,3", None, None), ("6,3", 0.0, None), ("6,3", 501.0, None),
+            ("nan,3", None, None), (None, None, "7,3,6,4"), ("6,3", None, "6,3,7,4")
+        ]:
+            with pytest.raises(ValueError):
+                parse_geo_query(near, radius, bbox)
+
+    def test_sql_filter_matches_brute_force(self, session):
+        """Test the geohash-range filter returns exactly the points in the area."""
+        rng = random.Random(11)
+        points = [(rng.uniform(6.0, 7.0), rng.uniform(3.0, 4.0)) for _ in range(2000)]
+        session.add_all(Place(id=i, latitude=lat, longitude=lng) for i, (lat, lng) in enumerate(points))
+        session.add(Place(id=len(points)))
+        session.flush()
+
+        for geo in (parse_geo_query("6.5,3.4", 12.0, None), parse_geo_query(None, None, "6.2,3.1,6.4,3.9")):
+            found = set(session.scalars(select(Place.id).where(geo_filter(Place, geo))))
+            assert found == {i for i, (lat, lng) in enumerate(points) if geo.contains(lat, lng)}
+            assert found
+
+    def test_geohash_follows_coordinate_changes(self, session):
+        """Test inserts and updates keep the stored geohash in step."""
+        place = Place(id=1, latitude=6.5, longitude=3.4)
+        session.add(place)
+        session.flush()
+        assert place.geohash == encode_geohash(6.5, 3.4)
+
+        place.latitude = None
+        session.flush()
+        assert place.geohash is None
+
+    def test_distance_orders_by_nearness(self):
+        """Test the equirectangular distance ranks points like great-circle distance."""
+        origin = (6.45, 3.39)
+        assert distance_sq(6.46, 3.39, origin) < distance_sq(6.45, 3.41, origin) < distance_sq(6.50, 3.39, origin)
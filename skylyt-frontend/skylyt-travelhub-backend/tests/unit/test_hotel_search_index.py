@@ -0,0 +1,99 @@
+import pytest
+from decimal import Decimal
+from app.services.hotel_search_index import HotelSearchIndex, IndexedHotel, SearchPage
+
+
+def hotel(id, location, price, rating=4.0, amenities=(), name=None):
+    return IndexedHotel(id, name or f"Hotel {id}", location.casefold(), price, rating, frozenset(amenities))
+
+
+@pytest.fixture
+def index():
+    index = HotelSearchIndex()
+    index.build([
+        hotel(1, "Victoria Island, Lagos", 250.0, 5.0, ["WiFi", "Pool"]),
+        hotel(2, "Ikeja, Lagos", 120.0, 3.5, ["WiFi"]),
+        hotel(3, "Maitama, Abuja", 180.0, 4.5, ["WiFi", "Pool", "Spa"]),
+        hotel(4, "Lekki, Lagos", 90.0, 4.0, []),
+    ])
+    return index
+
+
+class TestHotelSearchIndex:
+    def test_location_matches_substrings_case_insensitively(self, index):
+        """Test location search keeps ILIKE '%x%' semantics."""
+        assert index.search(location="LAGOS").ids == [4, 2, 1]
+        assert index.search(location="agos, ").ids == []
+        assert index.search(location="ki").ids == [4]
+
+    def test_filters_combine(self, index):
+        """Test price range, rating and amenity filters narrow together."""
+        result = index.search(min_price=Decimal("100"), max_price=Decimal("250"), amenities=["WiFi"])
+        assert result == SearchPage([2, 3, 1], 3)
+        assert index.search(min_rating=4.5, amenities=["Pool"]).ids == [3, 1]
+        assert index.search(amenities=["Sauna"]) == SearchPage([], 0)
+
+    def test_sort_and_pagination(self, index):
+        """Test descending sorts and pages report the full total."""
+        assert index.search(sort_by="-star_rating", offset=1, limit=2) == SearchPage([3, 4], 4)
+        assert index.search(location="lagos", sort_by="-price", limit=1) == SearchPage([1], 3)
+
+    def test_pages_continue_after_a_cursor_position(self, index):
+        """Test a page starts after the given hotel in either sort direction."""
+        after = index.sort_values(2, "-star_rating")
+        assert after == [3.5, 2]
+        assert index.search(sort_by="-star_rating", after=after) == SearchPage([], 4)
+        assert index.search(sort_by="-star_rating", after=[4.5, 3]).ids == [4, 2]
+        # SQL cursors carry Decimal prices; a removed hotel still has a position
+        assert index.search(after=[Decimal("120.00"), 2]).ids == [3, 1]
+        assert index.search(after=[100.0, 99]).ids == [2, 3, 1]
+
+    def test_unsupported_searches_fall_back(self):
+        """Test an unbuilt index or unknown sort field defers to SQL."""
+        assert HotelSearchIndex().search() is None
+        index = HotelSearchIndex()
+        index.build([])
+        assert index.search(sort_by="room_count") is None
+
+    def test_upsert_and_remove_patch_every_structure(self, index):
+        """Test incremental changes are visible to all filters and sorts."""
+        index.upsert(hotel(2, "Wuse, Abuja", 300.0, 5.0, ["Gym"]))
+        index.remove(4)
+
+        assert index.search(location="lagos").ids == [1]
+        assert index.search(location="abuja").ids == [3, 2]
+        assert index.search(amenities=["Gym"]).ids == [2]
+        assert index.search(sort_by="-price").ids == [2, 1, 3]
+        assert len(index) == 3
+
+    def test_facets_cover_every_match(self, index):
+        """Test facets describe all matches, not just the returned page."""
+        result = index.search(location="lagos", limit=1, facets=True, price_factor=0.5)
+
+        assert result.ids == [4]
+        assert result.facets["amenities"] == [{"value": "WiFi", "count": 2}, {"value": "Pool", "count": 1}]
+        assert result.facets["star_rating"] == [{"stars": 5, "count": 1}, {"stars": 4, "count": 1}, {"stars": 3, "count": 1}]
+        assert sum(bucket["count"] for bucket in result.facets["price"]) == 3
+        assert result.facets["price"][-1]["max"] >= 125.0
+        assert index.search(location="lagos").facets is None
+
+    def test_geo_search_filters_and_orders_by_distance(self, index):
+        """Test radius and box searches, distance sort and distance cursors."""
+        from app.utils.geo import parse_geo_query
+
+        index.upsert(IndexedHotel(1, "Hotel 1", "victoria island, lagos", 250.0, 5.0, frozenset(), 6.4281, 3.4219))
+        index.upsert(IndexedHotel(2, "Hotel 2", "ikeja, lagos", 120.0, 3.5, frozenset(), 6.6018, 3.3515))
+        index.upsert(IndexedHotel(4, "Hotel 4", "lekki, lagos", 90.0, 4.0, frozenset(), 6.4474, 3.4700))
+        near = parse_geo_query("6.43,3.43", 10.0, None)
+
+        assert index.search(geo=near).ids == [4, 1]
+        assert index.search(geo=near, sort_by="distance").ids == [1, 4]
+        assert index.search(geo=parse_geo_query("6.43,3.43", 30.0, None), sort_by="-distance").ids == [2, 4, 1]
+        assert index.search(geo=parse_geo_query(None, None, "6.5,3.3,6.7,3.4")).ids == [2]
+        assert index.search(geo=near, amenities=["WiFi"]).ids == []
+        after = index.sort_values(1, "distance", near)
+        assert index.search(geo=near, sort_by="distance", after=after).ids == [4]
+        # Distance needs a near point; an index without coordinates finds nothing
+        assert index.search(geo=parse_geo_query(None, None, "6,3,7,4"), sort_by="distance") is None
+        index.remove(1)
+        assert index.search(geo=near).ids == [4]
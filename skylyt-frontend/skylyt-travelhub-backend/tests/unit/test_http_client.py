@@ -0,0 +1,144 @@
+import asyncio
+import socket
+import time
+
+import httpx
+import pytest
+
+from app.core.http_client import (
+    CircuitBreaker, CircuitOpenError, OutboundHTTP, TokenBucket, Upstream, UpstreamPolicy
+)
+from tests.fake_suppliers import FakeSupplierServer
+
+FAST_RETRIES = UpstreamPolicy(retries=2, backoff=0.01, max_backoff=0.05)
+
+
+def outbound(**policy):
+    return OutboundHTTP({"api": FAST_RETRIES._replace(**policy)})
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/ping"
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        """Test the burst is served at once and later tokens wait for the refill rate."""
+        bucket = TokenBucket(rate=10, burst=2)
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.02)
+        assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+
+class TestCircuitBreaker:
+    def test_opens_and_recovers_through_one_trial(self):
+        """Test consecutive failures open the breaker, and one trial call after the reset closes it."""
+        breaker = CircuitBreaker(threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+    def test_failed_trial_reopens(self):
+        """Test a failing trial call opens the breaker again at once."""
+        breaker = CircuitBreaker(threshold=5, reset_timeout=0.05)
+        for _ in range(5):
+            breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    def test_backoff_honours_retry_after(self):
+        """Test Retry-After sets the backoff, capped, and jitter stays within the exponential bound."""
+        upstream = Upstream("api", UpstreamPolicy(backoff=0.5, max_backoff=3.0))
+
+        assert upstream.backoff(1, httpx.Response(429, headers={"Retry-After": "2"})) == 2.0
+        assert upstream.backoff(1, httpx.Response(429, headers={"Retry-After": "60"})) == 3.0
+        assert all(0 <= upstream.backoff(3, None) <= 2.0 for _ in range(50))
+
+
+class TestOutboundHTTP:
+    @pytest.mark.asyncio
+    async def test_idempotent_requests_retry_transient_statuses(self):
+        """Test a GET is retried through 503s, and the retries are counted."""
+        http = outbound()
+        with FakeSupplierServer({"ping": {"ok": True}}, status=[503, 503, 200]) as server:
+            response = await http.request("GET", f"{server.url}/ping", upstream="api")
+        stats = http.get_stats()["upstreams"]["api"]
+
+        assert response.json() == {"ok": True}
+        assert len(server.requests) == 3
+        assert (stats["requests"], stats["retries"], stats["errors"]) == (3, 2, 2)
+
+    @pytest.mark.asyncio
+    async def test_posts_only_retry_when_not_processed(self):
+        """Test a POST is not repeated after a 503 but is after a 429."""
+        http = outbound()
+        with FakeSupplierServer({"pay": {}}, status=[503, 200]) as server:
+            response = await http.request("POST", f"{server.url}/pay", upstream="api", json={})
+        assert response.status_code == 503 and len(server.requests) == 1
+
+        with FakeSupplierServer({"pay": {}}, status=[429, 200], headers={"Retry-After": "0"}) as server:
+            response = await http.request("POST", f"{server.url}/pay", upstream="api", json={})
+        assert response.status_code == 200 and len(server.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_are_retried_then_raised(self):
+        """Test an unreachable upstream is retried for any method, then the error is raised."""
+        http = outbound(retries=1)
+        with pytest.raises(httpx.ConnectError):
+            await http.request("POST", closed_port_url(), upstream="api")
+
+        assert http.get_stats()["upstreams"]["api"]["requests"] == 2
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test a failing upstream stops being called once its breaker opens."""
+        http = outbound(retries=0, failure_threshold=2)
+        with FakeSupplierServer({"ping": {}}, status=500) as server:
+            for _ in range(2):
+                assert (await http.request("GET", f"{server.url}/ping", upstream="api")).status_code == 500
+            with pytest.raises(CircuitOpenError):
+                await http.request("GET", f"{server.url}/ping", upstream="api")
+        stats = http.get_stats()["upstreams"]["api"]
+
+        assert len(server.requests) == 2
+        assert (stats["circuit"], stats["rejected"]) == ("open", 1)
+
+    @pytest.mark.asyncio
+    async def test_requests_are_rate_limited_per_upstream(self):
+        """Test concurrent calls beyond the burst wait for tokens, and other upstreams are unaffected."""
+        http = OutboundHTTP({"api": UpstreamPolicy(rate=20, burst=1)})
+        with FakeSupplierServer({"ping": {}}) as server:
+            began = time.perf_counter()
+            await asyncio.gather(*(http.request("GET", f"{server.url}/ping", upstream="api") for _ in range(4)))
+            limited = time.perf_counter() - began
+            began = time.perf_counter()
+            await asyncio.gather(*(http.request("GET", f"{server.url}/ping", upstream="other") for _ in range(4)))
+            unlimited = time.perf_counter() - began
+        stats = http.get_stats()["upstreams"]
+
+        assert limited >= 0.14 and unlimited < 0.1
+        assert (stats["api"]["throttled"], stats["other"]["throttled"]) == (3, 0)
+        assert stats["api"]["p50_ms"] is not None
+
+    def test_sync_requests_share_the_limits(self):
+        """Test blocking calls go through the same upstream stats and retries."""
+        http = outbound()
+        with FakeSupplierServer({"emails": {"id": "e1"}}, status=[502, 200]) as server:
+            response = http.request_sync("GET", f"{server.url}/emails", upstream="api")
+
+        assert response.json() == {"id": "e1"}
+        assert http.get_stats()["upstreams"]["api"]["retries"] == 1
@@ -0,0 +1,51 @@
+from datetime import datetime
+from sqlalchemy import create_engine
+from app.core.database import SessionLocal
+from app.models.booking import Booking
+from app.models.car import Car
+from app.models.city import City
+from app.models.hotel import Hotel
+from app.models.state import State
+from app.services.car_availability import car_availability_index
+from app.services.hotel_search_index import hotel_search_index
+from app.services.index_sync import REBUILD
+from app.services.suggestion_index import suggestion_index
+
+
+class TestSessionTracking:
+    def test_commits_publish_each_index_its_changed_keys(self, monkeypatch):
+        """Test flushed rows reach the indexes that track them, bulk statements ask for a rebuild and rollbacks nothing."""
+        published = []
+        for index in (suggestion_index, hotel_search_index, car_availability_index):
+            monkeypatch.setattr(index, "dispatch_changes", lambda keys, index=index: published.append((index.label, set(keys))))
+        engine = create_engine("sqlite://")
+        for model in (State, City, Hotel, Car, Booking):
+            model.__table__.create(engine)
+        session = SessionLocal(bind=engine)
+
+        session.add_all([
+            Hotel(id=3, name="Lagoon Inn", location="Lekki, Lagos", star_rating=4.0, price_per_night=80.0, room_count=4),
+            Car(id="c3", name="Rio 1", make="Kia", model="Rio", category="compact", transmission="manual", seats=4, price_per_day=25.0),
+            Booking(
+                booking_reference="BK9", booking_type="car", customer_name="Ada", customer_email="ada@example.com",
+                total_amount=50, start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 3), booking_data={"item_id": "c3"}
+            ),
+            Booking(
+                booking_reference="BK10", booking_type="hotel", customer_name="Ada", customer_email="ada@example.com",
+                total_amount=80, start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 2), booking_data={"item_id": "3"}
+            ),
+        ])
+        session.commit()
+        car_booking = session.query(Booking).filter_by(booking_reference="BK9").one().id
+        assert sorted(published) == [
+            ("Car availability index", {car_booking}), ("Hotel search index", {3}), ("Suggestion index", {"hotel:3", "car"})
+        ]
+
+        published.clear()
+        session.query(Hotel).update({Hotel.star_rating: 5.0}, synchronize_session=False)
+        session.commit()
+        session.add(City(id=4, name="Lekki", slug="lekki"))
+        session.rollback()
+        session.close()
+
+        assert sorted(published) == [("Hotel search index", {REBUILD}), ("Suggestion index", {REBUILD})]
@@ -0,0 +1,169 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Column, DateTime, Integer, Numeric, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from app.utils import pagination
+from app.utils.pagination import (
+    Count, InvalidCursor, count_total, decode_cursor, encode_cursor, order_fingerprint, paginate, plan_rows
+)
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+    id = Column(Integer, primary_key=True)
+    price = Column(Numeric(10, 2), nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        # Repeated prices and NULLs exercise the tie-breaker and NULL ordering
+        prices = [Decimal("10.00"), None, Decimal("5.00"), Decimal("10.00"), None, Decimal("7.50")]
+        session.add_all([
+            Row(id=i + 1, price=prices[i % len(prices)], created_at=datetime(2024, 1, 1 + i % 3))
+            for i in range(23)
+        ])
+        session.commit()
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    pagination._count_cache.clear()
+
+
+def add_row(db, id):
+    db.add(Row(id=id, price=Decimal("10.00"), created_at=datetime(2024, 2, 1)))
+    db.commit()
+
+
+def walk(query, order, per_page):
+    """Every page of query, following next_cursor from the first"""
+    pages = [paginate(query, order, per_page)]
+    while pages[-1].next_cursor:
+        pages.append(paginate(query, order, per_page, cursor=pages[-1].next_cursor))
+    return pages
+
+
+class TestCursors:
+    def test_round_trip_keeps_value_types(self):
+        """Test datetimes, decimals and NULLs survive the opaque token."""
+        values = [datetime(2024, 5, 1, 12, 30), Decimal("19.99"), None, "name", 42]
+        token = encode_cursor(values, "scope")
+
+        assert decode_cursor(token, "scope") == values
+        assert "=" not in token
+
+    def test_cursor_for_another_ordering_is_rejected(self):
+        """Test a cursor cannot be replayed against a different sort."""
+        token = encode_cursor([1], order_fingerprint([(Row.id, True)]))
+
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token, order_fingerprint([(Row.id, False)]))
+
+    @pytest.mark.parametrize("token", ["", "not-base64!", encode_cursor([1], "s")[:-4]])
+    def test_malformed_cursor_is_rejected(self, token):
+        """Test garbage tokens raise InvalidCursor instead of a server error."""
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token, "s")
+
+
+class TestPaginate:
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_cursor_walk_visits_every_row_once(self, db, descending):
+        """Test following cursors matches one ordered scan, ties and NULLs included."""
+        order = [(Row.price, descending), (Row.created_at, True), (Row.id, descending)]
+        pages = walk(db.query(Row), order, per_page=5)
+
+        walked = [row.id for page in pages for row in page.items]
+        expected = [row.id for row in paginate(db.query(Row), order, per_page=100).items]
+        assert walked == expected
+        assert sorted(walked) == list(range(1, 24))
+        assert [len(page.items) for page in pages] == [5, 5, 5, 5, 3]
+        assert not pages[-1].has_more
+
+    def test_page_numbers_still_work(self, db):
+        """Test OFFSET pages match the cursor pages and hand out a cursor."""
+        order = [(Row.created_at, True), (Row.id, True)]
+        by_cursor = walk(db.query(Row), order, per_page=5)
+        third = paginate(db.query(Row), order, per_page=5, page=3)
+
+        assert [r.id for r in third.items] == [r.id for r in by_cursor[2].items]
+        assert third.next_cursor == by_cursor[2].next_cursor
+        assert (third.page, third.total) == (3, 23)
+
+    def test_filters_apply_with_cursor(self, db):
+        """Test the keyset condition narrows the caller's filters, not replaces them."""
+        query = db.query(Row).filter(Row.price == Decimal("10.00"))
+        pages = walk(query, [(Row.id, False)], per_page=3)
+
+        assert [r.id for p in pages for r in p.items] == [1, 4, 7, 10, 13, 16, 19, 22]
+        assert pages[1].total == 8
+        assert pages[1].page is None
+
+    def test_response_shape(self, db):
+        """Test list responses keep the page fields and add the cursor."""
+        result = paginate(db.query(Row), [(Row.id, False)], per_page=10)
+        response = result.as_response("rows", [r.id for r in result.items])
+
+        assert response["rows"] == list(range(1, 11))
+        assert response["total_pages"] == 3
+        assert response["has_more"] is True
+        assert response["next_cursor"] == result.next_cursor
+
+
+class TestCountTotal:
+    def test_exact_counts_every_time(self, db):
+        """Test exact mode always reflects the current rows."""
+        assert count_total(db.query(Row), "exact") == Count(23, False)
+        add_row(db, 100)
+        assert count_total(db.query(Row), "exact") == Count(24, False)
+
+    def test_cached_counts_are_reused_per_filter_set(self, db):
+        """Test a cached total is reused for the same filters only."""
+        tens = db.query(Row).filter(Row.price == Decimal("10.00"))
+        assert count_total(db.query(Row), "cached") == Count(23, False)
+        assert count_total(tens, "cached") == Count(8, False)
+        add_row(db, 100)
+
+        assert count_total(db.query(Row), "cached") == Count(23, False)
+        assert count_total(db.query(Row).filter(Row.price == Decimal("5.00")), "cached").total == 4
+        pagination._count_cache.clear()
+        assert count_total(db.query(Row), "cached") == Count(24, False)
+
+    def test_large_estimates_replace_exact_counts(self, db, monkeypatch):
+        """Test auto mode only trusts planner estimates above the exact limit."""
+        monkeypatch.setattr(pagination, "planner_estimate", lambda query: 50_000)
+        assert count_total(db.query(Row), "auto") == Count(50_000, True)
+
+        pagination._count_cache.clear()
+        monkeypatch.setattr(pagination, "planner_estimate", lambda query: 40)
+        assert count_total(db.query(Row), "auto") == Count(23, False)
+        assert count_total(db.query(Row).filter(Row.id > 0), "estimate") == Count(40, True)
+
+    def test_estimates_are_unavailable_off_postgres(self, db):
+        """Test SQLite falls back to exact counts."""
+        assert pagination.planner_estimate(db.query(Row)) is None
+        assert count_total(db.query(Row), "estimate") == Count(23, False)
+
+    def test_last_page_corrects_the_total(self, db, monkeypatch):
+        """Test a page that reaches the end reports the exact total."""
+        monkeypatch.setattr(pagination, "planner_estimate", lambda query: 50_000)
+        first = paginate(db.query(Row), [(Row.id, False)], per_page=10)
+        last = paginate(db.query(Row), [(Row.id, False)], per_page=10, page=3)
+
+        assert (first.total, first.total_estimated) == (50_000, True)
+        assert (last.total, last.total_estimated) == (23, False)
+
+    def test_plan_rows_reads_explain_json(self):
+        """Test the row estimate is read from driver-decoded or raw EXPLAIN output."""
+        plan = [{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1234}}]
+
+        assert plan_rows(plan) == 1234
+        assert plan_rows('[{"Plan": {"Plan Rows": 7}}]') == 7
@@ -0,0 +1,119 @@
+import json
+import pytest
+from fastapi import Request
+from app.utils import cache as cache_module
+from app.utils import response_cache
+from app.utils.cache import CacheManager
+from app.utils.response_cache import cached_response, decode_body, encode_response, is_not_modified
+from tests.fake_redis import FakeAsyncRedis
+
+SMALL = {"cars": [], "total": 0}
+LARGE = {"hotels": [{"id": i, "name": f"Hotel {i}", "amenities": ["WiFi", "Pool"]} for i in range(50)]}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    client = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "get_async_redis", lambda: client)
+    manager = CacheManager(namespace="test")
+    monkeypatch.setattr(response_cache, "cache_manager", manager)
+    return manager
+
+
+def gzip_request() -> Request:
+    return Request({"type": "http", "headers": [(b"accept-encoding", b"gzip, deflate")]})
+
+
+def plain_request() -> Request:
+    return Request({"type": "http", "headers": []})
+
+
+class TestEncodeResponse:
+    def test_small_bodies_stay_identity(self):
+        """Test bodies below the gzip threshold are stored as plain JSON."""
+        cached = encode_response(SMALL)
+
+        assert cached.encoding == ""
+        assert json.loads(cached.body) == SMALL
+
+    def test_large_bodies_are_pre_gzipped(self):
+        """Test large bodies are stored gzipped and decode to the payload."""
+        cached = encode_response(LARGE)
+
+        assert cached.encoding == "gzip"
+        assert json.loads(decode_body(cached)) == LARGE
+
+    def test_etag_tracks_content(self):
+        """Test equal payloads share an ETag and different ones do not."""
+        assert encode_response(LARGE).etag == encode_response(LARGE).etag
+        assert encode_response(LARGE).etag != encode_response(SMALL).etag
+
+
+class TestCachedResponse:
+    @pytest.mark.asyncio
+    async def test_hit_serves_stored_bytes(self, cache):
+        """Test a hit sends the stored bytes without recomputing the payload."""
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return LARGE
+
+        first = await cached_response(gzip_request(), "hotels:v3:x", compute, 60)
+        cache.local.clear()
+        second = await cached_response(gzip_request(), "hotels:v3:x", compute, 60)
+
+        assert len(calls) == 1
+        assert first.body == second.body
+        assert second.headers["Content-Encoding"] == "gzip"
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+
+    @pytest.mark.asyncio
+    async def test_clients_without_gzip_get_identity(self, cache):
+        """Test clients that do not accept gzip receive the plain body."""
+        async def compute():
+            return LARGE
+
+        await cached_response(gzip_request(), "hotels:v3:x", compute, 60)
+        response = await cached_response(plain_request(), "hotels:v3:x", compute, 60)
+
+        assert "Content-Encoding" not in response.headers
+        assert json.loads(response.body) == LARGE
+
+
+class TestConditionalGet:
+    @pytest.mark.asyncio
+    async def test_matching_etag_returns_304(self, cache):
+        """Test a request carrying the current ETag gets an empty 304."""
+        async def compute():
+            return LARGE
+
+        first = await cached_response(gzip_request(), "hotels:v3:x", compute, 60)
+        etag = first.headers["ETag"]
+        request = Request({"type": "http", "headers": [(b"if-none-match", f'"old", W/{etag}'.encode())]})
+        response = await cached_response(request, "hotels:v3:x", compute, 60)
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["ETag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_stale_etag_returns_body(self, cache):
+        """Test a request carrying an outdated ETag gets the full response."""
+        async def compute():
+            return SMALL
+
+        request = Request({"type": "http", "headers": [(b"if-none-match", b'"old"')]})
+        response = await cached_response(request, "cars:v3:x", compute, 60)
+
+        assert response.status_code == 200
+        assert json.loads(response.body) == SMALL
+
+    def test_if_modified_since_is_ignored_with_etag(self):
+        """Test If-None-Match takes precedence over If-Modified-Since."""
+        cached = encode_response(SMALL)
+        headers = [(b"if-none-match", b'"old"'), (b"if-modified-since", b"Fri, 01 Jan 2100 00:00:00 GMT")]
+
+        assert not is_not_modified(Request({"type": "http", "headers": headers}), cached)
+        assert is_not_modified(Request({"type": "http", "headers": headers[1:]}), cached)
@@ -0,0 +1,168 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+
+import app.models  # noqa: F401  (every table, for create_all)
+from app.core.database import Base, SessionLocal
+from app.models.booking import Booking
+from app.models.hotel import Hotel
+from app.models.room_inventory import RoomInventory
+from app.services import room_inventory
+from app.services.room_inventory import (
+    InventoryCalendar, RoomsUnavailable, get_calendar, parse_stay, reserve_booking, reserve_rooms, room_allotments
+)
+
+TODAY = date.today()
+
+
+def day(offset: int) -> date:
+    return TODAY + timedelta(days=offset)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = SessionLocal(bind=engine)
+    session.add_all([
+        Hotel(id=1, name="Eko", location="Lagos", star_rating=4, price_per_night=100, room_count=3),
+        Hotel(
+            id=2, name="Transcorp", location="Abuja", star_rating=5, price_per_night=200, room_count=10,
+            room_types=[{"type": "Deluxe", "available_rooms": 1}, {"type": "Suite", "available_rooms": 2}]
+        ),
+    ])
+    session.commit()
+    room_inventory.invalidate_calendar()
+    yield session
+    session.close()
+
+
+def booked(db, hotel_id, room_type):
+    return {
+        night: count for night, count in db.query(RoomInventory.night, RoomInventory.booked_rooms).filter(
+            RoomInventory.hotel_id == hotel_id, RoomInventory.room_type == room_type
+        )
+    }
+
+
+class TestRoomInventory:
+    def test_allotments_come_from_room_types_or_room_count(self):
+        """Test room types define the rooms, falling back to room_count Standard rooms."""
+        assert room_allotments(5, None) == {"Standard": 5}
+        assert room_allotments(5, [{"type": "Suite", "available_rooms": 2}, {"type": "Suite"}]) == {"Suite": 3}
+
+    def test_stays_are_validated(self):
+        """Test malformed, empty and overlong stays are refused."""
+        assert parse_stay("2026-01-01", "2026-01-03T00:00:00Z") == (date(2026, 1, 1), date(2026, 1, 3))
+        for check_in, check_out in [("01/01/2026", "2026-01-03"), ("2026-01-03", "2026-01-03"), ("2026-01-01", "2026-03-01")]:
+            with pytest.raises(ValueError):
+                parse_stay(check_in, check_out)
+
+    def test_calendar_takes_the_tightest_night(self):
+        """Test a stay is limited by its fullest night and unbooked types are fully free."""
+        calendar = InventoryCalendar.from_rows(
+            1, TODAY, 30, [(1, 3, None), (2, 10, [{"type": "Deluxe", "available_rooms": 1}, {"type": "Suite", "available_rooms": 2}])],
+            [(1, "Standard", day(2), 3, 1), (1, "Standard", day(3), 3, 3), (2, "Suite", day(1), 2, 1)]
+        )
+
+        assert calendar.free_rooms(1, day(0), day(2)) == {"Standard": 3}
+        assert calendar.free_rooms(1, day(1), day(3)) == {"Standard": 2}
+        assert not calendar.is_available(1, day(2), day(4))
+        assert calendar.available_many([1, 2, 99], day(0), day(2), rooms=2) == {1: True, 2: False, 99: False}
+        assert calendar.is_available(2, day(0), day(2), room_type="Deluxe")
+        with pytest.raises(ValueError):
+            calendar.free_rooms(1, day(29), day(31))
+
+    def test_reservations_never_oversell(self, db):
+        """Test rooms run out per night and a failed stay takes nothing."""
+        assert reserve_rooms(db, 1, day(1), day(3), rooms=2) == "Standard"
+        with pytest.raises(RoomsUnavailable):
+            reserve_rooms(db, 1, day(2), day(4), rooms=2)
+        db.commit()
+
+        assert booked(db, 1, "Standard") == {day(1): 2, day(2): 2}
+        assert reserve_rooms(db, 1, day(0), day(2)) == "Standard"
+        with pytest.raises(ValueError):
+            reserve_rooms(db, 1, day(0), day(2), room_type="Penthouse")
+
+    def test_any_room_type_falls_through_to_the_next(self, db):
+        """Test a booking without a room type takes the first type with rooms left."""
+        assert reserve_rooms(db, 2, day(1), day(2)) == "Deluxe"
+        assert reserve_rooms(db, 2, day(1), day(2), rooms=2) == "Suite"
+        with pytest.raises(RoomsUnavailable):
+            reserve_rooms(db, 2, day(1), day(2))
+
+    def test_commits_refresh_the_calendar(self, db):
+        """Test a committed reservation is visible to the next availability check."""
+        assert get_calendar(db).free_rooms(1, day(1), day(2)) == {"Standard": 3}
+        reserve_rooms(db, 1, day(1), day(2), rooms=3)
+        db.commit()
+
+        assert get_calendar(db).free_rooms(1, day(1), day(2)) == {"Standard": 0}
+
+    def test_cancelling_a_booking_releases_its_rooms_once(self, db):
+        """Test cancelled and deleted bookings give their rooms back exactly once."""
+        def booking(reference):
+            return Booking(
+                booking_reference=reference, booking_type="hotel", customer_name="Ada", customer_email="ada@example.com",
+                total_amount=200, start_date=datetime.combine(day(1), datetime.min.time()),
+                end_date=datetime.combine(day(3), datetime.min.time()), booking_data={"item_id": "1", "rooms": 2}
+            )
+
+        first = booking("BK1")
+        assert reserve_booking(db, first)["room_type"] == "Standard"
+        db.add(first)
+        db.commit()
+        assert booked(db, 1, "Standard") == {day(1): 2, day(2): 2}
+
+        first.status = "cancelled"
+        db.commit()
+        first.special_requests = "Refunded"
+        db.commit()
+        assert booked(db, 1, "Standard") == {day(1): 0, day(2): 0}
+
+        second = booking("BK2")
+        reserve_booking(db, second)
+        db.add(second)
+        db.commit()
+        db.delete(second)
+        db.commit()
+        assert booked(db, 1, "Standard") == {day(1): 0, day(2): 0}
+
+    def test_bulk_deletes_and_cancellations_release_rooms(self, db):
+        """Test Query.delete and Query.update on bookings give back the rooms of the rows they drop, once."""
+        bookings = []
+        for reference in ("BK1", "BK2", "BK3"):
+            booking = Booking(
+                booking_reference=reference, booking_type="hotel", customer_name="Ada", customer_email="ada@example.com",
+                total_amount=100, start_date=datetime.combine(day(1), datetime.min.time()),
+                end_date=datetime.combine(day(2), datetime.min.time()), booking_data={"item_id": "1"}
+            )
+            reserve_booking(db, booking)
+            db.add(booking)
+            bookings.append(booking)
+        db.commit()
+        ids = [booking.id for booking in bookings]
+        assert booked(db, 1, "Standard") == {day(1): 3}
+
+        db.query(Booking).filter(Booking.id == ids[0]).update({Booking.status: "cancelled"}, synchronize_session=False)
+        db.commit()
+        assert booked(db, 1, "Standard") == {day(1): 2}
+
+        # As the admin bulk delete does it; the cancelled booking's rooms are not released again
+        deleted = db.query(Booking).filter(Booking.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+
+        assert deleted == 3 and db.query(Booking).count() == 0
+        assert booked(db, 1, "Standard") == {day(1): 0}
+        assert get_calendar(db).free_rooms(1, day(1), day(2)) == {"Standard": 3}
+
+    def test_partial_release_is_reported(self, db, caplog):
+        """Test a release that finds fewer booked nights than the stay has is logged, not applied below zero."""
+        reserve_rooms(db, 1, day(1), day(3))
+        db.query(RoomInventory).filter(RoomInventory.night == day(2)).delete(synchronize_session=False)
+
+        assert room_inventory.release_rooms(db, 1, "Standard", day(1), day(3)) == 1
+        assert booked(db, 1, "Standard") == {day(1): 0}
+        assert "only 1 of 2 nights" in caplog.text
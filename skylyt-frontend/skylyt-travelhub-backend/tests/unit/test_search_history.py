@@ -0,0 +1,120 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (every table, for create_all)
+from app.core.database import Base, SessionLocal
+from app.models.search_history import SearchHistory
+from app.models.user import User
+from app.services import search_history
+from app.services.search_demand_service import SearchDemandService
+from app.services.search_history import SearchHistoryRecorder, response_total, search_params
+from app.utils import cache as cache_module
+from app.utils.response_cache import encode_response
+from tests.fake_redis import FakeAsyncRedis
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "get_async_redis", lambda: client)
+    return client
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # One connection, shared with the threadpool the recorder writes from
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def enforce_foreign_keys(connection, record):
+        connection.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(engine)
+    session = SessionLocal(bind=engine)
+    session.add_all([
+        User(id=user_id, email=f"user{user_id}@example.com", hashed_password="x", first_name="Ada", last_name="Obi")
+        for user_id in (1, 2)
+    ])
+    session.commit()
+    monkeypatch.setattr(search_history, "run_in_session", lambda func, *args: func(session, *args))
+    yield session
+    session.close()
+
+
+def stored(db):
+    return [(row.user_id, row.search_params["location"]) for row in db.query(SearchHistory).order_by(SearchHistory.id)]
+
+
+class TestSearchHistoryRecorder:
+    def test_params_are_replayable_by_the_cache_warmer(self):
+        """Test stored parameters keep the route names and survive the JSON column."""
+        params = search_params(location="Lagos", min_price=Decimal("50.00"), category=None, page=2)
+
+        assert params == {"location": "Lagos", "min_price": "50.00", "page": 2}
+        assert SearchDemandService.warmable_params("car", params) == {
+            "location": "Lagos", "min_price": Decimal("50.00"), "page": 2
+        }
+
+    def test_results_are_counted_from_the_cached_response(self):
+        """Test the total is read from a cached response, even a gzipped one."""
+        assert response_total(encode_response({"cars": [], "total": 7})) == 7
+        assert response_total(encode_response({"cars": [{"name": "x" * 600}], "total": 1})) == 1
+        assert response_total(encode_response({"cars": []})) == 0
+
+    def test_buffer_is_bounded(self):
+        """Test a full buffer drops its oldest searches and counts them; guests are not kept."""
+        recorder = SearchHistoryRecorder(capacity=3, batch_size=10)
+        for i in range(5):
+            recorder.record(1, "car", {"location": f"City {i}"})
+        recorder.record(None, "car", {"location": "Guest"})
+
+        assert [entry.search_params["location"] for entry in recorder._buffer] == ["City 2", "City 3", "City 4"]
+        assert recorder.get_stats()["dropped"] == 2
+        assert recorder.recorded == 5
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_batches(self, db, fake_redis):
+        """Test buffered searches are written in batches, in order, and the buffer empties."""
+        recorder = SearchHistoryRecorder(capacity=100, batch_size=2)
+        for i in range(5):
+            recorder.record(1 + i % 2, "car", {"location": f"City {i}"}, 3)
+
+        assert await recorder.flush() == 5
+        assert stored(db) == [(1, "City 0"), (2, "City 1"), (1, "City 2"), (2, "City 3"), (1, "City 4")]
+        assert len(recorder) == 0 and recorder.written == 5
+
+    @pytest.mark.asyncio
+    async def test_deleted_users_do_not_fail_the_batch(self, db, fake_redis):
+        """Test a search by a removed account is skipped and the rest of its batch written."""
+        recorder = SearchHistoryRecorder(capacity=100, batch_size=10)
+        recorder.record(1, "car", {"location": "Lagos"})
+        recorder.record(99, "car", {"location": "Nowhere"})
+
+        assert await recorder.flush() == 1
+        assert stored(db) == [(1, "Lagos")]
+        assert recorder.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_recent_history_is_cached_per_user(self, db, fake_redis):
+        """Test reads fill the user's cached list, later writes are pushed to it and pending searches show."""
+        recorder = SearchHistoryRecorder(capacity=100, batch_size=10, recent=3)
+        recorder.record(1, "hotel", {"destination": "Abuja"}, 4)
+        await recorder.flush()
+
+        history = await recorder.recent(1)
+        assert [(item["query"], item["results_count"]) for item in history] == [("Abuja Hotels", 4)]
+        db.query(SearchHistory).delete()
+        db.commit()
+
+        for city in ("Lagos", "Kano", "Jos"):
+            recorder.record(1, "car", {"location": city})
+        await recorder.flush()
+        recorder.record(1, "bundle", {"city": "Enugu"})
+        recorder.record(2, "car", {"location": "Ibadan"})
+
+        assert [item["query"] for item in await recorder.recent(1)] == ["Enugu Bundle", "Jos Cars", "Kano Cars"]
+        assert [item["query"] for item in await recorder.recent(1, limit=1)] == ["Enugu Bundle"]
+        assert await recorder.recent(3) == []
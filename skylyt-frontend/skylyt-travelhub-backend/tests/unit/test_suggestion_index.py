@@ -0,0 +1,148 @@
+import random
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models.booking import Booking
+from app.models.car import Car
+from app.models.city import City
+from app.models.hotel import Hotel
+from app.models.state import State
+from app.services import suggestion_index as suggestions
+from app.services.suggestion_index import (
+    MAX_SUGGESTIONS, SCAN_LIMIT, Suggestion, SuggestionIndex, load_entries, tokens
+)
+
+
+def entry(key, name, score):
+    return Suggestion(key, key.partition(":")[0], name, score, (("id", key),))
+
+
+@pytest.fixture
+def index():
+    index = SuggestionIndex()
+    index.build([
+        entry("city:1", "Lagos", 100.0),
+        entry("state:1", "Lagos State", 60.0),
+        entry("hotel:1", "Eko Hotel Lagos", 9.0),
+        entry("hotel:2", "Lagoon Breeze Suites", 14.0),
+        entry("car:toyota camry", "Toyota Camry", 30.0),
+        entry("city:2", "Abuja", 80.0),
+    ])
+    return index
+
+
+def keys(results):
+    return [result.key for result in results]
+
+
+class TestSuggestionIndex:
+    def test_prefix_matches_rank_by_popularity(self, index):
+        """Test any word of a name can start a match and popular entries lead."""
+        assert keys(index.search("lag")) == ["city:1", "state:1", "hotel:2", "hotel:1"]
+        assert keys(index.search("LAGOS st")) == ["state:1"]
+        assert keys(index.search("camr")) == ["car:toyota camry"]
+        assert index.search("lag", limit=2)[1].as_response() == {"type": "state", "name": "Lagos State", "id": "state:1"}
+
+    def test_queries_are_normalized(self, index):
+        """Test case, punctuation and spacing do not matter."""
+        assert keys(index.search("  EKO-hotel ")) == ["hotel:1"]
+        assert index.search("   ") == []
+        assert index.search("zz") == []
+
+    def test_unbuilt_index_answers_nothing(self):
+        """Test callers can tell the index has not loaded yet."""
+        assert SuggestionIndex().search("lag") is None
+
+    def test_upsert_and_remove(self, index):
+        """Test renames, score changes and deletions show up immediately."""
+        index.upsert(entry("hotel:1", "Eko Signature", 500.0))
+        index.remove("city:2")
+
+        assert keys(index.search("lag")) == ["city:1", "state:1", "hotel:2"]
+        assert keys(index.search("e")) == ["hotel:1"]
+        assert index.search("abu") == []
+        assert tokens("Eko Signature") == {"eko signature", "signature"}
+
+    @pytest.mark.asyncio
+    async def test_refresh_drops_rows_that_no_longer_load(self, index, monkeypatch):
+        """Test deleted rows and vanished car models leave the index on refresh."""
+        monkeypatch.setattr(suggestions, "load_entries", lambda db, keys: [entry("car:kia rio", "Kia Rio", 3.0)])
+
+        await index.refresh(["hotel:2", "car"])
+
+        assert keys(index.search("lag")) == ["city:1", "state:1", "hotel:1"]
+        assert keys(index.search("camry")) == []
+        assert keys(index.search("rio")) == ["car:kia rio"]
+
+
+class TestRankedPrefixes:
+    def test_kept_rankings_follow_incremental_changes(self):
+        """Test broad prefixes patched in place match a fresh build after churn."""
+        rng = random.Random(3)
+        names = ["Lagos", "Lekki", "Lokoja", "Ilorin", "Ibadan", "Abuja", "Asaba"]
+        entries = [
+            entry(f"hotel:{i}", f"{rng.choice(names)} {rng.choice(names)} {i}", float(rng.randint(0, 500)))
+            for i in range(SCAN_LIMIT * 6)
+        ]
+        index = SuggestionIndex()
+        index.build(entries)
+        assert index._top
+
+        for step in range(300):
+            key = f"hotel:{rng.randrange(len(entries) + 20)}"
+            if step % 5 == 0:
+                index.remove(key)
+            else:
+                index.upsert(entry(key, f"{rng.choice(names)} {rng.choice(names)}", float(rng.randint(0, 500))))
+            index.search(rng.choice(names)[:rng.randint(1, 3)])
+
+        fresh = SuggestionIndex()
+        fresh.build(index._entries.values())
+        for prefix in {name[:n] for name in names for n in (1, 2, 3)}:
+            assert keys(index.search(prefix, MAX_SUGGESTIONS)) == keys(fresh.search(prefix, MAX_SUGGESTIONS))
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    for model in (State, City, Hotel, Car, Booking):
+        model.__table__.create(engine)
+    with Session(engine) as session:
+        lagos = State(id=1, name="Lagos", country="Nigeria", state_code="LA", slug="lagos", popularity_score=40.0, hotel_count=2)
+        session.add_all([
+            lagos,
+            City(id=1, name="Ikeja", state_id=1, slug="ikeja", popularity_ranking=2, hotel_count=1),
+            Hotel(id=1, name="Eko Hotel", location="Victoria Island, Lagos", star_rating=5.0, price_per_night=250.0, room_count=10),
+            Hotel(id=2, name="Closed Inn", location="Ikeja, Lagos", star_rating=3.0, price_per_night=90.0, room_count=5, is_available=False),
+            Car(id="c1", name="Camry 1", make="Toyota", model="Camry", category="sedan", transmission="automatic", seats=5, price_per_day=40.0),
+            Car(id="c2", name="Camry 2", make="toyota", model="CAMRY", category="sedan", transmission="automatic", seats=5, price_per_day=45.0),
+        ])
+        session.add_all([
+            Booking(
+                booking_reference=f"BK{i}", booking_type=booking_type, customer_name="Ada", customer_email="ada@example.com",
+                total_amount=100, start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 2), booking_data={},
+                hotel_name="Eko Hotel" if booking_type == "hotel" else None, car_name="Camry 2" if booking_type == "car" else None
+            )
+            for i, booking_type in enumerate(["hotel", "hotel", "car"])
+        ])
+        session.commit()
+        yield session
+
+
+class TestLoadEntries:
+    def test_popularity_comes_from_rankings_and_bookings(self, db):
+        """Test every source is loaded and scored, one entry per car model."""
+        entries = {entry.key: entry for entry in load_entries(db)}
+
+        assert set(entries) == {"state:1", "city:1", "hotel:1", "car:toyota camry"}
+        assert entries["state:1"].score == 42.0
+        assert entries["city:1"].score == 51.0
+        assert entries["hotel:1"].score == 15.0
+        assert entries["car:toyota camry"].score == 7.0
+        assert entries["city:1"].as_response() == {"type": "city", "name": "Ikeja", "id": 1, "state": "Lagos"}
+
+    def test_changed_keys_load_only_their_rows(self, db):
+        """Test incremental loads skip untouched rows and unavailable hotels."""
+        assert [e.key for e in load_entries(db, ["hotel:1", "hotel:2"])] == ["hotel:1"]
+        assert [e.key for e in load_entries(db, ["city:1", "car"])] == ["city:1", "car:toyota camry"]
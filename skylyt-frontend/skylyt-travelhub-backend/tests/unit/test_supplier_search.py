@@ -0,0 +1,178 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (every table, for create_all)
+from app.core.database import Base, SessionLocal
+from app.core.http_client import OutboundHTTP
+from app.external.cars.hertz import HertzAPI
+from app.external.hotels.booking_com import BookingComAPI
+from app.models.booking import Booking
+from app.models.car import Car
+from app.models.currency import Currency
+from app.models.hotel import Hotel
+from app.models.room_inventory import RoomInventory
+from app.services import fx_rates, supplier_search
+from app.services.fx_rates import RateSnapshot
+from app.services.room_inventory import invalidate_calendar
+from app.services.supplier_search import (
+    CACHED, ERROR, OK, TIMEOUT, SupplierAggregator, convert_offers, merge_offers, search_all_cars, search_all_hotels
+)
+from app.utils import cache as cache_module
+from app.utils.cache import CacheManager
+from tests.fake_redis import FakeAsyncRedis
+from tests.fake_suppliers import FakeSupplierServer
+
+CHECK_IN = date.today() + timedelta(days=7)
+CHECK_OUT = CHECK_IN + timedelta(days=2)
+
+
+def hotels(*offers):
+    return {"hotels": [
+        {"hotel_id": f"h{i}", "name": name, "location": "Lagos", "price": price, "currency": "USD", "rating": 4.0}
+        for i, (name, price) in enumerate(offers)
+    ]}
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "get_async_redis", lambda: client)
+    # A fresh in-process tier, so no test sees another's supplier responses
+    monkeypatch.setattr(supplier_search, "cache_manager", CacheManager())
+    return client
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = SessionLocal(bind=engine)
+    session.add_all([
+        Currency(code="USD", name="US Dollar", symbol="$", rate_to_ngn=1500),
+        Hotel(id=1, name="Eko Hotel", location="Victoria Island, Lagos", star_rating=5, price_per_night=150000, room_count=10),
+        Hotel(id=2, name="Transcorp", location="Abuja", star_rating=5, price_per_night=90000, room_count=10),
+    ])
+    session.commit()
+    fx_rates.invalidate_rates()
+    invalidate_calendar()
+    monkeypatch.setattr(supplier_search, "run_in_session", lambda func, *args: func(session, *args))
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def http():
+    # Fresh rate limits and circuit breakers per test
+    return OutboundHTTP()
+
+
+def booking_com(server, http, timeout=None):
+    return BookingComAPI("key", server.url, http, timeout)
+
+
+class TestSupplierSearch:
+    def test_offers_are_priced_and_deduplicated(self):
+        """Test local rows win, the cheapest duplicate offer is kept and unpriceable offers are dropped."""
+        rates = RateSnapshot.from_rows(1, [("USD", 1500, "$")])
+        offers = convert_offers([
+            {"supplier": "a", "name": "Eko Hotel", "price": 90, "currency": "USD"},
+            {"supplier": "a", "name": "Grand Plaza", "price": 120, "currency": "USD"},
+            {"supplier": "b", "name": "grand plaza!", "price": 110, "currency": "USD"},
+            {"supplier": "b", "name": "Unknown money", "price": 10, "currency": "XYZ"},
+            {"supplier": "b", "name": "No price", "price": None, "currency": "USD"},
+        ], rates, "NGN")
+        merged = merge_offers([{"source": "local", "name": "EKO hotel", "price": 150000.0}], offers)
+
+        assert [(item["source"], item["name"], item["price"]) for item in merged] == [
+            ("local", "EKO hotel", 150000.0), ("b", "grand plaza!", 165000.0)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_suppliers_are_queried_concurrently(self, fake_redis, http):
+        """Test every supplier is called at once, with its key and the search parameters."""
+        with FakeSupplierServer({"hotels": hotels(("A", 100))}, delay=0.3) as first, \
+                FakeSupplierServer({"hotels": hotels(("B", 90))}, delay=0.3) as second:
+            aggregator = SupplierAggregator([booking_com(first, http), booking_com(second, http)], timeout=2)
+            began = time.perf_counter()
+            results = await aggregator.search_hotels("Lagos", CHECK_IN, CHECK_OUT, 2, 1)
+            elapsed = time.perf_counter() - began
+
+        assert [(r.status, [item["name"] for item in r.items]) for r in results] == [(OK, ["A"]), (OK, ["B"])]
+        assert elapsed < 0.55
+        path, params, auth = first.requests[0]
+        assert (path, params["location"], params["check_in"], auth) == ("hotels", "Lagos", CHECK_IN.isoformat(), "Bearer key")
+
+    @pytest.mark.asyncio
+    async def test_slow_and_failing_suppliers_give_partial_results(self, fake_redis, http):
+        """Test a supplier past its deadline or failing is reported, and the others still return."""
+        with FakeSupplierServer({"hotels": hotels(("Fast", 100))}) as fast, \
+                FakeSupplierServer({"hotels": hotels(("Slow", 50))}, delay=1.0) as slow, \
+                FakeSupplierServer({"hotels": {}}, status=500) as broken:
+            aggregator = SupplierAggregator(
+                [booking_com(fast, http), booking_com(slow, http, timeout=0.2), booking_com(broken, http)],
+                timeout=2
+            )
+            began = time.perf_counter()
+            results = await aggregator.search_hotels("Lagos", CHECK_IN, CHECK_OUT, 1, 1)
+            elapsed = time.perf_counter() - began
+
+        assert [(r.status, len(r.items)) for r in results] == [(OK, 1), (TIMEOUT, 0), (ERROR, 0)]
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_supplier_responses_are_cached_per_query(self, fake_redis, http):
+        """Test a repeated query is served from the cache and a new query asks the supplier again."""
+        cars = {"cars": [{"car_id": "c1", "make": "Toyota", "model": "Corolla", "price_per_day": 40, "currency": "USD"}]}
+        with FakeSupplierServer({"cars": cars}) as hertz:
+            aggregator = SupplierAggregator(car_suppliers=[HertzAPI("key", hertz.url, http)])
+            first = await aggregator.search_cars("Lagos", CHECK_IN, CHECK_OUT)
+            again = await aggregator.search_cars(" lagos", CHECK_IN, CHECK_OUT)
+            later = await aggregator.search_cars("Lagos", CHECK_OUT, CHECK_OUT + timedelta(days=1))
+
+        assert [r.status for r in first + again + later] == [OK, CACHED, OK]
+        assert again[0].items[0]["name"] == "Toyota Corolla"
+        assert len(hertz.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_merges_local_hotels(self, db, fake_redis, http):
+        """Test local hotels and supplier offers come back as one list, in the requested currency."""
+        with FakeSupplierServer({"hotels": hotels(("EKO Hotel", 80), ("Grand Plaza", 60))}) as server:
+            aggregator = SupplierAggregator([booking_com(server, http)])
+            response = await search_all_hotels("Lagos", CHECK_IN, CHECK_OUT, 2, 1, "USD", 10, aggregator)
+
+        assert [(h["source"], h["name"], h["price"]) for h in response["hotels"]] == [
+            ("booking.com", "Grand Plaza", 60.0), ("local", "Eko Hotel", 100.0)
+        ]
+        assert response["suppliers"]["booking.com"]["status"] == OK
+        assert not response["partial"]
+
+    @pytest.mark.asyncio
+    async def test_local_rows_are_free_for_the_dates(self, db, fake_redis):
+        """Test sold-out hotels and cars booked for the window are left out of the local rows."""
+        db.add_all([
+            Hotel(id=3, name="Lagos Inn", location="Ikeja, Lagos", star_rating=3, price_per_night=30000, room_count=1),
+            RoomInventory(hotel_id=3, room_type="Standard", night=CHECK_IN + timedelta(days=1), total_rooms=1, booked_rooms=1),
+            Car(id="free", name="Corolla", make="Toyota", model="Corolla", category="sedan", transmission="automatic",
+                seats=5, price_per_day=60000, location="Lagos"),
+            Car(id="booked", name="Camry", make="Toyota", model="Camry", category="sedan", transmission="automatic",
+                seats=5, price_per_day=30000, location="Lagos"),
+            Booking(
+                booking_reference="B1", booking_type="car", customer_name="Ada", customer_email="ada@example.com",
+                total_amount=100, start_date=CHECK_IN, end_date=CHECK_OUT, status="confirmed",
+                booking_data={"item_id": "booked"}
+            ),
+        ])
+        db.commit()
+        invalidate_calendar()
+
+        hotels = await search_all_hotels("Lagos", CHECK_IN, CHECK_OUT, 1, 1, "NGN", 10, SupplierAggregator())
+        cars = await search_all_cars("Lagos", CHECK_IN, CHECK_OUT, "NGN", 10, SupplierAggregator())
+        later = await search_all_hotels("Lagos", CHECK_OUT, CHECK_OUT + timedelta(days=1), 1, 1, "NGN", 10, SupplierAggregator())
+
+        assert [h["name"] for h in hotels["hotels"]] == ["Eko Hotel"]
+        assert [c["id"] for c in cars["cars"]] == ["free"]
+        assert [h["name"] for h in later["hotels"]] == ["Lagos Inn", "Eko Hotel"]
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table, select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.utils.text_search import contains, escape_like, is_relevance_sort, relevance
+
+bookings = Table(
+    "bookings", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("customer_name", String),
+    Column("customer_email", String),
+)
+COLUMNS = [bookings.c.customer_name, bookings.c.customer_email]
+
+
+def compile_sql(clause, dialect) -> str:
+    return str(select(bookings.c.id).where(clause).compile(
+        dialect=dialect, compile_kwargs={"literal_binds": True}
+    ))
+
+
+class TestTextSearch:
+    def test_wildcards_in_terms_are_literal(self):
+        """Test user input cannot widen a LIKE pattern."""
+        assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+
+    def test_contains_uses_ilike_on_every_column(self):
+        """Test the filter stays an ILIKE that pg_trgm GIN indexes can serve."""
+        # psycopg2's paramstyle doubles literal percent signs
+        sql = compile_sql(contains(COLUMNS, "ada"), postgresql.dialect()).replace("%%", "%")
+
+        assert sql.count("ILIKE '%ada%'") == 2
+        assert " OR " in sql
+
+    def test_trigram_relevance_uses_word_similarity(self):
+        """Test PostgreSQL ranking uses pg_trgm's word_similarity."""
+        sql = str(relevance(COLUMNS, "ada", "trigram").compile(dialect=postgresql.dialect()))
+
+        assert "greatest" in sql.lower()
+        assert sql.lower().count("word_similarity(") == 2
+
+    def test_ilike_relevance_compiles_on_sqlite(self):
+        """Test the fallback ranking is portable SQL."""
+        sql = str(relevance(COLUMNS, "ada", "ilike").compile(dialect=sqlite.dialect()))
+
+        assert "word_similarity" not in sql
+        assert "CASE" in sql
+
+    def test_relevance_sort_accepts_direction_prefix(self):
+        """Test both 'relevance' and '-relevance' select relevance ordering."""
+        assert is_relevance_sort("relevance")
+        assert is_relevance_sort("-relevance")
+        assert not is_relevance_sort("price")
+        assert not is_relevance_sort(None)